@@ -35,7 +35,7 @@ class AITrader:
         """시장 분석 실행"""
         analysis = await self.gpt_analyzer.analyze_market(timeframe, klines)
         if analysis:
-            self.storage_formatter.save_analysis(analysis, timeframe)
+            self.storage_formatter.save_analysis(timeframe, analysis)
         return analysis
 
     def validate_auto_trading(self, analysis: Dict) -> bool:
@@ -0,0 +1,189 @@
+import copy
+import time
+import math
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import config
+from services.storage_io import atomic_write_json, read_json, run_io
+
+logger = logging.getLogger(__name__)
+
+# 진입가 기준 비율로 재계산하는 가격 필드
+PRICE_FIELDS = ('entry_price', 'stop_loss', 'take_profit1', 'take_profit2')
+
+def rebase_signals(response: Dict, reference_price: float, current_price: float) -> Dict:
+    """캐시된 GPT 응답의 가격 필드를 현재가 기준으로 환산한 복사본"""
+    result = copy.deepcopy(response)
+    signals = result.get('trading_signals', {})
+    if reference_price and current_price:
+        ratio = current_price / reference_price
+        for field in PRICE_FIELDS:
+            try:
+                if signals.get(field) is not None:
+                    signals[field] = round(float(signals[field]) * ratio, 1)
+            except (ValueError, TypeError):
+                continue
+    return result
+
+class AnalysisCache:
+    """GPT 분석 응답 캐시 (양자화된 시장 상태 키, LRU, 디스크 영속)
+
+    프롬프트에 들어가는 지표를 구간으로 묶어 키를 만들기 때문에
+    거의 같은 시장 상태에서는 최근 판단을 재사용하고 API 호출을 생략합니다.
+    """
+
+    DEFAULT_MAX_ENTRIES = 500
+    DEFAULT_TTL_MINUTES = 180
+    DEFAULT_BUCKETS = {
+        'rsi': 5,               # RSI 5 단위
+        'strength': 10,         # 추세 강도 10 단위
+        'price_change': 0.5     # 24시간 변동률 0.5% 단위
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'AnalysisCache':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, base_dir: Path = None):
+        settings = config.load_json_config('gpt_config.json').get('analysis_cache', {})
+        self.enabled = settings.get('enabled', True)
+        self.max_entries = int(settings.get('max_entries', self.DEFAULT_MAX_ENTRIES))
+        self.ttl = float(settings.get('ttl_minutes', self.DEFAULT_TTL_MINUTES)) * 60
+        self.buckets = {**self.DEFAULT_BUCKETS, **settings.get('buckets', {})}
+        self.path = (Path(base_dir) if base_dir else config.data_dir) / 'analysis' / 'llm_cache.json'
+
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._load()
+
+    # ---- 키 ----
+
+    def make_key(self, timeframe: str, indicators: Dict, price_change: float, version: str = '',
+                 symbol: str = '') -> str:
+        """양자화된 지표로 캐시 키 생성 (심볼별로 구분)"""
+        macd = float(indicators.get('macd', 0) or 0)
+        macd_signal = float(indicators.get('macd_signal', 0) or 0)
+        features = (
+            ('v', version),
+            ('sym', symbol),
+            ('tf', timeframe),
+            ('rsi', self._bucket(indicators.get('rsi'), self.buckets['rsi'])),
+            ('macd', '+' if macd > 0 else '-' if macd < 0 else '0'),
+            ('cross', '+' if macd > macd_signal else '-'),
+            ('bb', str(indicators.get('bb_position', '-'))),
+            ('trend', str(indicators.get('trend', '-'))),
+            ('strength', self._bucket(indicators.get('trend_strength'), self.buckets['strength'])),
+            ('chg', self._bucket(price_change, self.buckets['price_change']))
+        )
+        return '|'.join(f"{name}={value}" for name, value in features)
+
+    @staticmethod
+    def _bucket(value, size: float) -> str:
+        """구간 하한값 (NaN/None 은 'na')"""
+        try:
+            value = float(value)
+            if math.isnan(value):
+                return 'na'
+            return f"{math.floor(value / size) * size:g}"
+        except (ValueError, TypeError):
+            return 'na'
+
+    # ---- 조회/저장 ----
+
+    def get(self, key: str) -> Optional[Dict]:
+        """유효한 캐시 항목 조회 (response, reference_price, created_at)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry['created_at'] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, response: Dict, reference_price: float):
+        """GPT 응답 저장 (최대 개수 초과 시 가장 오래 사용하지 않은 항목 제거)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = {
+                'response': response,
+                'reference_price': reference_price,
+                'created_at': time.time()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """캐시 적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'hit_rate': round(self.hits / total * 100, 1) if total else 0.0
+        }
+
+    # ---- 영속화 ----
+
+    def save(self):
+        """디스크 저장 (만료 항목 제외)"""
+        if not self.enabled:
+            return
+        try:
+            now = time.time()
+            with self._lock:
+                data = [
+                    {'key': key, **entry}
+                    for key, entry in self._entries.items()
+                    if now - entry['created_at'] <= self.ttl
+                ]
+            atomic_write_json(self.path, data, indent=None)
+        except Exception as e:
+            logger.error(f"GPT 응답 캐시 저장 중 오류: {str(e)}")
+
+    async def save_async(self):
+        """디스크 저장 (스토리지 I/O 스레드에서 실행)"""
+        await run_io(self.save)
+
+    def _load(self):
+        """시작 시 디스크에서 로드"""
+        try:
+            data = read_json(self.path, default=[]) or []
+            now = time.time()
+            for item in data[-self.max_entries:]:
+                if now - item.get('created_at', 0) > self.ttl:
+                    continue
+                key = item.pop('key')
+                self._entries[key] = item
+            if self._entries:
+                logger.info(f"GPT 응답 캐시 로드: {len(self._entries)}개")
+        except Exception as e:
+            logger.error(f"GPT 응답 캐시 로드 중 오류: {str(e)}")
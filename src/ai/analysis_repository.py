@@ -0,0 +1,283 @@
+import json
+import queue
+import logging
+import threading
+import traceback
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+from config.trading_config import trading_config
+from services.storage_io import atomic_write_json, read_json, run_io
+
+logger = logging.getLogger(__name__)
+
+class AnalysisRepository:
+    """분석 결과 통합 저장소
+
+    - 시간대별 최신 분석은 메모리에 유지 (조회 시 디스크 접근 없음)
+    - 파일 저장은 백그라운드 워커 스레드의 write-behind 큐로 처리
+    - 모든 파일은 임시 파일 + rename 으로 원자적으로 기록
+    - 기본 심볼 외의 분석은 '<timeframe>_<symbol>' 키와 심볼별 하위 폴더에 저장
+    """
+
+    VALID_TIMEFRAMES = ('15m', '1h', '4h', '1d', 'final')
+    MAX_AGE_SECONDS = 3600  # 최신 분석 유효 시간 (1시간)
+    _STOP = object()
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'AnalysisRepository':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, base_dir: Path = None):
+        self.base_dir = Path(base_dir) if base_dir else config.data_dir
+        self.analysis_dir = self.base_dir / 'analysis'
+        self.trades_dir = self.base_dir / 'analysis_history' / 'trades'
+        self.analysis_dir.mkdir(parents=True, exist_ok=True)
+
+        self._latest: Dict[str, Dict] = {}
+        self._latest_lock = threading.Lock()
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._closed = False
+
+        # 시작 시 한 번만 디스크에서 최신 분석 로드
+        self._load_latest_from_disk()
+
+        self._worker = threading.Thread(
+            target=self._run_worker,
+            name='analysis-writer',
+            daemon=True
+        )
+        self._worker.start()
+
+    # ---- 쓰기 ----
+
+    def save_analysis(self, timeframe: str, analysis: Dict, symbol: str = None) -> bool:
+        """분석 결과 저장 (메모리 즉시 반영, 파일은 비동기 기록)"""
+        try:
+            if not isinstance(analysis, dict):
+                logger.error(f"잘못된 분석 데이터 타입: {type(analysis)}")
+                return False
+            if self._closed:
+                logger.error("저장소가 종료되어 분석 결과를 저장할 수 없습니다")
+                return False
+
+            analysis_data = self._normalize(analysis)
+            analysis_data.setdefault('timeframe', timeframe)
+            key = self._key(timeframe, symbol)
+
+            with self._latest_lock:
+                self._latest[key] = analysis_data
+
+            # 최신본 파일과 이력 파일을 모두 큐에 등록
+            self._queue.put((self.analysis_dir / f"analysis_{key}.json", analysis_data))
+            self._queue.put((self._history_path(timeframe, analysis_data['timestamp'], symbol), analysis_data))
+            return True
+
+        except Exception as e:
+            logger.error(f"분석 결과 저장 중 오류: {str(e)}")
+            return False
+
+    def save_trade_analysis(self, analysis: Dict, category: str) -> bool:
+        """거래 분석 결과 저장 (이력 전용)"""
+        try:
+            if self._closed:
+                return False
+            now = datetime.now()
+            save_path = (self.trades_dir / now.strftime('%Y%m%d') / category /
+                         f"analysis_{int(now.timestamp() * 1000)}.json")
+            self._queue.put((save_path, dict(analysis)))
+            return True
+        except Exception as e:
+            logger.error(f"거래 분석 결과 저장 중 오류: {str(e)}")
+            return False
+
+    # ---- 읽기 ----
+
+    def get_latest(self, timeframe: str, symbol: str = None) -> Optional[Dict]:
+        """메모리에 있는 최신 분석 결과 (유효 시간 무시)"""
+        with self._latest_lock:
+            data = self._latest.get(self._key(timeframe, symbol))
+        return dict(data) if data else None
+
+    def get_last_analysis(self, timeframe: str, max_age: int = MAX_AGE_SECONDS,
+                          symbol: str = None) -> Optional[Dict]:
+        """유효 시간 내의 최신 분석 결과 (분석 데이터의 timestamp 가 아닌 저장 시각 기준)"""
+        data = self.get_latest(timeframe, symbol)
+        if not data:
+            return None
+
+        saved_at = data.get('saved_at')
+        if not saved_at:
+            return None
+
+        try:
+            saved_time = datetime.strptime(saved_at, "%Y-%m-%d %H:%M:%S KST")
+        except (TypeError, ValueError):
+            logger.warning(f"저장 시각 형식 오류: {saved_at}")
+            return None
+
+        if (datetime.now() - saved_time).total_seconds() > max_age:
+            return None
+        return data
+
+    def get_analyses_in_range(self, start_time: int, end_time: int,
+                              timeframes: Tuple[str, ...] = VALID_TIMEFRAMES) -> List[Dict]:
+        """특정 기간의 분석 이력 로드 (디스크 조회, 이벤트 루프 밖에서 호출)"""
+        analyses = []
+        try:
+            current_date = datetime.fromtimestamp(start_time / 1000).date()
+            end_date = datetime.fromtimestamp(end_time / 1000).date()
+
+            while current_date <= end_date:
+                date_str = current_date.strftime('%Y%m%d')
+                for timeframe in timeframes:
+                    timeframe_dir = self.analysis_dir / date_str / timeframe
+                    if not timeframe_dir.exists():
+                        continue
+
+                    for file_path in timeframe_dir.glob('analysis_*.json'):
+                        try:
+                            file_ts = int(file_path.stem.split('_')[1])
+                        except (IndexError, ValueError):
+                            continue
+                        if not (start_time <= file_ts <= end_time):
+                            continue
+
+                        analysis = self._read_json(file_path)
+                        if analysis is not None:
+                            analysis.setdefault('timeframe', timeframe)
+                            analyses.append(analysis)
+
+                current_date += timedelta(days=1)
+
+            analyses.sort(key=lambda x: x.get('timestamp', 0))
+            return analyses
+
+        except Exception as e:
+            logger.error(f"기간별 분석 결과 로드 중 오류: {str(e)}")
+            return analyses
+
+    async def get_analyses_in_range_async(self, start_time: int, end_time: int,
+                                          timeframes: Tuple[str, ...] = VALID_TIMEFRAMES) -> List[Dict]:
+        """특정 기간의 분석 이력 로드 (스토리지 I/O 스레드에서 실행)"""
+        return await run_io(self.get_analyses_in_range, start_time, end_time, timeframes)
+
+    def get_analysis_at_time(self, timestamp: int) -> Optional[Dict]:
+        """특정 시점과 가장 가까운 분석 결과 (같은 날짜 내)"""
+        date = datetime.fromtimestamp(timestamp / 1000)
+        day_start = int(datetime.combine(date.date(), datetime.min.time()).timestamp() * 1000)
+        day_end = int(datetime.combine(date.date(), datetime.max.time()).timestamp() * 1000)
+
+        analyses = self.get_analyses_in_range(day_start, day_end)
+        if not analyses:
+            return None
+        return min(analyses, key=lambda x: abs(x.get('timestamp', 0) - timestamp))
+
+    # ---- 종료 ----
+
+    def flush(self, timeout: float = None) -> bool:
+        """대기 중인 쓰기 작업이 모두 끝날 때까지 대기"""
+        if timeout is None:
+            self._queue.join()
+            return True
+
+        done = threading.Event()
+
+        def _wait():
+            self._queue.join()
+            done.set()
+
+        threading.Thread(target=_wait, daemon=True).start()
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """남은 작업을 기록하고 워커 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._worker.join(timeout)
+        logger.info("분석 저장소 종료됨")
+
+    # ---- 내부 ----
+
+    def _run_worker(self):
+        """write-behind 워커 루프"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                path, data = item
+                atomic_write_json(path, data)
+            except Exception as e:
+                logger.error(f"분석 결과 파일 기록 중 오류: {str(e)}")
+                logger.error(traceback.format_exc())
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _key(timeframe: str, symbol: str = None) -> str:
+        """최신 분석 키 (기본 심볼은 기존과 같이 시간대만 사용)"""
+        if not symbol or symbol == trading_config.symbol:
+            return timeframe
+        return f"{timeframe}_{symbol}"
+
+    def _history_path(self, timeframe: str, timestamp: int, symbol: str = None) -> Path:
+        """이력 파일 경로 (analysis/<YYYYMMDD>/<timeframe>[/<symbol>]/analysis_<ts>.json)"""
+        date_str = datetime.fromtimestamp(timestamp / 1000).strftime('%Y%m%d')
+        directory = self.analysis_dir / date_str / timeframe
+        if self._key(timeframe, symbol) != timeframe:
+            directory = directory / symbol
+        return directory / f"analysis_{int(timestamp)}.json"
+
+    def _load_latest_from_disk(self):
+        """저장된 analysis_<key>.json 파일로 메모리 초기화"""
+        for path in self.analysis_dir.glob('analysis_*.json'):
+            key = path.stem[len('analysis_'):]
+            if key.split('_', 1)[0] not in self.VALID_TIMEFRAMES:
+                continue
+            data = self._read_json(path)
+            if isinstance(data, dict):
+                self._latest[key] = data
+
+    @staticmethod
+    def _normalize(analysis: Dict) -> Dict:
+        """숫자 데이터 소수점 정리 및 저장 시간 기록 (원본은 변경하지 않음)"""
+        data = json.loads(json.dumps(analysis, default=str))
+
+        if isinstance(data.get('market_summary'), dict):
+            market = data['market_summary']
+            market['current_price'] = round(float(market.get('current_price', 0) or 0), 2)
+
+        indicators = data.get('technical_analysis', {}).get('indicators')
+        if isinstance(indicators, dict):
+            indicators['rsi'] = round(float(indicators.get('rsi', 0) or 0), 2)
+
+        if isinstance(data.get('trading_signals'), dict):
+            signals = data['trading_signals']
+            for key, digits in (('entry_price', 2), ('stop_loss', 1), ('take_profit1', 2), ('take_profit2', 2)):
+                signals[key] = round(float(signals.get(key, 0) or 0), digits)
+
+        now = datetime.now()
+        data['saved_at'] = now.strftime("%Y-%m-%d %H:%M:%S KST")
+        data['timestamp'] = int(data.get('timestamp') or now.timestamp() * 1000)
+        return data
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict]:
+        """JSON 파일 읽기 (없거나 손상된 경우 None)"""
+        try:
+            return read_json(path)
+        except Exception as e:
+            logger.error(f"분석 파일 로드 중 오류 ({path}): {str(e)}")
+            return None
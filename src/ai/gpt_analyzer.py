@@ -2,11 +2,10 @@ import numpy as np
 import pandas as pd
 import logging
 from typing import Dict, Any, Optional, List, Tuple
-import json
 import time
 from datetime import datetime
 import traceback
-from .gpt_client import GPTClient
+from .llm_client import LLMClient
 from collections import Counter
 from services.market_data_service import MarketDataService
 from indicators.technical import TechnicalIndicators
@@ -15,6 +14,10 @@ from config.trading_config import trading_config
 from pathlib import Path
 from services.trade_store import TradeStore
 from .gpt_analysis_store import GPTAnalysisStore
+from .analysis_cache import AnalysisCache, rebase_signals
+from .signal_prefilter import SignalPrefilter
+from .signal_validator import SignalValidator
+from .prompt_builder import PromptBuilder
 
 # numpy 경고 무시 설정
 np.seterr(divide='ignore', invalid='ignore')
@@ -27,7 +30,7 @@ class GPTAnalyzer:
         self.support_levels = []
         self.resistance_levels = []
         self.analysis_timeout = 60
-        self.gpt_client = GPTClient()
+        self.llm_client = LLMClient.from_config()
         self.bybit_client = bybit_client
         self.market_data_service = market_data_service
         self.technical_indicators = TechnicalIndicators()
@@ -35,162 +38,57 @@ class GPTAnalyzer:
         
         # 새로운 저장소 추가
         self.analysis_store = GPTAnalysisStore()
+        self.analysis_cache = AnalysisCache.get_instance()
+        self.prefilter = SignalPrefilter()
+        self.signal_validator = SignalValidator()
 
-        if bybit_client:
+        # 전달받은 서비스가 없을 때만 새로 생성
+        if bybit_client and not market_data_service:
             self.market_data_service = MarketDataService(bybit_client)
 
-        # 프롬프트 템플릿 수정
-        leverage_settings = trading_config.leverage_settings
-        position_settings = trading_config.position_settings
+        # 고정 시스템 블록 + 압축된 지표/봉 표 (토큰 예산 적용)
+        self.prompt_builder = PromptBuilder()
         
-        self.SYSTEM_PROMPT = f"""당신은 1시간 봉을 기준으로 비트코인 선물 거래를 하는 트레이더입니다.
+        # 프롬프트가 바뀌면 이전 캐시 항목을 쓰지 않도록 키에 포함
+        self.prompt_version = self.prompt_builder.version
 
-*** 매매 포지션별 가격 설정 규칙 ***
+        # request_analysis 에서 예외로 끝난 횟수 (백테스트는 이 값으로 분석 실패를 구분)
+        self.error_count = 0
 
-매도(SELL) 포지션:
-- 원리: 가격이 내려갈 때 수익 발생
-- 예시) 현재가 50000일 때:
-  • 진입가: 50000
-  • 손절가: 51000 (진입가보다 높게)
-  • 이익실현1: 49000 (진입가보다 낮게)
-  • 이익실현2: 48000 (이익실현1보다 더 낮게)
-
-매수(BUY) 포지션:
-- 원리: 가격이 올라갈 때 수익 발생
-- 예시) 현재가 50000일 때:
-  • 진입가: 50000
-  • 손절가: 49000 (진입가보다 낮게)
-  • 이익실현1: 51000 (진입가보다 높게)
-  • 이익실현2: 52000 (이익실현1보다 더 높게)
-
-*** 레버리지 설정 규칙 ***
-시장 상황에 따라 적절한 레버리지를 선택하세요:
-
-1. 낮은 레버리지 (1-3배):
-   - 변동성이 매우 높을 때
-   - 시장 방향이 불확실할 때
-   - 여러 지표가 상충될 때
-   - 뉴스나 이벤트가 예상될 때
-
-2. 중간 레버리지 (4-7배):
-   - 일반적인 시장 상황
-   - 적당한 변동성
-   - 명확한 추세가 있을 때
-   - 지표들이 같은 방향을 가리킬 때
-
-3. 높은 레버리지 (8-10배):
-   - 변동성이 낮을 때
-   - 매우 명확한 추세일 때
-   - 모든 지표가 강하게 같은 방향을 가리킬 때
-   - 신뢰도가 매우 높을 때
-
-*** 시장 분석 필수 규칙 ***
-아래 필드는 모두 필수이며 반드시 채워야 합니다:
-1. market_phase: "상승", "하락", "횡보" 중 선택
-2. overall_sentiment: "긍정", "부정", "중립" 중 선택
-3. short_sentiment: "긍정", "부정", "중립" 중 선택
-4. volume_status: "거래량 증가", "거래량 감소", "거래량 보통" 중 선택
-5. risk_level: "높음", "중간", "낮음" 중 선택
-6. confidence: 0-100 사이의 정수
-
-응답 형식:
-{{
-    "market_summary": {{
-        "market_phase": "상승" 또는 "하락" 또는 "횡보",
-        "overall_sentiment": "긍정" 또는 "부정" 또는 "중립",
-        "short_sentiment": "긍정" 또는 "부정" 또는 "중립",
-        "volume_status": "거래량 증가" 또는 "거래량 감소" 또는 "거래량 보통",
-        "risk_level": "높음" 또는 "중간" 또는 "낮음",
-        "confidence": 0-100 사이 정수
-    }},
-    "trading_signals": {{
-        "position_suggestion": "BUY" 또는 "SELL" 또는 "HOLD",
-        "leverage": {leverage_settings['min']}-{leverage_settings['max']} 사이 정수 (기본값: {leverage_settings['default']}),
-        "position_size": {position_settings['min']}-{position_settings['max']} 사이 정수 (기본값: {position_settings['default']}),
-        "entry_price": 현재가,
-        "stop_loss": 포지션에 맞는 적절한 손절가,
-        "take_profit1": 포지션에 맞는 적절한 1차 익절가,
-        "take_profit2": 포지션에 맞는 적절한 2차 익절가,
-        "reason": "매매 사유"
-    }}
-}}
-
-주의사항:
-1. 매도(SELL) 포지션에서는 반드시:
-   take_profit2 < take_profit1 < entry_price < stop_loss
-2. 매수(BUY) 포지션에서는 반드시:
-   stop_loss < entry_price < take_profit1 < take_profit2
-3. 이 순서가 맞지 않으면 주문이 실패합니다.
-4. market_summary의 모든 필드는 필수입니다. 절대 비워두지 마세요.
-
-2. 매매 원칙:
-   • 상승 추세: RSI > 50, MACD > 0, 볼린저 밴드 중앙 이상일 때 매수
-   • 하락 추세: RSI < 50, MACD < 0, 볼린저 밴드 중앙 이하일 때 매도
-   • 횡보장: 변동성이 낮거나 명확한 신호가 없을 때는 HOLD
-
-3. 리스크 관리:
-   - 레버리지는 {leverage_settings['min']}-{leverage_settings['max']}배 사이로 제한
-   - 손절가/이익실현가 설정 규칙:
-    • 매수(BUY) 포지션:
-      - Stop Loss는 진입가보다 낮게 
-      - Take Profit은 진입가보다 높게 
-    • 매도(SELL) 포지션:
-      - Stop Loss는 진입가보다 높게
-      - Take Profit은 진입가보다 낮게 
-
-반드시 위 JSON 형식으로만 응답하세요. 다른 설명이나 텍스트는 포함하지 마세요.
-
-주의사항:
-1. HOLD 포지션일 때도 모든 가격 필드는 숫자로 설정해야 합니다
-2. entry_points는 항상 현재가를 포함해야 합니다
-3. stopLoss와 takeProfit은 문자열이 아닌 숫자여야 합니다. 매도포지션의 경우 반듯이 Stop Loss는 진입가보다 높아야하고, Take Profit은 진입가보다 낮아야합니다.
-
-3. 신뢰도(confidence) 판단 기준:
-   • 지표들의 일관성 (RSI, MACD, BB가 같은 방향을 가리키는지)
-   • 시장 상황의 명확성
-   • 거래량 증감과 추세의 일치도
-   • 다이버전스 존재 여부
-   • 주의: 신뢰도는 기술적 지표의 강도와는 다른 개념이고, 분석이 얼마나 정확한지에 대한 수치입니다.
-   • 예시: 
-     - 모든 지표가 약하지만 일관된 방향을 가리키면 신뢰도는 높을 수 있음
-     - 지표가 강하더라도 서로 상충되면 신뢰도는 낮을 수 있음
-"""
-
-        self.ANALYSIS_PROMPT_TEMPLATE = """
-현재 시장 데이터를 분석하여 JSON 형식으로만 응답해주세요:
-
-현재 시장 데이터:
-- 현재가: ${current_price:,.2f}
-- RSI: {rsi:.1f}
-- MACD: {macd}
-- 볼린저밴드: {bollinger}
-- 추세: {trend}
-- 추세강도: {trend_strength}/100
-- 24시간 변동: {price_change:+.2f}%
-- 거래량: {volume:,.0f}
-- 자금조달비율: {funding_rate:.4f}%
-
-위 데이터를 분석하여 system prompt에서 지정한 JSON 형식으로만 응답하세요.
-다른 설명이나 텍스트는 포함하지 마세요."""
-
-    async def analyze_market(self, timeframe: str, data: pd.DataFrame) -> Dict:
+    async def analyze_market(self, timeframe: str, data: pd.DataFrame, symbol: str = None) -> Dict:
         """시장 분석 수행"""
         try:
+            symbol = symbol or trading_config.symbol
+
             # 기술적 지표 계산
-            df_with_indicators = self.technical_indicators.calculate_indicators(data)
-            if df_with_indicators is None:
-                logger.error("기술적 지표 계산 실패")
+            prepared = self.compute_indicators(data)
+            if prepared is None:
                 return None
             
             # 시장 데이터 조회
-            market_data = await self.market_data_service.get_market_data('BTCUSDT')
+            market_data = await self.market_data_service.get_market_data(symbol)
             if not market_data:
                 logger.error("시장 데이터 조회 실패")
                 return None
+            logger.info(f"시장 데이터: {market_data}")
+
+            return await self.request_analysis(timeframe, prepared, symbol=symbol)
+            
+        except Exception as e:
+            logger.error(f"시장 분석 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+
+    def compute_indicators(self, data) -> Optional[Dict]:
+        """기술적 지표 계산 단계 (CPU 작업, 스레드에서 실행 가능)"""
+        try:
+            df_with_indicators = self.technical_indicators.calculate_indicators(data)
+            if df_with_indicators is None:
+                logger.error("기술적 지표 계산 실패")
+                return None
             
             # 디버깅을 위한 로그 추가
             logger.info(f"계산된 지표: {df_with_indicators.columns.tolist()}")
-            logger.info(f"시장 데이터: {market_data}")
             
             # 기술적 분석 결과 가져오기
             technical_analysis = self.technical_indicators.analyze_signals(df_with_indicators)
@@ -200,8 +98,9 @@ class GPTAnalyzer:
 
             # GPT에 전달할 데이터 구성
             latest = df_with_indicators.iloc[-1]
-            analysis_data = {
-                'market_data': market_data,
+            return {
+                'df': df_with_indicators,
+                'technical_analysis': technical_analysis,
                 'indicators': {
                     'rsi': float(latest['rsi']),
                     'macd': float(latest['macd']),
@@ -211,32 +110,54 @@ class GPTAnalyzer:
                     'trend_strength': technical_analysis['strength']
                 }
             }
+
+        except Exception as e:
+            logger.error(f"기술적 지표 계산 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+
+    async def request_analysis(self, timeframe: str, prepared: Dict, use_cache: bool = True,
+                               symbol: str = None) -> Optional[Dict]:
+        """GPT 분석 요청 단계 (compute_indicators 결과 사용)
+
+        Args:
+            use_cache: 양자화된 시장 상태가 같은 최근 응답이 있으면 API 호출 생략
+            symbol: 분석 대상 심볼 (기본: trading_config.symbol)
+        """
+        try:
+            symbol = symbol or trading_config.symbol
+            df_with_indicators = prepared['df']
+            technical_analysis = prepared['technical_analysis']
+            latest = df_with_indicators.iloc[-1]
+            current_price = float(latest['close'])
             
-            # 프롬프트 생성
-            system_message = {"role": "system", "content": self.SYSTEM_PROMPT}
-            user_message = {"role": "user", "content": self._create_analysis_prompt(df_with_indicators, analysis_data['indicators'], timeframe)}
-            
-            # GPT API 호출
-            response = await self.gpt_client.call_gpt_api([system_message, user_message])
-            
-            # 응답 처리
-            if not response:
-                logger.error("GPT API 응답이 없음")
-                return None
-            
-            # 응답 텍스트 추출
-            content = response.choices[0].message.content.strip()
+            cache_key = self.analysis_cache.make_key(
+                timeframe, prepared['indicators'],
+                df_with_indicators['price_change_24h'].iloc[-1], self.prompt_version, symbol
+            )
+            cached = None
             
-            # JSON 파싱
-            try:
-                gpt_analysis = json.loads(content)
-            except json.JSONDecodeError:
-                logger.error("JSON 파싱 실패")
-                logger.error(f"원본 응답: {content}")
-                return None
+            # 지표만으로 명확한 경우 LLM 생략 → 캐시 → LLM 순서
+            gpt_analysis = self.prefilter.evaluate(prepared, current_price)
+            if gpt_analysis:
+                source = 'rule'
+            else:
+                cached = self.analysis_cache.get(cache_key) if use_cache else None
+                if cached:
+                    source = 'cache'
+                    age = time.time() - cached['created_at']
+                    logger.info(f"GPT 응답 캐시 사용 (저장된 지 {age:.0f}초, 키: {cache_key})")
+                    gpt_analysis = rebase_signals(cached['response'], cached['reference_price'], current_price)
+                else:
+                    source = 'llm'
+                    gpt_analysis = await self._request_gpt_analysis(
+                        df_with_indicators, prepared['indicators'], timeframe, current_price, symbol)
+                    if not gpt_analysis:
+                        return None
             
             # 최종 분석 결과 구성
             analysis = {
+                "symbol": symbol,
                 "market_summary": {
                     **gpt_analysis['market_summary'],
                     "current_price": float(latest['close'])  # 현재가 추가
@@ -266,82 +187,82 @@ class GPTAnalyzer:
                     "enabled": True,
                     "status": "active"
                 },
+                "source": source,  # rule / cache / llm
+                "cache": {
+                    "hit": bool(cached),
+                    "key": cache_key
+                },
                 "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S KST"),
                 "timestamp": int(time.time() * 1000)
             }
             
+            # 검증을 통과한 LLM 응답만 캐시
+            if source == 'llm':
+                self.analysis_cache.put(cache_key, gpt_analysis, current_price)
+                await self.analysis_cache.save_async()
+            
             return analysis
             
         except Exception as e:
-            logger.error(f"시장 분석 중 오류: {str(e)}")
+            self.error_count += 1
+            logger.error(f"GPT 분석 요청 중 오류: {str(e)}")
             logger.error(traceback.format_exc())
             return None
 
-    def _validate_analysis_result(self, result: Dict) -> Dict:
-        """분석 결과 검증 및 정규화"""
-        try:
-            # 기본 필드 검증
-            required_fields = {
-                'position': ['position'],
-                'entry_price': ['entry_price'],
-                'stop_loss': ['stop_loss'],
-                'take_profit': ['take_profit'],
-                'leverage': ['leverage'],
-                'confidence': ['confidence'],
-                'reason': ['reason']
-            }
+    async def _request_gpt_analysis(self, df: pd.DataFrame, indicators: Dict, timeframe: str,
+                                    current_price: float, symbol: str = None) -> Optional[Dict]:
+        """GPT API 호출 후 검증/보정 (보정할 수 없으면 문제 항목만 지적하여 재요청)"""
+        # 프롬프트 생성
+        prompt = self.prompt_builder.build(df, indicators, timeframe, symbol)
+        if not prompt:
+            return None
+        messages = prompt
+        
+        for attempt in range(self.signal_validator.repair_attempts + 1):
+            gpt_analysis, text = await self.llm_client.complete_json(
+                messages,
+                on_field=self._check_response_section,
+                with_text=True
+            )
             
-            # 매도 포지션의 가격 설정 검증
-            trading_signals = result.get('trading_signals', {})
-            if trading_signals.get('position_suggestion') == 'SELL':
-                entry_price = float(trading_signals.get('entry_price', 0))
-                stop_loss = float(trading_signals.get('stop_loss', 0))
-                take_profit1 = float(trading_signals.get('take_profit1', 0))
-                take_profit2 = float(trading_signals.get('take_profit2', 0))
-                
-                # 매도 포지션의 가격 순서 검증
-                if not (take_profit2 < take_profit1 < entry_price < stop_loss):
-                    logger.warning("매도 포지션의 가격 순서가 잘못되었습니다. 수정합니다.")
-                    # 가격 재설정
-                    trading_signals['stop_loss'] = entry_price * 1.02
-                    trading_signals['take_profit1'] = entry_price * 0.98
-                    trading_signals['take_profit2'] = entry_price * 0.96
+            # 응답 자체가 없으면 (호출 실패) 재요청하지 않음
+            if not text:
+                logger.error("GPT API 응답이 없음")
+                break
             
-            for section, fields in required_fields.items():
-                if section not in result:
-                    raise ValueError(f"필수 섹션 누락: {section}")
-                    
-                for field in fields:
-                    if field not in result[section]:
-                        raise ValueError(f"필수 필드 누락: {section}.{field}")
-                    
-            return result
+            if gpt_analysis is None:
+                result, issues = None, ["응답을 JSON 객체로 파싱할 수 없음"]
+            else:
+                result, issues, fatal = self.signal_validator.validate(gpt_analysis, current_price)
+                if not fatal:
+                    if attempt:
+                        self.signal_validator.repaired_count += 1
+                        logger.info("GPT 재요청 응답으로 복구")
+                    return result
             
-        except Exception as e:
-            logger.error(f"분석 결과 검증 중 오류: {str(e)}")
-            return {}
+            logger.warning(f"GPT 응답 검증 실패 ({attempt + 1}회): {'; '.join(issues)}")
+            messages = [
+                *prompt,
+                {"role": "assistant", "content": text[:4000]},
+                {"role": "user", "content": self.signal_validator.build_repair_message(issues)}
+            ]
+        
+        self.signal_validator.failed_count += 1
+        return None
 
-    def _create_analysis_prompt(self, df: pd.DataFrame, indicators: Dict, timeframe: str) -> str:
-        """분석 프롬프트 생성"""
-        try:
-            # 템플릿에 데이터 적용
-            prompt = self.ANALYSIS_PROMPT_TEMPLATE.format(
-                current_price=df['close'].iloc[-1],
-                rsi=indicators['rsi'],
-                macd=indicators['macd'],
-                macd_signal=indicators['macd_signal'],
-                bollinger=indicators['bb_position'],
-                trend=indicators['trend'],
-                trend_strength=indicators['trend_strength'],
-                price_change=df['price_change_24h'].iloc[-1],
-                volume=df['volume'].iloc[-1],
-                volume_change=df['volume_change_24h'].iloc[-1],
-                funding_rate=0.01  # 기본값 설정
-            )
-            return prompt
-        except Exception as e:
-            logger.error(f"프롬프트 생성 중 오류: {str(e)}")
-            return None
+    @staticmethod
+    def _check_response_section(key: str, value: Any) -> bool:
+        """스트리밍 응답 섹션 검증 (False 면 나머지 응답을 기다리지 않음)
+
+        보정 가능한 문제는 SignalValidator 에 맡기고, 섹션 형식 오류와 알 수 없는 포지션만 중단합니다.
+        """
+        if key in ('market_summary', 'trading_signals') and not isinstance(value, dict):
+            logger.error(f"GPT 응답 섹션 형식 오류: {key}")
+            return False
+        if key == 'trading_signals' and SignalValidator.normalize_position(value.get('position_suggestion')) is None:
+            logger.error(f"잘못된 포지션 제안: {value.get('position_suggestion')}")
+            return False
+        return True
 
     def _determine_position(self, df: pd.DataFrame) -> str:
         # Implementation of _determine_position method
@@ -0,0 +1,511 @@
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import traceback
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+from config import config
+from services.rate_limiter import RateLimiter
+from services.tracer import Tracer
+from services.metrics import registry
+from .signal_validator import parse_json_lenient
+
+logger = logging.getLogger(__name__)
+
+LLM_LATENCY = registry.histogram('llm_request_duration_seconds', 'LLM 호출 1회 소요 시간 (동시성 대기 포함)',
+                                 ('backend', 'outcome'))
+LLM_TOKENS = registry.counter('llm_tokens_total', 'LLM 토큰 사용량', ('backend', 'kind'))
+
+class LLMError(Exception):
+    """LLM 호출 오류 (retryable: 재시도 가능 여부)"""
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: float = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+class LLMResponse(NamedTuple):
+    """LLM 응답"""
+    content: str
+    model: str
+    usage: Dict
+    latency: float
+
+# ---- 백엔드 ----
+
+class LLMBackend:
+    """LLM 백엔드 기본 클래스"""
+
+    name = 'base'
+    usage_totals: Dict[str, int] = None
+
+    def _record_usage(self, usage: Dict):
+        """토큰 사용량 누적 (cached_tokens: 제공자 프롬프트 캐시에 적중한 입력 토큰)"""
+        if not usage:
+            return
+        if self.usage_totals is None:
+            self.usage_totals = {'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0}
+        details = usage.get('prompt_tokens_details') or {}
+        counts = {
+            'prompt_tokens': int(usage.get('prompt_tokens') or 0),
+            'completion_tokens': int(usage.get('completion_tokens') or 0),
+            'cached_tokens': int(details.get('cached_tokens') or 0)
+        }
+        for kind, count in counts.items():
+            self.usage_totals[kind] += count
+            LLM_TOKENS.inc(self.name, kind, amount=count)
+
+    async def complete(self, messages: List[Dict], *, json_mode: bool, max_tokens: int,
+                       temperature: float) -> LLMResponse:
+        raise NotImplementedError
+
+    async def stream(self, messages: List[Dict], *, json_mode: bool, max_tokens: int,
+                     temperature: float) -> AsyncIterator[str]:
+        """응답 조각 스트리밍 (기본: 전체 응답을 한 번에 반환)"""
+        response = await self.complete(messages, json_mode=json_mode, max_tokens=max_tokens,
+                                       temperature=temperature)
+        yield response.content
+
+    async def close(self):
+        pass
+
+class OpenAICompatibleBackend(LLMBackend):
+    """OpenAI 호환 HTTP API (/chat/completions) 백엔드"""
+
+    name = 'openai'
+
+    def __init__(self, model: str, api_key: str = None, base_url: str = 'https://api.openai.com/v1',
+                 prompt_cache_key: str = None, stream_usage: bool = False):
+        """
+        Args:
+            prompt_cache_key: 같은 접두사(시스템 프롬프트) 요청을 같은 캐시로 보내도록 하는 키
+            stream_usage: 스트리밍 응답 끝에 토큰 사용량 요청 (stream_options 지원 서버만)
+        """
+        self.model = model
+        self.api_key = api_key
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.prompt_cache_key = prompt_cache_key
+        self.stream_usage = stream_usage
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            })
+        return self._session
+
+    def _payload(self, messages: List[Dict], json_mode: bool, max_tokens: int,
+                 temperature: float, stream: bool) -> Dict:
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'stream': stream
+        }
+        if json_mode:
+            payload['response_format'] = {'type': 'json_object'}
+        if self.prompt_cache_key:
+            payload['prompt_cache_key'] = self.prompt_cache_key
+        if stream and self.stream_usage:
+            payload['stream_options'] = {'include_usage': True}
+        return payload
+
+    @staticmethod
+    async def _raise_for_status(response: aiohttp.ClientResponse):
+        """HTTP 오류를 LLMError 로 변환 (429/5xx 는 재시도 가능)"""
+        if response.status < 400:
+            return
+        body = (await response.text())[:500]
+        retry_after = response.headers.get('Retry-After')
+        raise LLMError(
+            f"HTTP {response.status}: {body}",
+            retryable=response.status == 429 or response.status >= 500,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+
+    async def complete(self, messages: List[Dict], *, json_mode: bool, max_tokens: int,
+                       temperature: float) -> LLMResponse:
+        started = time.monotonic()
+        payload = self._payload(messages, json_mode, max_tokens, temperature, stream=False)
+        try:
+            async with self._get_session().post(self.url, json=payload) as response:
+                await self._raise_for_status(response)
+                data = await response.json()
+        except aiohttp.ClientError as e:
+            raise LLMError(f"네트워크 오류: {str(e)}", retryable=True)
+
+        self._record_usage(data.get('usage'))
+        return LLMResponse(
+            content=data['choices'][0]['message']['content'] or '',
+            model=data.get('model', self.model),
+            usage=data.get('usage', {}),
+            latency=time.monotonic() - started
+        )
+
+    async def stream(self, messages: List[Dict], *, json_mode: bool, max_tokens: int,
+                     temperature: float) -> AsyncIterator[str]:
+        """SSE 스트림의 delta.content 조각 반환"""
+        payload = self._payload(messages, json_mode, max_tokens, temperature, stream=True)
+        try:
+            async with self._get_session().post(self.url, json=payload) as response:
+                await self._raise_for_status(response)
+                async for raw_line in response.content:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line.startswith('data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        break
+                    event = json.loads(data)
+                    self._record_usage(event.get('usage'))
+                    if not event.get('choices'):
+                        continue
+                    delta = event['choices'][0].get('delta', {}).get('content')
+                    if delta:
+                        yield delta
+        except aiohttp.ClientError as e:
+            raise LLMError(f"네트워크 오류: {str(e)}", retryable=True)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+class StubBackend(LLMBackend):
+    """오프라인 테스트용 결정적 백엔드
+
+    프롬프트의 현재가/RSI 로 항상 같은 분석 JSON 을 만들어 반환합니다.
+    """
+
+    name = 'stub'
+    CHUNK_SIZE = 32
+
+    def __init__(self, model: str = 'stub', latency: float = 0.0):
+        self.model = model
+        self.latency = latency
+
+    def _respond(self, messages: List[Dict]) -> str:
+        prompt = messages[-1]['content'] if messages else ''
+        price = self._extract(r'현재가:\s*\$?([\d,\.]+)', prompt, 50000.0)
+        rsi = self._extract(r'RSI:\s*([\d\.]+)', prompt, 50.0)
+        digest = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+
+        if rsi >= 55:
+            position, direction = 'BUY', 1
+        elif rsi <= 45:
+            position, direction = 'SELL', -1
+        else:
+            position, direction = 'HOLD', 1
+
+        return json.dumps({
+            'market_summary': {
+                'market_phase': '상승' if direction > 0 and position != 'HOLD' else '하락' if direction < 0 else '횡보',
+                'overall_sentiment': '긍정' if position == 'BUY' else '부정' if position == 'SELL' else '중립',
+                'short_sentiment': '중립',
+                'volume_status': '거래량 보통',
+                'risk_level': '중간',
+                'confidence': 50 + digest % 30
+            },
+            'trading_signals': {
+                'position_suggestion': position,
+                'leverage': 3,
+                'position_size': 10,
+                'entry_price': round(price, 1),
+                'stop_loss': round(price * (1 - 0.01 * direction), 1),
+                'take_profit1': round(price * (1 + 0.01 * direction), 1),
+                'take_profit2': round(price * (1 + 0.02 * direction), 1),
+                'reason': f'stub (RSI {rsi:.1f})'
+            }
+        }, ensure_ascii=False)
+
+    @staticmethod
+    def _extract(pattern: str, text: str, default: float) -> float:
+        match = re.search(pattern, text)
+        if not match:
+            return default
+        try:
+            return float(match.group(1).replace(',', ''))
+        except ValueError:
+            return default
+
+    async def complete(self, messages: List[Dict], *, json_mode: bool, max_tokens: int,
+                       temperature: float) -> LLMResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return LLMResponse(content=self._respond(messages), model=self.model, usage={}, latency=self.latency)
+
+    async def stream(self, messages: List[Dict], *, json_mode: bool, max_tokens: int,
+                     temperature: float) -> AsyncIterator[str]:
+        content = self._respond(messages)
+        for i in range(0, len(content), self.CHUNK_SIZE):
+            if self.latency:
+                await asyncio.sleep(self.latency / max(len(content) // self.CHUNK_SIZE, 1))
+            yield content[i:i + self.CHUNK_SIZE]
+
+BACKENDS = {
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend,
+    StubBackend.name: StubBackend
+}
+
+# ---- 스트리밍 JSON 파서 ----
+
+class JSONStreamParser:
+    """최상위 JSON 객체의 멤버를 완성되는 즉시 반환하는 증분 파서
+
+    응답 전체를 기다리지 않고 "market_summary" 같은 섹션이 닫히는 시점에
+    (key, value) 를 돌려주므로 호출자가 먼저 검증을 시작할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.members: Dict[str, Any] = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """조각 추가 후 새로 완성된 멤버 목록 반환"""
+        completed = []
+        start = len(self.text)
+        self.text += chunk
+        for i in range(start, len(self.text)):
+            ch = self.text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._member_start is None:
+                    self._member_start = i
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                if self._depth == 1 and self._member_start is not None:
+                    completed.append(self._parse_member(i))
+                self._depth -= 1
+            elif ch == ',' and self._depth == 1 and self._member_start is not None:
+                completed.append(self._parse_member(i))
+
+        return [member for member in completed if member]
+
+    def _parse_member(self, end: int) -> Optional[Tuple[str, Any]]:
+        text = self.text[self._member_start:end]
+        self._member_start = None
+        try:
+            key, value = next(iter(json.loads('{' + text + '}').items()))
+        except (ValueError, StopIteration):
+            return None
+        self.members[key] = value
+        return key, value
+
+    def result(self) -> Optional[Dict]:
+        """완성된 객체 (완성되지 않았으면 관대한 파싱, 실패 시 None)"""
+        if self._depth == 0 and self.members:
+            return dict(self.members)
+        return parse_json_lenient(self.text)
+
+# ---- 클라이언트 ----
+
+class LLMClient:
+    """백엔드 독립 LLM 클라이언트
+
+    - 요청별 제한 시간 (asyncio.wait_for)
+    - 재시도 가능한 오류(타임아웃, 429, 5xx, 네트워크)는 지수 백오프 + 지터로 재시도
+    - 고정 대기 대신 토큰 버킷으로 분당 요청 수 제한, 세마포어로 동시 요청 수 제한
+    - JSON 모드 및 스트리밍 파싱 (섹션이 완성될 때마다 on_field 호출)
+    """
+
+    DEFAULT_SETTINGS = {
+        'provider': 'openai',
+        'model': 'gpt-3.5-turbo',
+        'base_url': 'https://api.openai.com/v1',
+        'api_key_env': 'OPENAI_API_KEY',
+        'timeout': 60,
+        'max_retries': 3,
+        'backoff_base': 2.0,
+        'backoff_max': 30.0,
+        'requests_per_minute': 20,
+        'burst': 3,
+        'max_concurrency': 2,
+        'temperature': 0.2,
+        'max_tokens': 2000,
+        'json_mode': True,
+        'stream': True,
+        'prompt_cache_key': None,
+        'stream_usage': False
+    }
+
+    def __init__(self, backend: LLMBackend, **settings):
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.backend = backend
+        self.timeout = float(options['timeout'])
+        self.max_retries = int(options['max_retries'])
+        self.backoff_base = float(options['backoff_base'])
+        self.backoff_max = float(options['backoff_max'])
+        self.temperature = float(options['temperature'])
+        self.max_tokens = int(options['max_tokens'])
+        self.json_mode = bool(options['json_mode'])
+        self.stream_enabled = bool(options['stream'])
+        self._limiter = RateLimiter(float(options['requests_per_minute']) / 60, float(options['burst']), name='llm')
+        self._semaphore = asyncio.Semaphore(int(options['max_concurrency']))
+
+        self.call_count = 0
+        self.failure_count = 0
+        self.retry_count = 0
+        self._latency_total = 0.0
+
+    @classmethod
+    def from_config(cls) -> 'LLMClient':
+        """gpt_config.json 의 llm 설정으로 생성"""
+        settings = {**cls.DEFAULT_SETTINGS, **config.load_json_config('gpt_config.json').get('llm', {})}
+        provider = settings.pop('provider')
+        model = settings.pop('model')
+        base_url = settings.pop('base_url')
+        api_key = os.getenv(settings.pop('api_key_env'))
+        cache_options = {
+            'prompt_cache_key': settings.pop('prompt_cache_key'),
+            'stream_usage': settings.pop('stream_usage')
+        }
+
+        if provider == StubBackend.name:
+            backend = StubBackend(model)
+        elif provider in BACKENDS:
+            backend = BACKENDS[provider](model=model, api_key=api_key, base_url=base_url, **cache_options)
+        else:
+            raise ValueError(f"지원하지 않는 LLM 백엔드: {provider}")
+
+        logger.info(f"LLM 클라이언트 생성 (백엔드: {provider}, 모델: {model})")
+        return cls(backend, **settings)
+
+    async def complete(self, messages: List[Dict], timeout: float = None) -> Optional[LLMResponse]:
+        """전체 응답 요청 (최종 실패 시 None)"""
+        try:
+            return await self._with_retries(
+                lambda: self.backend.complete(
+                    messages, json_mode=self.json_mode,
+                    max_tokens=self.max_tokens, temperature=self.temperature
+                ),
+                timeout
+            )
+        except Exception as e:
+            logger.error(f"LLM 호출 실패: {str(e)}")
+            return None
+
+    async def complete_json(self, messages: List[Dict], timeout: float = None,
+                            on_field: Callable[[str, Any], bool] = None,
+                            with_text: bool = False) -> Any:
+        """JSON 응답 요청
+
+        Args:
+            on_field: 최상위 필드가 완성될 때마다 호출, False 를 반환하면 응답 수신 중단
+            with_text: True 면 (파싱 결과, 원문) 반환 - 원문이 비어 있으면 호출 자체가 실패한 것
+        """
+        result, text = None, ''
+        try:
+            if self.stream_enabled:
+                result, text = await self._with_retries(lambda: self._stream_json(messages, on_field), timeout)
+            else:
+                response = await self.complete(messages, timeout)
+                if response is not None:
+                    text = response.content
+                    parser = JSONStreamParser()
+                    aborted = any(on_field and on_field(key, value) is False
+                                  for key, value in parser.feed(text))
+                    result = None if aborted else parser.result()
+
+        except Exception as e:
+            logger.error(f"LLM JSON 응답 처리 실패: {str(e)}")
+
+        return (result, text) if with_text else result
+
+    async def _stream_json(self, messages: List[Dict], on_field: Callable[[str, Any], bool]) -> Tuple[Optional[Dict], str]:
+        """스트리밍 수신하며 필드 단위로 검증 (결과, 원문)"""
+        started = time.monotonic()
+        parser = JSONStreamParser()
+        stream = self.backend.stream(messages, json_mode=self.json_mode,
+                                     max_tokens=self.max_tokens, temperature=self.temperature)
+        try:
+            async for chunk in stream:
+                for key, value in parser.feed(chunk):
+                    if on_field and on_field(key, value) is False:
+                        logger.warning(f"LLM 응답 필드 검증 실패로 수신 중단: {key}")
+                        return None, parser.text
+        finally:
+            await stream.aclose()
+
+        result = parser.result()
+        if result is None:
+            logger.error(f"LLM JSON 파싱 실패: {parser.text[:500]}")
+        logger.info(f"LLM 스트리밍 응답 완료 ({time.monotonic() - started:.1f}초)")
+        return result, parser.text
+
+    async def _with_retries(self, call: Callable, timeout: float = None) -> Any:
+        """속도 제한/동시성 제한/제한 시간/재시도 적용"""
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._limiter.acquire()
+            started = time.monotonic()
+            try:
+                async with self._semaphore:
+                    with Tracer.get_instance().span('llm.request', backend=self.backend.name, attempt=attempt):
+                        result = await asyncio.wait_for(call(), timeout)
+                elapsed = time.monotonic() - started
+                self.call_count += 1
+                self._latency_total += elapsed
+                LLM_LATENCY.observe(elapsed, self.backend.name, 'ok')
+                return result
+
+            except (asyncio.TimeoutError, LLMError) as e:
+                LLM_LATENCY.observe(time.monotonic() - started, self.backend.name,
+                                    'timeout' if isinstance(e, asyncio.TimeoutError) else 'error')
+                retryable = isinstance(e, asyncio.TimeoutError) or e.retryable
+                if not retryable or attempt > self.max_retries:
+                    self.failure_count += 1
+                    raise LLMError(
+                        f"{'시간 초과' if isinstance(e, asyncio.TimeoutError) else str(e)} "
+                        f"(시도 {attempt}회)"
+                    )
+                delay = getattr(e, 'retry_after', None) or min(
+                    self.backoff_base * 2 ** (attempt - 1), self.backoff_max
+                ) * (0.5 + random.random() / 2)
+                self.retry_count += 1
+                logger.warning(f"LLM 호출 재시도 {attempt}/{self.max_retries} ({delay:.1f}초 후): "
+                               f"{'시간 초과' if isinstance(e, asyncio.TimeoutError) else str(e)}")
+                await asyncio.sleep(delay)
+
+            except Exception as e:
+                LLM_LATENCY.observe(time.monotonic() - started, self.backend.name, 'error')
+                self.failure_count += 1
+                logger.error(traceback.format_exc())
+                raise LLMError(str(e))
+
+    def get_stats(self) -> Dict:
+        """호출 통계"""
+        return {
+            'backend': self.backend.name,
+            'calls': self.call_count,
+            'failures': self.failure_count,
+            'retries': self.retry_count,
+            'avg_latency': round(self._latency_total / self.call_count, 2) if self.call_count else 0.0,
+            **(self.backend.usage_totals or {})
+        }
+
+    async def close(self):
+        await self.backend.close()
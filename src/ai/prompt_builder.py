@@ -0,0 +1,214 @@
+import math
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from config import config
+from config.trading_config import trading_config
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (영문/숫자 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰)"""
+    if not text:
+        return 0
+    ascii_count = len(text.encode('ascii', 'ignore'))
+    return math.ceil(ascii_count / 4 + (len(text) - ascii_count))
+
+class PromptBuilder:
+    """GPT 분석 프롬프트 생성기
+
+    - 시스템 프롬프트는 고정 블록으로 유지하여 제공자 측 프롬프트 캐시(동일 접두사)에 걸리도록 함
+    - 사용자 프롬프트는 지표 한 줄 + 최근 봉 표(CSV) + 상위 시간봉 요약으로 압축
+    - 토큰 예산을 넘으면 봉 수 → 상위 시간봉 → 봉 표 순서로 줄임
+    """
+
+    # 사용자 프롬프트 형식이 바뀌면 올려서 캐시 키(prompt_version)를 갱신
+    FORMAT_VERSION = 'compact-1'
+
+    DEFAULT_SETTINGS = {
+        'max_prompt_tokens': 1500,      # 시스템 + 사용자 프롬프트 예산
+        'recent_bars': 24,              # 봉 표에 넣을 최근 봉 수
+        'min_bars': 6,                  # 예산 초과 시 최소 봉 수
+        'higher_timeframes': ['4h', '1d'],
+        'cache_control': False          # 시스템 블록에 cache_control 표시 (지원하는 제공자만)
+    }
+
+    # 상위 시간봉 구간 길이 (ns, UTC 자정 기준 정렬 - pandas resample 기본값과 동일)
+    RESAMPLE_RULES = {'4h': 4 * 3_600_000_000_000, '1d': 24 * 3_600_000_000_000}
+
+    def __init__(self, settings: Dict = None):
+        if settings is None:
+            settings = config.load_json_config('gpt_config.json').get('prompt', {})
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.max_prompt_tokens = int(options['max_prompt_tokens'])
+        self.recent_bars = int(options['recent_bars'])
+        self.min_bars = int(options['min_bars'])
+        self.higher_timeframes = [tf for tf in options['higher_timeframes'] if tf in self.RESAMPLE_RULES]
+        self.cache_control = bool(options['cache_control'])
+
+        self.system_prompt = self._build_system_prompt()
+        self.system_tokens = estimate_tokens(self.system_prompt)
+        self.version = hashlib.md5(
+            (self.system_prompt + self.FORMAT_VERSION).encode('utf-8')
+        ).hexdigest()[:8]
+
+        self.build_count = 0
+        self.trimmed_count = 0
+        self._tokens_total = 0
+
+    def build(self, df: pd.DataFrame, indicators: Dict, timeframe: str,
+              symbol: str = None) -> Optional[List[Dict]]:
+        """메시지 목록 생성 (시스템, 사용자)"""
+        try:
+            header = self._format_header(df, indicators, timeframe, symbol)
+            budget = self.max_prompt_tokens - self.system_tokens
+            higher = self._format_higher_timeframes(df)
+            bars = min(self.recent_bars, len(df))
+            # 봉 표는 한 번만 만들고 축소 시에는 뒤쪽 행만 사용
+            rows = self._format_bars(df.tail(bars))
+
+            user_prompt, tokens = self._compose(header, higher, rows, bars)
+            while tokens > budget and bars > self.min_bars:
+                bars = max(self.min_bars, bars - max(bars // 4, 1))
+                user_prompt, tokens = self._compose(header, higher, rows, bars)
+            if tokens > budget and higher:
+                higher = []
+                user_prompt, tokens = self._compose(header, higher, rows, bars)
+            if tokens > budget:
+                bars = 0
+                user_prompt, tokens = self._compose(header, higher, rows, bars)
+
+            if bars < min(self.recent_bars, len(df)):
+                self.trimmed_count += 1
+                logger.warning(f"프롬프트 토큰 예산 초과로 축소 (봉 {bars}개, 추정 {self.system_tokens + tokens}토큰)")
+
+            self.build_count += 1
+            self._tokens_total += self.system_tokens + tokens
+            return [self._system_message(), {"role": "user", "content": user_prompt}]
+
+        except Exception as e:
+            logger.error(f"프롬프트 생성 중 오류: {str(e)}")
+            return None
+
+    def get_stats(self) -> Dict:
+        """프롬프트 크기 통계 (추정 토큰)"""
+        return {
+            'version': self.version,
+            'system_tokens': self.system_tokens,
+            'avg_tokens': round(self._tokens_total / self.build_count) if self.build_count else 0,
+            'budget': self.max_prompt_tokens,
+            'built': self.build_count,
+            'trimmed': self.trimmed_count
+        }
+
+    # ---- 구성 ----
+
+    def _system_message(self) -> Dict:
+        if self.cache_control:
+            return {"role": "system", "content": [
+                {"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}
+            ]}
+        return {"role": "system", "content": self.system_prompt}
+
+    def _compose(self, header: str, higher: List[str], rows: List[str], bars: int) -> Tuple[str, int]:
+        parts = [header]
+        if higher:
+            parts.append("상위 시간봉 (종가, 직전 봉 대비 %, 최근 6봉 대비 %, 6봉 고가/저가):")
+            parts.extend(higher)
+        if bars:
+            parts.append(f"최근 {bars}봉 (시각 UTC, 시가, 고가, 저가, 종가, 거래량, RSI):")
+            parts.append('t,o,h,l,c,v,rsi')
+            parts.extend(rows[-bars:])
+        parts.append("JSON으로만 응답")
+        prompt = '\n'.join(parts)
+        return prompt, estimate_tokens(prompt)
+
+    @staticmethod
+    def _format_header(df: pd.DataFrame, indicators: Dict, timeframe: str, symbol: str = None) -> str:
+        latest = df.iloc[-1]
+        return (
+            f"{symbol + ' ' if symbol else ''}TF={timeframe} 현재가: {float(latest['close']):.1f} | RSI: {indicators['rsi']:.1f} | "
+            f"MACD: {indicators['macd']:.1f}/{indicators['macd_signal']:.1f} | "
+            f"BB: {indicators['bb_position']} | 추세: {indicators['trend']}({indicators['trend_strength']}) | "
+            f"24h: {_fmt_pct(latest.get('price_change_24h'))} | 거래량(24h평균 대비): {_fmt_pct(latest.get('volume_change_24h'))}"
+        )
+
+    @staticmethod
+    def _format_bars(df: pd.DataFrame) -> List[str]:
+        """최근 봉 표 행 (가격은 소수점 없이, 시각은 일-시)"""
+        timestamps = _timestamps(df)
+        values = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        rsi_values = df['rsi'].to_numpy(dtype=np.float64) if 'rsi' in df.columns else np.full(len(df), np.nan)
+        return [
+            f"{day:02d}-{hour:02d},{o:.0f},{h:.0f},{l:.0f},{c:.0f},{v:.0f},{'' if math.isnan(rsi) else f'{rsi:.0f}'}"
+            for day, hour, (o, h, l, c, v), rsi in zip(
+                timestamps.day.tolist(), timestamps.hour.tolist(), values.tolist(), rsi_values.tolist()
+            )
+        ]
+
+    def _format_higher_timeframes(self, df: pd.DataFrame) -> List[str]:
+        """1시간봉을 묶은 상위 시간봉 요약 (추가 API 호출 없음)"""
+        if not self.higher_timeframes or df.empty:
+            return []
+        lines = []
+        timestamps = _timestamps(df).asi8
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        for timeframe in self.higher_timeframes:
+            buckets = timestamps // self.RESAMPLE_RULES[timeframe]
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+            if len(starts) < 2:
+                continue
+            closes = close[np.r_[starts[1:] - 1, len(close) - 1]]
+            # 최근 6개 구간만 고가/저가 집계
+            recent = starts[-6:]
+            recent_high = float(np.nanmax(high[recent[0]:]))
+            recent_low = float(np.nanmin(low[recent[0]:]))
+            last = float(closes[-1])
+            lines.append(
+                f"{timeframe}: {last:.0f}, {_fmt_pct(_change(closes[-2], last))}, "
+                f"{_fmt_pct(_change(closes[-len(recent)], last))}, "
+                f"{recent_high:.0f}/{recent_low:.0f}"
+            )
+        return lines
+
+    @staticmethod
+    def _build_system_prompt() -> str:
+        """고정 시스템 프롬프트 (매 호출 동일해야 제공자 캐시에 걸림)"""
+        leverage = trading_config.leverage_settings
+        position = trading_config.position_settings
+        return f"""당신은 1시간 봉 기준 암호화폐 무기한 선물 트레이더입니다. 첫 줄의 심볼에 대해 주어진 지표와 최근 봉 표를 분석해 아래 JSON 형식으로만 응답하세요. 다른 텍스트는 포함하지 마세요.
+
+{{"market_summary": {{"market_phase": "상승|하락|횡보", "overall_sentiment": "긍정|부정|중립", "short_sentiment": "긍정|부정|중립", "volume_status": "거래량 증가|거래량 감소|거래량 보통", "risk_level": "높음|중간|낮음", "confidence": 0-100 정수}},
+ "trading_signals": {{"position_suggestion": "BUY|SELL|HOLD", "leverage": {leverage['min']}-{leverage['max']} 정수 (기본 {leverage['default']}), "position_size": {position['min']}-{position['max']} 정수 (기본 {position['default']}), "entry_price": 현재가, "stop_loss": 숫자, "take_profit1": 숫자, "take_profit2": 숫자, "reason": "매매 사유"}}}}
+
+규칙:
+1. 가격 순서 (어기면 주문 실패): BUY 는 stop_loss < entry_price < take_profit1 < take_profit2, SELL 은 take_profit2 < take_profit1 < entry_price < stop_loss. HOLD 도 모든 가격 필드를 숫자로 채움.
+2. 모든 필드는 필수입니다.
+3. 매매 원칙: RSI > 50, MACD > 0, 볼린저 중앙 이상이면 매수 / RSI < 50, MACD < 0, 볼린저 중앙 이하면 매도 / 신호가 불명확하거나 변동성이 낮으면 HOLD.
+4. 레버리지: 변동성이 높거나 지표가 상충하면 1-3배, 일반적인 추세는 4-7배, 변동성이 낮고 모든 지표가 강하게 일치할 때만 8-10배.
+5. confidence 는 지표 강도가 아니라 분석의 정확도입니다. 약해도 지표가 일관되면 높고, 강해도 서로 상충하면 낮습니다. 거래량과 추세의 일치, 다이버전스 여부를 반영하세요."""
+
+def _timestamps(df: pd.DataFrame) -> pd.DatetimeIndex:
+    """봉 시각 (지표 계산 후 인덱스, 또는 timestamp 열 - ms 정수도 허용)"""
+    if 'timestamp' not in df.columns:
+        return pd.DatetimeIndex(df.index)
+    timestamps = df['timestamp']
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, unit='ms')
+    return pd.DatetimeIndex(timestamps)
+
+def _change(previous, current) -> Optional[float]:
+    previous = float(previous)
+    return (float(current) - previous) / previous * 100 if previous else None
+
+def _fmt_pct(value) -> str:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return '-'
+    return '-' if math.isnan(value) else f"{value:+.2f}%"
@@ -0,0 +1,151 @@
+import logging
+from typing import Dict, Optional
+from config import config
+from config.trading_config import trading_config
+
+logger = logging.getLogger(__name__)
+
+class SignalPrefilter:
+    """규칙 기반 사전 판단기
+
+    지표만으로 결론이 명확한 경우(뚜렷한 횡보 → HOLD, 선택적으로 강한 합의 → BUY/SELL)
+    GPT 응답과 같은 형식의 결과를 만들어 LLM 호출을 생략합니다.
+    애매한 상태는 None 을 반환하여 LLM 으로 넘깁니다.
+    """
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'hold': {
+            'max_strength': 30,         # 추세 강도 상한
+            'rsi_low': 42,              # RSI 중립 구간
+            'rsi_high': 58,
+            'confidence': 70
+        },
+        'consensus': {
+            'enabled': False,           # 강한 합의 구간 자동 판단 (기본 비활성)
+            'min_strength': 70,
+            'rsi_max_long': 70,         # 과매수 구간 진입 금지
+            'rsi_min_short': 30,        # 과매도 구간 진입 금지
+            'confidence': 75,
+            'stop_loss_pct': 1.0,
+            'take_profit1_pct': 1.5,
+            'take_profit2_pct': 3.0
+        }
+    }
+
+    PHASES = {'UPTREND': '상승', 'DOWNTREND': '하락', 'SIDEWAYS': '횡보'}
+    SENTIMENTS = {'POSITIVE': '긍정', 'NEGATIVE': '부정', 'NEUTRAL': '중립'}
+    VOLUMES = {'VOLUME_INCREASE': '거래량 증가', 'VOLUME_DECREASE': '거래량 감소', 'VOLUME_NEUTRAL': '거래량 보통'}
+    RISKS = {'HIGH': '높음', 'MEDIUM': '중간', 'LOW': '낮음'}
+
+    def __init__(self, settings: Dict = None):
+        if settings is None:
+            settings = config.load_json_config('gpt_config.json').get('prefilter', {})
+        self.enabled = settings.get('enabled', self.DEFAULT_SETTINGS['enabled'])
+        self.hold = {**self.DEFAULT_SETTINGS['hold'], **settings.get('hold', {})}
+        self.consensus = {**self.DEFAULT_SETTINGS['consensus'], **settings.get('consensus', {})}
+        self.decided_count = 0
+        self.escalated_count = 0
+
+    def evaluate(self, prepared: Dict, current_price: float) -> Optional[Dict]:
+        """지표 묶음으로 판단 (GPT 응답 형식, 판단 불가 시 None)"""
+        if not self.enabled:
+            return None
+        try:
+            technical = prepared['technical_analysis']
+            indicators = prepared['indicators']
+            decision = (self._check_hold(technical, indicators, current_price)
+                        or self._check_consensus(technical, indicators, current_price))
+            if decision:
+                self.decided_count += 1
+                logger.info(f"규칙 기반 판단: {decision['trading_signals']['position_suggestion']} "
+                            f"({decision['trading_signals']['reason']})")
+            else:
+                self.escalated_count += 1
+            return decision
+
+        except Exception as e:
+            logger.error(f"규칙 기반 판단 중 오류: {str(e)}")
+            return None
+
+    def get_stats(self) -> Dict:
+        total = self.decided_count + self.escalated_count
+        return {
+            'decided': self.decided_count,
+            'escalated': self.escalated_count,
+            'decided_rate': round(self.decided_count / total * 100, 1) if total else 0.0
+        }
+
+    # ---- 규칙 ----
+
+    def _check_hold(self, technical: Dict, indicators: Dict, price: float) -> Optional[Dict]:
+        """뚜렷한 횡보: 추세 없음 + 약한 강도 + 중립 심리 + RSI 중립 + 밴드 내부"""
+        rule = self.hold
+        sentiment = technical.get('sentiment', {})
+        rsi = float(indicators['rsi'])
+        if (technical['trend'] == 'SIDEWAYS'
+                and technical['strength'] <= rule['max_strength']
+                and sentiment.get('market') == 'NEUTRAL'
+                and rule['rsi_low'] <= rsi <= rule['rsi_high']
+                and indicators['bb_position'] in ('ABOVE_MIDDLE', 'BELOW_MIDDLE')):
+            return self.build(technical, 'HOLD', price, rule['confidence'],
+                               f"규칙: 횡보 (강도 {technical['strength']}, RSI {rsi:.1f})")
+        return None
+
+    def _check_consensus(self, technical: Dict, indicators: Dict, price: float) -> Optional[Dict]:
+        """강한 합의: 추세/심리/MACD/밴드가 모두 같은 방향"""
+        rule = self.consensus
+        if not rule['enabled'] or technical['strength'] < rule['min_strength']:
+            return None
+
+        sentiment = technical.get('sentiment', {})
+        macd = technical.get('signals', {}).get('macd')
+        rsi = float(indicators['rsi'])
+
+        if (technical['trend'] == 'UPTREND'
+                and sentiment.get('market') == 'POSITIVE'
+                and sentiment.get('short_term') == 'POSITIVE'
+                and macd == 'STRONG_BULLISH'
+                and indicators['bb_position'] == 'ABOVE_MIDDLE'
+                and rsi < rule['rsi_max_long']):
+            position = 'BUY'
+        elif (technical['trend'] == 'DOWNTREND'
+                and sentiment.get('market') == 'NEGATIVE'
+                and sentiment.get('short_term') == 'NEGATIVE'
+                and macd == 'STRONG_BEARISH'
+                and indicators['bb_position'] == 'BELOW_MIDDLE'
+                and rsi > rule['rsi_min_short']):
+            position = 'SELL'
+        else:
+            return None
+
+        return self.build(technical, position, price, rule['confidence'],
+                           f"규칙: 강한 {'상승' if position == 'BUY' else '하락'} 합의 "
+                           f"(강도 {technical['strength']}, RSI {rsi:.1f})")
+
+    def build(self, technical: Dict, position: str, price: float, confidence: int, reason: str) -> Dict:
+        """GPT 응답과 같은 형식으로 구성"""
+        sentiment = technical.get('sentiment', {})
+        rule = self.consensus
+        direction = -1 if position == 'SELL' else 1
+
+        return {
+            'market_summary': {
+                'market_phase': self.PHASES.get(technical['trend'], '횡보'),
+                'overall_sentiment': self.SENTIMENTS.get(sentiment.get('market'), '중립'),
+                'short_sentiment': self.SENTIMENTS.get(sentiment.get('short_term'), '중립'),
+                'volume_status': self.VOLUMES.get(sentiment.get('volume'), '거래량 보통'),
+                'risk_level': self.RISKS.get(sentiment.get('risk'), '중간'),
+                'confidence': confidence
+            },
+            'trading_signals': {
+                'position_suggestion': position,
+                'leverage': trading_config.leverage_settings['default'],
+                'position_size': trading_config.position_settings['default'],
+                'entry_price': price,
+                'stop_loss': round(price * (1 - direction * rule['stop_loss_pct'] / 100), 1),
+                'take_profit1': round(price * (1 + direction * rule['take_profit1_pct'] / 100), 1),
+                'take_profit2': round(price * (1 + direction * rule['take_profit2_pct'] / 100), 1),
+                'reason': reason
+            }
+        }
@@ -0,0 +1,254 @@
+import re
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from config import config
+from config.trading_config import trading_config
+from services.tracer import traced
+
+logger = logging.getLogger(__name__)
+
+_FENCE = re.compile(r'```(?:json)?\s*(.*?)```', re.DOTALL)
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+def parse_json_lenient(text: str) -> Optional[Dict]:
+    """관대한 JSON 파싱
+
+    코드 펜스, 앞뒤 설명 문구, 끝의 쉼표, 잘린 응답(닫히지 않은 문자열/괄호)을 허용합니다.
+    """
+    if not text:
+        return None
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    start = text.find('{')
+    if start < 0:
+        return None
+    text = text[start:]
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    end = text.rfind('}')
+    if end > 0:
+        try:
+            return json.loads(_TRAILING_COMMA.sub(r'\1', text[:end + 1]))
+        except ValueError:
+            pass
+
+    return _close_partial(text)
+
+def _close_partial(text: str) -> Optional[Dict]:
+    """잘린 JSON 을 마지막 완성된 값까지 잘라 괄호를 닫아서 파싱"""
+    stack = []
+    in_string = escape = False
+    last_safe = None    # 값이 끝난 직후 위치와 그때의 괄호 상태
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+            last_safe = (i + 1, list(stack))
+        elif ch == ',':
+            last_safe = (i, list(stack))
+
+    if not last_safe:
+        return None
+    cut, remaining = last_safe
+    candidate = _TRAILING_COMMA.sub(r'\1', text[:cut] + ''.join(reversed(remaining)))
+    try:
+        result = json.loads(candidate)
+        return result if isinstance(result, dict) else None
+    except ValueError:
+        return None
+
+def to_number(value: Any) -> Optional[float]:
+    """숫자 또는 숫자 문자열('$50,000', '5x', '10%') 변환"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = re.search(r'-?\d+(?:\.\d+)?', value.replace(',', ''))
+        if match:
+            return float(match.group(0))
+    return None
+
+class SignalValidator:
+    """GPT 매매 신호 스키마 검증 및 보정
+
+    - 숫자 문자열 변환, 누락된 요약 필드 기본값
+    - 레버리지/포지션 크기를 trading_config 범위로 제한
+    - BUY/SELL 가격 순서 강제 (위반 시 진입가 기준 기본 비율로 재설정)
+    보정할 수 없는 문제(섹션 누락, 알 수 없는 포지션)는 fatal 로 보고합니다.
+    """
+
+    POSITIONS = {
+        'BUY': 'BUY', 'LONG': 'BUY', '매수': 'BUY', '롱': 'BUY',
+        'SELL': 'SELL', 'SHORT': 'SELL', '매도': 'SELL', '숏': 'SELL',
+        'HOLD': 'HOLD', 'NEUTRAL': 'HOLD', 'WAIT': 'HOLD', '관망': 'HOLD'
+    }
+    SUMMARY_DEFAULTS = {
+        'market_phase': '횡보',
+        'overall_sentiment': '중립',
+        'short_sentiment': '중립',
+        'volume_status': '거래량 보통',
+        'risk_level': '중간'
+    }
+    PRICE_FIELDS = ('stop_loss', 'take_profit1', 'take_profit2')
+    # 가격 순서 위반 시 재설정 비율 (진입가 대비 %)
+    DEFAULT_STOP_PCT = 2.0
+    DEFAULT_TP1_PCT = 2.0
+    DEFAULT_TP2_PCT = 4.0
+    DEFAULT_REPAIR_ATTEMPTS = 1
+
+    def __init__(self, settings: Dict = None):
+        if settings is None:
+            settings = config.load_json_config('gpt_config.json').get('validation', {})
+        self.repair_attempts = int(settings.get('repair_attempts', self.DEFAULT_REPAIR_ATTEMPTS))
+        self.valid_count = 0
+        self.corrected_count = 0
+        self.repaired_count = 0
+        self.failed_count = 0
+
+    def get_stats(self) -> Dict:
+        """검증 통계 (통과/보정/재요청 복구/실패)"""
+        return {
+            'valid': self.valid_count,
+            'corrected': self.corrected_count,
+            'repaired': self.repaired_count,
+            'failed': self.failed_count
+        }
+
+    def build_repair_message(self, issues: List[str]) -> str:
+        """재요청 프롬프트 (문제 항목만 지적)"""
+        return ("이전 응답을 처리할 수 없습니다. 다음 문제를 고쳐 같은 JSON 형식으로 전체 응답만 다시 보내주세요:\n"
+                + '\n'.join(f"- {issue}" for issue in issues)
+                + "\n(position_suggestion 은 BUY/SELL/HOLD 중 하나, 가격은 숫자)")
+
+    @classmethod
+    def normalize_position(cls, value: Any) -> Optional[str]:
+        """포지션 제안 정규화 (알 수 없으면 None)"""
+        if not isinstance(value, str):
+            return None
+        return cls.POSITIONS.get(value.strip().upper(), cls.POSITIONS.get(value.strip()))
+
+    @traced('signal.validate')
+    def validate(self, analysis: Dict, current_price: float) -> Tuple[Optional[Dict], List[str], bool]:
+        """검증 및 보정
+
+        Returns:
+            (보정된 결과, 보정/오류 내역, 치명적 오류 여부)
+        """
+        issues: List[str] = []
+        if not isinstance(analysis, dict):
+            return None, ["응답이 JSON 객체가 아님"], True
+
+        summary = analysis.get('market_summary')
+        signals = analysis.get('trading_signals')
+        if not isinstance(summary, dict) or not isinstance(signals, dict):
+            missing = [key for key, value in (('market_summary', summary), ('trading_signals', signals))
+                       if not isinstance(value, dict)]
+            return None, [f"필수 섹션 누락: {', '.join(missing)}"], True
+
+        position = self.normalize_position(signals.get('position_suggestion'))
+        if position is None:
+            return None, [f"알 수 없는 position_suggestion: {signals.get('position_suggestion')}"], True
+
+        result = {
+            **analysis,
+            'market_summary': self._validate_summary(summary, issues),
+            'trading_signals': self._validate_signals(signals, position, current_price, issues)
+        }
+        if issues:
+            self.corrected_count += 1
+            logger.info(f"GPT 응답 보정: {'; '.join(issues)}")
+        else:
+            self.valid_count += 1
+        return result, issues, False
+
+    def _validate_summary(self, summary: Dict, issues: List[str]) -> Dict:
+        result = dict(summary)
+        for field, default in self.SUMMARY_DEFAULTS.items():
+            if not result.get(field):
+                result[field] = default
+                issues.append(f"{field} 누락 → {default}")
+
+        confidence = to_number(result.get('confidence'))
+        if confidence is None:
+            issues.append("confidence 누락 → 0")
+            confidence = 0
+        clamped = int(min(max(confidence, 0), 100))
+        if clamped != result.get('confidence'):
+            if confidence != clamped:
+                issues.append(f"confidence {result.get('confidence')} → {clamped}")
+            result['confidence'] = clamped
+        return result
+
+    def _validate_signals(self, signals: Dict, position: str, current_price: float, issues: List[str]) -> Dict:
+        result = dict(signals)
+        if result.get('position_suggestion') != position:
+            issues.append(f"position_suggestion {result.get('position_suggestion')} → {position}")
+        result['position_suggestion'] = position
+
+        # 레버리지/포지션 크기 범위 제한
+        result['leverage'] = self._clamp_int(
+            result.get('leverage'), trading_config.leverage_settings, 'leverage', issues)
+        result['position_size'] = self._clamp_int(
+            result.get('position_size'), trading_config.position_settings, 'position_size', issues)
+
+        entry = to_number(result.get('entry_price')) or current_price
+        result['entry_price'] = entry
+        for field in self.PRICE_FIELDS:
+            value = to_number(result.get(field))
+            if value is None and result.get(field) is not None:
+                issues.append(f"{field} 숫자 아님: {result.get(field)}")
+            result[field] = value
+
+        if not result.get('reason'):
+            result['reason'] = '사유 없음'
+
+        if not self._price_order_valid(position, entry, result):
+            direction = -1 if position == 'SELL' else 1
+            result['stop_loss'] = round(entry * (1 - direction * self.DEFAULT_STOP_PCT / 100), 1)
+            result['take_profit1'] = round(entry * (1 + direction * self.DEFAULT_TP1_PCT / 100), 1)
+            result['take_profit2'] = round(entry * (1 + direction * self.DEFAULT_TP2_PCT / 100), 1)
+            issues.append(f"{position} 가격 순서 오류 → 기본 비율로 재설정")
+        return result
+
+    @staticmethod
+    def _price_order_valid(position: str, entry: float, signals: Dict) -> bool:
+        """BUY: SL < 진입 < TP1 < TP2, SELL: TP2 < TP1 < 진입 < SL (HOLD 는 값만 있으면 됨)"""
+        sl, tp1, tp2 = signals['stop_loss'], signals['take_profit1'], signals['take_profit2']
+        if None in (sl, tp1, tp2):
+            return False
+        if position == 'BUY':
+            return sl < entry < tp1 < tp2
+        if position == 'SELL':
+            return tp2 < tp1 < entry < sl
+        return True
+
+    @staticmethod
+    def _clamp_int(value: Any, bounds: Dict, field: str, issues: List[str]) -> int:
+        number = to_number(value)
+        if number is None:
+            issues.append(f"{field} 누락 → {bounds['default']}")
+            return int(bounds['default'])
+        clamped = int(min(max(round(number), bounds['min']), bounds['max']))
+        if clamped != number:
+            issues.append(f"{field} {value} → {clamped}")
+        return clamped
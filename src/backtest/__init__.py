@@ -0,0 +1,9 @@
+from .engine import BacktestEngine, load_klines
+from .simulated_exchange import SimulatedExchange
+from .sweep import ParameterSweep
+from .replay_dataset import ReplayDataset, ReplayDatasetBuilder
+
+__all__ = [
+    'BacktestEngine', 'SimulatedExchange', 'ParameterSweep',
+    'ReplayDataset', 'ReplayDatasetBuilder', 'load_klines'
+]
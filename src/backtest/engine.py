@@ -0,0 +1,249 @@
+import json
+import time
+import logging
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from indicators.technical import TechnicalIndicators
+from services.order_service import OrderService
+from services.risk_engine import RiskEngine
+from services.trade_analytics import compute_trade_stats
+from trade.trade_manager import TradeManager
+from trade.exit_manager import ExitManager
+from .simulated_exchange import (
+    SimulatedExchange, SimulatedBybitClient, SimulatedPositionService, SimulatedBalanceService, bar_path
+)
+
+logger = logging.getLogger(__name__)
+
+KLINE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+def load_klines(path: Union[str, Path]) -> List[Dict]:
+    """과거 봉 로드 (CSV 또는 JSON 목록, timestamp 는 ms 또는 날짜 문자열)"""
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            df = pd.DataFrame(json.load(f))
+    else:
+        df = pd.read_csv(path)
+
+    if not pd.api.types.is_numeric_dtype(df['timestamp']):
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True).astype('int64') // 1_000_000
+    columns = KLINE_COLUMNS + (['funding_rate'] if 'funding_rate' in df.columns else [])
+    df = df[columns].sort_values('timestamp').drop_duplicates('timestamp')
+    return df.to_dict('records')
+
+class BacktestEngine:
+    """과거 봉을 실제 분석/주문 로직으로 재생하는 백테스트 엔진
+
+    - 지표와 봉별 신호 분류는 전체 기간에 대해 한 번만 벡터 계산 (롤링 지표는 과거 값만 사용)
+    - 봉마다 최근 window 개 봉으로 GPTAnalyzer.compute_indicators 와 같은 형식의 입력을 구성
+    - 신호 소스(규칙/LLM 스텁/기록 재생) → TradeManager.should_execute_trade → OrderService.execute_trade
+    - 주문은 SimulatedExchange 에서 체결, 청산 기록은 /stats 와 같은 compute_trade_stats 로 집계
+    - exits.enabled 이면 봉 내부 가격 경로를 틱으로 재생하며 청산 실행기(분할 익절/트레일링)를 구동하고
+      틱 처리 지연과 손절/익절 변경 요청 수를 함께 보고
+    """
+
+    DEFAULT_SETTINGS = {
+        'window': 200,          # 봉마다 분석에 넘기는 최근 봉 수 (실시간 조회 개수와 동일)
+        'warmup': 50,           # 지표 안정화 전 건너뛸 봉 수
+        'bar_minutes': 60,
+        'exchange': {},
+        'risk': {},             # risk_config.json 덮어쓰기 (유지 증거금률은 모의 거래소 값 사용)
+        'exits': {'enabled': False, 'ticks_per_leg': 4}   # 청산 실행기 재생 (봉 내부 구간별 틱 수)
+    }
+
+    def __init__(self, klines: List[Dict], signal_source, settings: Dict = None,
+                 technical_indicators: TechnicalIndicators = None):
+        if settings is None:
+            settings = config.load_json_config('backtest_config.json')
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.window = int(options['window'])
+        self.warmup = max(int(options['warmup']), 2)
+        self.bar_ms = int(options['bar_minutes']) * 60_000
+        self.klines = klines
+        self.signal_source = signal_source
+        self.technical_indicators = technical_indicators or TechnicalIndicators()
+
+        # 실거래와 같은 주문 서비스에 모의 거래소를 연결
+        self.exchange = SimulatedExchange(options['exchange'])
+        self.risk_engine = RiskEngine({
+            **config.load_json_config('risk_config.json'),
+            'maintenance_margin': self.exchange.maintenance_margin,
+            **options['risk']
+        })
+        exits = {**self.DEFAULT_SETTINGS['exits'], **options['exits']}
+        client = SimulatedBybitClient(self.exchange)
+        self.ticks_per_leg = max(int(exits['ticks_per_leg']), 1)
+        self.exit_manager = None
+        if exits['enabled']:
+            # 손절가 변경 간격은 모의 거래소 시각 기준
+            self.exit_manager = ExitManager(
+                client, risk_engine=self.risk_engine, clock=lambda: self.exchange.timestamp / 1000
+            )
+        self._exit_position = None
+        self.order_service = OrderService(
+            client,
+            SimulatedPositionService(self.exchange),
+            SimulatedBalanceService(self.exchange),
+            risk_engine=self.risk_engine,
+            exit_manager=self.exit_manager
+        )
+        self.trade_manager = TradeManager(self.order_service)
+
+        self.signal_counts = {'BUY': 0, 'SELL': 0, 'HOLD': 0}
+        self.orders_executed = 0
+        self.orders_failed = 0
+
+    async def run(self, indicators: pd.DataFrame = None) -> Optional[Dict]:
+        """백테스트 실행 (통계 + 요약 + 거래 목록 + 자산 곡선)
+
+        Args:
+            indicators: 미리 계산한 지표 (klines 와 같은 봉 순서, 없으면 여기서 계산)
+        """
+        try:
+            started = time.perf_counter()
+            df = indicators
+            if df is None:
+                df = self.technical_indicators.calculate_indicators(
+                    [{key: bar[key] for key in KLINE_COLUMNS} for bar in self.klines]
+                )
+            if df is None or len(df) <= self.warmup:
+                logger.error(f"백테스트 데이터 부족 ({len(self.klines)}봉)")
+                return None
+
+            # 봉별 신호 분류를 한 번에 계산 (봉마다 analyze_signals 를 호출하지 않음)
+            signals = self.technical_indicators.classify_signals(df)
+            timestamps = np.array([bar['timestamp'] for bar in self.klines], dtype=np.int64)
+            ohlc = df[['open', 'high', 'low', 'close']].to_numpy(dtype=np.float64)
+            funding = np.array([bar.get('funding_rate', np.nan) for bar in self.klines], dtype=np.float64)
+            equity_curve = np.empty(len(df) - self.warmup, dtype=np.float64)
+
+            for i in range(self.warmup, len(df)):
+                open_, high, low, close = ohlc[i]
+                funding_rate = None if np.isnan(funding[i]) else float(funding[i])
+                if self.exit_manager:
+                    await self._replay_bar(int(timestamps[i]), open_, high, low, close, funding_rate)
+                else:
+                    self.exchange.on_bar(
+                        int(timestamps[i]), open_, high, low, close,
+                        funding_rate=funding_rate, bar_ms=self.bar_ms
+                    )
+
+                prepared = self._prepare(df, signals, i)
+                analysis = await self.signal_source.analyze(prepared, float(close), int(timestamps[i]))
+                if analysis:
+                    await self._handle_analysis(analysis)
+                    if self.exit_manager:
+                        await self._sync_exit_position()
+
+                equity_curve[i - self.warmup] = self.exchange.equity()
+
+            self.exchange.close_all()
+            elapsed = time.perf_counter() - started
+            return self._report(equity_curve, timestamps[self.warmup:], elapsed)
+
+        except Exception as e:
+            logger.error(f"백테스트 실행 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+
+    async def _replay_bar(self, timestamp: int, open_: float, high: float, low: float, close: float,
+                          funding_rate: float = None):
+        """봉 내부 가격 경로를 틱으로 재생 (틱마다 트리거 → 포지션 변경 → 마크 가격 순으로 청산 실행기에 전달)"""
+        exchange = self.exchange
+        exchange.begin_bar(timestamp, open_, funding_rate)
+        path = bar_path(open_, high, low, close, self.ticks_per_leg)
+        for k, price in enumerate(path):
+            exchange.on_tick(float(price), timestamp + self.bar_ms * k // len(path))
+            await self._sync_exit_position()
+            self.exit_manager.on_mark(exchange.symbol, float(price))
+            await self.exit_manager.flush()
+        exchange.end_bar(close, timestamp + self.bar_ms)
+
+    async def _sync_exit_position(self):
+        """모의 포지션이 바뀌었으면 포지션 스트림처럼 청산 실행기에 전달"""
+        position = self.exchange.position
+        state = (position['side'], position['size'], position['entry_price']) if position else None
+        if state == self._exit_position:
+            return
+        self._exit_position = state
+        if position:
+            side = 'Buy' if position['side'] == 'Long' else 'Sell'
+            self.exit_manager.on_position(self.exchange.symbol, side, position['size'], position['entry_price'])
+        else:
+            self.exit_manager.on_position(self.exchange.symbol, '', 0.0, 0.0)
+        await self.exit_manager.flush()
+
+    def _prepare(self, df: pd.DataFrame, signals: pd.DataFrame, i: int) -> Dict:
+        """i 번째 봉 시점의 GPTAnalyzer.compute_indicators 형식 입력 (최근 window 개 봉)"""
+        window = df.iloc[max(0, i - self.window + 1):i + 1]
+        technical_analysis = self.technical_indicators.signals_at(signals, i, timestamp=df.index[i])
+        return {
+            'df': window,
+            'technical_analysis': technical_analysis,
+            'indicators': {
+                'rsi': float(df['rsi'].iat[i]),
+                'macd': float(df['macd'].iat[i]),
+                'macd_signal': float(df['macd_signal'].iat[i]),
+                'bb_position': technical_analysis['signals']['bollinger'],
+                'trend': technical_analysis['trend'],
+                'trend_strength': technical_analysis['strength']
+            }
+        }
+
+    async def _handle_analysis(self, analysis: Dict):
+        """AutoAnalyzer._handle_trading_signals 와 같은 조건으로 주문 실행"""
+        signals = analysis.get('trading_signals', {})
+        position_suggestion = signals.get('position_suggestion')
+        if position_suggestion in self.signal_counts:
+            self.signal_counts[position_suggestion] += 1
+
+        if not self.trade_manager.should_execute_trade(analysis):
+            return
+
+        order_signals = {
+            **signals,
+            'symbol': 'BTCUSDT',
+            'side': 'BUY' if position_suggestion == 'BUY' else 'SELL',
+            'is_btc_unit': False
+        }
+        if await self.order_service.execute_trade(order_signals):
+            self.orders_executed += 1
+        else:
+            self.orders_failed += 1
+
+    def _report(self, equity_curve: np.ndarray, timestamps: np.ndarray, elapsed: float) -> Dict:
+        exchange = self.exchange
+        trades = exchange.closed_trades
+        peaks = np.maximum.accumulate(np.concatenate(([exchange.initial_balance], equity_curve)))
+        drawdowns = 1 - np.concatenate(([exchange.initial_balance], equity_curve)) / peaks
+        final_equity = exchange.equity()
+
+        return {
+            'stats': compute_trade_stats(trades),
+            'summary': {
+                'bars': int(equity_curve.size),
+                'start': int(timestamps[0]) if timestamps.size else 0,
+                'end': int(timestamps[-1]) if timestamps.size else 0,
+                'initial_balance': exchange.initial_balance,
+                'final_equity': final_equity,
+                'return_pct': (final_equity / exchange.initial_balance - 1) * 100,
+                'max_drawdown_pct': float(drawdowns.max() * 100),
+                'fees': exchange.fees_paid,
+                'funding': exchange.funding_paid,
+                'liquidations': exchange.liquidations,
+                'signals': dict(self.signal_counts),
+                'orders_executed': self.orders_executed,
+                'orders_failed': self.orders_failed,
+                'exits': self.exit_manager.get_stats() if self.exit_manager else None,
+                'elapsed': elapsed
+            },
+            'trades': trades,
+            'equity_curve': equity_curve
+        }
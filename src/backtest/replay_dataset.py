@@ -0,0 +1,570 @@
+"""기록된 LLM 판단 재생 데이터셋
+
+사용법 (src 디렉토리에서):
+    python -m backtest.replay_dataset build [--klines 봉 데이터.csv] [--logs ../logs] [--out data/replay]
+    python -m backtest.replay_dataset evaluate [data/replay] [--horizon 4]
+
+분석 이력(analysis/<YYYYMMDD>/<tf>/analysis_<ts>.json, 최신본 analysis_<tf>.json)과
+app.log.* 의 "분석 결과 trading_signals" 기록을 하나의 판단 목록으로 정규화하고,
+그 시점의 봉(이후 수익률, 손절/익절 선도달)과 청산 포지션 손익을 붙여 열 단위로 저장합니다.
+열마다 .npy 파일 하나로 저장하여 np.load(mmap_mode='r') 로 복사 없이 읽습니다.
+"""
+import re
+import ast
+import sys
+import glob
+import logging
+import argparse
+import traceback
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from config.trading_config import trading_config
+from ai.signal_validator import SignalValidator, to_number
+from services.risk_engine import RiskEngine
+from services.storage_io import atomic_write_bytes, atomic_write_json, read_json
+from .engine import load_klines
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+TIMEFRAMES = ['15m', '1h', '4h', '1d', 'final']
+POSITION_CODES = {'BUY': 1, 'SELL': -1, 'HOLD': 0}
+POSITION_NAMES = {code: name for name, code in POSITION_CODES.items()}
+ORIGINS = ['archive', 'log']
+
+# 로그의 분석 시작 문구 → 시간대
+LOG_TIMEFRAMES = {
+    '15m': '15m', '15분봉': '15m', '1h': '1h', '1시간봉': '1h',
+    '4h': '4h', '4시간봉': '4h', '1d': '1d', '일봉': '1d'
+}
+LOG_LINE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3}) - [\w.]+ - \w+ - (.*)$')
+LOG_START = re.compile(r'(15m|1h|4h|1d|15분봉|1시간봉|4시간봉|일봉) ?분석 시작')
+LOG_SIGNALS = '분석 결과 trading_signals: '
+LOG_LOW_CONFIDENCE = re.compile(r'신뢰도 부족 \(현재: (\d+(?:\.\d+)?)%')
+
+PRICE_FIELDS = ['entry_price', 'stop_loss', 'take_profit1', 'take_profit2']
+
+def _first(values) -> Optional[float]:
+    if isinstance(values, (list, tuple)) and values:
+        return to_number(values[0])
+    return None
+
+def _read_json(path) -> Optional[Union[Dict, List]]:
+    """JSON 파일 읽기 (손상된 파일은 건너뜀)"""
+    try:
+        return read_json(path)
+    except Exception as e:
+        logger.warning(f"파일 로드 실패 ({path}): {str(e)}")
+        return None
+
+def normalize_decision(data: Dict) -> Optional[Dict]:
+    """분석 결과(현재/이전 스키마 모두)를 판단 한 건으로 정규화 (매매 정보가 없으면 None)"""
+    signals = data.get('trading_signals') or data.get('trading_strategy')
+    suggestion = data.get('trading_suggestion')
+    if not isinstance(signals, dict) and not suggestion:
+        return None
+    signals = signals if isinstance(signals, dict) else {}
+    summary = data.get('market_summary') if isinstance(data.get('market_summary'), dict) else {}
+
+    position = SignalValidator.normalize_position(signals.get('position_suggestion') or signals.get('position'))
+    if position is None:
+        # 초기 형식: "관망 제안" 같은 문장
+        text = str(suggestion or signals.get('position') or '')
+        position = next((code for word, code in (('매수', 'BUY'), ('매도', 'SELL')) if word in text), 'HOLD')
+
+    take_profits = signals.get('take_profits')
+    price = to_number(summary.get('current_price'))
+    if price is None:
+        price = to_number(((data.get('market_data') or {}).get('price_data') or {}).get('last_price'))
+
+    return {
+        'position': position,
+        'confidence': to_number(summary.get('confidence')),
+        'leverage': to_number(signals.get('leverage', signals.get('recommended_leverage'))),
+        'position_size': to_number(signals.get('position_size')),
+        'entry_price': to_number(signals.get('entry_price')) or _first(signals.get('entry_points')),
+        'stop_loss': to_number(signals.get('stop_loss', signals.get('stopLoss'))),
+        'take_profit1': to_number(signals.get('take_profit1', signals.get('takeProfit'))) or _first(take_profits),
+        'take_profit2': to_number(signals.get('take_profit2')) or (
+            to_number(take_profits[1]) if isinstance(take_profits, list) and len(take_profits) > 1 else None
+        ),
+        'price': price,
+        'reason': str(signals.get('reason') or data.get('trend_analysis') or '')
+    }
+
+class ReplayDataset:
+    """열 단위 판단 데이터셋 (각 열은 메모리 매핑된 numpy 배열)"""
+
+    COLUMNS = {
+        'timestamp': 'int64',       # 판단 시각 (ms)
+        'timeframe': 'int8',        # TIMEFRAMES 인덱스
+        'origin': 'int8',           # ORIGINS 인덱스
+        'position': 'int8',         # 1 BUY / -1 SELL / 0 HOLD
+        'confidence': 'float32',    # 없으면 NaN (로그 기록)
+        'leverage': 'float32',
+        'position_size': 'float32',
+        'entry_price': 'float64',
+        'stop_loss': 'float64',
+        'take_profit1': 'float64',
+        'take_profit2': 'float64',
+        'bar_index': 'int32',       # 판단 시각이 속한 봉 (봉 범위 밖이면 -1)
+        'price': 'float64',         # 판단 시점 가격 (해당 봉 시가)
+        'outcome': 'int8',          # 최대 구간 내 1 익절1 먼저 / -1 손절 먼저 / 0 둘 다 아님
+        'realized_pnl': 'float64',  # 다음 판단 전까지 청산된 포지션 손익 합
+        'closed_positions': 'int16'
+    }
+
+    def __init__(self, path: Union[str, Path], columns: Dict[str, np.ndarray], meta: Dict, reasons: List[str]):
+        self.path = Path(path)
+        self.columns = columns
+        self.meta = meta
+        self.reasons = reasons
+
+    def __len__(self) -> int:
+        return int(self.meta['rows'])
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'ReplayDataset':
+        """저장된 데이터셋 열기 (열은 읽기 전용 메모리 매핑)"""
+        path = Path(path)
+        meta = read_json(path / 'meta.json')
+        if not meta or meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"재생 데이터셋 형식이 맞지 않습니다: {path}")
+        columns = {name: np.load(path / f"{name}.npy", mmap_mode='r') for name in meta['columns']}
+        return cls(path, columns, meta, read_json(path / 'reasons.json', []))
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def timeframe_code(self, timeframe: str) -> int:
+        return self.meta['timeframes'].index(timeframe)
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame({name: np.asarray(values) for name, values in self.columns.items()})
+        df['timeframe'] = np.array(self.meta['timeframes'])[df['timeframe']]
+        df['origin'] = np.array(ORIGINS)[df['origin']]
+        df['position'] = df['position'].map(POSITION_NAMES)
+        df['reason'] = self.reasons
+        return df
+
+    def analysis(self, row: int) -> Dict:
+        """한 판단을 GPT 응답 형식으로 (없는 값은 None, SignalValidator 로 보정해서 사용)"""
+        def value(name):
+            number = float(self.columns[name][row])
+            return None if np.isnan(number) else number
+
+        confidence = value('confidence')
+        return {
+            'market_summary': {'confidence': confidence},
+            'trading_signals': {
+                'position_suggestion': POSITION_NAMES[int(self.columns['position'][row])],
+                'leverage': value('leverage'),
+                'position_size': value('position_size'),
+                **{field: value(field) for field in PRICE_FIELDS},
+                'reason': self.reasons[row] if row < len(self.reasons) else ''
+            },
+            'timestamp': int(self.columns['timestamp'][row])
+        }
+
+    def size_positions(self, equity: float, risk_engine: RiskEngine = None) -> Dict[str, np.ndarray]:
+        """모든 판단의 주문 수량/레버리지를 리스크 엔진으로 한 번에 계산 (관망은 수량 0)
+
+        기록되지 않은 레버리지/비중은 현재 trading_config 기본값을 사용합니다.
+        """
+        risk_engine = risk_engine or RiskEngine.get_instance()
+        position = np.asarray(self.columns['position'])
+        entry = np.asarray(self.columns['entry_price'], dtype=np.float64)
+        entry = np.where(np.isfinite(entry), entry, np.asarray(self.columns['price'], dtype=np.float64))
+        leverage = np.asarray(self.columns['leverage'], dtype=np.float64)
+        percentage = np.asarray(self.columns['position_size'], dtype=np.float64)
+
+        return risk_engine.size_batch(
+            equity,
+            np.where(np.isfinite(percentage), percentage, trading_config.position_settings['default']),
+            np.where(np.isfinite(leverage), leverage, trading_config.leverage_settings['default']),
+            np.where(position != 0, entry, np.nan),
+            np.where(position >= 0, 1, -1),
+            np.asarray(self.columns['stop_loss'], dtype=np.float64),
+            np.asarray(self.columns['take_profit1'], dtype=np.float64)
+        )
+
+    def evaluate(self, horizon: int = None) -> Dict:
+        """판단 품질 집계 (방향 적중률, 방향 수익률, 손절/익절 선도달, 신뢰도 구간별)"""
+        horizons = self.meta['horizons']
+        horizon = horizon or horizons[min(1, len(horizons) - 1)]
+        if f"return_{horizon}" not in self.columns:
+            raise ValueError(f"저장되지 않은 구간: {horizon} (가능: {horizons})")
+
+        position = np.asarray(self.columns['position'])
+        returns = np.asarray(self.columns[f"return_{horizon}"], dtype=np.float64)
+        confidence = np.asarray(self.columns['confidence'], dtype=np.float64)
+        outcome = np.asarray(self.columns['outcome'])
+        directional = position * returns
+        active = (position != 0) & np.isfinite(returns)
+        hold = (position == 0) & np.isfinite(returns)
+
+        def summarize(mask: np.ndarray) -> Dict:
+            count = int(mask.sum())
+            return {
+                'count': count,
+                'hit_rate': float((directional[mask] > 0).mean() * 100) if count else 0.0,
+                'avg_return_pct': float(directional[mask].mean() * 100) if count else 0.0,
+                'tp_first': int((outcome[mask] == 1).sum()),
+                'sl_first': int((outcome[mask] == -1).sum())
+            }
+
+        buckets = {}
+        for label, low, high in (('<50', -np.inf, 50), ('50-70', 50, 70), ('>=70', 70, np.inf), ('없음', np.nan, np.nan)):
+            mask = active & (np.isnan(confidence) if np.isnan(low) else (confidence >= low) & (confidence < high))
+            buckets[label] = summarize(mask)
+
+        return {
+            'horizon': horizon,
+            'bar_minutes': self.meta['bar_minutes'],
+            'decisions': len(self),
+            'positions': {name: int((position == code).sum()) for name, code in POSITION_CODES.items()},
+            'evaluated': int((np.isfinite(returns)).sum()),
+            'signals': summarize(active),
+            'buy': summarize(active & (position == 1)),
+            'sell': summarize(active & (position == -1)),
+            'hold_avg_abs_move_pct': float(np.abs(returns[hold]).mean() * 100) if hold.any() else 0.0,
+            'by_confidence': buckets,
+            'sizing': self._sizing_summary(position != 0),
+            'realized_pnl': float(np.nansum(self.columns['realized_pnl'])),
+            'closed_positions': int(np.sum(self.columns['closed_positions']))
+        }
+
+    def _sizing_summary(self, active: np.ndarray, equity: float = 10000.0) -> Dict:
+        """리스크 엔진 적용 결과 요약 (기준 자산 equity 가정)"""
+        plans = self.size_positions(equity)
+        sized = active & (plans['qty'] > 0)
+        count = int(sized.sum())
+        return {
+            'count': count,
+            'leverage_capped': int((plans['leverage_capped'] & sized).sum()),
+            'exposure_capped': int((plans['exposure_capped'] & sized).sum()),
+            'below_min_qty': int((plans['below_min_qty'] & sized).sum()),
+            'avg_leverage': float(plans['leverage'][sized].mean()) if count else 0.0,
+            'avg_stop_distance_pct': float(plans['stop_distance_pct'][sized].mean()) if count else 0.0,
+            'avg_risk_pct': float((plans['risk_amount'][sized] / equity * 100).mean()) if count else 0.0
+        }
+
+class ReplayDatasetBuilder:
+    """분석 이력 + 로그 + 봉 + 청산 포지션으로 ReplayDataset 생성"""
+
+    DEFAULT_SETTINGS = {
+        'dataset_dir': 'data/replay',
+        'log_dir': 'logs',
+        'log_timezone': 'Asia/Seoul',   # 로그 시각 기준 시간대
+        'horizons': [1, 4, 24],         # 이후 수익률 구간 (봉 수)
+        'dedupe_seconds': 120,          # 같은 판단의 이력 파일/로그 기록 중복 제거 범위
+        'price_tolerance': 0.1          # 판단 시점 가격과 이 비율 이상 다른 기록 가격은 버림
+    }
+
+    def __init__(self, settings: Dict = None, bar_minutes: int = None):
+        backtest_settings = config.load_json_config('backtest_config.json')
+        if settings is None:
+            settings = backtest_settings.get('replay', {})
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.dataset_dir = Path(options['dataset_dir'])
+        self.log_dir = Path(options['log_dir'])
+        self.log_timezone = options['log_timezone']
+        self.horizons = sorted(int(h) for h in options['horizons'])
+        self.dedupe_ms = int(options['dedupe_seconds']) * 1000
+        self.price_tolerance = float(options['price_tolerance'])
+        self.bar_ms = int(bar_minutes or backtest_settings.get('bar_minutes', 60)) * 60_000
+
+    def build(self, klines: List[Dict] = None, analysis_dir: Path = None, positions_dir: Path = None,
+              out_dir: Path = None) -> Optional[ReplayDataset]:
+        """데이터셋 생성 후 열어서 반환"""
+        try:
+            analysis_dir = Path(analysis_dir or config.data_dir / 'analysis')
+            positions_dir = Path(positions_dir or config.data_dir / 'positions')
+            out_dir = Path(out_dir or self.dataset_dir)
+
+            archive = self._load_archive(analysis_dir)
+            logged = self._load_logs(self.log_dir)
+            records = self._dedupe(archive, logged)
+            if not records:
+                logger.error("재생할 분석 기록이 없습니다")
+                return None
+            records.sort(key=lambda record: (record['timestamp'], record['timeframe']))
+
+            columns = self._to_columns(records)
+            self._join_candles(columns, klines or [])
+            self._join_positions(columns, self._load_positions(positions_dir))
+
+            meta = {
+                'version': FORMAT_VERSION,
+                'rows': len(records),
+                'columns': {name: str(values.dtype) for name, values in columns.items()},
+                'timeframes': TIMEFRAMES,
+                'horizons': self.horizons,
+                'bar_minutes': self.bar_ms // 60_000,
+                'candles': len(klines or []),
+                'sources': {
+                    'archive': len(archive),
+                    'log': len(logged),
+                    'log_duplicates': len(archive) + len(logged) - len(records)
+                },
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            self._write(out_dir, columns, meta, [record['reason'] for record in records])
+            logger.info(f"재생 데이터셋 생성: {len(records)}건 (이력 {len(archive)}, 로그 {len(logged)}) → {out_dir}")
+            return ReplayDataset.open(out_dir)
+
+        except Exception as e:
+            logger.error(f"재생 데이터셋 생성 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+
+    # ---- 원본 로드 ----
+
+    def _load_archive(self, analysis_dir: Path) -> List[Dict]:
+        """분석 이력 파일 (이력 파일과 최신본이 같은 판단이면 하나만, 기본 심볼만)"""
+        records, seen = [], set()
+        paths = sorted(glob.glob(str(analysis_dir / '*' / '*' / 'analysis_*.json')))
+        paths += sorted(glob.glob(str(analysis_dir / 'analysis_*.json')))
+        for path in paths:
+            data = _read_json(path)
+            if not isinstance(data, dict) or not data.get('timestamp'):
+                continue
+            if data.get('symbol', trading_config.symbol) != trading_config.symbol:
+                continue
+            timeframe = data.get('timeframe') or Path(path).parent.name
+            if timeframe not in TIMEFRAMES:
+                continue
+            key = (timeframe, int(data['timestamp']))
+            decision = normalize_decision(data)
+            if decision is None or key in seen:
+                continue
+            seen.add(key)
+            records.append({**decision, 'timestamp': key[1], 'timeframe': timeframe, 'origin': 'archive'})
+        return records
+
+    def _load_logs(self, log_dir: Path) -> List[Dict]:
+        """app.log.* 의 매매 신호 기록 (직전 '분석 시작' 문구로 시간대, 이어지는 '신뢰도 부족' 으로 신뢰도)"""
+        records, times = [], []
+        for path in sorted(glob.glob(str(log_dir / 'app.log*'))):
+            timeframe, current = '1h', None
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = LOG_LINE.match(line.rstrip('\n'))
+                    if not match:
+                        continue
+                    message = match.group(3)
+                    start = LOG_START.search(message)
+                    if start:
+                        timeframe, current = LOG_TIMEFRAMES[start.group(1)], None
+                        continue
+                    if message.startswith(LOG_SIGNALS):
+                        try:
+                            signals = ast.literal_eval(message[len(LOG_SIGNALS):])
+                        except (ValueError, SyntaxError):
+                            continue
+                        decision = normalize_decision({'trading_signals': signals}) if isinstance(signals, dict) else None
+                        if decision is None:
+                            continue
+                        current = {**decision, 'timeframe': timeframe, 'origin': 'log'}
+                        records.append(current)
+                        times.append(f"{match.group(1)}.{match.group(2)}")
+                        continue
+                    low_confidence = LOG_LOW_CONFIDENCE.search(message)
+                    if low_confidence and current is not None and current['confidence'] is None:
+                        current['confidence'] = float(low_confidence.group(1))
+
+        if records:
+            local = pd.to_datetime(times, format='%Y-%m-%d %H:%M:%S.%f').tz_localize(self.log_timezone)
+            for record, timestamp in zip(records, local.asi8 // 1_000_000):
+                record['timestamp'] = int(timestamp)
+        return records
+
+    def _dedupe(self, archive: List[Dict], logged: List[Dict]) -> List[Dict]:
+        """이력 파일에 같은 시간대/포지션 판단이 dedupe 범위 안에 있으면 로그 기록 제외"""
+        by_timeframe = {}
+        for record in archive:
+            by_timeframe.setdefault(record['timeframe'], []).append(record)
+        index = {
+            timeframe: (np.array([r['timestamp'] for r in items], dtype=np.int64),
+                        np.array([POSITION_CODES[r['position']] for r in items], dtype=np.int8))
+            for timeframe, items in ((tf, sorted(items, key=lambda r: r['timestamp'])) for tf, items in by_timeframe.items())
+        }
+
+        records = list(archive)
+        for record in logged:
+            timestamps, positions = index.get(record['timeframe'], (np.empty(0, np.int64), np.empty(0, np.int8)))
+            low = np.searchsorted(timestamps, record['timestamp'] - self.dedupe_ms, 'left')
+            high = np.searchsorted(timestamps, record['timestamp'] + self.dedupe_ms, 'right')
+            if not np.any(positions[low:high] == POSITION_CODES[record['position']]):
+                records.append(record)
+        return records
+
+    @staticmethod
+    def _load_positions(positions_dir: Path) -> List[Dict]:
+        """TradeStore 의 일별 청산 포지션 파일 (id 기준 중복 제거)"""
+        positions = {}
+        for path in glob.glob(str(positions_dir / '*' / '*.json')):
+            for position in _read_json(path) or []:
+                if isinstance(position, dict) and position.get('timestamp'):
+                    positions[position.get('id') or (position['timestamp'], position.get('pnl'))] = position
+        return list(positions.values())
+
+    # ---- 열 구성 ----
+
+    def _to_columns(self, records: List[Dict]) -> Dict[str, np.ndarray]:
+        columns = {}
+        for name, dtype in ReplayDataset.COLUMNS.items():
+            columns[name] = np.full(len(records), np.nan if dtype.startswith('float') else 0, dtype=dtype)
+
+        columns['timestamp'][:] = [record['timestamp'] for record in records]
+        columns['timeframe'][:] = [TIMEFRAMES.index(record['timeframe']) for record in records]
+        columns['origin'][:] = [ORIGINS.index(record['origin']) for record in records]
+        columns['position'][:] = [POSITION_CODES[record['position']] for record in records]
+        for name in ('confidence', 'leverage', 'position_size', *PRICE_FIELDS, 'price'):
+            columns[name][:] = [np.nan if record[name] is None else record[name] for record in records]
+        columns['bar_index'][:] = -1
+        return columns
+
+    def _join_candles(self, columns: Dict[str, np.ndarray], klines: List[Dict]):
+        """판단 시각이 속한 봉 기준 가격, 이후 수익률, 손절/익절 선도달"""
+        for horizon in self.horizons:
+            columns[f"return_{horizon}"] = np.full(len(columns['timestamp']), np.nan, dtype=np.float64)
+        if not klines:
+            return
+
+        opens_at = np.array([bar['timestamp'] for bar in klines], dtype=np.int64)
+        open_, high, low, close = (np.array([bar[key] for bar in klines], dtype=np.float64)
+                                   for key in ('open', 'high', 'low', 'close'))
+        timestamps = columns['timestamp']
+        bar_index = np.searchsorted(opens_at, timestamps, 'right') - 1
+        inside = (bar_index >= 0) & (timestamps < opens_at[np.maximum(bar_index, 0)] + self.bar_ms)
+        bar_index = np.where(inside, bar_index, -1)
+        columns['bar_index'][:] = bar_index
+
+        rows = np.flatnonzero(inside)
+        price = open_[bar_index[rows]]
+        columns['price'][rows] = price
+
+        # 기록된 가격이 판단 시점 가격과 크게 다르면 (초기 형식의 비율 값 등) 사용하지 않음
+        for name in PRICE_FIELDS:
+            values = columns[name][rows]
+            columns[name][rows] = np.where(np.abs(values / price - 1) < self.price_tolerance, values, np.nan)
+
+        for horizon in self.horizons:
+            end = bar_index[rows] + horizon - 1
+            valid = end < len(close)
+            columns[f"return_{horizon}"][rows[valid]] = close[end[valid]] / price[valid] - 1
+
+        # 최대 구간 안에서 손절/익절1 중 먼저 닿은 쪽 (같은 봉이면 손절)
+        span = self.horizons[-1]
+        offsets = bar_index[rows][:, None] + np.arange(span)
+        in_range = offsets < len(close)
+        offsets = np.minimum(offsets, len(close) - 1)
+        direction = columns['position'][rows].astype(np.float64)[:, None]
+        stop = columns['stop_loss'][rows][:, None]
+        target = columns['take_profit1'][rows][:, None]
+        with np.errstate(invalid='ignore'):
+            stop_hit = in_range & np.where(direction > 0, low[offsets] <= stop, high[offsets] >= stop)
+            target_hit = in_range & np.where(direction > 0, high[offsets] >= target, low[offsets] <= target)
+        first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), span)
+        first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), span)
+        outcome = np.select([first_stop <= first_target, first_target < first_stop], [-1, 1], 0)
+        outcome[(first_stop == span) & (first_target == span)] = 0
+        outcome[direction[:, 0] == 0] = 0
+        columns['outcome'][rows] = outcome
+
+    @staticmethod
+    def _join_positions(columns: Dict[str, np.ndarray], positions: List[Dict]):
+        """판단 시각부터 다음 판단 전까지 청산된 포지션 손익"""
+        if not positions:
+            columns['realized_pnl'][:] = 0.0
+            return
+        closed_at = np.array([int(p['timestamp']) for p in positions], dtype=np.int64)
+        order = np.argsort(closed_at)
+        closed_at = closed_at[order]
+        cumulative = np.concatenate(([0.0], np.cumsum(np.array([float(p.get('pnl') or 0) for p in positions])[order])))
+
+        timestamps = columns['timestamp']
+        following = np.append(timestamps[1:], np.iinfo(np.int64).max)
+        start = np.searchsorted(closed_at, timestamps, 'left')
+        end = np.searchsorted(closed_at, following, 'left')
+        columns['realized_pnl'][:] = cumulative[end] - cumulative[start]
+        columns['closed_positions'][:] = np.minimum(end - start, np.iinfo(np.int16).max)
+
+    @staticmethod
+    def _write(out_dir: Path, columns: Dict[str, np.ndarray], meta: Dict, reasons: List[str]):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name, values in columns.items():
+            atomic_write_bytes(out_dir / f"{name}.npy", lambda f, values=values: np.save(f, values))
+        atomic_write_json(out_dir / 'reasons.json', reasons)
+        # meta 를 마지막에 기록 (열 파일이 모두 있어야 열 수 있음)
+        atomic_write_json(out_dir / 'meta.json', meta)
+
+def format_evaluation(result: Dict) -> str:
+    def line(label: str, stats: Dict) -> str:
+        return (f"• {label}: {stats['count']}건 | 적중률 {stats['hit_rate']:.1f}% | "
+                f"평균 {stats['avg_return_pct']:+.3f}% | 익절 먼저 {stats['tp_first']} / 손절 먼저 {stats['sl_first']}")
+
+    positions = result['positions']
+    lines = [
+        f"📼 기록 판단 평가 ({result['horizon']}봉 후, {result['bar_minutes']}분봉)",
+        f"• 판단: {result['decisions']}건 (매수 {positions['BUY']} / 매도 {positions['SELL']} / 관망 {positions['HOLD']}), "
+        f"봉 데이터와 연결 {result['evaluated']}건",
+        line('매수/매도', result['signals']),
+        line('매수', result['buy']),
+        line('매도', result['sell']),
+        f"• 관망 후 평균 변동: {result['hold_avg_abs_move_pct']:.3f}%",
+        "신뢰도 구간별:"
+    ]
+    lines += [line(label, stats) for label, stats in result['by_confidence'].items() if stats['count']]
+    sizing = result['sizing']
+    lines.append(
+        f"• 리스크 엔진: {sizing['count']}건 | 평균 레버리지 {sizing['avg_leverage']:.1f}x | "
+        f"평균 손절 거리 {sizing['avg_stop_distance_pct']:.2f}% | 손절 시 평균 손실 {sizing['avg_risk_pct']:.2f}% | "
+        f"레버리지 하향 {sizing['leverage_capped']} / 노출 제한 {sizing['exposure_capped']}"
+    )
+    lines.append(f"• 실현 손익: ${result['realized_pnl']:,.2f} ({result['closed_positions']}건 청산)")
+    return "\n".join(lines)
+
+def main(args) -> int:
+    if args.command == 'build':
+        builder = ReplayDatasetBuilder()
+        if args.logs:
+            builder.log_dir = Path(args.logs)
+        dataset = builder.build(
+            load_klines(args.klines) if args.klines else None,
+            analysis_dir=args.analysis, positions_dir=args.positions, out_dir=args.out
+        )
+        if dataset is None:
+            print("재생 데이터셋 생성 실패")
+            return 1
+        print(f"재생 데이터셋: {len(dataset)}건 → {dataset.path} ({dataset.meta['sources']})")
+        return 0
+
+    path = args.dataset or ReplayDatasetBuilder().dataset_dir
+    print(format_evaluation(ReplayDataset.open(path).evaluate(args.horizon)))
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='기록된 LLM 판단 재생 데이터셋')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='분석 이력/로그로 데이터셋 생성')
+    build.add_argument('--klines', help='봉 데이터 파일 (CSV 또는 JSON, 없으면 가격 연결 생략)')
+    build.add_argument('--logs', help='app.log.* 디렉토리')
+    build.add_argument('--analysis', help='분석 이력 디렉토리 (기본: data/analysis)')
+    build.add_argument('--positions', help='청산 포지션 디렉토리 (기본: data/positions)')
+    build.add_argument('--out', help='저장 디렉토리')
+    evaluate = commands.add_parser('evaluate', help='판단 품질 평가')
+    evaluate.add_argument('dataset', nargs='?', help='데이터셋 디렉토리')
+    evaluate.add_argument('--horizon', type=int, help='평가 구간 (봉 수)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(args))
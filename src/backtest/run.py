@@ -0,0 +1,88 @@
+"""백테스트 실행
+
+사용법 (src 디렉토리에서):
+    python -m backtest.run <봉 데이터.csv|json> [--source rule|stub|replay] [--dataset data/replay]
+                           [--balance 10000] [--trades 결과.json] [--exits]
+
+봉 데이터는 timestamp(ms 또는 날짜), open, high, low, close, volume 열(선택: funding_rate)이 필요합니다.
+"""
+import sys
+import json
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timezone
+
+from config import config
+from telegram_bot.formatters.stats_formatter import StatsFormatter
+from .engine import BacktestEngine, load_klines
+from .signal_sources import SIGNAL_SOURCES
+
+# 봉마다 남기는 주문/분석 로그는 백테스트에서 생략
+QUIET_LOGGERS = ('order_service', 'trade_manager', 'ai', 'indicators', 'services')
+
+def _format_time(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+def format_summary(summary: dict) -> str:
+    signals = summary['signals']
+    lines = [
+        f"🧪 백테스트 ({_format_time(summary['start'])} ~ {_format_time(summary['end'])} UTC, {summary['bars']:,}봉)",
+        f"• 자산: ${summary['initial_balance']:,.2f} → ${summary['final_equity']:,.2f} ({summary['return_pct']:+.2f}%)",
+        f"• 최대 낙폭: {summary['max_drawdown_pct']:.2f}%",
+        f"• 수수료: ${summary['fees']:,.2f} / 펀딩비: ${summary['funding']:,.2f} / 강제 청산: {summary['liquidations']}회",
+        f"• 신호: 매수 {signals['BUY']} / 매도 {signals['SELL']} / 관망 {signals['HOLD']}",
+        f"• 주문: 성공 {summary['orders_executed']} / 실패 {summary['orders_failed']}",
+        f"• 소요 시간: {summary['elapsed']:.1f}초"
+    ]
+    exits = summary.get('exits')
+    if exits:
+        tick, reaction = exits['tick_us'], exits['reaction_us']
+        lines.insert(-1, (
+            f"• 청산 실행기: 틱 {exits['ticks']:,} / 요청 {exits['requests']} "
+            f"(부분 익절 {exits['take_profit_orders']}, 손절 이동 {exits['stop_updates']}, 실패 {exits['failed']})"
+        ))
+        lines.insert(-1, (
+            f"• 반응 지연: 틱 처리 p50 {tick['p50']:.0f}µs / p95 {tick['p95']:.0f}µs, "
+            f"요청까지 p50 {reaction['p50']:.0f}µs / p95 {reaction['p95']:.0f}µs / 최대 {reaction['max']:.0f}µs"
+        ))
+    return "\n".join(lines)
+
+async def main(args) -> int:
+    settings = config.load_json_config('backtest_config.json')
+    if args.balance:
+        settings = {**settings, 'exchange': {**settings.get('exchange', {}), 'initial_balance': args.balance}}
+    if args.exits:
+        settings = {**settings, 'exits': {**settings.get('exits', {}), 'enabled': True}}
+
+    klines = load_klines(args.data)
+    source = SIGNAL_SOURCES[args.source](args.dataset) if args.source == 'replay' else SIGNAL_SOURCES[args.source]()
+    engine = BacktestEngine(klines, source, settings)
+    report = await engine.run()
+    if report is None:
+        print("백테스트 실패")
+        return 1
+
+    print(format_summary(report['summary']))
+    print()
+    print(StatsFormatter().format_period_stats(report['stats'], '백테스트'))
+
+    if args.trades:
+        with open(args.trades, 'w', encoding='utf-8') as f:
+            json.dump(report['trades'], f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='과거 봉 백테스트')
+    parser.add_argument('data', help='봉 데이터 파일 (CSV 또는 JSON)')
+    parser.add_argument('--source', choices=sorted(SIGNAL_SOURCES), default='rule', help='신호 소스')
+    parser.add_argument('--dataset', help='재생 데이터셋 디렉토리 (replay 소스)')
+    parser.add_argument('--balance', type=float, help='초기 자산 (USDT)')
+    parser.add_argument('--trades', help='거래 목록 저장 경로 (JSON)')
+    parser.add_argument('--exits', action='store_true', help='분할 익절/트레일링 청산 실행기 적용')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.ERROR)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,137 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+from config import config
+from config.trading_config import trading_config
+from ai.signal_prefilter import SignalPrefilter
+from ai.signal_validator import SignalValidator
+
+logger = logging.getLogger(__name__)
+
+class SignalSourceError(Exception):
+    """봉 분석 중 오류 (신호 없음과 구분하여 백테스트 실패로 처리)"""
+
+class RuleSignalSource:
+    """규칙 기반 신호 (SignalPrefilter, 합의 규칙 활성화 / 판단 불가 시 HOLD)"""
+
+    name = 'rule'
+
+    def __init__(self, settings: Dict = None):
+        defaults = SignalPrefilter.DEFAULT_SETTINGS
+        settings = settings or {}
+        self.prefilter = SignalPrefilter({
+            'enabled': True,
+            'hold': {**defaults['hold'], **settings.get('hold', {})},
+            'consensus': {**defaults['consensus'], 'enabled': True, **settings.get('consensus', {})}
+        })
+
+    async def analyze(self, prepared: Dict, current_price: float, timestamp: int) -> Optional[Dict]:
+        decision = self.prefilter.evaluate(prepared, current_price)
+        if decision:
+            return decision
+        technical = prepared['technical_analysis']
+        return self.prefilter.build(technical, 'HOLD', current_price, 0, "규칙: 판단 불가")
+
+    def get_stats(self) -> Dict:
+        return self.prefilter.get_stats()
+
+class GPTSignalSource:
+    """GPTAnalyzer.request_analysis 경로 그대로 (사전 판단 → LLM → 검증)
+
+    LLM 은 주입된 클라이언트(기본: StubBackend)를 사용하고 응답 캐시는 쓰지 않습니다.
+    분석 중 예외가 나면 신호 없음(None)이 아닌 SignalSourceError 로 실행을 중단합니다.
+    """
+
+    name = 'gpt'
+
+    def __init__(self, gpt_analyzer, timeframe: str = '1h'):
+        self.gpt_analyzer = gpt_analyzer
+        self.timeframe = timeframe
+
+    @classmethod
+    def with_stub(cls, timeframe: str = '1h') -> 'GPTSignalSource':
+        """StubBackend 로 구성 (속도 제한 없음, 실제 API 호출 없음)"""
+        from ai.gpt_analyzer import GPTAnalyzer
+        from ai.analysis_cache import AnalysisCache
+        from ai.llm_client import LLMClient, StubBackend
+
+        analyzer = GPTAnalyzer()
+        analyzer.llm_client = LLMClient(
+            StubBackend(), requests_per_minute=1_000_000, burst=1_000_000, max_retries=0, stream=False
+        )
+        analyzer.analysis_cache = AnalysisCache()
+        analyzer.analysis_cache.enabled = False
+        return cls(analyzer, timeframe)
+
+    async def analyze(self, prepared: Dict, current_price: float, timestamp: int) -> Optional[Dict]:
+        # request_analysis 는 예외를 None 으로 돌려주므로 오류 횟수로 구분
+        errors = self.gpt_analyzer.error_count
+        analysis = await self.gpt_analyzer.request_analysis(self.timeframe, prepared, use_cache=False)
+        if self.gpt_analyzer.error_count > errors:
+            raise SignalSourceError(f"GPT 분석 오류 (봉 {timestamp})")
+        return analysis
+
+    def get_stats(self) -> Dict:
+        return {
+            'prefilter': self.gpt_analyzer.prefilter.get_stats(),
+            'validator': self.gpt_analyzer.signal_validator.get_stats()
+        }
+
+class RecordedSignalSource:
+    """기록된 LLM 판단 재생 (ReplayDataset, LLM 재호출 없음)
+
+    봉이 진행되는 동안 기록된 마지막 판단을 봉 마감 시점에 사용하고,
+    누락된 값은 실시간과 같은 SignalValidator 로 보정합니다.
+    신뢰도가 기록되지 않은 판단(로그 기록)은 당시 신뢰도 기준을 통과한 것으로 봅니다.
+    """
+
+    name = 'replay'
+
+    def __init__(self, dataset, timeframe: str = '1h', bar_minutes: int = 60):
+        self.dataset = dataset
+        self.bar_ms = int(bar_minutes) * 60_000
+        self.rows = np.flatnonzero(np.asarray(dataset.column('timeframe')) == dataset.timeframe_code(timeframe))
+        self.timestamps = np.asarray(dataset.column('timestamp'))[self.rows]
+        self.validator = SignalValidator({'repair_attempts': 0})
+        self.replayed_count = 0
+        self.rejected_count = 0
+
+    @classmethod
+    def from_path(cls, path: str = None, timeframe: str = '1h') -> 'RecordedSignalSource':
+        from .replay_dataset import ReplayDataset, ReplayDatasetBuilder
+
+        settings = config.load_json_config('backtest_config.json')
+        dataset = ReplayDataset.open(path or ReplayDatasetBuilder().dataset_dir)
+        return cls(dataset, timeframe, settings.get('bar_minutes', 60))
+
+    async def analyze(self, prepared: Dict, current_price: float, timestamp: int) -> Optional[Dict]:
+        start = np.searchsorted(self.timestamps, timestamp, 'left')
+        end = np.searchsorted(self.timestamps, timestamp + self.bar_ms, 'left')
+        if end <= start:
+            return None
+
+        analysis = self.dataset.analysis(int(self.rows[end - 1]))
+        if analysis['market_summary']['confidence'] is None:
+            analysis['market_summary']['confidence'] = trading_config.min_confidence
+        result, issues, fatal = self.validator.validate(analysis, current_price)
+        if fatal:
+            self.rejected_count += 1
+            return None
+        self.replayed_count += 1
+        return result
+
+    def get_stats(self) -> Dict:
+        return {
+            'decisions': int(self.rows.size),
+            'replayed': self.replayed_count,
+            'rejected': self.rejected_count,
+            'validator': self.validator.get_stats()
+        }
+
+SIGNAL_SOURCES = {
+    'rule': RuleSignalSource,
+    'stub': GPTSignalSource.with_stub,
+    'replay': RecordedSignalSource.from_path
+}
@@ -0,0 +1,373 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def bar_path(open_: float, high: float, low: float, close: float, steps: int = 4) -> np.ndarray:
+    """봉 내부 가격 경로 근사 (양봉: 시가 → 저가 → 고가 → 종가, 음봉: 시가 → 고가 → 저가 → 종가, 구간마다 steps 등분)"""
+    points = [open_, low, high, close] if close >= open_ else [open_, high, low, close]
+    legs = [np.linspace(start, end, steps + 1)[1:] for start, end in zip(points, points[1:])]
+    return np.concatenate([[open_], *legs])
+
+class InsufficientMargin(Exception):
+    """증거금 부족 (실거래소의 주문 거부에 해당)"""
+
+class SimulatedExchange:
+    """백테스트용 모의 거래소 (단일 심볼, 단방향 포지션)
+
+    OrderService 가 사용하는 ccxt 메서드(fetch_open_orders, cancel_all_orders,
+    create_order, set_leverage)를 같은 시그니처로 제공합니다.
+    - 지정가 주문은 즉시 체결: 현재가를 넘는 (즉시 체결 가능한) 지정가는 현재가에 테이커 수수료,
+      그 외에는 주문가에 메이커 수수료 / 시장가는 슬리피지 + 테이커 수수료
+    - 다음 봉부터 봉의 고가/저가로 손절/익절/청산가 도달 여부 확인 (같은 봉에서 둘 다 닿으면 손절 우선)
+    - 청산 실행기용 trading-stop(손절가 변경, 부분 익절)과 봉 내부 틱 재생(begin_bar/on_tick/end_bar) 지원
+    - 펀딩비는 8시간마다 포지션 가치 기준으로 정산
+    - 청산 손익에는 진입/청산 수수료와 보유 중 펀딩비가 포함됩니다 (거래소 closedPnl 과 동일)
+    """
+
+    DEFAULT_SETTINGS = {
+        'initial_balance': 10000.0,
+        'maker_fee': 0.0002,
+        'taker_fee': 0.00055,
+        'slippage': 0.0002,            # 시장가/트리거 체결 슬리피지 비율
+        'funding_rate': 0.0001,        # 8시간당 (데이터에 funding_rate 열이 있으면 그 값 사용)
+        'funding_hours': [0, 8, 16],   # UTC
+        'maintenance_margin': 0.005
+    }
+
+    def __init__(self, settings: Dict = None, symbol: str = 'BTCUSDT'):
+        options = {**self.DEFAULT_SETTINGS, **(settings or {})}
+        self.symbol = symbol
+        self.maker_fee = float(options['maker_fee'])
+        self.taker_fee = float(options['taker_fee'])
+        self.slippage = float(options['slippage'])
+        self.funding_rate = float(options['funding_rate'])
+        self.funding_hours = set(options['funding_hours'])
+        self.maintenance_margin = float(options['maintenance_margin'])
+
+        self.initial_balance = float(options['initial_balance'])
+        self.wallet = self.initial_balance
+        self.leverage = 1
+        self.position: Optional[Dict] = None
+        self.closed_trades: List[Dict] = []
+        self.fees_paid = 0.0
+        self.funding_paid = 0.0
+        self.liquidations = 0
+        self.trading_stop_requests = 0
+
+        self.price = 0.0
+        self.timestamp = 0
+
+    # ---- 봉 진행 ----
+
+    def on_bar(self, timestamp: int, open_: float, high: float, low: float, close: float,
+               funding_rate: float = None, bar_ms: int = 3_600_000):
+        """새 봉 처리: 펀딩 정산 → 손절/익절/청산 트리거 → 종가/마감 시각으로 갱신
+
+        Args:
+            timestamp: 봉 시작 시각 (ms)
+        """
+        self.begin_bar(timestamp, open_, funding_rate)
+        if self.position:
+            self._check_triggers(open_, high, low)
+        # 이후 주문은 봉 마감 시점에 체결
+        self.end_bar(close, timestamp + bar_ms)
+
+    def begin_bar(self, timestamp: int, open_: float, funding_rate: float = None):
+        """봉 시작: 시가/시각 갱신, 펀딩 시각이면 정산"""
+        self.timestamp = timestamp
+        self.price = open_
+        if self.position and timestamp % 3_600_000 == 0 and (timestamp // 3_600_000) % 24 in self.funding_hours:
+            self._settle_funding(open_, self.funding_rate if funding_rate is None else funding_rate)
+
+    def on_tick(self, price: float, timestamp: int = None):
+        """봉 내부 가격 한 틱: 직전 틱에서 이 가격까지 지나간 구간으로 트리거 확인"""
+        previous = self.price
+        if timestamp is not None:
+            self.timestamp = timestamp
+        if self.position:
+            self._check_triggers(previous, max(previous, price), min(previous, price))
+        self.price = price
+
+    def end_bar(self, close: float, timestamp: int):
+        """봉 마감: 종가/마감 시각으로 갱신"""
+        self.price = close
+        self.timestamp = timestamp
+
+    def _settle_funding(self, price: float, rate: float):
+        position = self.position
+        # 양수 펀딩비는 롱이 숏에게 지급
+        payment = position['size'] * price * rate * (1 if position['side'] == 'Long' else -1)
+        self.wallet -= payment
+        position['funding'] += payment
+        self.funding_paid += payment
+
+    def _check_triggers(self, open_: float, high: float, low: float):
+        position = self.position
+        is_long = position['side'] == 'Long'
+        stop = position['stop_loss']
+        liquidation = self.liquidation_price(position)
+        # 손절가보다 청산가에 먼저 닿는 경우 청산
+        if not stop or (stop < liquidation if is_long else stop > liquidation):
+            stop, stop_reason = liquidation, 'liquidation'
+        else:
+            stop_reason = 'stop_loss'
+        take_profit = position['take_profit']
+
+        if is_long:
+            stop_hit = low <= stop
+            tp_hit = bool(take_profit) and high >= take_profit
+            # 갭으로 트리거 가격을 지나쳐 시작하면 시가 체결
+            stop_fill, tp_fill = min(stop, open_), max(take_profit or 0, open_)
+        else:
+            stop_hit = high >= stop
+            tp_hit = bool(take_profit) and low <= take_profit
+            stop_fill, tp_fill = max(stop, open_), min(take_profit or float('inf'), open_)
+
+        if stop_hit:
+            if stop_reason == 'liquidation':
+                # 격리 증거금이므로 갭이 있어도 청산가로 정리
+                self.liquidations += 1
+                self._close(position['size'], liquidation, self.taker_fee, 'liquidation')
+            else:
+                self._close(position['size'], self._slipped(stop_fill, not is_long), self.taker_fee, 'stop_loss')
+            return
+
+        # 부분 익절 (tpslMode=Partial) 후 남은 수량에 전량 익절 확인
+        partial = position['partial_take_profit']
+        if partial and (high >= partial if is_long else low <= partial):
+            fill = max(partial, open_) if is_long else min(partial, open_)
+            size = min(position['partial_size'], position['size'])
+            position['partial_take_profit'] = 0.0
+            self._close(size, self._slipped(fill, not is_long), self.taker_fee, 'take_profit1')
+            if not self.position:
+                return
+        if tp_hit:
+            self._close(position['size'], self._slipped(tp_fill, not is_long), self.taker_fee, 'take_profit')
+
+    def liquidation_price(self, position: Dict) -> float:
+        """격리 증거금 기준 청산가 (증거금 - 유지 증거금 만큼 손실)"""
+        offset = 1 / position['leverage'] - self.maintenance_margin
+        if position['side'] == 'Long':
+            return position['entry_price'] * (1 - offset)
+        return position['entry_price'] * (1 + offset)
+
+    def close_all(self, reason: str = 'end'):
+        """백테스트 종료 시 남은 포지션 정리"""
+        if self.position:
+            is_long = self.position['side'] == 'Long'
+            self._close(self.position['size'], self._slipped(self.price, not is_long), self.taker_fee, reason)
+
+    # ---- ccxt 호환 메서드 ----
+
+    async def fetch_open_orders(self, symbol: str = None, params: Dict = None) -> List[Dict]:
+        # 지정가 주문은 즉시 체결되므로 미체결 주문이 남지 않음
+        return []
+
+    async def cancel_all_orders(self, symbol: str = None, params: Dict = None) -> List[Dict]:
+        return []
+
+    async def set_leverage(self, leverage: int, symbol: str = None, params: Dict = None):
+        self.leverage = int(leverage)
+
+    async def private_post_v5_position_trading_stop(self, params: Dict) -> Dict:
+        """포지션 손절/익절 변경 (Full: 전체 손절/익절가, 없는 값은 유지 / Partial: 일부 수량 익절)"""
+        self.trading_stop_requests += 1
+        position = self.position
+        if not position:
+            return {'retCode': '10001', 'retMsg': 'can not set tp/sl/ts for zero position'}
+        if params.get('tpslMode') == 'Partial':
+            position['partial_take_profit'] = float(params['takeProfit'])
+            position['partial_size'] = float(params['tpSize'])
+        else:
+            if params.get('stopLoss') is not None:
+                position['stop_loss'] = float(params['stopLoss'] or 0)
+            if params.get('takeProfit') is not None:
+                position['take_profit'] = float(params['takeProfit'] or 0)
+        return {'retCode': '0', 'retMsg': 'OK'}
+
+    async def create_order(self, symbol: str, side: str, type: str, amount: float,
+                           price: float = None, params: Dict = None) -> Dict:
+        """주문 체결 (지정가는 주문가 또는 더 유리한 현재가, 시장가는 현재가 + 슬리피지)"""
+        params = params or {}
+        is_buy = side.upper() == 'BUY'
+        if type == 'market':
+            fill_price, fee_rate = self._slipped(self.price, is_buy), self.taker_fee
+        elif float(price) >= self.price if is_buy else float(price) <= self.price:
+            fill_price, fee_rate = self.price, self.taker_fee
+        else:
+            fill_price, fee_rate = float(price), self.maker_fee
+        amount = float(amount)
+
+        position = self.position
+        if position and (position['side'] == 'Long') != is_buy:
+            # 반대 방향: 감소/청산, 남는 수량은 반대 포지션으로 (reduceOnly 면 버림)
+            closing = min(amount, position['size'])
+            self._close(closing, fill_price, fee_rate, 'signal')
+            amount -= closing
+            if amount <= 0 or params.get('reduceOnly'):
+                return self._order_result(side, type, closing, fill_price)
+
+        if params.get('reduceOnly'):
+            return self._order_result(side, type, 0.0, fill_price)
+
+        self._open(is_buy, amount, fill_price, fee_rate, params)
+        return self._order_result(side, type, amount, fill_price)
+
+    def _order_result(self, side: str, type: str, amount: float, price: float) -> Dict:
+        return {
+            'id': f"sim-{self.timestamp}-{len(self.closed_trades)}",
+            'symbol': self.symbol,
+            'side': side.lower(),
+            'type': type,
+            'amount': amount,
+            'price': price,
+            'status': 'closed',
+            'timestamp': self.timestamp
+        }
+
+    # ---- 포지션/잔고 ----
+
+    def _open(self, is_buy: bool, amount: float, price: float, fee_rate: float, params: Dict):
+        margin = amount * price / self.leverage
+        fee = amount * price * fee_rate
+        if margin + fee > self.available_balance():
+            raise InsufficientMargin(
+                f"증거금 부족 (필요: {margin + fee:,.2f}, 가용: {self.available_balance():,.2f})"
+            )
+        self.wallet -= fee
+        self.fees_paid += fee
+
+        position = self.position
+        if position:
+            # 같은 방향 추가 진입: 평균 단가, 증거금 합산
+            total = position['size'] + amount
+            position['entry_price'] = (position['entry_price'] * position['size'] + price * amount) / total
+            position['size'] = total
+            position['margin'] += margin
+            position['fees'] += fee
+            position['leverage'] = self.leverage
+        else:
+            self.position = {
+                'side': 'Long' if is_buy else 'Short',
+                'size': amount,
+                'entry_price': price,
+                'leverage': self.leverage,
+                'margin': margin,
+                'stop_loss': 0.0,
+                'take_profit': 0.0,
+                'partial_take_profit': 0.0,
+                'partial_size': 0.0,
+                'fees': fee,
+                'funding': 0.0,
+                'opened_at': self.timestamp
+            }
+        if params.get('stopLoss'):
+            self.position['stop_loss'] = float(params['stopLoss'])
+        if params.get('takeProfit'):
+            self.position['take_profit'] = float(params['takeProfit'])
+
+    def _close(self, size: float, price: float, fee_rate: float, reason: str):
+        """포지션 (일부) 청산 후 거래 기록"""
+        position = self.position
+        ratio = size / position['size']
+        direction = 1 if position['side'] == 'Long' else -1
+        gross = (price - position['entry_price']) * size * direction
+        fee = size * price * fee_rate
+        # 진입 수수료/펀딩비는 청산 비율만큼 배분
+        entry_fee = position['fees'] * ratio
+        funding = position['funding'] * ratio
+
+        self.wallet += gross - fee
+        self.fees_paid += fee
+
+        self.closed_trades.append({
+            'timestamp': self.timestamp,
+            'opened_at': position['opened_at'],
+            'position_side': position['side'],
+            'side': 'Sell' if position['side'] == 'Long' else 'Buy',
+            'size': size,
+            'entry_price': position['entry_price'],
+            'exit_price': price,
+            'leverage': position['leverage'],
+            'pnl': gross - fee - entry_fee - funding,
+            'fees': fee + entry_fee,
+            'funding': funding,
+            'reason': reason
+        })
+
+        if ratio >= 1 - 1e-9:
+            self.position = None
+        else:
+            position['size'] -= size
+            position['margin'] *= 1 - ratio
+            position['fees'] -= entry_fee
+            position['funding'] -= funding
+
+    def _slipped(self, price: float, is_buy: bool) -> float:
+        return price * (1 + self.slippage if is_buy else 1 - self.slippage)
+
+    def unrealized_pnl(self) -> float:
+        position = self.position
+        if not position:
+            return 0.0
+        direction = 1 if position['side'] == 'Long' else -1
+        return (self.price - position['entry_price']) * position['size'] * direction
+
+    def equity(self) -> float:
+        return self.wallet + self.unrealized_pnl()
+
+    def used_margin(self) -> float:
+        return self.position['margin'] if self.position else 0.0
+
+    def available_balance(self) -> float:
+        return self.equity() - self.used_margin()
+
+class SimulatedBybitClient:
+    """OrderService 에 넘기는 BybitClient 대용 (exchange 속성만 사용)"""
+
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+
+class SimulatedPositionService:
+    """PositionService.get_position 과 같은 형식으로 모의 포지션 반환"""
+
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+
+    async def get_position(self, symbol: str = None) -> Dict:
+        position = self.exchange.position
+        if not position or (symbol and symbol != self.exchange.symbol):
+            return {}
+        return {
+            'symbol': 'BTC/USDT:USDT',
+            'side': position['side'],
+            'size': position['size'],
+            'leverage': position['leverage'],
+            'entryPrice': position['entry_price'],
+            'entry_price': position['entry_price'],
+            'markPrice': self.exchange.price,
+            'unrealisedPnl': self.exchange.unrealized_pnl(),
+            'stopLoss': position['stop_loss'],
+            'takeProfit': position['take_profit']
+        }
+
+class SimulatedBalanceService:
+    """BalanceService.get_balance 와 같은 형식으로 모의 잔고 반환"""
+
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+
+    async def get_balance(self) -> Dict:
+        return {
+            'timestamp': self.exchange.timestamp,
+            'currencies': {
+                'USDT': {
+                    'total_equity': self.exchange.equity(),
+                    'used_margin': self.exchange.used_margin(),
+                    'available_balance': self.exchange.available_balance()
+                }
+            }
+        }
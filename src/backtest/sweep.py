@@ -0,0 +1,457 @@
+"""전략 파라미터 스윕 (그리드/랜덤 탐색, 전체 코어 병렬 백테스트)
+
+사용법 (src 디렉토리에서):
+    python -m backtest.sweep <봉 데이터.csv|json> [--mode grid|random] [--samples 200] [--workers 0]
+                             [--metric return_pct] [--top 10] [--fresh]
+
+탐색 범위는 config/data/sweep_config.json 의 parameters 에 "영역.키" 형식으로 지정합니다.
+    trading.*     trading_config 속성 (예: trading.min_confidence, trading.leverage_settings.max_difference)
+    indicators.*  TechnicalIndicators 설정 (예: indicators.bb_std, indicators.rsi_overbought)
+    prefilter.*   규칙 신호 소스 설정 (예: prefilter.consensus.min_strength, rule 소스만 해당)
+    backtest.*    backtest_config 덮어쓰기 (예: backtest.exchange.taker_fee)
+값은 목록 또는 {"min", "max", "step"} 범위 (랜덤 탐색에서 step 이 없으면 연속 구간)입니다.
+
+완료된 조합은 체크포인트(JSONL)에 바로 기록되어, 중단 후 다시 실행하면 남은 조합만 계산합니다.
+metric 앞에 '-' 를 붙이면 낮을수록 좋은 값으로 정렬합니다 (예: -max_drawdown_pct).
+"""
+import os
+import sys
+import copy
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import itertools
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from config.trading_config import trading_config
+from indicators.technical import TechnicalIndicators
+from .engine import BacktestEngine, load_klines
+from .signal_sources import RuleSignalSource, GPTSignalSource, RecordedSignalSource
+
+logger = logging.getLogger(__name__)
+
+NAMESPACES = ('trading', 'indicators', 'prefilter', 'backtest')
+
+BASE_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'funding_rate']
+
+# 작업 프로세스 상태 (초기화 시 공유 메모리 연결)
+_worker: Dict[str, Any] = {}
+
+class SharedArrays:
+    """배열을 공유 메모리에 올려 작업 프로세스에서 복사 없이 참조"""
+
+    def __init__(self):
+        self.blocks: List[shared_memory.SharedMemory] = []
+
+    def share(self, array: np.ndarray) -> Dict:
+        """배열 복사 후 연결 정보 반환 (이름, 모양, 자료형)"""
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        self.blocks.append(block)
+        return {'name': block.name, 'shape': list(array.shape), 'dtype': array.dtype.str}
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+def _attach(descriptor: Dict) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=descriptor['name'])
+    # 배열이 버퍼를 참조하는 동안 블록이 닫히지 않도록 보관
+    _worker.setdefault('blocks', []).append(block)
+    return np.ndarray(tuple(descriptor['shape']), dtype=np.dtype(descriptor['dtype']), buffer=block.buf)
+
+def _init_worker(base: Dict, frames: Dict[str, Dict], source: str, settings: Dict, quiet_loggers: List[str]):
+    """작업 프로세스 초기화: 공유 배열 연결, 봉 목록 구성, trading_config 기준값 보관"""
+    for name in quiet_loggers:
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    timestamps = _attach(base['timestamps'])
+    values = _attach(base['values'])
+    _worker['klines'] = [
+        {'timestamp': timestamp, **dict(zip(BASE_COLUMNS, row))}
+        for timestamp, row in zip(timestamps.tolist(), values.tolist())
+    ]
+    _worker['index'] = pd.to_datetime(timestamps, unit='ms')
+    _worker['frames'] = frames
+    _worker['dataframes'] = {}
+    _worker['source'] = source
+    _worker['settings'] = settings
+    _worker['trading'] = copy.deepcopy({key: value for key, value in vars(trading_config).items() if key != 'bybit'})
+
+def _indicator_frame(key: str) -> pd.DataFrame:
+    """공유 메모리의 지표 배열을 DataFrame 으로 감쌈 (작업 프로세스마다 한 번)"""
+    dataframes = _worker['dataframes']
+    if key not in dataframes:
+        frame = _worker['frames'][key]
+        df = pd.DataFrame(_attach(frame['values']), index=_worker['index'], columns=frame['columns'], copy=False)
+        # 범주 코드 → 문자열 (코드 -1 은 None)
+        codes = _attach(frame['codes'])
+        for j, (column, labels) in enumerate(frame['labels'].items()):
+            df[column] = np.asarray(labels + [None], dtype=object)[codes[:, j]]
+        dataframes[key] = df
+    return dataframes[key]
+
+def _run_job(params: Dict) -> Dict:
+    """조합 하나 백테스트 (작업 프로세스에서 실행)"""
+    try:
+        groups = split_params(params)
+
+        # 이전 조합의 덮어쓰기를 지우고 이번 조합 적용
+        for key, value in copy.deepcopy(_worker['trading']).items():
+            setattr(trading_config, key, value)
+        apply_trading_overrides(groups['trading'])
+
+        if _worker['source'] == 'rule':
+            source = RuleSignalSource(groups['prefilter'])
+        elif _worker['source'] == 'replay':
+            source = RecordedSignalSource.from_path()
+        else:
+            source = GPTSignalSource.with_stub()
+
+        engine = BacktestEngine(
+            _worker['klines'], source,
+            _merge(_worker['settings'], groups['backtest']),
+            TechnicalIndicators(groups['indicators'])
+        )
+        report = asyncio.run(engine.run(_indicator_frame(indicator_key(groups['indicators']))))
+        if report is None:
+            return {'key': param_key(params), 'params': params, 'error': '백테스트 실패'}
+
+        summary = {key: value for key, value in report['summary'].items() if key != 'elapsed'}
+        return {'key': param_key(params), 'params': params, 'summary': summary, 'stats': report['stats']}
+
+    except Exception as e:
+        return {'key': param_key(params), 'params': params, 'error': str(e), 'traceback': traceback.format_exc()}
+
+def param_key(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True)
+
+def indicator_key(settings: Dict) -> str:
+    return json.dumps(settings, sort_keys=True)
+
+def split_params(params: Dict) -> Dict[str, Dict]:
+    """'영역.키' 파라미터를 영역별 설정으로 분리 (trading 은 경로 그대로)"""
+    groups = {namespace: {} for namespace in NAMESPACES}
+    for name, value in params.items():
+        namespace, _, path = name.partition('.')
+        if namespace not in groups or not path:
+            raise ValueError(f"알 수 없는 파라미터: {name}")
+        if namespace == 'trading':
+            groups['trading'][path] = value
+        else:
+            _set_path(groups[namespace], path.split('.'), value)
+    return groups
+
+def apply_trading_overrides(overrides: Dict):
+    """trading_config 속성 덮어쓰기 (예: leverage_settings.max_difference)"""
+    for path, value in overrides.items():
+        keys = path.split('.')
+        if not hasattr(trading_config, keys[0]):
+            raise ValueError(f"알 수 없는 trading 설정: {path}")
+        if len(keys) == 1:
+            setattr(trading_config, keys[0], value)
+            continue
+        target = getattr(trading_config, keys[0])
+        for key in keys[1:-1]:
+            target = target[key]
+        target[keys[-1]] = value
+
+def _set_path(target: Dict, keys: List[str], value):
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+def _merge(base: Dict, overrides: Dict) -> Dict:
+    merged = dict(base)
+    for key, value in overrides.items():
+        merged[key] = _merge(merged.get(key, {}), value) if isinstance(value, dict) else value
+    return merged
+
+def _range_values(spec: Dict) -> List:
+    start, stop, step = spec['min'], spec['max'], spec['step']
+    count = int(round((stop - start) / step)) + 1
+    values = [start + step * i for i in range(count)]
+    if all(isinstance(v, int) for v in (start, stop, step)):
+        return values
+    return [round(value, 10) for value in values]
+
+def grid_candidates(parameters: Dict) -> List[Dict]:
+    """전체 조합 (범위는 step 간격으로 전개)"""
+    names = list(parameters)
+    values = [_range_values(spec) if isinstance(spec, dict) else list(spec) for spec in parameters.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def random_candidates(parameters: Dict, samples: int, seed: int) -> List[Dict]:
+    """무작위 조합 (중복 제외, step 없는 범위는 연속 구간에서 추출)"""
+    rng = random.Random(seed)
+    candidates, seen = [], set()
+    for _ in range(samples * 20):
+        if len(candidates) >= samples:
+            break
+        params = {}
+        for name, spec in parameters.items():
+            if isinstance(spec, dict) and 'step' not in spec:
+                params[name] = round(rng.uniform(spec['min'], spec['max']), 4)
+            else:
+                params[name] = rng.choice(_range_values(spec) if isinstance(spec, dict) else list(spec))
+        key = param_key(params)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+def metric_value(result: Dict, metric: str) -> Optional[float]:
+    """요약 또는 거래 통계에서 정렬 기준 값"""
+    name = metric.lstrip('-')
+    value = result.get('summary', {}).get(name, result.get('stats', {}).get(name))
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(value) else value
+
+def rank_results(results: List[Dict], metric: str) -> List[Dict]:
+    """정렬 기준 값으로 순위 (값이 없는 결과는 제외)"""
+    descending = not metric.startswith('-')
+    scored = [(metric_value(result, metric), result) for result in results]
+    scored = [(value, result) for value, result in scored if value is not None]
+    scored.sort(key=lambda item: item[0], reverse=descending)
+    return [{**result, 'rank': rank, 'score': value} for rank, (value, result) in enumerate(scored, 1)]
+
+class ParameterSweep:
+    """전략 파라미터 스윕
+
+    - 봉 배열과 지표 조합별 계산 결과는 부모 프로세스에서 한 번 만들어 공유 메모리로 전달
+    - 조합마다 BacktestEngine 을 ProcessPoolExecutor 작업 프로세스에서 실행
+    - 결과는 완료 즉시 체크포인트에 추가하고, 끝나면 순위 보고서 저장
+    """
+
+    DEFAULT_SETTINGS = {
+        'mode': 'grid',             # grid | random
+        'samples': 200,             # 랜덤 탐색 조합 수
+        'seed': 42,
+        'workers': 0,               # 0 이면 전체 코어
+        'source': 'rule',           # rule | stub | replay
+        'metric': 'return_pct',
+        'top': 10,
+        'checkpoint': 'sweep_checkpoint.jsonl',
+        'report': 'sweep_report.json',
+        'parameters': {}
+    }
+
+    def __init__(self, klines: List[Dict], settings: Dict = None, backtest_settings: Dict = None):
+        if settings is None:
+            settings = config.load_json_config('sweep_config.json')
+        self.options = {**self.DEFAULT_SETTINGS, **settings}
+        self.klines = klines
+        self.backtest_settings = (
+            backtest_settings if backtest_settings is not None else config.load_json_config('backtest_config.json')
+        )
+        self.workers = int(self.options['workers']) or os.cpu_count() or 1
+        self.metric = self.options['metric']
+        self.checkpoint_path = self.options['checkpoint']
+
+    def candidates(self) -> List[Dict]:
+        parameters = self.options['parameters']
+        if self.options['mode'] == 'random':
+            return random_candidates(parameters, int(self.options['samples']), int(self.options['seed']))
+        return grid_candidates(parameters)
+
+    def run(self, fresh: bool = False, quiet_loggers: List[str] = ()) -> Optional[Dict]:
+        """스윕 실행 후 보고서 반환 (체크포인트에 있는 조합은 건너뜀)"""
+        shared = SharedArrays()
+        try:
+            started = time.perf_counter()
+            candidates = self.candidates()
+            if not candidates:
+                logger.error("스윕할 파라미터 조합이 없습니다")
+                return None
+            # 파라미터 이름 확인 (모든 조합이 같은 이름을 가짐)
+            split_params(candidates[0])
+
+            if fresh and os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+            done = self._load_checkpoint()
+            pending = [params for params in candidates if param_key(params) not in done]
+            logger.info(f"스윕 시작: {len(candidates)}개 조합 (완료 {len(candidates) - len(pending)}, "
+                        f"남은 조합 {len(pending)}, 작업 프로세스 {self.workers}개)")
+
+            failed = 0
+            if pending:
+                base, frames = self._share_arrays(shared, pending)
+                failed = self._execute(pending, done, base, frames, list(quiet_loggers))
+
+            keys = {param_key(params) for params in candidates}
+            results = [result for key, result in done.items() if key in keys]
+            report = {
+                'mode': self.options['mode'],
+                'source': self.options['source'],
+                'metric': self.metric,
+                'candidates': len(candidates),
+                'completed': len(results),
+                'failed': failed,
+                'workers': self.workers,
+                'elapsed': time.perf_counter() - started,
+                'results': rank_results(results, self.metric)
+            }
+            if self.options.get('report'):
+                with open(self.options['report'], 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+            return report
+
+        except Exception as e:
+            logger.error(f"파라미터 스윕 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+        finally:
+            shared.close()
+
+    def _share_arrays(self, shared: SharedArrays, pending: List[Dict]):
+        """봉 배열과 지표 설정별 지표 배열을 공유 메모리에 올림"""
+        timestamps = np.array([bar['timestamp'] for bar in self.klines], dtype=np.int64)
+        values = np.array(
+            [[bar.get(column, np.nan) for column in BASE_COLUMNS] for bar in self.klines], dtype=np.float64
+        )
+        base = {'timestamps': shared.share(timestamps), 'values': shared.share(values)}
+
+        frames = {}
+        bars = [{key: bar[key] for key in ('timestamp', 'open', 'high', 'low', 'close', 'volume')} for bar in self.klines]
+        for params in pending:
+            settings = split_params(params)['indicators']
+            key = indicator_key(settings)
+            if key in frames:
+                continue
+            df = TechnicalIndicators(settings).calculate_indicators(bars)
+            if df is None:
+                raise ValueError(f"지표 계산 실패: {key}")
+            numeric = df.select_dtypes(include='number').astype(np.float64)
+            # 문자열 열(추세/다이버전스 종류·설명)은 범주 코드로 공유하고 작업 프로세스에서 복원
+            labels, codes = {}, []
+            for column in df.columns:
+                if column not in numeric.columns:
+                    column_codes, categories = pd.factorize(df[column])
+                    labels[column] = categories.tolist()
+                    codes.append(column_codes)
+            codes = np.column_stack(codes) if codes else np.empty((len(df), 0), dtype=np.int64)
+            frames[key] = {
+                'columns': list(numeric.columns),
+                'values': shared.share(numeric.to_numpy()),
+                'labels': labels,
+                'codes': shared.share(codes)
+            }
+        logger.info(f"공유 메모리: 봉 {len(self.klines):,}개, 지표 조합 {len(frames)}개")
+        return base, frames
+
+    def _execute(self, pending: List[Dict], done: Dict[str, Dict], base: Dict, frames: Dict,
+                 quiet_loggers: List[str]) -> int:
+        """작업 프로세스에 분배, 완료 순서대로 체크포인트 기록 (실패 수 반환)"""
+        failed = 0
+        step = max(len(pending) // 20, 1)
+        # spawn: 부모 프로세스의 스레드(스토리지 I/O 풀, 분석 기록 워커 등)가 없는 상태로 복제되어
+        # 작업 프로세스에서 run_io 가 끝나지 않는 문제를 피함
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint, ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(base, frames, self.options['source'], self.backtest_settings, quiet_loggers)
+        ) as executor:
+            futures = [executor.submit(_run_job, params) for params in pending]
+            for count, future in enumerate(as_completed(futures), 1):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"스윕 작업 실행 중 오류: {str(e)}")
+                    continue
+
+                if 'error' in result:
+                    failed += 1
+                    logger.error(f"조합 백테스트 실패 ({result['key']}): {result['error']}")
+                else:
+                    done[result['key']] = result
+                    checkpoint.write(json.dumps(result, ensure_ascii=False) + '\n')
+                    checkpoint.flush()
+
+                if count % step == 0 or count == len(pending):
+                    logger.info(f"스윕 진행: {count}/{len(pending)} (실패 {failed})")
+        return failed
+
+    def _load_checkpoint(self) -> Dict[str, Dict]:
+        done = {}
+        if not os.path.exists(self.checkpoint_path):
+            return done
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    # 중단 시 마지막 줄이 잘릴 수 있음
+                    continue
+                done[result['key']] = result
+        return done
+
+def format_report(report: Dict, top: int = 10) -> str:
+    lines = [
+        f"🔎 파라미터 스윕 ({report['mode']}, {report['source']}, {report['candidates']:,}개 조합, "
+        f"작업 프로세스 {report['workers']}개, {report['elapsed']:.1f}초)",
+        f"• 완료: {report['completed']:,} / 실패: {report['failed']:,} / 기준: {report['metric']}"
+    ]
+    for result in report['results'][:top]:
+        summary, stats = result['summary'], result['stats']
+        params = ', '.join(f"{name}={value}" for name, value in result['params'].items())
+        lines.append(
+            f"{result['rank']}. {result['score']:.2f} | 수익률 {summary['return_pct']:+.2f}% | "
+            f"MDD {summary['max_drawdown_pct']:.2f}% | 거래 {stats.get('total_trades', 0)}회 | "
+            f"승률 {stats.get('win_rate', 0):.1f}% | {params}"
+        )
+    return "\n".join(lines)
+
+def main(args) -> int:
+    from .run import QUIET_LOGGERS
+
+    settings = config.load_json_config('sweep_config.json')
+    overrides = {
+        'mode': args.mode, 'samples': args.samples, 'workers': args.workers, 'source': args.source,
+        'metric': args.metric, 'top': args.top, 'checkpoint': args.checkpoint, 'report': args.report
+    }
+    settings = {**settings, **{key: value for key, value in overrides.items() if value is not None}}
+
+    sweep = ParameterSweep(load_klines(args.data), settings)
+    report = sweep.run(fresh=args.fresh, quiet_loggers=list(QUIET_LOGGERS))
+    if report is None:
+        print("파라미터 스윕 실패")
+        return 1
+    print(format_report(report, int(sweep.options['top'])))
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='전략 파라미터 스윕')
+    parser.add_argument('data', help='봉 데이터 파일 (CSV 또는 JSON)')
+    parser.add_argument('--mode', choices=['grid', 'random'], help='탐색 방식')
+    parser.add_argument('--samples', type=int, help='랜덤 탐색 조합 수')
+    parser.add_argument('--workers', type=int, help='작업 프로세스 수 (0 이면 전체 코어)')
+    parser.add_argument('--source', choices=['rule', 'stub', 'replay'], help='신호 소스')
+    parser.add_argument('--metric', help="정렬 기준 (요약/통계 키, '-' 접두사는 낮을수록 좋음)")
+    parser.add_argument('--top', type=int, help='출력할 상위 조합 수')
+    parser.add_argument('--checkpoint', help='체크포인트 경로 (JSONL)')
+    parser.add_argument('--report', help='보고서 경로 (JSON)')
+    parser.add_argument('--fresh', action='store_true', help='체크포인트를 지우고 처음부터 실행')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    sys.exit(main(args))
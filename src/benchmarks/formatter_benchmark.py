@@ -0,0 +1,128 @@
+"""포맷터 마이크로 벤치마크
+
+사용법 (src 디렉토리에서):
+    python -m benchmarks.formatter_benchmark [이벤트 수]
+
+합성 이벤트로 각 포맷터의 메시지 생성 시간을 측정합니다.
+- miss: 매번 다른 이벤트 (템플릿 렌더링 비용)
+- hit: 같은 이벤트 반복 (여러 채팅방 전송 시 렌더 캐시 효과)
+"""
+import sys
+import time
+import random
+from typing import Callable, Dict, List
+
+from telegram_bot.formatters.analysis_formatter import AnalysisFormatter
+from telegram_bot.formatters.monitor_formatter import MonitorFormatter
+from telegram_bot.formatters.order_formatter import OrderFormatter
+from telegram_bot.formatters.stats_formatter import StatsFormatter
+from services.trade_analytics import compute_trade_stats
+
+DEFAULT_EVENTS = 20000
+
+def _order_event(i: int) -> Dict:
+    return {
+        'orderId': f'bench-{i}',
+        'symbol': 'BTCUSDT',
+        'orderType': random.choice(['Limit', 'Market']),
+        'side': random.choice(['Buy', 'Sell']),
+        'price': f"{random.uniform(60000, 70000):.1f}",
+        'qty': f"{random.uniform(0.001, 1):.3f}",
+        'leverage': random.randint(1, 10)
+    }
+
+def _position_event(i: int) -> Dict:
+    return {
+        'symbol': 'BTCUSDT',
+        'side': random.choice(['Buy', 'Sell']),
+        'size': f"{random.uniform(0.001, 1):.3f}",
+        'entryPrice': f"{random.uniform(60000, 70000):.1f}",
+        'leverage': str(random.randint(1, 10))
+    }
+
+def _analysis_event(i: int) -> Dict:
+    price = random.uniform(60000, 70000)
+    return {
+        'timestamp': 1700000000000 + i * 60000,
+        'market_summary': {
+            'market_phase': random.choice(['UPTREND', 'DOWNTREND', 'SIDEWAYS']),
+            'overall_sentiment': random.choice(['BULLISH', 'BEARISH', 'NEUTRAL']),
+            'short_sentiment': random.choice(['BULLISH', 'BEARISH', 'NEUTRAL']),
+            'volume_status': random.choice(['HIGH', 'NORMAL', 'LOW']),
+            'risk_level': random.choice(['HIGH', 'MEDIUM', 'LOW']),
+            'confidence': random.randint(0, 100)
+        },
+        'technical_analysis': {
+            'trend': random.choice(['UPTREND', 'DOWNTREND']),
+            'strength': random.randint(0, 100),
+            'indicators': {'rsi': random.uniform(0, 100), 'macd': 'BULLISH', 'bollinger': 'MIDDLE'},
+            'divergence': {'type': 'NONE', 'description': '없음'}
+        },
+        'trading_signals': {
+            'position_suggestion': random.choice(['BUY', 'SELL', 'HOLD']),
+            'entry_price': price,
+            'stop_loss': price * 0.98,
+            'take_profit1': price * 1.02,
+            'take_profit2': price * 1.04,
+            'leverage': random.randint(1, 10),
+            'position_size': random.randint(5, 30),
+            'reason': 'benchmark'
+        }
+    }
+
+def _closed_position(i: int) -> Dict:
+    return {
+        'side': random.choice(['Buy', 'Sell']),
+        'pnl': random.uniform(-50, 60),
+        'timestamp': 1700000000000 + i * 3600000
+    }
+
+def _time(label: str, func: Callable, events: List) -> float:
+    """이벤트 목록 포맷팅 시간 측정 (이벤트당 마이크로초)"""
+    start = time.perf_counter()
+    for event in events:
+        func(event)
+    elapsed = time.perf_counter() - start
+    per_event = elapsed / max(len(events), 1) * 1_000_000
+    print(f"  {label:<32} {elapsed * 1000:9.1f}ms  {per_event:8.2f}µs/건")
+    return per_event
+
+def run(count: int = DEFAULT_EVENTS):
+    """포맷터별 벤치마크 실행"""
+    random.seed(42)
+    orders = [_order_event(i) for i in range(count)]
+    positions = [_position_event(i) for i in range(count)]
+    analyses = [_analysis_event(i) for i in range(count)]
+    repeated_order = [orders[0]] * count
+    repeated_analysis = [analyses[0]] * count
+
+    monitor = MonitorFormatter()
+    analysis = AnalysisFormatter()
+    order = OrderFormatter()
+    stats = StatsFormatter()
+
+    print(f"📏 포맷터 벤치마크 ({count:,}건)")
+
+    print("MonitorFormatter")
+    _time("order_created (miss)", monitor.format_order_created, orders)
+    _time("order_created (hit)", monitor.format_order_created, repeated_order)
+    _time("position_update (miss)", monitor.format_position_update, positions)
+
+    print("AnalysisFormatter")
+    _time("format_analysis (miss)", analysis.format_analysis, analyses)
+    _time("format_analysis (hit)", analysis.format_analysis, repeated_analysis)
+
+    print("OrderFormatter")
+    _time("format_order", order.format_order, orders)
+
+    print("StatsFormatter")
+    period_stats = compute_trade_stats([_closed_position(i) for i in range(min(count, 2000))])
+    _time("format_period_stats", lambda s: stats.format_period_stats(s, '벤치마크'),
+          [period_stats] * min(count, 2000))
+
+    for name, formatter in (('monitor', monitor), ('analysis', analysis)):
+        cache = formatter._render_cache
+        print(f"🗃 {name} 렌더 캐시: hit {cache.hits:,} / miss {cache.misses:,}")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EVENTS)
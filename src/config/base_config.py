@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -33,6 +34,22 @@ class BaseConfig:
             logger.error(f"설정 파일 로드 중 오류: {str(e)}")
             return {}
             
+    async def load_json_config_async(self, filename: str) -> Dict:
+        """JSON 설정 파일 로드 (스토리지 I/O 스레드에서 실행)"""
+        filepath = self.config_dir / filename
+        if filepath in self._cache:
+            return self._cache[filepath]
+
+        from services.storage_io import run_io
+        return await run_io(self.load_json_config, filename)
+
+    async def preload_json_configs(self) -> int:
+        """설정 디렉토리의 JSON 파일을 미리 읽어 캐시 (이후 생성자의 동기 로드는 캐시에서 반환)"""
+        from services.storage_io import run_io
+        names = await run_io(lambda: sorted(path.name for path in self.config_dir.glob('*.json')))
+        await asyncio.gather(*(self.load_json_config_async(name) for name in names))
+        return len(names)
+            
     def get_env(self, key: str, default: Any = None) -> Any:
         """환경 변수 조회"""
         return os.getenv(key, default) 
\ No newline at end of file
@@ -1,8 +1,28 @@
+import queue
+import atexit
 import logging
 import logging.handlers
 import os
 from datetime import datetime
 
+# 파일 핸들러는 리스너 스레드에서만 기록 (이벤트 루프 블로킹 방지)
+_listeners = []
+
+def _queue_handler(*handlers: logging.Handler) -> logging.handlers.QueueHandler:
+    """파일 핸들러들을 백그라운드 리스너로 감싼 QueueHandler 생성"""
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return logging.handlers.QueueHandler(log_queue)
+
+def stop_logging():
+    """큐에 남은 로그를 기록하고 리스너 종료"""
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(stop_logging)
+
 def setup_logging():
     # logs 디렉토리 생성
     log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
@@ -44,12 +64,15 @@ def setup_logging():
     )
     trading_handler.setFormatter(formatter)
 
+    # 콘솔 핸들러
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
     # 루트 로거 설정
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(app_handler)
-    root_logger.addHandler(error_handler)
+    root_logger.addHandler(_queue_handler(app_handler, error_handler, console_handler))
 
     # 거래 관련 로거 설정
     trading_logger = logging.getLogger('trade')
-    trading_logger.addHandler(trading_handler) 
\ No newline at end of file
+    trading_logger.addHandler(_queue_handler(trading_handler)) 
\ No newline at end of file
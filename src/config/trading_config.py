@@ -1,7 +1,7 @@
 import os
 import json
 import logging
-from typing import Optional
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -56,9 +56,14 @@ class TradingConfig:
             cls._instance = cls()
         return cls._instance
 
-    # 포지션 관련 설정
-    MIN_POSITION_SIZE = 0.001  # 최소 주문 수량 (BTC)
-    DECIMAL_PLACES = 3         # 수량 소수점 자리수
+    @property
+    def symbols(self) -> List[str]:
+        """자동 분석/매매 대상 심볼 (market_config.json 의 symbols.trading, 없으면 기본 심볼)"""
+        from config import config
+        symbols = config.load_json_config('market_config.json').get('symbols', {}).get('trading')
+        return list(dict.fromkeys(symbols)) if symbols else [self.symbol]
+
+    # 최소 주문 수량/소수점 자리수는 services.instrument_cache.InstrumentCache 에서 심볼별로 관리
     
     # 기본 레버리지 설정
     DEFAULT_LEVERAGE = 1
@@ -10,9 +10,11 @@ import traceback
 import ssl
 import certifi
 import asyncio
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
+from urllib.parse import urlparse
 from config.bybit_config import BybitConfig
 from .websocket_client import BybitWebsocketClient
+from .public_websocket_client import BybitPublicWebsocketClient
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,7 @@ class BybitClient:
         
         # WebSocket 클라이언트 초기화
         self.ws_client = BybitWebsocketClient(self.config)
+        self.public_ws_client = BybitPublicWebsocketClient(self.config)
         
         # CCXT exchange 객체 초기화 (market_data_service에서 필요)
         self.exchange = ccxt.bybit({
@@ -56,6 +59,11 @@ class BybitClient:
         if self.config.testnet:
             self.exchange.set_sandbox_mode(True)
 
+        # REST 요청 관찰자 (client, endpoint, status, 소요 초) - 봇이 지표 수집에 연결
+        self.request_observer: Optional[Callable[[str, str, str, float], None]] = None
+        self._ccxt_fetch = self.exchange.fetch
+        self.exchange.fetch = self._observed_fetch
+
         # 세션 초기화
         self.session = None
         
@@ -90,6 +98,7 @@ class BybitClient:
 
     async def _request(self, method: str, path: str, params: Dict = None) -> Dict:
         """API 요청 공통 처리"""
+        started = None
         try:
             await self._ensure_time_sync()
             
@@ -140,25 +149,47 @@ class BybitClient:
             logger.debug(f"Final request headers: {headers}")
             
             # 8. API 요청 실행
+            started = time.perf_counter()
             async with aiohttp.ClientSession() as session:
                 if method == "GET":
                     # GET 요청은 파라미터를 쿼리 스트링으로 전달
                     async with session.get(url, params=request_params, headers=headers, ssl=self.ssl_context) as response:
                         result = await response.json()
+                        self._observe_request('v5', path, str(response.status), started)
                         logger.debug(f"API Response: {result}")
                         return result
                 else:  # POST
                     # POST 요청은 파라미터를 본문으로 전달
                     async with session.post(url, json=request_params, headers=headers, ssl=self.ssl_context) as response:
                         result = await response.json()
+                        self._observe_request('v5', path, str(response.status), started)
                         logger.debug(f"API Response: {result}")
                         return result
 
         except Exception as e:
+            if started is not None:
+                self._observe_request('v5', path, type(e).__name__, started)
             logger.error(f"API 요청 실패: {str(e)}")
             logger.error(traceback.format_exc())
             return None
 
+    def _observe_request(self, client: str, endpoint: str, status: str, started: float):
+        """요청 결과를 관찰자에게 전달 (관찰자가 없으면 무시)"""
+        if self.request_observer:
+            self.request_observer(client, endpoint, status, time.perf_counter() - started)
+
+    async def _observed_fetch(self, url, method='GET', headers=None, body=None):
+        """ccxt HTTP 요청 관찰 (엔드포인트는 URL 경로, 실패는 ccxt 예외 이름)"""
+        started = time.perf_counter()
+        status = '200'
+        try:
+            return await self._ccxt_fetch(url, method, headers, body)
+        except BaseException as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self._observe_request('ccxt', urlparse(url).path, status, started)
+
     async def v5_post(self, path: str, params: Dict = None) -> Dict:
         """V5 API POST 요청"""
         try:
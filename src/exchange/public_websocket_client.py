@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+import ssl
+import time
+import certifi
+import websockets
+from typing import Callable, Dict, List
+from config.bybit_config import BybitConfig
+
+logger = logging.getLogger(__name__)
+
+class BybitPublicWebsocketClient:
+    """Bybit 퍼블릭(선물) 웹소켓 클라이언트
+
+    인증이 필요 없는 시세 토픽(kline 등)을 구독합니다.
+    연결이 끊기면 지수 백오프로 재연결하고 등록된 토픽을 다시 구독합니다.
+    """
+
+    PING_INTERVAL = 20          # Bybit 권장 하트비트 간격 (초)
+    MAX_RECONNECT_DELAY = 60
+
+    def __init__(self, config: BybitConfig = None):
+        """
+        Args:
+            config: Bybit 설정
+        """
+        self.config = config or BybitConfig()
+        self.ws = None
+        self.is_connected = False
+        self.callbacks: Dict[str, List[Callable]] = {}
+        self.last_message_at = 0.0
+        self.message_counts: Dict[str, int] = {}   # 토픽별 수신 메시지 수 (지표용)
+        self.reconnect_count = 0
+        self._monitoring_task = None
+        self._ping_task = None
+        self._stop_event = asyncio.Event()
+
+        # SSL 컨텍스트 설정
+        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+
+        # 웹소켓 URL 설정
+        self.ws_url = ("wss://stream-testnet.bybit.com/v5/public/linear" if self.config.testnet
+                       else "wss://stream.bybit.com/v5/public/linear")
+
+    @staticmethod
+    def kline_topic(symbol: str, interval: str) -> str:
+        """kline 토픽 이름 (interval 은 분 단위 문자열, 예: '60')"""
+        return f"kline.{interval}.{symbol}"
+
+    @staticmethod
+    def ticker_topic(symbol: str) -> str:
+        """티커 토픽 이름 (마크 가격 포함, 변경 시 100ms 간격 push)"""
+        return f"tickers.{symbol}"
+
+    def add_callback(self, topic: str, callback: Callable):
+        """토픽 콜백 등록 (연결 중이면 즉시 구독)"""
+        is_new = topic not in self.callbacks
+        self.callbacks.setdefault(topic, []).append(callback)
+        if is_new and self.is_connected:
+            asyncio.create_task(self._subscribe([topic]))
+
+    def remove_callback(self, topic: str, callback: Callable = None):
+        """콜백 함수 제거 (callback 미지정 시 토픽의 모든 콜백 제거)"""
+        if topic not in self.callbacks:
+            return
+        if callback is None:
+            self.callbacks[topic].clear()
+        elif callback in self.callbacks[topic]:
+            self.callbacks[topic].remove(callback)
+
+    def is_healthy(self, max_silence: float) -> bool:
+        """연결되어 있고 max_silence 초 이내에 메시지를 받았는지 여부"""
+        return self.is_connected and time.monotonic() - self.last_message_at <= max_silence
+
+    async def connect(self):
+        """웹소켓 연결 및 토픽 구독"""
+        try:
+            self.ws = await websockets.connect(self.ws_url, ssl=self.ssl_context)
+            self.is_connected = True
+            self.last_message_at = time.monotonic()
+            logger.info("퍼블릭 웹소켓 연결 성공")
+
+            if self.callbacks:
+                await self._subscribe(list(self.callbacks))
+
+        except Exception as e:
+            logger.error(f"퍼블릭 웹소켓 연결 실패: {str(e)}")
+            self.is_connected = False
+
+    async def _subscribe(self, topics: List[str]):
+        """토픽 구독 (응답은 수신 루프에서 처리)"""
+        try:
+            await self.ws.send(json.dumps({"op": "subscribe", "args": topics}))
+            logger.info(f"퍼블릭 토픽 구독 요청: {topics}")
+        except Exception as e:
+            logger.error(f"퍼블릭 토픽 구독 실패: {str(e)}")
+
+    async def start_monitoring(self):
+        """실시간 수신 시작"""
+        if self._monitoring_task is not None:
+            logger.warning("퍼블릭 웹소켓 모니터링이 이미 실행 중입니다")
+            return
+
+        self._stop_event.clear()
+        self._monitoring_task = asyncio.create_task(self._monitoring_loop())
+        self._ping_task = asyncio.create_task(self._ping_loop())
+
+    async def _ping_loop(self):
+        """하트비트 전송"""
+        while not self._stop_event.is_set():
+            await asyncio.sleep(self.PING_INTERVAL)
+            if self.is_connected and self.ws:
+                try:
+                    await self.ws.send(json.dumps({"op": "ping"}))
+                except Exception as e:
+                    logger.warning(f"퍼블릭 웹소켓 ping 실패: {str(e)}")
+
+    async def _monitoring_loop(self):
+        """수신 루프 (끊기면 재연결)"""
+        reconnect_delay = 1
+        while not self._stop_event.is_set():
+            try:
+                if not self.is_connected:
+                    await self.connect()
+                    if not self.is_connected:
+                        await asyncio.sleep(reconnect_delay)
+                        reconnect_delay = min(reconnect_delay * 2, self.MAX_RECONNECT_DELAY)
+                        continue
+                    reconnect_delay = 1
+
+                message = await self.ws.recv()
+                self.last_message_at = time.monotonic()
+                data = json.loads(message)
+
+                topic = data.get('topic')
+                if topic and 'data' in data:
+                    self.message_counts[topic] = self.message_counts.get(topic, 0) + 1
+                    for callback in list(self.callbacks.get(topic, [])):
+                        await callback(data)
+                elif data.get('op') == 'subscribe' and not data.get('success', True):
+                    logger.error(f"퍼블릭 토픽 구독 실패 응답: {data}")
+
+            except websockets.ConnectionClosed:
+                logger.warning("퍼블릭 웹소켓 연결 끊김, 재연결 시도...")
+                self.is_connected = False
+                self.reconnect_count += 1
+                await asyncio.sleep(reconnect_delay)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.error(f"퍼블릭 웹소켓 수신 중 오류: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def stop(self):
+        """웹소켓 연결 종료"""
+        try:
+            self._stop_event.set()
+
+            for task in (self._monitoring_task, self._ping_task):
+                if task:
+                    task.cancel()
+            await asyncio.gather(*(t for t in (self._monitoring_task, self._ping_task) if t),
+                                 return_exceptions=True)
+            self._monitoring_task = None
+            self._ping_task = None
+
+            if self.ws:
+                await self.ws.close()
+                self.ws = None
+            self.is_connected = False
+            logger.info("퍼블릭 웹소켓 연결이 종료되었습니다")
+
+        except Exception as e:
+            logger.error(f"퍼블릭 웹소켓 연결 종료 중 오류: {str(e)}")
@@ -24,8 +24,11 @@ class BybitWebsocketClient:
         self.callbacks = {
             'order': [],
             'position': [],
-            'execution': []
+            'execution': [],
+            'wallet': []
         }
+        self.message_counts: Dict[str, int] = {}   # 토픽별 수신 메시지 수 (지표용)
+        self.reconnect_count = 0
         self._monitoring_task = None
         self._stop_event = asyncio.Event()
         
@@ -101,7 +104,8 @@ class BybitWebsocketClient:
                 "args": [
                     "order",           # 주문 업데이트
                     "position",        # 포지션 업데이트
-                    "execution"        # 체결 업데이트
+                    "execution",       # 체결 업데이트
+                    "wallet"           # 지갑(자산) 업데이트
                 ]
             }
             await self.ws.send(json.dumps(subscribe_message))
@@ -117,6 +121,15 @@ class BybitWebsocketClient:
         if topic in self.callbacks:
             self.callbacks[topic].append(callback)
 
+    def remove_callback(self, topic: str, callback: Callable = None):
+        """콜백 함수 제거 (callback 미지정 시 토픽의 모든 콜백 제거)"""
+        if topic not in self.callbacks:
+            return
+        if callback is None:
+            self.callbacks[topic].clear()
+        elif callback in self.callbacks[topic]:
+            self.callbacks[topic].remove(callback)
+
     async def _handle_order_update(self, data: Dict):
         """주문 업데이트 처리"""
         for callback in self.callbacks['order']:
@@ -132,6 +145,11 @@ class BybitWebsocketClient:
         for callback in self.callbacks['execution']:
             await callback(data)
 
+    async def _handle_wallet_update(self, data: Dict):
+        """지갑 업데이트 처리"""
+        for callback in self.callbacks['wallet']:
+            await callback(data)
+
     async def start_monitoring(self):
         """실시간 모니터링 시작"""
         if self._monitoring_task is not None:
@@ -155,6 +173,7 @@ class BybitWebsocketClient:
                 if 'topic' in data and 'data' in data:
                     topic = data['topic']
                     topic_data = data['data']
+                    self.message_counts[topic] = self.message_counts.get(topic, 0) + 1
                     
                     # data가 리스트인 경우 각각의 항목 처리
                     if isinstance(topic_data, list):
@@ -165,6 +184,8 @@ class BybitWebsocketClient:
                                 await self._handle_position_update({'topic': topic, 'data': item})
                             elif topic == 'execution':
                                 await self._handle_execution_update({'topic': topic, 'data': item})
+                            elif topic == 'wallet':
+                                await self._handle_wallet_update({'topic': topic, 'data': item})
                     else:
                         # 단일 데이터 처리
                         if topic == 'order':
@@ -173,10 +194,13 @@ class BybitWebsocketClient:
                             await self._handle_position_update(data)
                         elif topic == 'execution':
                             await self._handle_execution_update(data)
+                        elif topic == 'wallet':
+                            await self._handle_wallet_update(data)
                 
             except websockets.ConnectionClosed:
                 logger.warning("웹소켓 연결 끊김, 재연결 시도...")
                 self.is_connected = False
+                self.reconnect_count += 1
                 await asyncio.sleep(5)  # 5초 후 재시도
                 
             except Exception as e:
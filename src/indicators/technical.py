@@ -6,11 +6,29 @@ from ta.trend import MACD, ADXIndicator, IchimokuIndicator
 from ta.volatility import BollingerBands
 import logging
 from typing import Optional, Dict, Any
+from services.tracer import traced
 import traceback
 
 logger = logging.getLogger(__name__)
 
 class TechnicalIndicators:
+    DEFAULT_SETTINGS = {
+        'bb_std': 2.5,              # 볼린저 밴드 표준편차 배수
+        'rsi_overbought': 70,       # RSI 과매수 / 과매도 (신호, 위험도 판단)
+        'rsi_oversold': 30,
+        'rsi_positive': 60,         # 시장 심리 긍정 / 부정 RSI 기준
+        'rsi_negative': 40
+    }
+
+    def __init__(self, settings: Dict = None):
+        options = {**self.DEFAULT_SETTINGS, **(settings or {})}
+        self.bb_std = float(options['bb_std'])
+        self.rsi_overbought = float(options['rsi_overbought'])
+        self.rsi_oversold = float(options['rsi_oversold'])
+        self.rsi_positive = float(options['rsi_positive'])
+        self.rsi_negative = float(options['rsi_negative'])
+
+    @traced('indicators.calculate')
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """모든 기술적 지표 계산"""
         try:
@@ -59,12 +77,13 @@ class TechnicalIndicators:
             df['di_plus'] = adx_indicator.adx_pos()
             df['di_minus'] = adx_indicator.adx_neg()
             
-            # 추세 판단
-            df['trend'] = self._get_trend_direction(df)
-            df['trend_strength'] = self._get_trend_strength(df)
+            # 추세 판단 (봉별)
+            signals = self.classify_signals(df)
+            df['trend'] = signals['trend']
+            df['trend_strength'] = signals['strength']
             
-            # RSI 다이버전스 계산
-            divergence = self.check_rsi_divergence(df)
+            # RSI 다이버전스 계산 (봉별)
+            divergence = self.rsi_divergence(df)
             df['divergence_type'] = divergence['type']
             df['divergence_desc'] = divergence['description']
             
@@ -77,45 +96,44 @@ class TechnicalIndicators:
             logger.error(f"지표 계산 중 오류: {str(e)}")
             return None
 
+    @staticmethod
+    def rsi_divergence(df: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+        """봉별 RSI 다이버전스 (type, description 열)
+
+        각 봉에서 최근 window 개 봉(해당 봉 포함)의 가격/RSI 고점·저점과 비교합니다.
+        """
+        close = df['close']
+        rsi = df['rsi']
+        price_high = close.rolling(window, min_periods=1).max()
+        price_low = close.rolling(window, min_periods=1).min()
+        rsi_high = rsi.rolling(window, min_periods=1).max()
+        rsi_low = rsi.rolling(window, min_periods=1).min()
+        prev_rsi = rsi.shift(1)
+
+        # 베어리시: 가격은 고점의 99.5% 이상, RSI 는 이전 고점의 98% 미만이며 하락 중
+        bearish = ((close >= price_high * 0.995) & (rsi < rsi_high * 0.98) & (rsi < prev_rsi)).to_numpy()
+        # 불리시: 가격은 저점의 100.5% 이하, RSI 는 이전 저점의 102% 초과이며 상승 중
+        bullish = ~bearish & ((close <= price_low * 1.005) & (rsi > rsi_low * 1.02) & (rsi > prev_rsi)).to_numpy()
+
+        types = np.full(len(df), "없음", dtype=object)
+        descriptions = np.full(len(df), "현재 다이버전스 없음", dtype=object)
+        types[bearish] = "베어리시"
+        types[bullish] = "불리시"
+        for i in np.flatnonzero(bearish):
+            descriptions[i] = f"가격 상승({close.iloc[i]:.0f}), RSI 하락({rsi.iloc[i]:.1f} < {rsi_high.iloc[i]:.1f})"
+        for i in np.flatnonzero(bullish):
+            descriptions[i] = f"가격 하락({close.iloc[i]:.0f}), RSI 상승({rsi.iloc[i]:.1f} > {rsi_low.iloc[i]:.1f})"
+
+        return pd.DataFrame({'type': types, 'description': descriptions}, index=df.index)
+
     @staticmethod
     def check_rsi_divergence(df: pd.DataFrame, window: int = 14) -> Dict:
-        """RSI 다이버전스 확인"""
+        """RSI 다이버전스 확인 (마지막 봉)"""
         try:
             if 'rsi' not in df.columns:
                 return {"type": "없음", "description": "RSI 데이터 없음"}
-                
-            # 최근 N개 봉에서 고점/저점 찾기
-            last_n = df.tail(window)
-            
-            # 가격과 RSI의 고점/저점 찾기
-            price_high = last_n['close'].max()
-            price_low = last_n['close'].min()
-            rsi_high = last_n['rsi'].max()
-            rsi_low = last_n['rsi'].min()
-            
-            current_price = df['close'].iloc[-1]
-            current_rsi = df['rsi'].iloc[-1]
-            prev_rsi = df['rsi'].iloc[-2]
-            
-            # 베어리시 다이버전스 (가격은 상승, RSI는 하락)
-            if (current_price >= price_high * 0.995 and    # 가격이 고점의 99.5% 이상
-                current_rsi < rsi_high * 0.98 and          # RSI는 이전 고점의 98% 미만
-                current_rsi < prev_rsi):                   # RSI는 하락 중
-                return {
-                    "type": "베어리시",
-                    "description": f"가격 상승({current_price:.0f}), RSI 하락({current_rsi:.1f} < {rsi_high:.1f})"
-                }
-                
-            # 불리시 다이버전스 (가격은 하락, RSI는 상승)
-            if (current_price <= price_low * 1.005 and     # 가격이 저점의 100.5% 이하
-                current_rsi > rsi_low * 1.02 and           # RSI는 이전 저점의 102% 초과
-                current_rsi > prev_rsi):                   # RSI는 상승 중
-                return {
-                    "type": "불리시",
-                    "description": f"가격 하락({current_price:.0f}), RSI 상승({current_rsi:.1f} > {rsi_low:.1f})"
-                }
-                
-            return {"type": "없음", "description": "현재 다이버전스 없음"}
+            latest = TechnicalIndicators.rsi_divergence(df.tail(window), window).iloc[-1]
+            return {"type": latest['type'], "description": latest['description']}
             
         except Exception as e:
             logger.error(f"다이버전스 확인 중 오류: {str(e)}")
@@ -221,9 +239,11 @@ class TechnicalIndicators:
                 'histogram': pd.Series([0] * len(prices))
             }
 
-    def calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std: float = 2.5) -> Dict:
-        """볼린저 밴드 계산"""
+    def calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std: float = None) -> Dict:
+        """볼린저 밴드 계산 (std 미지정 시 설정값)"""
         try:
+            if std is None:
+                std = self.bb_std
             # 중심선 (SMA)
             middle = prices.rolling(window=period).mean()
             
@@ -261,71 +281,87 @@ class TechnicalIndicators:
             logger.error(f"볼린저 밴드 위치 계산 중 오류: {str(e)}")
             return '중단'
 
-    def _get_trend_direction(self, df: pd.DataFrame) -> str:
-        """추세 방향 판단"""
-        latest = df.iloc[-1]
-        if (latest['sma_10'] > latest['sma_30'] and 
-            latest['rsi'] > 50 and 
-            latest['macd'] > 0):
-            return "UPTREND"
-        elif (latest['sma_10'] < latest['sma_30'] and 
-              latest['rsi'] < 50 and 
-              latest['macd'] < 0):
-            return "DOWNTREND"
-        return "SIDEWAYS"
+    def classify_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """봉별 신호 분류 (analyze_signals 의 판단 규칙을 모든 봉에 대해 벡터 계산)"""
+        close = df['close']
+        rsi = df['rsi']
+        macd = df['macd']
+        macd_signal = df['macd_signal']
+        upper, lower, middle = df['bb_upper'], df['bb_lower'], df['bb_middle']
 
-    def _get_trend_strength(self, df: pd.DataFrame) -> int:
-        """추세 강도 계산"""
-        try:
-            latest = df.iloc[-1]
-            strength = 0
-            
-            # RSI 반영 (0-40점)
-            rsi_score = abs(latest['rsi'] - 50) * 0.8  # RSI가 0이나 100에 가까울수록 최대 40점
-            strength += rsi_score
-            
-            # MACD 반영 (0-30점)
-            macd_strength = min(abs(latest['macd'] / latest['close'] * 10000), 30)  # MACD를 가격 대비 비율로 계산
-            if abs(latest['macd']) > abs(latest['macd_signal']):
-                strength += macd_strength
-            
-            # ADX 반영 (0-20점)
+        # 추세 방향
+        trend = np.select(
+            [(df['sma_10'] > df['sma_30']) & (rsi > 50) & (macd > 0),
+             (df['sma_10'] < df['sma_30']) & (rsi < 50) & (macd < 0)],
+            ['UPTREND', 'DOWNTREND'], 'SIDEWAYS'
+        )
+
+        # 추세 강도: RSI (0-40점) + MACD (0-30점) + ADX (0-20점) + 볼린저 밴드 이탈 (0-10점)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = ((rsi - 50).abs() * 0.8).to_numpy(dtype=np.float64)
+            macd_strength = np.minimum((macd / close * 10000).abs().to_numpy(), 30)
+            strength = strength + np.where(macd.abs() > macd_signal.abs(), macd_strength, 0)
             if 'adx' in df.columns:
-                strength += min(latest['adx'] * 0.5, 20)  # ADX * 0.5로 최대 20점
-            
-            # 볼린저 밴드 반영 (0-10점)
-            bb_width = (latest['bb_upper'] - latest['bb_lower']) / latest['bb_middle']
-            if latest['close'] > latest['bb_upper'] or latest['close'] < latest['bb_lower']:
-                strength += min(bb_width * 100, 10)  # 밴드폭이 클수록 강도 증가, 최대 10점
-            
-            return min(int(strength), 100)
-            
-        except Exception as e:
-            logger.error(f"추세 강도 계산 중 오류: {str(e)}")
-            return 50
+                strength = strength + np.minimum(df['adx'].to_numpy() * 0.5, 20)
+            bb_width = ((upper - lower) / middle).to_numpy()
+            outside = ((close > upper) | (close < lower)).to_numpy()
+            strength = strength + np.where(outside, np.minimum(bb_width * 100, 10), 0)
+        # 계산할 수 없는 봉은 중간값
+        strength = np.where(np.isfinite(strength), np.minimum(np.floor(strength), 100), 50).astype(int)
 
-    def _analyze_rsi(self, rsi: float) -> str:
-        """RSI 분석"""
-        if rsi > 70:
-            return "OVERBOUGHT"
-        elif rsi < 30:
-            return "OVERSOLD"
-        elif rsi > 50:
-            return "BULLISH"
-        else:
-            return "BEARISH"
+        volume_ma = df['volume'].rolling(20).mean()
+        return pd.DataFrame({
+            'trend': trend,
+            'strength': strength,
+            'rsi': np.select(
+                [rsi > self.rsi_overbought, rsi < self.rsi_oversold, rsi > 50],
+                ['OVERBOUGHT', 'OVERSOLD', 'BULLISH'], 'BEARISH'
+            ),
+            'macd': np.select(
+                [(macd > macd_signal) & (macd > 0), macd > macd_signal,
+                 (macd < macd_signal) & (macd < 0), macd < macd_signal],
+                ['STRONG_BULLISH', 'BULLISH', 'STRONG_BEARISH', 'BEARISH'], 'NEUTRAL'
+            ),
+            'bollinger': np.select(
+                [close > upper, close < lower, close > middle],
+                ['UPPER_BREAK', 'LOWER_BREAK', 'ABOVE_MIDDLE'], 'BELOW_MIDDLE'
+            ),
+            'market': np.select(
+                [(rsi > self.rsi_positive) & (macd > 0), (rsi < self.rsi_negative) & (macd < 0)],
+                ['POSITIVE', 'NEGATIVE'], 'NEUTRAL'
+            ),
+            'short_term': np.select([macd > macd_signal, macd < macd_signal], ['POSITIVE', 'NEGATIVE'], 'NEUTRAL'),
+            'volume': np.select(
+                [df['volume'] > volume_ma * 1.5, df['volume'] < volume_ma * 0.5],
+                ['VOLUME_INCREASE', 'VOLUME_DECREASE'], 'VOLUME_NEUTRAL'
+            ),
+            'risk': np.select(
+                [(rsi > self.rsi_overbought) | (rsi < self.rsi_oversold),
+                 (rsi >= self.rsi_negative) & (rsi <= self.rsi_positive)],
+                ['HIGH', 'LOW'], 'MEDIUM'
+            )
+        }, index=df.index)
 
-    def _analyze_macd(self, macd: float, signal: float) -> str:
-        """MACD 분석"""
-        if macd > signal:
-            if macd > 0:
-                return "STRONG_BULLISH"
-            return "BULLISH"
-        elif macd < signal:
-            if macd < 0:
-                return "STRONG_BEARISH"
-            return "BEARISH"
-        return "NEUTRAL"
+    @staticmethod
+    def signals_at(signals: pd.DataFrame, i: int = -1, timestamp=None) -> Dict[str, Any]:
+        """classify_signals 결과의 한 봉을 analyze_signals 형식으로 변환"""
+        row = signals.iloc[i]
+        return {
+            "trend": row['trend'],
+            "strength": int(row['strength']),
+            "signals": {
+                "rsi": row['rsi'],
+                "macd": row['macd'],
+                "bollinger": row['bollinger']
+            },
+            "sentiment": {
+                "market": row['market'],
+                "short_term": row['short_term'],
+                "volume": row['volume'],
+                "risk": row['risk']
+            },
+            "timestamp": timestamp if timestamp is not None else pd.Timestamp.now()
+        }
 
     def _analyze_bollinger(self, df: pd.DataFrame) -> str:
         """볼린저 밴드 분석"""
@@ -350,75 +386,10 @@ class TechnicalIndicators:
             return "NEUTRAL"
 
     def analyze_signals(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """모든 기술적 지표를 종합 분석"""
+        """모든 기술적 지표를 종합 분석 (마지막 봉, 거래량 평균에 필요한 20봉만 사용)"""
         try:
-            latest = df.iloc[-1]
-            
-            # 1. 추세 분석
-            trend = {
-                "direction": self._get_trend_direction(df),
-                "strength": self._get_trend_strength(df)
-            }
-            
-            # 2. 주요 지표 신호
-            signals = {
-                "rsi": self._analyze_rsi(latest['rsi']),
-                "macd": self._analyze_macd(latest['macd'], latest['macd_signal']),
-                "bollinger": self._analyze_bollinger(df)
-            }
-            
-            # 3. 시장 심리 분석
-            sentiment = {
-                "market": self._get_market_sentiment(df),
-                "short_term": self._get_short_term_sentiment(df),
-                "volume": self._get_volume_trend(df),
-                "risk": self._get_risk_level(df)
-            }
-            
-            return {
-                "trend": trend["direction"],
-                "strength": trend["strength"],
-                "signals": signals,
-                "sentiment": sentiment,
-                "timestamp": pd.Timestamp.now()
-            }
+            return self.signals_at(self.classify_signals(df.tail(20)))
             
         except Exception as e:
             logger.error(f"기술적 분석 중 오류: {str(e)}")
             return None
-
-    def _get_market_sentiment(self, df: pd.DataFrame) -> str:
-        """전반적 시장 심리 판단"""
-        latest = df.iloc[-1]
-        if latest['rsi'] > 60 and latest['macd'] > 0:
-            return "POSITIVE"
-        elif latest['rsi'] < 40 and latest['macd'] < 0:
-            return "NEGATIVE"
-        return "NEUTRAL"
-
-    def _get_short_term_sentiment(self, df: pd.DataFrame) -> str:
-        """단기 시장 심리 판단"""
-        latest = df.iloc[-1]
-        if latest['macd'] > latest['macd_signal']:
-            return "POSITIVE"
-        elif latest['macd'] < latest['macd_signal']:
-            return "NEGATIVE"
-        return "NEUTRAL"
-
-    def _get_volume_trend(self, df: pd.DataFrame) -> str:
-        """거래량 추세 판단"""
-        vol_ma = df['volume'].rolling(20).mean()
-        if df['volume'].iloc[-1] > vol_ma.iloc[-1] * 1.5:
-            return "VOLUME_INCREASE"
-        elif df['volume'].iloc[-1] < vol_ma.iloc[-1] * 0.5:
-            return "VOLUME_DECREASE"
-        return "VOLUME_NEUTRAL"
-
-    def _get_risk_level(self, df: pd.DataFrame) -> str:
-        """리스크 레벨 판단"""
-        latest = df.iloc[-1]
-        if latest['rsi'] > 70 or latest['rsi'] < 30:
-            return "HIGH"
-        elif 40 <= latest['rsi'] <= 60:
-            return "LOW"
-        return "MEDIUM"
\ No newline at end of file
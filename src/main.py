@@ -6,29 +6,23 @@ from telegram import Bot
 from telegram_bot.bot import TelegramBot
 from exchange.bybit_client import BybitClient
 from config.bybit_config import BybitConfig
-from indicators.technical import TechnicalIndicators
-from ai.gpt_analyzer import GPTAnalyzer
 import platform
 import time
 from config.telegram_config import TelegramConfig
-from services.market_data_service import MarketDataService
-from trade.trade_manager import TradeManager
-from services import PositionService, OrderService, BalanceService
-from ai.ai_trader import AITrader
+from services.container import ServiceContainer
+from services.startup_profiler import StartupProfiler
 import traceback
 from dotenv import load_dotenv
-from config.logging_config import setup_logging
+from config.logging_config import setup_logging, stop_logging
+from config import config
 from config.config import Config
 import signal
 
 # 환경 변수 로드
 load_dotenv()  
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 로깅 설정 (파일/콘솔 기록은 리스너 스레드에서 수행)
+setup_logging()
 
 # httpx 로거 레벨 설정
 logging.getLogger('httpx').setLevel(logging.WARNING)
@@ -47,10 +41,31 @@ if project_root not in sys.path:
 if platform.system() == 'Windows':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+WS_CONNECT_ATTEMPTS = 3
+
+async def connect_websocket(bybit_client: BybitClient):
+    """웹소켓 연결 및 인증 후 모니터링 시작 (연결 실패 시 재시도, 끝내 실패하면 예외)"""
+    for attempt in range(1, WS_CONNECT_ATTEMPTS + 1):
+        await bybit_client.ws_client.connect()
+        if bybit_client.ws_client.is_connected:
+            break
+        if attempt < WS_CONNECT_ATTEMPTS:
+            logger.warning(f"웹소켓 연결 실패, {2 ** attempt}초 후 재시도 ({attempt}/{WS_CONNECT_ATTEMPTS})")
+            await asyncio.sleep(2 ** attempt)
+    else:
+        raise ConnectionError(f"웹소켓 연결 실패 ({WS_CONNECT_ATTEMPTS}회 시도)")
+    await bybit_client.ws_client.start_monitoring()
+    # 퍼블릭 스트림 (봉 마감 트리거용, 수신 루프에서 연결)
+    await bybit_client.public_ws_client.start_monitoring()
+
 async def main():
     try:
         logger.info("=== 메인 프로그램 시작 ===")
         
+        # JSON 설정 파일을 이벤트 루프 밖에서 미리 읽어 캐시
+        loaded = await config.preload_json_configs()
+        logger.info(f"설정 파일 {loaded}개 로드됨")
+        
         # Config 초기화
         Config.initialize()
         logger.info("Config 초기화됨")
@@ -58,34 +73,40 @@ async def main():
         logger.info("환경변수 및 설정 초기화 중...")
         telegram_config = TelegramConfig()
         
+        profiler = StartupProfiler()
+        
         # Bybit 클라이언트 초기화
         logger.info("Bybit 테스트넷 클라이언트 초기화 중...")
-        bybit_client = BybitClient()
+        with profiler.stage('bybit_client'):
+            bybit_client = BybitClient()
         
-        # 웹소켓 연결
-        logger.info("웹소켓 연결 시작...")
-        await bybit_client.ws_client.connect()
-        await bybit_client.ws_client.start_monitoring()
+        # 서비스 컨테이너 (각 서비스는 처음 사용할 때 한 번만 생성)
+        container = ServiceContainer(bybit_client, startup_profiler=profiler)
         
-        # 서비스 초기화
-        market_data_service = MarketDataService(bybit_client)
-        position_service = PositionService(bybit_client)
-        balance_service = BalanceService(bybit_client)
-        order_service = OrderService(
-            bybit_client=bybit_client,
-            position_service=position_service,
-            balance_service=balance_service
-        )
+        # 봇 초기화 (OrderService 의 telegram_bot 은 봇에서 설정)
+        with profiler.stage('telegram_bot'):
+            telegram_bot = TelegramBot(
+                config=telegram_config,
+                bybit_client=bybit_client,
+                container=container
+            )
         
-        # 봇 초기화
-        telegram_bot = TelegramBot(
-            config=telegram_config,
-            bybit_client=bybit_client,
-            market_data_service=market_data_service
+        # 서로 독립적인 시작 단계 병렬 실행
+        logger.info("웹소켓 연결 / 마켓 로드 / 텔레그램 초기화 병렬 시작...")
+        results = await profiler.gather(
+            ws_connect=connect_websocket(bybit_client),
+            load_markets=container.market_data_service.initialize(),
+            telegram_init=telegram_bot.initialize()
         )
+        # 웹소켓(시장 데이터 스트림) 또는 텔레그램 초기화 실패는 치명적 오류로 종료
+        for name in ('ws_connect', 'telegram_init'):
+            if isinstance(results[name], BaseException):
+                raise results[name]
         
-        # OrderService에 telegram_bot 설정
-        order_service.telegram_bot = telegram_bot
+        # 90일 거래 내역 동기화는 명령 처리를 막지 않도록 백그라운드에서 실행
+        history_task = profiler.background(
+            'trade_history_sync', container.trade_history_service.initialize()
+        )
         
         # 종료 시그널 핸들러 설정
         if platform.system() != 'Windows':
@@ -103,20 +124,23 @@ async def main():
         
         # 봇 실행
         try:
-            await telegram_bot.run()
+            await telegram_bot.start()
         except asyncio.CancelledError:
             logger.info("봇 실행이 취소되었습니다")
         finally:
+            history_task.cancel()
             # 봇 종료
             await telegram_bot.stop()
             # 웹소켓 종료
             await bybit_client.close()
-            # 프로세스 종료
+            # 프로세스 종료 (os._exit 는 atexit 를 건너뛰므로 로그 큐를 먼저 비움)
+            stop_logging()
             os._exit(0)
         
     except Exception as e:
         logger.error(f"실행 중 에러 발생: {str(e)}")
         logger.error(traceback.format_exc())
+        stop_logging()
         os._exit(1)
 
 if __name__ == "__main__":
@@ -131,4 +155,5 @@ if __name__ == "__main__":
         logger.info("프로그램이 Ctrl+C로 종료되었습니다")
     except Exception as e:
         logger.error(f"메인 루프 오류: {e}")
+        stop_logging()
         os._exit(1)
\ No newline at end of file
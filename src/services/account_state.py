@@ -0,0 +1,161 @@
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class AccountState:
+    """계정 상태 미러 (지갑/포지션 스트림, 심볼별 분석 작업이 공유)
+
+    - 시작 시 REST 로 한 번 채우고 이후에는 private 웹소켓 업데이트만 반영
+    - 심볼별 리스크 검사가 다른 심볼의 포지션까지 포함한 계정 전체 노출을 조회할 때 사용
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'AccountState':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._wallet: Dict[str, float] = {}
+        self._positions: Dict[str, Dict] = {}  # 심볼별 {'side', 'size', 'value', 'leverage', 'unrealized_pnl'}
+        self._ws_client = None
+        self.updated_at = 0.0
+
+    # ---- 시작/중지 ----
+
+    async def start(self, bybit_client):
+        """REST 로 초기 상태를 채우고 지갑/포지션 스트림 구독"""
+        if self._ws_client is None:
+            self._ws_client = bybit_client.ws_client
+            self._ws_client.add_callback('wallet', self._handle_wallet_update)
+            self._ws_client.add_callback('position', self._handle_position_update)
+        await self.refresh(bybit_client)
+        logger.info(f"계정 상태 미러 시작 (포지션 {len(self._positions)}개)")
+
+    def stop(self):
+        """스트림 구독 해제"""
+        if self._ws_client is not None:
+            self._ws_client.remove_callback('wallet', self._handle_wallet_update)
+            self._ws_client.remove_callback('position', self._handle_position_update)
+            self._ws_client = None
+
+    async def refresh(self, bybit_client) -> bool:
+        """REST 로 전체 USDT 무기한 포지션과 지갑 조회"""
+        try:
+            response = await bybit_client.v5_get_positions({'category': 'linear', 'settleCoin': 'USDT'})
+            if response and response.get('retCode') == 0:
+                self._positions.clear()
+                for item in response.get('result', {}).get('list', []):
+                    self.update_position(item)
+
+            balance = await bybit_client.exchange.fetch_balance({'type': 'unified', 'accountType': 'UNIFIED'})
+            usdt = (balance or {}).get('USDT', {})
+            if usdt:
+                self._wallet = {
+                    'equity': self._to_float(usdt.get('total')),
+                    'used_margin': self._to_float(usdt.get('used')),
+                    'available': self._to_float(usdt.get('free'))
+                }
+            self.updated_at = time.time()
+            return True
+
+        except Exception as e:
+            logger.error(f"계정 상태 조회 중 오류: {str(e)}")
+            return False
+
+    # ---- 업데이트 ----
+
+    def update_wallet(self, wallet: Dict):
+        """지갑 데이터 반영 (Bybit wallet 형식)"""
+        if not wallet or wallet.get('accountType', 'UNIFIED') != 'UNIFIED':
+            return
+        self._wallet = {
+            'equity': self._to_float(wallet.get('totalEquity')),
+            'used_margin': self._to_float(wallet.get('totalInitialMargin')),
+            'available': self._to_float(wallet.get('totalAvailableBalance'))
+        }
+        self.updated_at = time.time()
+
+    def update_position(self, position: Dict):
+        """포지션 데이터 반영 (Bybit position 형식, 크기 0 이면 제거)"""
+        symbol = position.get('symbol')
+        if not symbol:
+            return
+        size = abs(self._to_float(position.get('size')))
+        if size > 0:
+            self._positions[symbol] = {
+                'side': str(position.get('side', '')).upper(),
+                'size': size,
+                'value': abs(self._to_float(position.get('positionValue'))),
+                'leverage': self._to_float(position.get('leverage'), 1.0),
+                'unrealized_pnl': self._to_float(position.get('unrealisedPnl'))
+            }
+        else:
+            self._positions.pop(symbol, None)
+        self.updated_at = time.time()
+
+    async def _handle_wallet_update(self, data: Dict):
+        try:
+            self.update_wallet(data.get('data', {}))
+        except Exception as e:
+            logger.error(f"계정 상태 지갑 업데이트 중 오류: {str(e)}")
+
+    async def _handle_position_update(self, data: Dict):
+        try:
+            self.update_position(data.get('data', {}))
+        except Exception as e:
+            logger.error(f"계정 상태 포지션 업데이트 중 오류: {str(e)}")
+
+    # ---- 조회 ----
+
+    @property
+    def equity(self) -> float:
+        return self._wallet.get('equity', 0.0)
+
+    @property
+    def available(self) -> float:
+        return self._wallet.get('available', 0.0)
+
+    def has_wallet(self) -> bool:
+        return bool(self._wallet)
+
+    def position(self, symbol: str) -> Optional[Dict]:
+        data = self._positions.get(symbol)
+        return dict(data) if data else None
+
+    def symbols(self) -> List[str]:
+        """포지션이 열려 있는 심볼"""
+        return list(self._positions)
+
+    def exposure(self, exclude: str = None) -> float:
+        """열린 포지션 명목 가치 합계 (exclude 심볼 제외)"""
+        return sum(p['value'] for symbol, p in self._positions.items() if symbol != exclude)
+
+    def unrealized_pnl(self) -> float:
+        return sum(p['unrealized_pnl'] for p in self._positions.values())
+
+    def snapshot(self) -> Dict:
+        return {
+            'wallet': dict(self._wallet),
+            'positions': {symbol: dict(p) for symbol, p in self._positions.items()},
+            'exposure': self.exposure(),
+            'age': round(time.time() - self.updated_at, 1) if self.updated_at else None
+        }
+
+    @staticmethod
+    def _to_float(value, default: float = 0.0) -> float:
+        """안전한 float 변환"""
+        try:
+            if value is None or value == '':
+                return default
+            return float(value)
+        except (ValueError, TypeError):
+            return default
@@ -0,0 +1,129 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+from services.startup_profiler import StartupProfiler
+
+logger = logging.getLogger(__name__)
+
+class ServiceContainer:
+    """서비스 의존성 컨테이너
+
+    각 서비스는 처음 조회될 때 한 번만 생성되고 이후에는 같은 인스턴스를 공유합니다.
+    main 과 TelegramBot, GPTAnalyzer 가 서비스를 각자 생성하던 중복을 없애기 위해 사용합니다.
+    """
+
+    def __init__(self, bybit_client, startup_profiler: StartupProfiler = None):
+        self.bybit_client = bybit_client
+        self.startup_profiler = startup_profiler or StartupProfiler()
+        self._factories: Dict[str, Callable[['ServiceContainer'], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._creating = set()
+        self._lock = threading.RLock()
+        self._register_defaults()
+
+    def register(self, name: str, factory: Callable[['ServiceContainer'], Any]):
+        """서비스 팩토리 등록 (이미 생성된 인스턴스는 교체하지 않음)"""
+        self._factories[name] = factory
+
+    def register_instance(self, name: str, instance: Any):
+        """이미 생성된 인스턴스 등록"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        """서비스 조회 (없으면 생성)"""
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories:
+                raise KeyError(f"등록되지 않은 서비스: {name}")
+            if name in self._creating:
+                raise RuntimeError(f"서비스 순환 의존성 감지: {name}")
+
+            self._creating.add(name)
+            try:
+                start = time.perf_counter()
+                instance = self._factories[name](self)
+                elapsed = time.perf_counter() - start
+                self.startup_profiler.record(f"build:{name}", elapsed)
+                logger.debug(f"서비스 생성: {name} ({elapsed * 1000:.1f}ms)")
+            finally:
+                self._creating.discard(name)
+
+            self._instances[name] = instance
+            return instance
+
+    def is_created(self, name: str) -> bool:
+        """서비스 생성 여부"""
+        return name in self._instances
+
+    def __getattr__(self, name: str) -> Any:
+        # __init__ 이전 또는 내부 속성 조회 시 재귀 방지
+        if name.startswith('_') or '_factories' not in self.__dict__:
+            raise AttributeError(name)
+        if name in self._factories or name in self._instances:
+            return self.get(name)
+        raise AttributeError(name)
+
+    def _register_defaults(self):
+        """기본 서비스 팩토리 등록 (순환 import 방지를 위해 지연 import)"""
+
+        def market_data_service(c):
+            from services.market_data_service import MarketDataService
+            return MarketDataService(c.bybit_client)
+
+        def position_service(c):
+            from services.position_service import PositionService
+            return PositionService(c.bybit_client)
+
+        def balance_service(c):
+            from services.balance_service import BalanceService
+            return BalanceService(c.bybit_client)
+
+        def account_state(c):
+            from services.account_state import AccountState
+            return AccountState.get_instance()
+
+        def exit_manager(c):
+            from trade.exit_manager import ExitManager
+            return ExitManager(c.bybit_client)
+
+        def order_service(c):
+            from services.order_service import OrderService
+            return OrderService(
+                bybit_client=c.bybit_client,
+                position_service=c.position_service,
+                balance_service=c.balance_service,
+                account_state=c.account_state,
+                exit_manager=c.exit_manager
+            )
+
+        def trade_history_service(c):
+            from services.trade_history_service import TradeHistoryService
+            return TradeHistoryService(c.bybit_client)
+
+        def trade_manager(c):
+            from trade.trade_manager import TradeManager
+            return TradeManager(order_service=c.order_service)
+
+        def gpt_analyzer(c):
+            from ai.gpt_analyzer import GPTAnalyzer
+            return GPTAnalyzer(
+                bybit_client=c.bybit_client,
+                market_data_service=c.market_data_service
+            )
+
+        def ai_trader(c):
+            from ai.ai_trader import AITrader
+            return AITrader(
+                bybit_client=c.bybit_client,
+                market_data_service=c.market_data_service,
+                gpt_analyzer=c.gpt_analyzer,
+                trade_manager=c.trade_manager
+            )
+
+        for factory in (market_data_service, position_service, balance_service, account_state, exit_manager,
+                        order_service, trade_history_service, trade_manager, gpt_analyzer, ai_trader):
+            self.register(factory.__name__, factory)
@@ -0,0 +1,269 @@
+import time
+import logging
+import threading
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import config
+from services.storage_io import atomic_write_bytes, run_io
+
+logger = logging.getLogger(__name__)
+
+# 버킷 하나의 레코드 형식
+EQUITY_DTYPE = np.dtype([
+    ('ts', np.int64),                # 버킷 시작 시각 (초)
+    ('equity_open', np.float64),
+    ('equity_high', np.float64),
+    ('equity_low', np.float64),
+    ('equity_close', np.float64),
+    ('used_margin', np.float64),     # 버킷 마지막 값
+    ('unrealized_pnl', np.float64),  # 버킷 마지막 값
+    ('position_size', np.float64),   # 버킷 마지막 값 (수량 합계)
+    ('position_value', np.float64),  # 버킷 마지막 값 (명목 가치 합계)
+    ('max_position_value', np.float64),
+    ('samples', np.int32),
+])
+
+class RollupSeries:
+    """고정 크기 링 버퍼에 버킷 단위로 집계되는 시계열"""
+
+    def __init__(self, bucket_seconds: int, capacity: int):
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=EQUITY_DTYPE)
+        self._head = 0   # 다음에 기록할 위치
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, ts: int, equity: float, used_margin: float,
+               unrealized_pnl: float, position_size: float, position_value: float):
+        """샘플 반영 (같은 버킷이면 갱신, 새 버킷이면 추가)"""
+        bucket = ts - ts % self.bucket_seconds
+        last = (self._head - 1) % self.capacity
+
+        if self._count and self._data[last]['ts'] == bucket:
+            row = self._data[last]
+            row['equity_high'] = max(row['equity_high'], equity)
+            row['equity_low'] = min(row['equity_low'], equity)
+            row['equity_close'] = equity
+            row['used_margin'] = used_margin
+            row['unrealized_pnl'] = unrealized_pnl
+            row['position_size'] = position_size
+            row['position_value'] = position_value
+            row['max_position_value'] = max(row['max_position_value'], position_value)
+            row['samples'] += 1
+            return
+
+        # 이미 지난 버킷의 늦게 도착한 샘플은 무시
+        if self._count and bucket < self._data[last]['ts']:
+            return
+
+        self._data[self._head] = (bucket, equity, equity, equity, equity, used_margin,
+                                  unrealized_pnl, position_size, position_value, position_value, 1)
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def to_array(self, start: int = None, end: int = None) -> np.ndarray:
+        """시간순 정렬된 복사본 반환 (start/end 는 초 단위)"""
+        if self._count < self.capacity:
+            data = self._data[:self._count].copy()
+        else:
+            data = np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+        if start is not None:
+            data = data[data['ts'] >= start - start % self.bucket_seconds]
+        if end is not None:
+            data = data[data['ts'] <= end]
+        return data
+
+    def load(self, data: np.ndarray):
+        """저장된 배열로 초기화 (용량을 넘으면 최근 데이터만 유지)"""
+        data = np.sort(data.astype(EQUITY_DTYPE), order='ts')[-self.capacity:]
+        self._data[:] = 0
+        self._data[:len(data)] = data
+        self._count = len(data)
+        self._head = self._count % self.capacity
+
+class EquityStore:
+    """계좌 자산 시계열 저장소
+
+    지갑/포지션 스트림에서 받은 샘플을 1분/1시간/1일 버킷으로 동시에 집계합니다.
+    각 단계는 고정 크기 링 버퍼라서 메모리 사용량이 일정하며,
+    자산 곡선/낙폭/노출도 조회는 거래소 호출 없이 메모리에서 바로 계산됩니다.
+    """
+
+    # 단계별 (버킷 크기(초), 보관 개수)
+    TIERS = {
+        '1m': (60, 2 * 24 * 60),    # 2일
+        '1h': (3600, 90 * 24),      # 90일
+        '1d': (86400, 5 * 365),     # 5년
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'EquityStore':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, base_dir: Path = None):
+        self.equity_dir = (Path(base_dir) if base_dir else config.data_dir) / 'equity'
+        self._lock = threading.Lock()
+        self._series = {
+            tier: RollupSeries(bucket_seconds, capacity)
+            for tier, (bucket_seconds, capacity) in self.TIERS.items()
+        }
+        self._latest: Optional[Dict] = None
+        self._dirty = False
+        self._load()
+
+    # ---- 기록 ----
+
+    def record(self, equity: float, used_margin: float = 0.0, unrealized_pnl: float = 0.0,
+               position_size: float = 0.0, position_value: float = 0.0, timestamp: float = None):
+        """자산 샘플 기록 (모든 단계에 동시 반영)"""
+        try:
+            ts = int(timestamp if timestamp is not None else time.time())
+            with self._lock:
+                for series in self._series.values():
+                    series.record(ts, equity, used_margin, unrealized_pnl, position_size, position_value)
+                self._latest = {
+                    'timestamp': ts,
+                    'equity': equity,
+                    'used_margin': used_margin,
+                    'unrealized_pnl': unrealized_pnl,
+                    'position_size': position_size,
+                    'position_value': position_value
+                }
+                self._dirty = True
+        except Exception as e:
+            logger.error(f"자산 샘플 기록 중 오류: {str(e)}")
+
+    # ---- 조회 ----
+
+    def get_latest(self) -> Optional[Dict]:
+        """마지막 샘플"""
+        with self._lock:
+            return dict(self._latest) if self._latest else None
+
+    def get_series(self, tier: str = '1h', start: int = None, end: int = None) -> np.ndarray:
+        """단계별 시계열 배열 (start/end 는 초 단위)"""
+        if tier not in self._series:
+            raise ValueError(f"지원하지 않는 단계: {tier}")
+        with self._lock:
+            return self._series[tier].to_array(start, end)
+
+    def get_equity_curve(self, tier: str = '1h', start: int = None, end: int = None) -> List[Dict]:
+        """자산 곡선 (버킷별 시각/종가/고가/저가)"""
+        data = self.get_series(tier, start, end)
+        return [
+            {
+                'timestamp': int(row['ts']),
+                'equity': float(row['equity_close']),
+                'high': float(row['equity_high']),
+                'low': float(row['equity_low'])
+            }
+            for row in data
+        ]
+
+    def get_drawdown(self, tier: str = '1h', start: int = None, end: int = None) -> Dict:
+        """최대/현재 낙폭 (버킷 고가의 누적 최고점 대비 저가 기준)"""
+        data = self.get_series(tier, start, end)
+        if not len(data):
+            return {}
+
+        peaks = np.maximum.accumulate(data['equity_high'])
+        drawdowns = peaks - data['equity_low']
+        worst = int(np.argmax(drawdowns))
+        peak = float(peaks[-1])
+        current = float(data['equity_close'][-1])
+
+        return {
+            'peak_equity': peak,
+            'current_equity': current,
+            'current_drawdown': peak - current,
+            'current_drawdown_pct': (peak - current) / peak * 100 if peak > 0 else 0.0,
+            'max_drawdown': float(drawdowns[worst]),
+            'max_drawdown_pct': float(drawdowns[worst] / peaks[worst] * 100) if peaks[worst] > 0 else 0.0,
+            'max_drawdown_at': int(data['ts'][worst])
+        }
+
+    def get_exposure(self, tier: str = '1h', start: int = None, end: int = None) -> Dict:
+        """포지션 노출도 및 증거금 사용률"""
+        data = self.get_series(tier, start, end)
+        if not len(data):
+            return {}
+
+        equity = data['equity_close']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margin_usage = np.where(equity > 0, data['used_margin'] / equity * 100, 0.0)
+            leverage = np.where(equity > 0, data['max_position_value'] / equity, 0.0)
+        in_market = data['position_size'] > 0
+
+        return {
+            'avg_position_value': float(data['position_value'].mean()),
+            'max_position_value': float(data['max_position_value'].max()),
+            'avg_margin_usage_pct': float(margin_usage.mean()),
+            'max_margin_usage_pct': float(margin_usage.max()),
+            'max_effective_leverage': float(leverage.max()),
+            'time_in_market_pct': float(in_market.mean() * 100)
+        }
+
+    # ---- 저장 ----
+
+    def save(self) -> bool:
+        """변경된 경우 단계별 배열을 .npy 파일로 저장"""
+        try:
+            with self._lock:
+                if not self._dirty:
+                    return True
+                snapshots = {tier: series.to_array() for tier, series in self._series.items()}
+                self._dirty = False
+
+            for tier, data in snapshots.items():
+                atomic_write_bytes(
+                    self.equity_dir / f"equity_{tier}.npy",
+                    lambda f, data=data: np.save(f, data, allow_pickle=False)
+                )
+            return True
+
+        except Exception as e:
+            logger.error(f"자산 시계열 저장 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
+
+    async def save_async(self) -> bool:
+        """자산 시계열 저장 (스토리지 I/O 스레드에서 실행)"""
+        return await run_io(self.save)
+
+    def _load(self):
+        """저장된 시계열 로드"""
+        for tier, series in self._series.items():
+            path = self.equity_dir / f"equity_{tier}.npy"
+            if not path.exists():
+                continue
+            try:
+                series.load(np.load(path, allow_pickle=False))
+            except Exception as e:
+                logger.error(f"자산 시계열 로드 중 오류 ({path}): {str(e)}")
+
+        data = self._series['1m'].to_array()
+        if len(data):
+            row = data[-1]
+            self._latest = {
+                'timestamp': int(row['ts']),
+                'equity': float(row['equity_close']),
+                'used_margin': float(row['used_margin']),
+                'unrealized_pnl': float(row['unrealized_pnl']),
+                'position_size': float(row['position_size']),
+                'position_value': float(row['position_value'])
+            }
@@ -0,0 +1,320 @@
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from decimal import Decimal
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional
+
+from config import config
+from config.trading_config import trading_config
+from services.storage_io import atomic_write_json, read_json, run_io
+
+logger = logging.getLogger(__name__)
+
+# ccxt precisionMode 값 (ccxt 를 import 하지 않고 비교하기 위해 정의)
+DECIMAL_PLACES = 2
+TICK_SIZE = 4
+
+# load_markets 정보가 없을 때 쓰는 BTCUSDT 무기한 기본값
+DEFAULT_SPEC = {
+    'symbol': 'BTCUSDT',
+    'qty_step': 0.001,
+    'min_qty': 0.001,
+    'max_qty': 100.0,
+    'tick_size': 0.1,
+    'min_notional': 0.0,
+    'max_leverage': 100,
+    'risk_tiers': []      # [{'max_notional', 'maintenance_margin', 'max_leverage'}] 명목 가치 오름차순
+}
+
+def _number(value, default=None) -> Optional[float]:
+    try:
+        if value is None or value == '':
+            return default
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def _precision_step(value, precision_mode: int) -> Optional[float]:
+    """ccxt precision 값을 단위 크기로 변환 (DECIMAL_PLACES 모드면 자릿수 → 10^-n)"""
+    value = _number(value)
+    if value is None:
+        return None
+    if precision_mode == DECIMAL_PLACES:
+        return 10 ** -int(value)
+    return value
+
+def _decimals(step: float) -> int:
+    return max(0, -Decimal(str(step)).normalize().as_tuple().exponent)
+
+def market_symbol(symbol: str) -> str:
+    """통합 심볼(BTC/USDT:USDT) → 거래소 심볼(BTCUSDT)"""
+    return symbol.split(':')[0].replace('/', '')
+
+def instrument_spec(market: Dict, precision_mode: int = TICK_SIZE) -> Dict:
+    """ccxt load_markets 의 market 항목 → 수량/가격 단위 정보
+
+    Bybit 원본(info.lotSizeFilter/priceFilter)을 우선 사용하고, 없으면 ccxt 정규화 값을 사용합니다.
+    """
+    info = market.get('info') or {}
+    lot = info.get('lotSizeFilter') or {}
+    price_filter = info.get('priceFilter') or {}
+    leverage_filter = info.get('leverageFilter') or {}
+    precision = market.get('precision') or {}
+    limits = market.get('limits') or {}
+
+    qty_step = _number(lot.get('qtyStep')) or _precision_step(precision.get('amount'), precision_mode)
+    tick_size = _number(price_filter.get('tickSize')) or _precision_step(precision.get('price'), precision_mode)
+    return {
+        'symbol': market.get('id') or DEFAULT_SPEC['symbol'],
+        'unified_symbol': market.get('symbol'),
+        'qty_step': qty_step or DEFAULT_SPEC['qty_step'],
+        'min_qty': _number(lot.get('minOrderQty')) or _number((limits.get('amount') or {}).get('min'))
+                   or qty_step or DEFAULT_SPEC['min_qty'],
+        'max_qty': _number(lot.get('maxOrderQty')) or _number((limits.get('amount') or {}).get('max'))
+                   or DEFAULT_SPEC['max_qty'],
+        'tick_size': tick_size or DEFAULT_SPEC['tick_size'],
+        'min_notional': _number(lot.get('minNotionalValue')) or _number((limits.get('cost') or {}).get('min'), 0.0),
+        'max_leverage': _number(leverage_filter.get('maxLeverage')) or _number((limits.get('leverage') or {}).get('max'))
+                        or DEFAULT_SPEC['max_leverage']
+    }
+
+def margin_rate_scale(items: List[Dict]) -> float:
+    """위험 한도 응답의 증거금률 단위 (퍼센트 표기면 100, 비율 표기면 1)
+
+    단계마다 값 크기로 판단하면 퍼센트 표기의 1 미만 값(예: 0.5%)을 비율로 잘못 읽으므로
+    응답 전체에서 한 번 결정합니다. 초기 증거금률 × 최대 레버리지는 퍼센트 표기면 약 100
+    (1% × 100배), 비율 표기면 약 1 (0.01 × 100배) 입니다.
+    초기 증거금률이 없으면 유지 증거금률 중 1 이상인 값이 있을 때 퍼센트로 봅니다.
+    """
+    products = [
+        initial * leverage
+        for initial, leverage in ((_number(item.get('initialMargin')), _number(item.get('maxLeverage')))
+                                  for item in items)
+        if initial and leverage
+    ]
+    if products:
+        return 100.0 if median(products) >= 10 else 1.0
+    return 100.0 if any((_number(item.get('maintenanceMargin')) or 0) >= 1 for item in items) else 1.0
+
+def risk_tiers(items: List[Dict]) -> List[Dict]:
+    """Bybit /v5/market/risk-limit 목록 → 명목 가치 오름차순 위험 한도 단계 (유지 증거금률은 비율)"""
+    items = items or []
+    scale = margin_rate_scale(items)
+    tiers = []
+    for item in items:
+        max_notional = _number(item.get('riskLimitValue'))
+        maintenance_margin = _number(item.get('maintenanceMargin'))
+        if not max_notional or maintenance_margin is None:
+            continue
+        maintenance_margin /= scale
+        tiers.append({
+            'max_notional': max_notional,
+            'maintenance_margin': maintenance_margin,
+            'max_leverage': _number(item.get('maxLeverage'), DEFAULT_SPEC['max_leverage'])
+        })
+    return sorted(tiers, key=lambda tier: tier['max_notional'])
+
+def find_market(markets: Dict, symbol: str) -> Optional[Dict]:
+    """load_markets 결과에서 거래소 심볼(BTCUSDT) 또는 통합 심볼(BTC/USDT:USDT)로 선물 시장 검색"""
+    if not markets:
+        return None
+    if symbol in markets:
+        return markets[symbol]
+    candidates = [market for market in markets.values() if market.get('id') == symbol]
+    for market in candidates:
+        if market.get('linear') or market.get('swap'):
+            return market
+    return candidates[0] if candidates else None
+
+class InstrumentCache:
+    """심볼별 거래 단위/위험 한도 캐시
+
+    - load_markets 의 호가/수량 단위, 최소 명목 가치, 최대 레버리지와 위험 한도 단계를 보관
+    - data/instruments.json 에 저장하여 재시작 직후(마켓 로드 전)에도 같은 단위 사용
+    - refresh_interval 마다 거래소에서 다시 읽어 갱신 (start/stop)
+    - 조회는 메모리에서만 수행 (주문 경로에서 거래소 호출 없음)
+    """
+
+    DEFAULT_SETTINGS = {
+        'refresh_interval': 21600,    # 갱신 주기 (초)
+        'symbols': [],                # 비어 있으면 market_config.json 의 symbols.allowed
+        'fetch_risk_tiers': True
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'InstrumentCache':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, settings: Dict = None, path: Path = None):
+        market_config = config.load_json_config('market_config.json')
+        if settings is None:
+            settings = market_config.get('instruments', {})
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.refresh_interval = float(options['refresh_interval'])
+        self.symbols = [market_symbol(symbol) for symbol in (
+            options['symbols'] or market_config.get('symbols', {}).get('allowed') or [trading_config.symbol]
+        )]
+        self.fetch_risk_tiers = bool(options['fetch_risk_tiers'])
+        self.path = Path(path) if path else config.data_dir / 'instruments.json'
+
+        self._lock = threading.Lock()
+        self._specs: Dict[str, Dict] = {}
+        self._market_loaded = set()   # 이번 실행에서 load_markets 정보로 갱신된 심볼
+        self._defaults: Dict[str, Dict] = {}   # 정보가 없는 심볼의 기본값 (저장하지 않음)
+        self.updated_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._load()
+
+    # ---- 조회 ----
+
+    def get(self, symbol: str = None) -> Dict:
+        """심볼 단위 정보 (없으면 기본값, 심볼은 BTCUSDT 또는 BTC/USDT:USDT 형식)"""
+        symbol = market_symbol(symbol or trading_config.symbol)
+        spec = self._specs.get(symbol)
+        if spec is not None:
+            return spec
+        spec = self._defaults.get(symbol)
+        if spec is None:
+            if symbol != DEFAULT_SPEC['symbol']:
+                logger.warning(f"{symbol} 거래 단위 정보 없음 - 기본값 사용")
+            spec = self._defaults[symbol] = self.update({**DEFAULT_SPEC, 'symbol': symbol}, register=False)
+        return spec
+
+    def has(self, symbol: str) -> bool:
+        return market_symbol(symbol) in self._specs
+
+    def is_stale(self) -> bool:
+        return time.time() - self.updated_at >= self.refresh_interval
+
+    # ---- 갱신 ----
+
+    def update(self, spec: Dict, register: bool = True) -> Dict:
+        """심볼 단위 정보 등록 (소수 자릿수 계산 포함, register=False 면 정규화만)"""
+        spec = {**DEFAULT_SPEC, **spec}
+        spec['qty_decimals'] = _decimals(spec['qty_step'])
+        spec['price_decimals'] = _decimals(spec['tick_size'])
+        if register:
+            with self._lock:
+                self._specs[spec['symbol']] = spec
+        return spec
+
+    def apply_markets(self, markets: Dict, symbols: List[str] = None, precision_mode: int = TICK_SIZE) -> int:
+        """ccxt load_markets 결과 반영 (거래소 호출 없음, 기존 위험 한도 단계는 유지)"""
+        count = 0
+        for symbol in symbols or self.symbols:
+            symbol = market_symbol(symbol)
+            market = find_market(markets, symbol)
+            if not market:
+                logger.warning(f"{symbol} 시장 정보 없음")
+                continue
+            spec = instrument_spec(market, precision_mode)
+            spec['risk_tiers'] = self._specs.get(symbol, {}).get('risk_tiers', [])
+            self.update(spec)
+            self._market_loaded.add(symbol)
+            count += 1
+        return count
+
+    def sync_exchange(self, exchange, symbol: str = None) -> bool:
+        """exchange.markets 가 로드되어 있으면 아직 반영하지 않은 심볼만 반영"""
+        symbol = market_symbol(symbol or trading_config.symbol)
+        if symbol in self._market_loaded:
+            return True
+        markets = getattr(exchange, 'markets', None)
+        if not isinstance(markets, dict) or not markets:
+            return False
+        return self.apply_markets(markets, [symbol], getattr(exchange, 'precisionMode', TICK_SIZE)) > 0
+
+    async def refresh(self, exchange, symbols: List[str] = None, force: bool = False) -> bool:
+        """거래소에서 단위 정보/위험 한도 다시 읽기 (주기 내이면 건너뜀)"""
+        try:
+            if not force and not self.is_stale() and self._market_loaded:
+                return True
+            symbols = [market_symbol(symbol) for symbol in (symbols or self.symbols)]
+
+            markets = getattr(exchange, 'markets', None)
+            if force or not markets:
+                markets = await exchange.load_markets(True)
+            count = self.apply_markets(markets, symbols, getattr(exchange, 'precisionMode', TICK_SIZE))
+
+            if self.fetch_risk_tiers:
+                for symbol in symbols:
+                    tiers = await self._fetch_risk_tiers(exchange, symbol)
+                    if tiers and symbol in self._specs:
+                        self.update({**self._specs[symbol], 'risk_tiers': tiers})
+
+            self.updated_at = time.time()
+            await run_io(self.save)
+            logger.info(f"거래 단위 정보 갱신 완료 ({count}/{len(symbols)}개 심볼)")
+            return count > 0
+
+        except Exception as e:
+            logger.error(f"거래 단위 정보 갱신 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
+
+    async def _fetch_risk_tiers(self, exchange, symbol: str) -> List[Dict]:
+        """위험 한도 단계 조회 (GET /v5/market/risk-limit)"""
+        try:
+            response = await exchange.public_get_v5_market_risk_limit({'category': 'linear', 'symbol': symbol})
+            return risk_tiers(((response or {}).get('result') or {}).get('list') or [])
+        except Exception as e:
+            logger.error(f"{symbol} 위험 한도 조회 중 오류: {str(e)}")
+            return []
+
+    # ---- 주기 갱신 ----
+
+    def start(self, exchange):
+        """refresh_interval 마다 갱신하는 백그라운드 작업 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop(exchange))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self, exchange):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh(exchange, force=True)
+
+    # ---- 저장 ----
+
+    def save(self):
+        """단위 정보 파일 저장"""
+        with self._lock:
+            data = {
+                'updated_at': self.updated_at,
+                'instruments': {
+                    symbol: {key: value for key, value in spec.items() if key not in ('qty_decimals', 'price_decimals')}
+                    for symbol, spec in self._specs.items()
+                }
+            }
+        atomic_write_json(self.path, data)
+
+    def _load(self):
+        try:
+            data = read_json(self.path)
+            if not data:
+                return
+            for spec in data.get('instruments', {}).values():
+                self.update(spec)
+            self.updated_at = float(data.get('updated_at', 0))
+            logger.info(f"저장된 거래 단위 정보 로드: {len(self._specs)}개 심볼")
+        except Exception as e:
+            logger.error(f"거래 단위 정보 로드 중 오류: {str(e)}")
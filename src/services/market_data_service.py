@@ -9,6 +9,8 @@ import ccxt.async_support as ccxt
 import asyncio
 from exchange.bybit_client import BybitClient
 from config import config
+from services.instrument_cache import InstrumentCache
+from services.tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,7 @@ class MarketDataService:
         self.bybit_client = bybit_client
         self.exchange = bybit_client.exchange
         self.markets = {}
+        self.instrument_cache = InstrumentCache.get_instance()
         
         # 설정 로드
         market_config = config.load_json_config('market_config.json')
@@ -58,6 +61,10 @@ class MarketDataService:
             self.markets = self.bybit_client.exchange.markets
             logger.info("마켓 데이터 로드 완료")
             
+            # 거래 단위/위험 한도 캐시 갱신 후 주기 갱신 시작
+            await self.instrument_cache.refresh(self.exchange)
+            self.instrument_cache.start(self.exchange)
+            
         except ccxt.InvalidNonce as e:
             logger.error(f"타임스탬프 오류: {str(e)}")
             # 시간 동기화 후 재시도
@@ -68,6 +75,7 @@ class MarketDataService:
             logger.error(f"마켓 데이터 로드 실패: {str(e)}")
             raise
 
+    @traced('market_data.get_ohlcv')
     async def get_ohlcv(self, symbol: str, timeframe: str) -> List[Dict]:
         """OHLCV 데이터 조회"""
         try:
@@ -0,0 +1,279 @@
+import os
+import time
+import asyncio
+import logging
+import resource
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# 초 단위 지연 히스토그램 기본 구간 (1ms ~ 2분)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric:
+    """레이블 값 튜플별 값을 보관하는 지표 (레이블 값은 선언 순서대로 위치 인자로 전달)
+
+    이벤트 루프 한 곳에서만 갱신된다고 보고 잠금을 쓰지 않습니다 (핫 패스 비용 최소화).
+    """
+
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, object] = {}
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, value: float, *labels: str):
+        """다른 객체가 누적한 값 반영 (collector 용)"""
+        self._values[labels] = value
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self._values.items()]
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self._values.items()]
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        """구간별 개수는 누적하지 않고 저장 (렌더링 시 누적)"""
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """프로세스 지표 저장소 (Prometheus 텍스트 형식 0.0.4 로 출력)
+
+    - 카운터/히스토그램은 이벤트가 날 때 딕셔너리 갱신만 하고,
+      대기열 깊이/루프 지연/메모리 같은 현재 값은 수집 시점에 collector 로 계산
+    - 같은 이름으로 다시 선언하면 기존 지표를 반환 (모듈 재임포트/테스트 안전)
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'MetricsRegistry':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labels)
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labels)
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labels, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]):
+        """수집 직전에 호출할 함수 등록 (게이지 값 갱신용)"""
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"지표 수집 중 오류: {str(e)}")
+
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, cls, name: str, documentation: str, labels: Iterable[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labels, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"같은 이름의 다른 종류 지표: {name}")
+            return metric
+
+registry = MetricsRegistry.get_instance()
+
+# ---- 공통 지표 ----
+
+PROCESS_RSS = registry.gauge('process_resident_memory_bytes', '프로세스 상주 메모리 (bytes)')
+PROCESS_START = registry.gauge('process_start_time_seconds', '프로세스 시작 시각 (epoch 초)')
+
+def _collect_process():
+    PROCESS_RSS.set(resident_memory_bytes())
+    PROCESS_START.set(registry.started_at)
+
+registry.add_collector(_collect_process)
+
+EVENT_LOOP_LAG = registry.histogram('event_loop_lag_seconds', '이벤트 루프 지연 (0.5초 주기 측정)',
+                                    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+QUEUE_DEPTH = registry.gauge('queue_depth', '대기열 깊이 (notification: 미전송 알림, analysis: 실행 중인 분석)',
+                             ('queue',))
+
+# ---- 거래소 (exchange 패키지는 services 를 import 하지 않으므로 여기서 선언하고 봇이 연결) ----
+
+REST_REQUESTS = registry.counter('bybit_rest_requests_total', 'Bybit REST 요청 수', ('client', 'endpoint', 'status'))
+REST_LATENCY = registry.histogram('bybit_rest_request_duration_seconds', 'Bybit REST 요청 소요 시간',
+                                  ('client', 'endpoint'))
+WS_MESSAGES = registry.counter('websocket_messages_total', '웹소켓 수신 메시지 수', ('client', 'topic'))
+WS_RECONNECTS = registry.counter('websocket_reconnects_total', '웹소켓 재연결 수', ('client',))
+
+def observe_rest_request(client: str, endpoint: str, status: str, elapsed: float):
+    """BybitClient.request_observer 로 연결"""
+    REST_REQUESTS.inc(client, endpoint, status)
+    REST_LATENCY.observe(elapsed, client, endpoint)
+
+def collect_websocket(client: str, ws_client):
+    """웹소켓 클라이언트가 누적한 토픽별 메시지 수/재연결 수 반영"""
+    for topic, count in list(ws_client.message_counts.items()):
+        WS_MESSAGES.set_total(count, client, topic)
+    WS_RECONNECTS.set_total(ws_client.reconnect_count, client)
+
+def resident_memory_bytes() -> float:
+    """현재 RSS (/proc 이 없으면 최대 RSS)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # macOS 는 bytes, Linux 는 KB
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if os.uname().sysname == 'Darwin' else usage * 1024
+
+class MetricsServer:
+    """/metrics HTTP 엔드포인트 (asyncio 스트림 서버, 외부 의존성 없음)"""
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'host': '127.0.0.1',
+        'port': 9108
+    }
+
+    def __init__(self, metrics_registry: MetricsRegistry = None, settings: Dict = None):
+        if settings is None:
+            settings = config.load_json_config('metrics_config.json')
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.registry = metrics_registry or registry
+        self.enabled = bool(options['enabled'])
+        self.host = options['host']
+        self.port = int(options['port'])
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """지표 서버 시작 (포트 사용 중이면 경고만 남김)"""
+        if not self.enabled or self._server:
+            return
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            logger.info(f"지표 엔드포인트 시작: http://{self.host}:{self.port}/metrics")
+        except OSError as e:
+            logger.error(f"지표 엔드포인트 시작 실패: {str(e)}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            logger.info("지표 엔드포인트 중지됨")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            # 헤더는 읽고 버림
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b'\r\n', b'\n', b''):
+                pass
+
+            parts = request_line.decode('latin-1').split()
+            path = parts[1].split('?')[0] if len(parts) > 1 else ''
+            if len(parts) > 1 and parts[0] == 'GET' and path == '/metrics':
+                status, body = '200 OK', self.registry.render().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            else:
+                status, body, content_type = '404 Not Found', b'not found\n', 'text/plain'
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"지표 요청 처리 중 오류: {str(e)}")
+        finally:
+            writer.close()
@@ -10,24 +10,46 @@ from config.trading_config import trading_config
 from telegram_bot.formatters.order_formatter import OrderFormatter
 from services.position_service import PositionService
 from services.balance_service import BalanceService
+from services.risk_engine import RiskEngine
+from services.account_state import AccountState
+from services.tracer import Tracer, traced
+from services.metrics import registry
 
 logger = logging.getLogger('order_service')
 
+ORDERS = registry.counter('orders_total', '주문 요청 결과 (placed/rejected)', ('kind', 'result'))
+
 class OrderService:
     def __init__(self, bybit_client: BybitClient, position_service: PositionService, 
-                 balance_service: BalanceService, telegram_bot=None):
+                 balance_service: BalanceService, telegram_bot=None, risk_engine: RiskEngine = None,
+                 account_state: AccountState = None, exit_manager=None):
         self.bybit_client = bybit_client
         self.position_service = position_service
         self.balance_service = balance_service
         self.telegram_bot = telegram_bot
+        self.risk_engine = risk_engine or RiskEngine.get_instance()
+        self.account_state = account_state or AccountState.get_instance()
+        self.exit_manager = exit_manager  # 분할 익절/트레일링 실행기 (없으면 1차 익절가 전량 청산)
+        self.tracer = Tracer.get_instance()
         self.order_formatter = OrderFormatter()
-        self.symbol = 'BTCUSDT'
+        self.symbol = trading_config.symbol
         
         # 메시지 타입 상수 정의
         self.MSG_TYPE_ORDER = 'order'
         self.MSG_TYPE_INFO = 'info'
         self.MSG_TYPE_ERROR = 'error'
 
+    async def _submit_order(self, kind: str, awaitable, **attributes):
+        """주문 전송 (구간 추적 + 결과 집계, 예외/retCode 오류/빈 응답은 거부로 집계)"""
+        try:
+            result = await self.tracer.measure('exchange.create_order', awaitable, **attributes)
+        except Exception:
+            ORDERS.inc(kind, 'rejected')
+            raise
+        placed = bool(result) and (not isinstance(result, dict) or result.get('retCode', 0) == 0)
+        ORDERS.inc(kind, 'placed' if placed else 'rejected')
+        return result
+
     def _validate_side(self, side: str) -> str:
         """주문 방향 검증"""
         if side not in ['Buy', 'Sell']:
@@ -40,22 +62,22 @@ class OrderService:
             logger.info(f"주문 시도: {signal}")
             
             # 1. 미체결 주문 확인 및 처리
-            open_orders = await self.bybit_client.exchange.fetch_open_orders(
+            open_orders = await self.tracer.measure('exchange.fetch_open_orders', self.bybit_client.exchange.fetch_open_orders(
                 symbol=signal['symbol'],
                 params={'category': 'linear'}
-            )
+            ))
             
             if open_orders:
                 logger.info(f"미체결 주문 {len(open_orders)}개 발견 - 취소 처리")
                 # 모든 미체결 주문 취소
-                await self.bybit_client.exchange.cancel_all_orders(
+                await self.tracer.measure('exchange.cancel_all_orders', self.bybit_client.exchange.cancel_all_orders(
                     symbol=signal['symbol'],
                     params={'category': 'linear'}
-                )
+                ))
                 await asyncio.sleep(1)  # 주문 취소 처리 대기
             
             # 2. 현재 포지션 확인
-            current_position = await self.position_service.get_position(signal['symbol'])
+            current_position = await self.tracer.measure('exchange.get_position', self.position_service.get_position(signal['symbol']))
             
             # 3. 포지션 없는 경우 신규 진입 (size가 0이거나 current_position이 None인 경우)
             if not current_position or float(current_position.get('size', 0)) == 0:
@@ -89,11 +111,6 @@ class OrderService:
             take_profit = order_info.get('take_profit', 0)
             is_btc_unit = order_info.get('is_btc_unit', False)
             
-            # 레버리지 설정
-            logger.info(f"레버리지 설정 시도: {leverage}x")
-            await self.set_leverage(leverage)
-            logger.info(f"레버리지 설정 확인: {leverage}x")
-            
             # 잔고 조회
             balance = await self.get_balance()
             if not balance:
@@ -102,15 +119,28 @@ class OrderService:
                 
             logger.info(f"USDT 잔고 - 총자산: ${balance['total_equity']:,.2f}, 가용잔고: ${balance['available_balance']:,.2f}, 사용중: ${balance['used_margin']:,.2f}")
             
-            # 수량 계산
-            btc_qty = await self._calculate_position_size(
-                total_equity=balance['total_equity'],
-                unrealized_pnl=balance['unrealized_pnl'],
-                percentage=position_size / 100,  # percentage to decimal
-                leverage=leverage,
-                entry_price=entry_price,
-                is_btc_unit=is_btc_unit
+            # 수량/레버리지/손절·익절 계산 (리스크 엔진)
+            plan = self._calculate_position_size(
+                balance, position_size, leverage, entry_price, side,
+                stop_loss=stop_loss, take_profit=take_profit, is_btc_unit=is_btc_unit, symbol=symbol
             )
+            if not plan:
+                return False
+            btc_qty = plan['qty']
+            leverage = plan['leverage']
+            entry_price = plan['entry_price']
+            stop_loss = plan['stop_loss']
+            take_profit = plan['take_profit']
+            
+            # 분할 익절: 진입 주문에는 2차 익절가를 전량으로 걸고 1차 익절은 청산 실행기가 등록
+            take_profit2 = order_info.get('take_profit2')
+            use_ladder = bool(self.exit_manager) and self.exit_manager.accepts(side, entry_price, take_profit, take_profit2)
+            exchange_take_profit = float(take_profit2) if use_ladder else take_profit
+            
+            # 레버리지 설정
+            logger.info(f"레버리지 설정 시도: {leverage}x")
+            await self.set_leverage(leverage, symbol)
+            logger.info(f"레버리지 설정 확인: {leverage}x")
             
             # CCXT 주문 파라미터 설정
             order_params = {
@@ -123,20 +153,26 @@ class OrderService:
                     'category': 'linear',
                     'timeInForce': 'GTC',
                     'positionIdx': 0,
-                    'stopLoss': str(stop_loss),
-                    'takeProfit': str(take_profit)  # take_profit으로 통일
+                    'stopLoss': self.risk_engine.format_price(stop_loss, symbol),
+                    'takeProfit': self.risk_engine.format_price(exchange_take_profit, symbol)
                 }
             }
             
             # CCXT를 통한 주문 실행
             logger.info(f"신규 포지션 생성 시도: {order_params}")
-            order_result = await self.bybit_client.exchange.create_order(**order_params)
+            order_result = await self._submit_order('entry', self.bybit_client.exchange.create_order(**order_params))
             
             if order_result:
                 logger.info(f"신규 포지션 생성 성공: {order_params}")
                 logger.info("주문 결과:")
                 logger.info(json.dumps(order_result, indent=2))
                 
+                if use_ladder:
+                    self.exit_manager.register(
+                        symbol, side, btc_qty, entry_price, stop_loss, take_profit,
+                        float(self.risk_engine.round_price(take_profit2, symbol))
+                    )
+                
                 # 텔레그램 알림 전송 (skip_notification이 False일 때만)
                 if self.telegram_bot and not skip_notification:
                     formatted_message = self.order_formatter.format_order({
@@ -237,44 +273,49 @@ class OrderService:
             logger.info(f"레버리지 차이가 작음({leverage_diff}) - 크기만 조정")
             
             # 계좌 잔고 조회
-            balance = await self.balance_service.get_balance()
+            balance = await self.get_balance()
             if not balance:
                 return False
                 
-            usdt_balance = balance['currencies']['USDT']
-            logger.info(f"가용 잔고: ${usdt_balance['available_balance']}, 총 자산: ${usdt_balance['total_equity']}, 사용중: ${usdt_balance['used_margin']}")
-            
-            # 목표 포지션 크기 계산
-            target_size = await self._calculate_position_size(
-                total_equity=float(usdt_balance['total_equity']),
-                unrealized_pnl=float(usdt_balance.get('unrealized_pnl', 0)),
-                percentage=signal['position_size'],
-                leverage=signal['leverage'],
-                entry_price=signal['entry_price']
+            logger.info(f"가용 잔고: ${balance['available_balance']}, 총 자산: ${balance['total_equity']}, 사용중: ${balance['used_margin']}")
+            
+            # 목표 포지션 크기 계산 (신규 진입과 같은 기준 자산/비중)
+            plan = self._calculate_position_size(
+                balance, signal['position_size'], signal['leverage'], signal['entry_price'], signal['side'],
+                stop_loss=signal.get('stop_loss'), take_profit=signal.get('take_profit'),
+                symbol=current_position['symbol']
             )
+            if not plan:
+                return False
+            target_size = plan['qty']
             
             # 크기 차이 계산
             current_size = abs(float(current_position['size']))
             size_diff = target_size - current_size
             
-            if abs(size_diff) < 0.001:  # 최소 변경 크기
+            if not self.risk_engine.is_size_change(current_size, target_size, current_position['symbol']):
                 logger.info(f"포지션 크기 차이가 미미함 - 조정 불필요 (현재: {current_size:.3f} BTC, 목표: {target_size:.3f} BTC)")
                 return True
             
+            # 수량이 바뀌면 등록된 분할 익절 수량과 맞지 않으므로 청산 계획 해제
+            if self.exit_manager:
+                self.exit_manager.release(signal['symbol'])
+            
             logger.info(f"포지션 크기 조정 필요 - 현재: {current_size:.3f} BTC, 목표: {target_size:.3f} BTC, 차이: {size_diff:.3f} BTC")
             
             # 크기 조정 주문
             order_side = signal['side']
-            if size_diff < 0:  # 크기 감소
+            reduce_only = size_diff < 0
+            if reduce_only:  # 크기 감소
                 order_side = 'Sell' if current_side == 'Long' else 'Buy'
-                size_diff = abs(size_diff)
+            size_diff = float(self.risk_engine.round_qty(abs(size_diff), current_position['symbol']))
             
             # 조정 주문 실행
             if not await self.create_market_order(
                 symbol=current_position['symbol'].split(':')[0],
                 side=order_side,
                 size=size_diff,
-                reduce_only=(size_diff < 0)
+                reduce_only=reduce_only
             ):
                 return False
             
@@ -348,8 +389,8 @@ class OrderService:
                 'symbol': symbol,
                 'side': side,
                 'orderType': 'Limit',
-                'qty': f"{qty:.3f}",  # 소수점 3자리까지
-                'price': str(entry_price),
+                'qty': self.risk_engine.format_qty(qty, symbol),  # 수량 단위 내림
+                'price': self.risk_engine.format_price(entry_price, symbol),
                 'timeInForce': 'GTC',
                 'positionIdx': 0,
                 'reduceOnly': is_reduce_only
@@ -358,14 +399,14 @@ class OrderService:
             # TP/SL이 필요한 경우에만 설정
             if needs_sl_tp:
                 if stop_loss:
-                    order_params['stopLoss'] = str(stop_loss)
+                    order_params['stopLoss'] = self.risk_engine.format_price(stop_loss, symbol)
                 if take_profit:
-                    order_params['takeProfit'] = str(take_profit)
+                    order_params['takeProfit'] = self.risk_engine.format_price(take_profit, symbol)
                 
             logger.info(f"주문 실행 시도: {order_params}")
             
             # 주문 실행
-            response = await self.bybit_client.v5_post("/order/create", order_params)
+            response = await self._submit_order('limit', self.bybit_client.v5_post("/order/create", order_params))
             
             # 응답 로깅
             logger.info("=== 주문 요청 및 응답 상세 ===")
@@ -395,12 +436,12 @@ class OrderService:
                 'symbol': symbol,
                 'side': side,
                 'type': 'market',
-                'amount': size,
+                'amount': float(self.risk_engine.round_qty(size, symbol)),  # 수량 단위 내림
                 'params': params
             }
             
             # CCXT를 통한 주문 실행
-            order = await self.bybit_client.exchange.create_order(**order_params)
+            order = await self._submit_order('market', self.bybit_client.exchange.create_order(**order_params), market=True)
             
             if order:
                 logger.info(f"시장가 주문 성공: {order}")
@@ -414,81 +455,78 @@ class OrderService:
             logger.error(traceback.format_exc())
             return False
 
-    async def set_leverage(self, leverage: int) -> None:
+    async def set_leverage(self, leverage: int, symbol: str = None) -> None:
         """레버리지 설정"""
         try:
-            await self.bybit_client.exchange.set_leverage(
+            await self.tracer.measure('exchange.set_leverage', self.bybit_client.exchange.set_leverage(
                 leverage=leverage,
-                symbol=self.symbol,
+                symbol=symbol or self.symbol,
                 params={'category': 'linear'}
-            )
+            ))
         except Exception as e:
             if "leverage not modified" in str(e):
                 logger.info(f"레버리지가 이미 {leverage}x로 설정되어 있습니다")
             else:
                 raise e
 
-    async def _calculate_position_size(self, total_equity: float, unrealized_pnl: float, 
-                                percentage: float, leverage: int, entry_price: float, is_btc_unit: bool = False) -> float:
+    def _calculate_position_size(self, balance: Dict, position_size: float, leverage: int,
+                                 entry_price: float, side: str, stop_loss: float = None,
+                                 take_profit: float = None, is_btc_unit: bool = False,
+                                 symbol: str = None) -> Optional[Dict]:
         """
-        포지션 크기 계산 (BTC)
+        포지션 크기 계산 (RiskEngine)
         Args:
-            total_equity: 총 자산 (USDT)
-            unrealized_pnl: 미실현 손익 (USDT)
-            percentage: 포지션 크기 (0.0 ~ 1.0)
-            leverage: 레버리지
+            balance: get_balance 결과 (total_equity/unrealized_pnl/available_balance)
+            position_size: 포지션 비중 (%) 또는 BTC 수량 (is_btc_unit)
+            leverage: 요청 레버리지
             entry_price: 진입가격
+            side: 주문 방향
             is_btc_unit: BTC 단위로 직접 지정 여부
         Returns:
-            float: BTC 수량
+            Dict: qty/leverage/entry_price/stop_loss/take_profit 등 (주문 불가면 None)
         """
         try:
-            # BTC 단위로 직접 지정된 경우
+            symbol = symbol or self.symbol
+            self.risk_engine.instruments.sync_exchange(self.bybit_client.exchange, symbol)
+            equity = self.risk_engine.sizing_equity(balance)
+            logger.info(f"기준 자산({self.risk_engine.equity_basis}): ${equity:,.2f}")
+
+            plan = self.risk_engine.size_position(
+                equity, position_size, leverage, entry_price, side,
+                stop_loss=stop_loss, take_profit=take_profit, symbol=symbol
+            )
             if is_btc_unit:
-                btc_size = percentage  # percentage가 직접 BTC 수량
-                logger.info(f"직접 지정된 BTC 수량: {btc_size}")
-            else:
-                # 순수 자산 계산
-                net_equity = total_equity - unrealized_pnl
-                logger.info(f"순수 자산: ${net_equity:,.2f}")
-                
-                # USDT 값 계산 (레버리지 적용)
-                position_value = net_equity * percentage * leverage
-                logger.info(f"포지션 가치(USDT): ${position_value:,.2f}")
-                
-                # BTC 수량 계산
-                btc_size = position_value / entry_price
-                logger.info(f"계산된 BTC 수량: {btc_size:.3f}")
-            
-            # 최소 주문 수량 확인 (0.001 BTC)
-            if btc_size < 0.001:
-                logger.warning("계산된 수량이 최소 주문 수량보다 작습니다. 최소 수량으로 설정합니다.")
-                btc_size = 0.001
-            
-            # 최대 주문 수량 확인 (10 BTC)
-            if btc_size > 10:
-                logger.warning("계산된 수량이 최대 주문 수량을 초과합니다. 최대 수량으로 제한합니다.")
-                btc_size = 10
-            
-            # 최종 반올림 (소수점 3자리)
-            final_size = round(btc_size, 3)
-            logger.info(f"최종 BTC 수량(반올림): {final_size:.3f}")
-            
-            if final_size <= 0:
+                # position_size 가 직접 BTC 수량 (단위 내림만 적용)
+                plan['qty'] = float(self.risk_engine.round_qty(position_size, symbol))
+                logger.info(f"직접 지정된 BTC 수량: {plan['qty']}")
+
+            if plan['leverage_capped']:
+                logger.warning(f"손절가가 청산가에 가까워 레버리지 조정: {leverage}x → {plan['leverage']}x")
+            if plan['exposure_capped']:
+                logger.warning(f"최대 노출 한도로 포지션 가치 제한: ${plan['notional']:,.2f}")
+            if plan['below_min_qty']:
+                logger.warning(f"계산된 수량이 최소 주문 수량보다 작습니다 (결과: {plan['qty']})")
+
+            logger.info(
+                f"포지션 계산 - 수량: {plan['qty']}, 가치: ${plan['notional']:,.2f}, "
+                f"증거금: ${plan['margin']:,.2f}, 레버리지: {plan['leverage']}x, "
+                f"청산가: {plan['liquidation_price']:,.1f}, 손절 거리: {plan['stop_distance_pct']:.2f}%"
+            )
+
+            if plan['qty'] <= 0:
                 logger.error("계산된 포지션 크기가 0 이하입니다!")
-                raise ValueError("Invalid position size calculated")
-            
-            return final_size
-            
+                return None
+            return plan
+
         except Exception as e:
             logger.error(f"포지션 크기 계산 중 오류 발생: {str(e)}")
             logger.error(traceback.format_exc())
-            raise
+            return None
 
-    async def get_unrealized_pnl(self) -> float:
+    async def get_unrealized_pnl(self, symbol: str = None) -> float:
         """현재 포지션의 미실현 손익 조회"""
         try:
-            positions = await self.bybit_client.get_positions(self.symbol)
+            positions = await self.bybit_client.get_positions(symbol or self.symbol)
             if positions and len(positions) > 0 and positions[0].get('size', '0') != '0':
                 # 포지션 정보에서 직접 계산
                 size = float(positions[0].get('size', '0'))
@@ -520,13 +558,13 @@ class OrderService:
                 "symbol": position['symbol'],
                 "side": close_side,
                 "orderType": "Market",
-                "qty": str(position['size']),
+                "qty": self.risk_engine.format_qty(position['size'], position['symbol']),
                 "reduceOnly": True,
                 "timeInForce": "GTC",
                 "positionIdx": 0
             }
             
-            response = await self.bybit_client.v5_create_order(order_params)
+            response = await self._submit_order('close', self.bybit_client.v5_create_order(order_params), reduce_only=True)
             if response and response.get('retCode') == 0:
                 logger.info("포지션 청산 성공")
                 return True
@@ -544,6 +582,7 @@ class OrderService:
         except (ValueError, TypeError):
             return 0.0
 
+    @traced('order.execute_trade')
     async def execute_trade(self, signals: Dict) -> bool:
         """매매 신호 실행"""
         try:
@@ -556,6 +595,7 @@ class OrderService:
                 'entry_price': signals['entry_price'],
                 'stop_loss': signals['stop_loss'],
                 'take_profit': signals['take_profit1'],  # take_profit1을 take_profit으로 사용
+                'take_profit2': signals.get('take_profit2'),  # 청산 실행기가 있으면 분할 익절
                 'is_btc_unit': signals.get('is_btc_unit', False)
             }
             
@@ -573,15 +613,23 @@ class OrderService:
     async def get_balance(self) -> Optional[Dict]:
         """잔고 조회"""
         try:
-            balance = await self.balance_service.get_balance()
+            balance = await self.tracer.measure('exchange.get_balance', self.balance_service.get_balance())
             if not balance:
                 return None
                 
             usdt_balance = balance['currencies']['USDT']
             
-            # 포지션 미실현 손익 조회
-            positions = await self.position_service.get_position(self.symbol)
-            unrealized_pnl = float(positions.get('unrealizedPnl', 0)) if positions else 0
+            # 포지션 미실현 손익 조회 (모든 거래 심볼 합계, 계정 상태 미러가 없으면 심볼별 포지션 조회)
+            if self.account_state.has_wallet():
+                unrealized_pnl = self.account_state.unrealized_pnl()
+            else:
+                positions = await asyncio.gather(*(
+                    self.tracer.measure('exchange.get_position', self.position_service.get_position(symbol))
+                    for symbol in trading_config.symbols
+                ))
+                unrealized_pnl = sum(
+                    float(p.get('unrealisedPnl', p.get('unrealizedPnl', 0)) or 0) for p in positions if p
+                )
             
             return {
                 'total_equity': usdt_balance['total_equity'],
@@ -606,7 +654,7 @@ class OrderService:
             
             # 주문 정보 구성
             order_info = {
-                'symbol': signal.get('symbol', 'BTCUSDT'),
+                'symbol': signal.get('symbol', self.symbol),
                 'side': signal.get('position_suggestion'),
                 'leverage': signal.get('leverage', 5),
                 'position_size': signal.get('position_size', 10),
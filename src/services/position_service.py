@@ -5,6 +5,7 @@ from decimal import Decimal
 from functools import wraps
 import time
 from config.trading_config import trading_config
+from services.risk_engine import RiskEngine
 import asyncio
 
 logger = logging.getLogger('position_service')
@@ -25,6 +26,7 @@ class PositionService:
     def __init__(self, bybit_client):
         self.bybit_client = bybit_client
         self.symbol = trading_config.symbol
+        self.risk_engine = RiskEngine.get_instance()
 
     async def get_position(self, symbol: str = None) -> Dict:
         """포지션 조회"""
@@ -52,7 +54,7 @@ class PositionService:
                 'leverage': int(float(position.get('leverage', 1))),
                 'entryPrice': float(position.get('avgPrice', 0)),
                 'markPrice': float(position.get('markPrice', 0)),
-                'unrealisedPnl': float(position.get('unrealizedPnl', 0)),
+                'unrealisedPnl': float(position.get('unrealisedPnl', position.get('unrealizedPnl', 0)) or 0),
                 'stopLoss': float(position.get('stopLoss', 0)),
                 'takeProfit': float(position.get('takeProfit', 0))
             }
@@ -146,7 +148,7 @@ class PositionService:
                 logger.error(f"신호 데이터 검증 실패: {error_msg}")
                 return False
 
-            symbol = signal.get('symbol', 'BTCUSDT')
+            symbol = signal.get('symbol', self.symbol)
             side = signal.get('side')
             target_leverage = int(signal.get('leverage', 1))
             target_percent = float(signal.get('size', 0))
@@ -165,11 +167,11 @@ class PositionService:
                     logger.error("잔고 조회 실패")
                     return False
                     
-                available_balance = float(balance.get('currencies', {}).get('USDT', {}).get('available_balance', 0))
-                target_value = available_balance * (target_percent / 100) * target_leverage
-                target_btc = target_value / entry_price
+                plan = self._size_from_balance(balance, symbol, side, target_percent, target_leverage, entry_price)
+                target_btc = plan['qty']
+                target_leverage = plan['leverage']
                 
-                logger.info(f"신규 진입 계산 - 가용잔고: ${available_balance}, 목표금액: ${target_value}, BTC수량: {target_btc}")
+                logger.info(f"신규 진입 계산 - 기준자산: ${plan['equity']}, 목표금액: ${plan['notional']}, BTC수량: {target_btc}")
                 
                 return await self._open_new_position(
                     symbol=symbol,
@@ -293,16 +295,12 @@ class PositionService:
             # 로그 추가
             logger.info(f"잔고 정보: {balance}")
             
-            # currencies['USDT']에서 available_balance 사용
-            available_balance = float(balance.get('currencies', {}).get('USDT', {}).get('available_balance', 0))
-            logger.info(f"사용 가능 잔고: {available_balance} USDT")
-            
-            # 목표 BTC 수량 계산
-            target_value = available_balance * (target_percent / 100) * leverage
-            target_btc = target_value / price
+            # 목표 BTC 수량 계산 (리스크 엔진)
+            plan = self._size_from_balance(balance, symbol, side, target_percent, leverage, price)
+            target_btc = plan['qty']
             
             logger.info(f"계산 과정:")
-            logger.info(f"- 목표 가치: {target_value} USDT (잔고의 {target_percent}%)")
+            logger.info(f"- 목표 가치: {plan['notional']} USDT (기준자산 {plan['equity']} USDT 의 {target_percent}%)")
             logger.info(f"- 목표 BTC: {target_btc} BTC (가격: {price})")
             logger.info(f"- 현재 BTC: {current_btc} BTC")
             
@@ -313,7 +311,7 @@ class PositionService:
                 logger.info("포지션 크기가 정확히 일치")
                 return await self.order_service.cancel_all_tpsl(symbol)
             
-            if abs(btc_diff) < trading_config.MIN_POSITION_SIZE:
+            if not self.risk_engine.is_size_change(current_btc, target_btc, symbol):
                 # 수량 차이가 무 작을 때 알림
                 order_data = {
                     'symbol': symbol,
@@ -334,7 +332,7 @@ class PositionService:
 
             if btc_diff > 0:  # 증가
                 # TP/SL 계산 - 원래 방향 그대로
-                stopLoss, takeProfit = self._calculate_sl_tp(side, price)
+                stopLoss, takeProfit = self._calculate_sl_tp(side, price, symbol)
                 order = await self.order_service.create_order(
                     symbol=symbol,
                     side=side,
@@ -438,9 +436,9 @@ class PositionService:
                 logger.error("잔고 조회 실패")
                 return False
             
-            available_balance = float(balance.get('currencies', {}).get('USDT', {}).get('available_balance', 0))
-            target_value = available_balance * (target_size / 100) * target_leverage
-            target_btc = target_value / entry_price
+            plan = self._size_from_balance(balance, symbol, side, target_size, target_leverage, entry_price,
+                                           stopLoss, takeProfit)
+            target_btc = plan['qty']
             
             logger.info(f"신규 진입 시도: {target_btc} BTC")
             
@@ -573,12 +571,19 @@ class PositionService:
             logger.error(f"SL/TP 설정 중 오류: {str(e)}")
             return False
 
-    def _calculate_sl_tp(self, side: str, entry_price: float) -> Tuple[float, float]:
-        """손손절가/익절가 계산"""
-        if side == 'Buy':
-            stop_loss = entry_price * 0.98  # 2% 손절
-            take_profit = entry_price * 1.02  # 2% 익절
-        else:
-            stop_loss = entry_price * 1.02
-            take_profit = entry_price * 0.98
-        return stop_loss, take_profit
+    def _calculate_sl_tp(self, side: str, entry_price: float, symbol: str = None) -> Tuple[float, float]:
+        """손절가/익절가 계산 (리스크 엔진 기본 거리, 호가 단위 반올림)"""
+        stop_loss, take_profit = self.risk_engine.default_sl_tp(side, entry_price, symbol)
+        return float(stop_loss), float(take_profit)
+
+    def _size_from_balance(self, balance: Dict, symbol: str, side: str, percent: float, leverage: int,
+                           price: float, stop_loss: float = None, take_profit: float = None) -> Dict:
+        """잔고 조회 결과로 목표 수량 계산 (OrderService 와 같은 기준 자산)"""
+        usdt_balance = balance.get('currencies', {}).get('USDT', {})
+        equity = self.risk_engine.sizing_equity(usdt_balance)
+        plan = self.risk_engine.size_position(
+            equity, percent, leverage, price, side,
+            stop_loss=stop_loss, take_profit=take_profit, symbol=symbol
+        )
+        plan['equity'] = equity
+        return plan
@@ -0,0 +1,40 @@
+import time
+import asyncio
+
+from services.metrics import registry
+
+RATE_LIMIT_WAITS = registry.counter('rate_limiter_waits_total', '속도 제한으로 대기한 횟수', ('limiter',))
+RATE_LIMIT_WAIT_SECONDS = registry.counter('rate_limiter_wait_seconds_total', '속도 제한 대기 시간 합계 (초)',
+                                           ('limiter',))
+
+class RateLimiter:
+    """토큰 버킷 기반 호출 속도 제한"""
+
+    def __init__(self, rate: float, capacity: float = None, name: str = 'default'):
+        """
+        Args:
+            rate: 초당 토큰 보충 수
+            capacity: 최대 토큰 수 (순간 허용량, 기본값 rate)
+            name: 지표 레이블
+        """
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                RATE_LIMIT_WAITS.inc(self.name)
+                RATE_LIMIT_WAIT_SECONDS.inc(self.name, amount=delay)
+                await asyncio.sleep(delay)
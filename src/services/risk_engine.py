@@ -0,0 +1,255 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from config import config
+from config.trading_config import trading_config
+from services.instrument_cache import InstrumentCache
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, int, str, np.ndarray, list]
+
+def side_sign(side: ArrayLike) -> np.ndarray:
+    """방향 → +1(롱) / -1(숏) 배열 (BUY/Buy/Long/1 은 롱)"""
+    side = np.asarray(side)
+    if side.dtype.kind in 'iuf':
+        return np.where(side >= 0, 1.0, -1.0)
+    upper = np.char.upper(side.astype(str))
+    return np.where(np.isin(upper, ['BUY', 'LONG']), 1.0, -1.0)
+
+class RiskEngine:
+    """포지션 크기/레버리지/손절·익절/청산 여유를 한 곳에서 계산하는 리스크 엔진
+
+    - 수량은 거래소 수량 단위로 내림, 가격은 호가 단위로 반올림 (InstrumentCache 의 load_markets 정보)
+    - 목표 명목 가치 = 기준 자산 × 비중(%) × 레버리지, 최대 노출(자산 대비 배수)로 제한
+    - 손절가가 청산가보다 liquidation_buffer_pct 이상 앞서도록 레버리지를 낮춤
+      (유지 증거금률/최대 레버리지는 명목 가치에 해당하는 위험 한도 단계 기준)
+    - 모든 계산은 NumPy 배열로 한 번에 수행 (size_batch), 단건 계산은 길이 1 배열로 처리
+    """
+
+    DEFAULT_SETTINGS = {
+        'equity_basis': 'net_equity',     # net_equity: 총자산 - 미실현 손익 / available: 가용 잔고
+        'max_qty': 10.0,                  # 거래소 최대 수량과 별도로 두는 1회 주문 상한
+        'raise_to_min_qty': True,         # 최소 수량 미만이면 최소 수량으로 올림 (False 면 주문 불가)
+        'max_exposure': 3.0,              # 포지션 명목 가치 상한 (기준 자산 대비 배수)
+        'maintenance_margin': 0.005,      # 유지 증거금률 (위험 한도 단계 정보가 없을 때)
+        'liquidation_buffer_pct': 1.0,    # 손절가와 청산가 사이 최소 간격 (진입가 대비 %)
+        'default_stop_loss_pct': 2.0,     # 손절가가 없을 때 사용하는 거리 (%)
+        'default_take_profit_pct': 2.0
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'RiskEngine':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, settings: Dict = None, instruments: InstrumentCache = None):
+        if settings is None:
+            settings = config.load_json_config('risk_config.json')
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        self.equity_basis = options['equity_basis']
+        self.max_qty = float(options['max_qty'])
+        self.raise_to_min_qty = bool(options['raise_to_min_qty'])
+        self.max_exposure = float(options['max_exposure'])
+        self.maintenance_margin = float(options['maintenance_margin'])
+        self.liquidation_buffer = float(options['liquidation_buffer_pct']) / 100
+        self.default_stop_loss = float(options['default_stop_loss_pct']) / 100
+        self.default_take_profit = float(options['default_take_profit_pct']) / 100
+        self.instruments = instruments or InstrumentCache.get_instance()
+
+    # ---- 거래 단위 ----
+
+    def spec(self, symbol: str = None) -> Dict:
+        """심볼 단위 정보 (InstrumentCache)"""
+        return self.instruments.get(symbol)
+
+    def round_qty(self, qty: ArrayLike, symbol: str = None) -> np.ndarray:
+        """수량 단위로 내림 (부동소수 오차 보정)"""
+        spec = self.spec(symbol)
+        steps = np.floor(np.asarray(qty, dtype=np.float64) / spec['qty_step'] + 1e-9)
+        return np.round(steps * spec['qty_step'], spec['qty_decimals'])
+
+    def round_price(self, price: ArrayLike, symbol: str = None) -> np.ndarray:
+        """호가 단위로 반올림"""
+        spec = self.spec(symbol)
+        ticks = np.round(np.asarray(price, dtype=np.float64) / spec['tick_size'])
+        return np.round(ticks * spec['tick_size'], spec['price_decimals'])
+
+    def format_qty(self, qty: float, symbol: str = None) -> str:
+        """주문 요청용 수량 문자열"""
+        spec = self.spec(symbol)
+        return f"{float(self.round_qty(qty, symbol)):.{spec['qty_decimals']}f}"
+
+    def format_price(self, price: float, symbol: str = None) -> str:
+        """주문 요청용 가격 문자열"""
+        spec = self.spec(symbol)
+        return f"{float(self.round_price(price, symbol)):.{spec['price_decimals']}f}"
+
+    def min_order_qty(self, symbol: str = None) -> float:
+        spec = self.spec(symbol)
+        return max(spec['min_qty'], spec['qty_step'])
+
+    # ---- 자산 ----
+
+    def sizing_equity(self, balance: Dict) -> float:
+        """포지션 크기 계산 기준 자산 (USDT 잔고 dict: total_equity/unrealized_pnl/available_balance)"""
+        if self.equity_basis == 'available':
+            return float(balance.get('available_balance', 0) or 0)
+        return float(balance.get('total_equity', 0) or 0) - float(balance.get('unrealized_pnl', 0) or 0)
+
+    # ---- 가격 ----
+
+    def maintenance_tier(self, notional: ArrayLike, symbol: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """명목 가치별 (유지 증거금률, 최대 레버리지) - 위험 한도 단계가 없으면 설정값/거래소 상한"""
+        spec = self.spec(symbol)
+        notional = np.asarray(notional, dtype=np.float64)
+        tiers = spec['risk_tiers']
+        if not tiers:
+            return (np.full(notional.shape, self.maintenance_margin),
+                    np.full(notional.shape, float(spec['max_leverage'])))
+        limits = np.array([tier['max_notional'] for tier in tiers])
+        index = np.minimum(np.searchsorted(limits, notional, 'left'), len(tiers) - 1)
+        return (np.array([tier['maintenance_margin'] for tier in tiers])[index],
+                np.array([tier['max_leverage'] for tier in tiers])[index])
+
+    def liquidation_price(self, side: ArrayLike, entry_price: ArrayLike, leverage: ArrayLike,
+                          maintenance_margin: ArrayLike = None) -> np.ndarray:
+        """격리 증거금 기준 청산가 (증거금 - 유지 증거금 만큼 손실, SimulatedExchange 와 동일)"""
+        sign = side_sign(side)
+        if maintenance_margin is None:
+            maintenance_margin = self.maintenance_margin
+        offset = 1 / np.asarray(leverage, dtype=np.float64) - maintenance_margin
+        return np.asarray(entry_price, dtype=np.float64) * (1 - sign * offset)
+
+    def default_sl_tp(self, side: ArrayLike, entry_price: ArrayLike,
+                      symbol: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """기본 거리로 손절가/익절가 계산 (호가 단위 반올림)"""
+        sign = side_sign(side)
+        entry = np.asarray(entry_price, dtype=np.float64)
+        stop_loss = self.round_price(entry * (1 - sign * self.default_stop_loss), symbol)
+        take_profit = self.round_price(entry * (1 + sign * self.default_take_profit), symbol)
+        return stop_loss, take_profit
+
+    # ---- 크기 계산 ----
+
+    def size_batch(self, equity: ArrayLike, percentage: ArrayLike, leverage: ArrayLike,
+                   entry_price: ArrayLike, side: ArrayLike = 1, stop_loss: ArrayLike = None,
+                   take_profit: ArrayLike = None, symbol: str = None) -> Dict[str, np.ndarray]:
+        """여러 후보 신호의 수량/레버리지/손절·익절/청산가를 한 번에 계산
+
+        Args:
+            equity: 기준 자산 (USDT)
+            percentage: 포지션 비중 (%, 증거금 기준)
+            leverage: 요청 레버리지
+            entry_price: 진입가
+            side: 방향 (BUY/SELL, Long/Short 또는 ±1)
+            stop_loss/take_profit: 없거나 0/NaN 이면 기본 거리 사용
+        Returns:
+            입력을 브로드캐스트한 모양의 배열 dict
+            (qty 가 0 이면 주문 불가: 가격/자산 오류 또는 최소 수량 미달)
+        """
+        spec = self.spec(symbol)
+        equity, percentage, leverage, entry, sign = np.broadcast_arrays(
+            np.asarray(equity, dtype=np.float64),
+            np.asarray(percentage, dtype=np.float64),
+            np.asarray(leverage, dtype=np.float64),
+            np.asarray(entry_price, dtype=np.float64),
+            side_sign(side)
+        )
+        shape = entry.shape
+        default_stop, default_take_profit = self.default_sl_tp(sign, entry, symbol)
+        stop = self._price_or_default(stop_loss, default_stop, shape, symbol)
+        take_profit = self._price_or_default(take_profit, default_take_profit, shape, symbol)
+
+        valid_price = np.isfinite(entry) & (entry > 0)
+        safe_entry = np.where(valid_price, entry, 1.0)
+        stop_distance = np.abs(safe_entry - stop) / safe_entry
+        take_profit_distance = np.abs(take_profit - safe_entry) / safe_entry
+
+        # 레버리지: 설정/거래소 상한 → 요청 명목 가치의 위험 한도 단계 상한
+        #          → 손절가가 청산가보다 buffer 이상 앞서는 최대 레버리지
+        max_leverage = min(float(trading_config.leverage_settings.get('max', spec['max_leverage'])),
+                           float(spec['max_leverage']))
+        min_leverage = float(trading_config.leverage_settings.get('min', 1))
+        requested = np.floor(np.clip(np.nan_to_num(leverage, nan=min_leverage), min_leverage, max_leverage))
+        safe_equity = np.maximum(np.nan_to_num(equity), 0.0)
+        margin_share = safe_equity * np.maximum(np.nan_to_num(percentage), 0.0) / 100
+        exposure_cap = safe_equity * self.max_exposure
+        maintenance_margin, tier_leverage = self.maintenance_tier(
+            np.minimum(margin_share * requested, exposure_cap), symbol
+        )
+        safe_leverage = np.floor(1 / (stop_distance + self.liquidation_buffer + maintenance_margin))
+        applied_leverage = np.maximum(np.minimum(np.minimum(requested, np.floor(tier_leverage)), safe_leverage),
+                                      min_leverage)
+        leverage_capped = applied_leverage < requested
+
+        # 명목 가치: 비중 × 레버리지, 최대 노출로 제한
+        notional = margin_share * applied_leverage
+        exposure_capped = notional > exposure_cap
+        notional = np.minimum(notional, exposure_cap)
+
+        # 수량: 상한 → 단위 내림 → 최소 수량
+        max_qty = min(self.max_qty, spec['max_qty'])
+        raw_qty = notional / safe_entry
+        qty = self.round_qty(np.minimum(raw_qty, max_qty), symbol)
+        min_qty = self.min_order_qty(symbol)
+        below_min = (qty < min_qty) | (qty * safe_entry < spec['min_notional'])
+        if self.raise_to_min_qty:
+            # 최소 명목 가치를 채우는 수량 (단위 올림)
+            notional_floor = np.ceil(spec['min_notional'] / safe_entry / spec['qty_step'] - 1e-9) * spec['qty_step']
+            floor_qty = np.round(np.maximum(min_qty, notional_floor), spec['qty_decimals'])
+            qty = np.where(below_min & (raw_qty > 0), floor_qty, qty)
+        else:
+            qty = np.where(below_min, 0.0, qty)
+        qty = np.where(valid_price & (safe_equity > 0), qty, 0.0)
+
+        notional = qty * entry
+        return {
+            'qty': qty,
+            'notional': notional,
+            'margin': np.divide(notional, applied_leverage),
+            'leverage': applied_leverage,
+            'entry_price': self.round_price(entry, symbol),
+            'stop_loss': stop,
+            'take_profit': take_profit,
+            'stop_distance_pct': stop_distance * 100,
+            'take_profit_distance_pct': take_profit_distance * 100,
+            'maintenance_margin': maintenance_margin,
+            'liquidation_price': self.liquidation_price(sign, entry, applied_leverage, maintenance_margin),
+            'risk_amount': qty * np.abs(entry - stop),
+            'leverage_capped': leverage_capped,
+            'exposure_capped': exposure_capped,
+            'below_min_qty': below_min
+        }
+
+    def _price_or_default(self, price: Optional[ArrayLike], default: np.ndarray,
+                          shape: Tuple, symbol: str = None) -> np.ndarray:
+        if price is None:
+            return default
+        price = np.broadcast_to(np.asarray(price, dtype=np.float64), shape)
+        return np.where(np.isfinite(price) & (price > 0), self.round_price(price, symbol), default)
+
+    def size_position(self, equity: float, percentage: float, leverage: float, entry_price: float,
+                      side: str = 'Buy', stop_loss: float = None, take_profit: float = None,
+                      symbol: str = None) -> Dict:
+        """단건 크기 계산 (size_batch 결과의 스칼라 버전)"""
+        result = self.size_batch(
+            equity, percentage, leverage, entry_price, side,
+            stop_loss if stop_loss else None, take_profit if take_profit else None, symbol
+        )
+        plan = {key: value.item() for key, value in result.items()}
+        plan['leverage'] = int(plan['leverage'])
+        return plan
+
+    def is_size_change(self, current_qty: float, target_qty: float, symbol: str = None) -> bool:
+        """목표 수량과의 차이가 최소 주문 수량 이상인지"""
+        return abs(target_qty - current_qty) >= self.min_order_qty(symbol) - 1e-12
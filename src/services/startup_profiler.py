@@ -0,0 +1,111 @@
+import time
+import asyncio
+import logging
+import traceback
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+class StartupProfiler:
+    """시작 단계별 소요 시간 기록
+
+    각 단계의 시작 시점(프로세스 시작 기준)과 소요 시간을 기록하고,
+    첫 명령 처리 가능 시점까지의 시간을 보고서로 만듭니다.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._stages: List[Dict] = []
+        self._milestones: Dict[str, float] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    def elapsed(self) -> float:
+        """시작 후 경과 시간 (초)"""
+        return time.perf_counter() - self._origin
+
+    def record(self, name: str, duration: float, ok: bool = True, started_at: float = None):
+        """단계 소요 시간 기록"""
+        if started_at is None:
+            started_at = self.elapsed() - duration
+        self._stages.append({
+            'name': name,
+            'start': started_at,
+            'duration': duration,
+            'ok': ok
+        })
+
+    @contextmanager
+    def stage(self, name: str):
+        """동기 단계 측정"""
+        started_at = self.elapsed()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, self.elapsed() - started_at, ok, started_at)
+
+    async def measure(self, name: str, awaitable: Awaitable) -> Any:
+        """비동기 단계 측정"""
+        started_at = self.elapsed()
+        ok = False
+        try:
+            result = await awaitable
+            ok = True
+            return result
+        finally:
+            self.record(name, self.elapsed() - started_at, ok, started_at)
+
+    async def gather(self, **stages: Awaitable) -> Dict[str, Any]:
+        """독립적인 단계를 동시에 실행 (실패한 단계는 예외를 결과로 반환)"""
+        names = list(stages)
+        results = await asyncio.gather(
+            *(self.measure(name, stages[name]) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.error(f"시작 단계 실패 ({name}): {str(result)}")
+                logger.error(''.join(traceback.format_exception(type(result), result, result.__traceback__)))
+        return dict(zip(names, results))
+
+    def background(self, name: str, awaitable: Awaitable) -> asyncio.Task:
+        """명령 처리를 막지 않는 단계를 백그라운드 태스크로 실행
+
+        태스크 참조를 보관하여 GC 로 사라지지 않게 하고, 실패하면 예외를 로그로 남깁니다.
+        """
+        task = asyncio.create_task(self.measure(name, awaitable), name=f"startup:{name}")
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+        return task
+
+    def _background_done(self, task: asyncio.Task):
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"백그라운드 시작 단계 실패 ({task.get_name()}): {str(error)}")
+            logger.error(''.join(traceback.format_exception(type(error), error, error.__traceback__)))
+
+    def mark(self, name: str):
+        """주요 시점 기록"""
+        self._milestones[name] = self.elapsed()
+
+    def get_stages(self) -> List[Dict]:
+        """기록된 단계 목록 (시작 순)"""
+        return sorted(self._stages, key=lambda s: s['start'])
+
+    def report(self) -> str:
+        """시작 시간 보고서"""
+        lines = ["⏱ 시작 시간 분석:"]
+        for stage in self.get_stages():
+            status = "" if stage['ok'] else " ❌"
+            lines.append(
+                f"• {stage['name']}: {stage['duration'] * 1000:.0f}ms "
+                f"(+{stage['start'] * 1000:.0f}ms){status}"
+            )
+        for name, at in sorted(self._milestones.items(), key=lambda m: m[1]):
+            lines.append(f"• [{name}] {at * 1000:.0f}ms")
+        return "\n".join(lines)
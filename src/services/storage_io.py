@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import tempfile
+import functools
+import threading
+import traceback
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+def _atomic_write(path: Path, write: Callable, mode: str = 'w') -> None:
+    """임시 파일에 기록한 뒤 rename 하여 부분 기록이 보이지 않도록 저장"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        encoding = None if 'b' in mode else 'utf-8'
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    """JSON 파일 원자적 저장"""
+    _atomic_write(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=indent))
+
+def atomic_write_bytes(path: Path, write: Callable) -> None:
+    """바이너리 파일 원자적 저장 (write(f) 가 파일 객체에 기록)"""
+    _atomic_write(path, write, mode='wb')
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """JSON 파일 읽기 (파일이 없으면 default 반환)"""
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class StorageIOExecutor:
+    """스토리지 I/O 전용 스레드 풀
+
+    파일 읽기/쓰기를 이벤트 루프 밖에서 실행하기 위한 async 래퍼를 제공합니다.
+    모든 저장소(TradeStore, AnalysisRepository, 설정 로더 등)가 같은 풀을 공유합니다.
+    """
+
+    DEFAULT_MAX_WORKERS = 4
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'StorageIOExecutor':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='storage-io'
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """블로킹 함수를 I/O 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    async def read_json(self, path: Path, default: Any = None) -> Any:
+        """JSON 파일 비동기 읽기"""
+        return await self.run(read_json, path, default)
+
+    async def write_json(self, path: Path, data: Any, indent: Optional[int] = 2) -> None:
+        """JSON 파일 비동기 원자적 쓰기"""
+        await self.run(atomic_write_json, path, data, indent)
+
+    def shutdown(self, wait: bool = True):
+        """스레드 풀 종료"""
+        self._executor.shutdown(wait=wait)
+        logger.info("스토리지 I/O 실행기 종료됨")
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    """공용 스토리지 I/O 실행기로 블로킹 함수 실행"""
+    return await StorageIOExecutor.get_instance().run(func, *args, **kwargs)
+
+class EventLoopLagMonitor:
+    """이벤트 루프 지연 모니터
+
+    주기적으로 sleep 하고 예정 시각보다 늦게 깨어난 만큼을 지연으로 측정합니다.
+    지연이 임계값을 넘으면 콜백이 루프를 블로킹한 것으로 보고 경고를 남깁니다.
+    debug=True 이면 asyncio 디버그 모드의 slow_callback_duration 도 함께 설정하여
+    어떤 콜백이 느렸는지 asyncio 로거가 기록하도록 합니다.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.5, debug: bool = False):
+        self.threshold = threshold
+        self.interval = interval
+        self.debug = debug
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.slow_count = 0
+        self.samples = 0
+        self._task = None
+        self._listeners = []
+
+    def add_listener(self, callback: Callable[[float], None]):
+        """지연 측정값 리스너 등록 (지표 수집용)"""
+        self._listeners.append(callback)
+
+    def is_running(self) -> bool:
+        """실행 상태 확인"""
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """모니터링 시작"""
+        if self.is_running():
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.debug:
+            loop.slow_callback_duration = self.threshold
+            loop.set_debug(True)
+
+        self._task = asyncio.create_task(self._monitor_loop())
+        logger.info(f"이벤트 루프 지연 모니터 시작 (임계값: {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self):
+        """모니터링 중지"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("이벤트 루프 지연 모니터 중지됨")
+
+    def get_stats(self) -> dict:
+        """지연 통계 조회"""
+        return {
+            'last_lag_ms': round(self.last_lag * 1000, 2),
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'slow_count': self.slow_count,
+            'samples': self.samples
+        }
+
+    async def _monitor_loop(self):
+        """지연 측정 루프"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.samples += 1
+
+            if lag > self.threshold:
+                self.slow_count += 1
+                logger.warning(f"이벤트 루프 블로킹 감지: {lag * 1000:.0f}ms (임계값: {self.threshold * 1000:.0f}ms)")
+
+            for listener in self._listeners:
+                try:
+                    listener(lag)
+                except Exception as e:
+                    logger.error(f"루프 지연 리스너 오류: {str(e)}")
+                    logger.debug(traceback.format_exc())
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import asyncio
+import inspect
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import config
+from services.storage_io import run_io
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('trace_span', default=None)
+
+class Span:
+    """추적 구간 1개 (OpenTelemetry span 과 같은 식별자 구조)"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'duration',
+                 'attributes', 'error', '_started')
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.duration = 0.0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self, error: BaseException = None):
+        self.duration = time.perf_counter() - self._started
+        self.end_ns = self.start_ns + int(self.duration * 1e9)
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+class Tracer:
+    """신호 → 주문 경로 단계별 지연 추적
+
+    - span() / measure() / @traced 로 구간을 기록하고, 같은 태스크(및 자식 태스크/스레드)의
+      구간은 contextvars 로 부모-자식 관계가 이어져 봉 마감 → 주문 응답까지 하나의 trace 가 됨
+    - 단계(구간 이름)별 최근 window_seconds 동안의 소요 시간으로 p50/p95/p99 계산 (/latency)
+    - 끝난 구간은 OTLP/JSON(ExportTraceServiceRequest) 형식으로 일별 파일에 한 줄씩 저장하고,
+      endpoint 가 설정되어 있으면 OTLP/HTTP 수집기로도 전송
+    """
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'service_name': 'aibybit',
+        'window_seconds': 3600,      # /latency 집계 구간
+        'max_samples': 2000,         # 단계별 보관 최대 표본 수
+        'export': {
+            'file': True,            # data/traces/spans_<YYYYMMDD>.jsonl
+            'endpoint': None,        # 예: http://localhost:4318/v1/traces
+            'flush_interval': 10.0,
+            'max_buffer': 5000       # 내보내기 전 보관 최대 구간 수 (넘치면 오래된 것부터 버림)
+        }
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'Tracer':
+        """싱글톤 인스턴스 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, settings: Dict = None, export_dir: Path = None):
+        if settings is None:
+            settings = config.load_json_config('tracing_config.json')
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        export = {**self.DEFAULT_SETTINGS['export'], **(options.get('export') or {})}
+
+        self.enabled = bool(options['enabled'])
+        self.service_name = options['service_name']
+        self.window_seconds = float(options['window_seconds'])
+        self.max_samples = int(options['max_samples'])
+        self.export_file = bool(export['file'])
+        self.endpoint = export['endpoint']
+        self.flush_interval = float(export['flush_interval'])
+        self.export_dir = Path(export_dir or config.data_dir / 'traces')
+
+        self._samples: Dict[str, deque] = {}     # 단계별 (종료 시각, 소요 시간, 오류 여부)
+        self._pending = deque(maxlen=int(export['max_buffer']))
+        self._lock = threading.Lock()            # to_thread 로 실행되는 단계도 기록하므로
+        self._flush_task: Optional[asyncio.Task] = None
+        self.exported_count = 0
+        self.dropped_count = 0
+
+    # ---- 기록 ----
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """동기/비동기 코드 모두에서 쓰는 구간 기록 (with tracer.span('order.create_order'):)"""
+        if not self.enabled:
+            yield None
+            return
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish(error)
+            self._record(span)
+
+    async def measure(self, name: str, awaitable: Awaitable, **attributes) -> Any:
+        """awaitable 하나를 구간으로 기록"""
+        with self.span(name, **attributes):
+            return await awaitable
+
+    def _record(self, span: Span):
+        with self._lock:
+            samples = self._samples.get(span.name)
+            if samples is None:
+                samples = self._samples[span.name] = deque(maxlen=self.max_samples)
+            samples.append((time.monotonic(), span.duration, span.error is not None))
+            if self.export_file or self.endpoint:
+                if len(self._pending) == self._pending.maxlen:
+                    self.dropped_count += 1
+                self._pending.append(span)
+
+    # ---- 집계 ----
+
+    def stage_stats(self, window_seconds: float = None) -> Dict[str, Dict]:
+        """단계별 최근 구간 통계 (ms)"""
+        since = time.monotonic() - (window_seconds or self.window_seconds)
+        with self._lock:
+            snapshot = {name: [s for s in samples if s[0] >= since] for name, samples in self._samples.items()}
+
+        stats = {}
+        for name, samples in snapshot.items():
+            if not samples:
+                continue
+            durations = np.array([s[1] for s in samples]) * 1000
+            p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+            stats[name] = {
+                'count': len(samples),
+                'errors': sum(1 for s in samples if s[2]),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(durations.max())
+            }
+        return stats
+
+    def report(self, window_seconds: float = None) -> str:
+        """/latency 보고서"""
+        window = window_seconds or self.window_seconds
+        stats = self.stage_stats(window)
+        if not stats:
+            return f"⏱ 최근 {window / 60:.0f}분간 기록된 구간이 없습니다"
+
+        lines = [f"⏱ 단계별 지연 (최근 {window / 60:.0f}분, ms)"]
+        for name in sorted(stats):
+            s = stats[name]
+            errors = f" ❌{s['errors']}" if s['errors'] else ""
+            lines.append(
+                f"• {name} ({s['count']}회{errors})\n"
+                f"  p50 {s['p50']:,.1f} / p95 {s['p95']:,.1f} / p99 {s['p99']:,.1f} / 최대 {s['max']:,.1f}"
+            )
+        if self.dropped_count:
+            lines.append(f"(내보내기 대기열 초과로 버린 구간: {self.dropped_count})")
+        return "\n".join(lines)
+
+    # ---- 내보내기 ----
+
+    async def start(self):
+        """주기적 내보내기 시작"""
+        if not self.enabled or self._flush_task or not (self.export_file or self.endpoint):
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"구간 추적 내보내기 시작 (파일: {self.export_file}, 수집기: {self.endpoint or '-'})")
+
+    async def stop(self):
+        """내보내기 중지 (남은 구간은 마지막으로 한 번 저장)"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """대기 중인 구간 내보내기"""
+        with self._lock:
+            spans = list(self._pending)
+            self._pending.clear()
+        if not spans:
+            return 0
+
+        payload = self.to_otlp(spans)
+        try:
+            if self.export_file:
+                path = self.export_dir / f"spans_{datetime.now().strftime('%Y%m%d')}.jsonl"
+                await run_io(self._append_line, path, json.dumps(payload, ensure_ascii=False))
+            if self.endpoint:
+                await self._post(payload)
+            self.exported_count += len(spans)
+        except Exception as e:
+            logger.error(f"구간 추적 내보내기 중 오류: {str(e)}")
+        return len(spans)
+
+    def to_otlp(self, spans: List[Span]) -> Dict:
+        """OTLP/JSON ExportTraceServiceRequest 형식"""
+        def attribute(key: str, value: Any) -> Dict:
+            if isinstance(value, bool):
+                return {'key': key, 'value': {'boolValue': value}}
+            if isinstance(value, int):
+                return {'key': key, 'value': {'intValue': str(value)}}
+            if isinstance(value, float):
+                return {'key': key, 'value': {'doubleValue': value}}
+            return {'key': key, 'value': {'stringValue': str(value)}}
+
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': __name__},
+                    'spans': [{
+                        'traceId': span.trace_id,
+                        'spanId': span.span_id,
+                        **({'parentSpanId': span.parent_id} if span.parent_id else {}),
+                        'name': span.name,
+                        'kind': 1,
+                        'startTimeUnixNano': str(span.start_ns),
+                        'endTimeUnixNano': str(span.end_ns),
+                        'attributes': [attribute(key, value) for key, value in span.attributes.items()],
+                        'status': {'code': 2, 'message': span.error} if span.error else {'code': 1}
+                    } for span in spans]
+                }]
+            }]
+        }
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _post(self, payload: Dict):
+        import aiohttp
+        async with aiohttp.ClientSession() as session:
+            async with session.post(self.endpoint, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status >= 300:
+                    logger.warning(f"OTLP 수집기 응답 오류: {response.status}")
+
+    @staticmethod
+    def _append_line(path: Path, line: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+def traced(name: str):
+    """함수/코루틴 전체를 구간으로 기록하는 데코레이터 (호출 시점의 Tracer 싱글톤 사용)"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with Tracer.get_instance().span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Tracer.get_instance().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
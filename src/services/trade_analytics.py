@@ -0,0 +1,182 @@
+import logging
+import traceback
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = ('월', '화', '수', '목', '금', '토', '일')
+
+class TradeAnalytics:
+    """청산 포지션 통계 계산기
+
+    포지션 목록을 한 번만 순회하여 NumPy 컬럼(손익, 시간, 방향)으로 변환한 뒤
+    모든 지표를 벡터 연산으로 계산합니다. 포맷터는 compute() 결과만 렌더링합니다.
+    """
+
+    def __init__(self, positions: List[Dict]):
+        count = len(positions)
+        self.pnl = np.empty(count, dtype=np.float64)
+        self.timestamps = np.empty(count, dtype=np.int64)
+        self.is_long = np.empty(count, dtype=bool)
+
+        for i, p in enumerate(positions):
+            self.pnl[i] = float(p.get('pnl', 0) or 0)
+            self.timestamps[i] = int(p.get('timestamp', 0) or 0)
+            self.is_long[i] = self._is_long(p)
+
+        # 시간순 정렬 (자산 곡선/연속 기록 계산용)
+        order = np.argsort(self.timestamps, kind='stable')
+        self.pnl = self.pnl[order]
+        self.timestamps = self.timestamps[order]
+        self.is_long = self.is_long[order]
+
+    @staticmethod
+    def _is_long(position: Dict) -> bool:
+        """포지션 방향 판별 (position_side 우선, 없으면 청산 주문 방향으로 판단)"""
+        position_side = position.get('position_side')
+        if position_side in ('Long', 'Short'):
+            return position_side == 'Long'
+        # 청산 주문이 Sell 이면 롱 포지션
+        return position.get('side') == 'Sell'
+
+    def compute(self) -> Dict:
+        """전체 통계 계산"""
+        try:
+            pnl = self.pnl
+            total_trades = int(pnl.size)
+            if total_trades == 0:
+                return self._empty_stats()
+
+            wins = pnl > 0
+            losses = pnl < 0
+            win_pnl = pnl[wins]
+            loss_pnl = pnl[losses]
+
+            gross_profit = float(win_pnl.sum())
+            gross_loss = float(-loss_pnl.sum())
+            average_profit = float(win_pnl.mean()) if win_pnl.size else 0.0
+            average_loss = float(loss_pnl.mean()) if loss_pnl.size else 0.0
+
+            stats = {
+                'total_trades': total_trades,
+                'winning_trades': int(wins.sum()),
+                'losing_trades': int(losses.sum()),
+                'win_rate': float(wins.mean() * 100),
+                'total_profit': float(pnl.sum()),
+                'average_profit': average_profit,
+                'average_loss': average_loss,
+                'max_profit': float(win_pnl.max()) if win_pnl.size else 0.0,
+                'max_loss': float(loss_pnl.min()) if loss_pnl.size else 0.0,
+                'long_trades': int(self.is_long.sum()),
+                'long_profit': float(pnl[self.is_long].sum()),
+                'short_trades': int((~self.is_long).sum()),
+                'short_profit': float(pnl[~self.is_long].sum()),
+                'profit_factor': gross_profit / gross_loss if gross_loss > 0 else 0.0,
+                'expectancy': float(pnl.mean()),
+                'risk_reward_ratio': average_profit / abs(average_loss) if average_loss else 0.0,
+                'max_drawdown': self._max_drawdown(pnl),
+                'sharpe_ratio': self._sharpe(pnl),
+                'sortino_ratio': self._sortino(pnl),
+                'max_win_streak': self._max_run(wins),
+                'max_loss_streak': self._max_run(losses),
+            }
+            stats.update(self._time_breakdown())
+            return stats
+
+        except Exception as e:
+            logger.error(f"거래 통계 계산 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return self._empty_stats()
+
+    @staticmethod
+    def _max_drawdown(pnl: np.ndarray) -> float:
+        """누적 손익 기준 최대 낙폭 (양수 금액)"""
+        equity = np.concatenate(([0.0], np.cumsum(pnl)))
+        peaks = np.maximum.accumulate(equity)
+        return float((peaks - equity).max())
+
+    @staticmethod
+    def _sharpe(pnl: np.ndarray) -> float:
+        """거래당 샤프 비율 (연율화하지 않음)"""
+        if pnl.size < 2:
+            return 0.0
+        std = pnl.std(ddof=1)
+        return float(pnl.mean() / std) if std > 0 else 0.0
+
+    @staticmethod
+    def _sortino(pnl: np.ndarray) -> float:
+        """거래당 소르티노 비율 (하방 편차 기준)"""
+        downside = np.sqrt(np.mean(np.minimum(pnl, 0.0) ** 2))
+        return float(pnl.mean() / downside) if downside > 0 else 0.0
+
+    @staticmethod
+    def _max_run(mask: np.ndarray) -> int:
+        """True 가 연속된 최대 길이"""
+        if not mask.any():
+            return 0
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return int((ends - starts).max())
+
+    def _time_breakdown(self) -> Dict:
+        """시간대별/요일별 거래 수와 손익 (로컬 시간 기준)"""
+        offset = datetime.now().astimezone().utcoffset()
+        offset_seconds = int(offset.total_seconds()) if offset else 0
+        local_seconds = self.timestamps // 1000 + offset_seconds
+
+        hours = (local_seconds // 3600) % 24
+        # 1970-01-01 은 목요일 (월요일=0 기준 3)
+        weekdays = (local_seconds // 86400 + 3) % 7
+
+        hour_counts = np.bincount(hours, minlength=24)
+        hour_profit = np.bincount(hours, weights=self.pnl, minlength=24)
+        weekday_counts = np.bincount(weekdays, minlength=7)
+        weekday_profit = np.bincount(weekdays, weights=self.pnl, minlength=7)
+
+        return {
+            'hourly_performance': {
+                int(h): {'trades': int(hour_counts[h]), 'profit': float(hour_profit[h])}
+                for h in np.flatnonzero(hour_counts)
+            },
+            'weekday_performance': {
+                WEEKDAY_NAMES[d]: {'trades': int(weekday_counts[d]), 'profit': float(weekday_profit[d])}
+                for d in np.flatnonzero(weekday_counts)
+            }
+        }
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        """거래가 없을 때의 기본 통계"""
+        return {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'losing_trades': 0,
+            'win_rate': 0.0,
+            'total_profit': 0.0,
+            'average_profit': 0.0,
+            'average_loss': 0.0,
+            'max_profit': 0.0,
+            'max_loss': 0.0,
+            'long_trades': 0,
+            'long_profit': 0.0,
+            'short_trades': 0,
+            'short_profit': 0.0,
+            'profit_factor': 0.0,
+            'expectancy': 0.0,
+            'risk_reward_ratio': 0.0,
+            'max_drawdown': 0.0,
+            'sharpe_ratio': 0.0,
+            'sortino_ratio': 0.0,
+            'max_win_streak': 0,
+            'max_loss_streak': 0,
+            'hourly_performance': {},
+            'weekday_performance': {}
+        }
+
+def compute_trade_stats(positions: List[Dict]) -> Dict:
+    """포지션 목록의 거래 통계 계산"""
+    return TradeAnalytics(positions).compute()
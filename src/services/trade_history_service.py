@@ -5,6 +5,8 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import traceback
 from services.trade_store import TradeStore
+from services.trade_analytics import compute_trade_stats
+from config.trading_config import trading_config
 import time
 import asyncio
 
@@ -14,12 +16,17 @@ class TradeHistoryService:
     def __init__(self, bybit_client):
         self.bybit_client = bybit_client
         self.trade_store = TradeStore()
+        self.symbol = trading_config.symbol
+        self.symbols = trading_config.symbols
+        self._ready = asyncio.Event()
+        self._init_started = False
         # 디버그 로거 설정
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
 
     async def initialize(self):
         """포지션 정보 초기화"""
+        self._init_started = True
         try:
             logger.info("=== 포지션 정보 초기화 시작 ===")
             
@@ -33,7 +40,7 @@ class TradeHistoryService:
             logger.info(f"조회 기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
             
             # 저장된 데이터 확인
-            existing_positions = self.trade_store.get_positions(start_timestamp, end_timestamp)
+            existing_positions = await self.trade_store.get_positions_async(start_timestamp, end_timestamp)
             logger.info(f"기존 데이터: {len(existing_positions)}건")
             
             if not existing_positions:
@@ -47,6 +54,18 @@ class TradeHistoryService:
         except Exception as e:
             logger.error(f"포지션 정보 초기화 실패: {str(e)}")
             logger.error(traceback.format_exc())
+        finally:
+            self._ready.set()
+
+    async def wait_until_ready(self, timeout: float = None) -> bool:
+        """초기 동기화 완료 대기 (백그라운드 초기화 중 중복 조회 방지)"""
+        if not self._init_started:
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     def _find_missing_periods(self, existing_trades, start_timestamp, end_timestamp):
         """누락된 기간 찾기"""
@@ -96,16 +115,17 @@ class TradeHistoryService:
         
         return missing_periods
 
-    async def _fetch_trades_for_period(self, start_time: int, end_time: int):
+    async def _fetch_trades_for_period(self, start_time: int, end_time: int, symbol: str = None):
         """특정 기간의 포지션 정보 조회"""
         try:
+            symbol = symbol or self.symbol
             positions = []
             cursor = None
             
             while True:
                 params = {
                     'category': 'linear',
-                    'symbol': 'BTCUSDT',
+                    'symbol': symbol,
                     'limit': 100,
                     'startTime': start_time,
                     'endTime': end_time
@@ -167,8 +187,10 @@ class TradeHistoryService:
             logger.error(traceback.format_exc())
             return []
 
-    async def _fetch_trades_with_pagination(self, start_time: int, end_time: int) -> List[Dict]:
+    async def _fetch_trades_with_pagination(self, start_time: int, end_time: int,
+                                            symbol: str = None) -> List[Dict]:
         """페이지네이션을 사용하여 거래 내역 조회"""
+        symbol = symbol or self.symbol
         trades = []
         cursor = None
         
@@ -186,7 +208,7 @@ class TradeHistoryService:
                 try:
                     params = {
                         "category": "linear",
-                        "symbol": "BTCUSDT",
+                        "symbol": symbol,
                         "limit": 100,
                         "startTime": start_time,  # 밀리초 단위 유지
                         "endTime": end_time,      # 밀리초 단위 유지
@@ -201,7 +223,7 @@ class TradeHistoryService:
                     
                     # API 호출
                     batch = await self.bybit_client.fetch_my_trades(
-                        symbol="BTCUSDT",
+                        symbol=symbol,
                         params=params
                     )
                     
@@ -261,12 +283,18 @@ class TradeHistoryService:
                 saved_count += 1
         return saved_count
 
-    async def get_positions(self, start_time: int, end_time: int) -> List[Dict]:
-        """포지션 정보 조회"""
+    async def get_positions(self, start_time: int, end_time: int, symbol: str = None) -> List[Dict]:
+        """포지션 정보 조회 (심볼 미지정 시 모든 거래 심볼)"""
+        if symbol is None:
+            positions = []
+            for symbol in self.symbols:
+                positions.extend(await self.get_positions(start_time, end_time, symbol))
+            return positions
+
         try:
             params = {
                 "category": "linear",
-                "symbol": "BTCUSDT",
+                "symbol": symbol,
                 "startTime": str(start_time),
                 "endTime": str(end_time),
                 "limit": 100
@@ -292,7 +320,7 @@ class TradeHistoryService:
                         processed_position = {
                             'id': p.get('orderId'),
                             'timestamp': int(p.get('updatedTime')),
-                            'symbol': 'BTCUSDT',
+                            'symbol': p.get('symbol', symbol),
                             'side': p.get('side'),
                             'position_side': position_side,  # 포지션 방향 추가
                             'type': p.get('orderType'),
@@ -338,7 +366,7 @@ class TradeHistoryService:
                 
                 positions = await self.get_positions(current_start, current_end)
                 if positions:
-                    if self.trade_store.save_positions(positions):
+                    if await self.trade_store.save_positions_async(positions):
                         logger.info(f"포지션 정보 {len(positions)}건 저장 완료")
                 
                 current_start = current_end
@@ -355,21 +383,20 @@ class TradeHistoryService:
             end_time = int(time.time() * 1000)
             start_time = end_time - (days * 24 * 60 * 60 * 1000)
             
-            positions = self.trade_store.get_positions(start_time, end_time)
+            positions = await self.trade_store.get_positions_async(start_time, end_time)
             
             if not positions:
                 return None
             
-            total_pnl = sum(float(p.get('closed_pnl', 0)) for p in positions)
-            win_trades = sum(1 for p in positions if float(p.get('closed_pnl', 0)) > 0)
-            total_trades = len(positions)
+            stats = compute_trade_stats(positions)
+            total_trades = stats['total_trades']
             
             return {
                 'period': f"{days}일",
                 'total_trades': total_trades,
-                'win_rate': round(win_trades / total_trades * 100, 2) if total_trades > 0 else 0,
-                'total_pnl': round(total_pnl, 4),
-                'avg_pnl': round(total_pnl / total_trades, 4) if total_trades > 0 else 0
+                'win_rate': round(stats['win_rate'], 2),
+                'total_pnl': round(stats['total_profit'], 4),
+                'avg_pnl': round(stats['expectancy'], 4) if total_trades > 0 else 0
             }
             
         except Exception as e:
@@ -1,10 +1,10 @@
 from pathlib import Path
 from datetime import datetime, timedelta
-import json
 import logging
 from typing import Dict, List
 import time
 import traceback
+from services.storage_io import atomic_write_json, read_json, run_io
 
 logger = logging.getLogger(__name__)
 
@@ -65,10 +65,7 @@ class TradeStore:
                 position_file = month_dir / f"{date_str}.json"
                 
                 # 기존 데이터 로드
-                existing_positions = []
-                if position_file.exists():
-                    with open(position_file, 'r') as f:
-                        existing_positions = json.load(f)
+                existing_positions = read_json(position_file, [])
                 
                 # 기존 데이터와 새 데이터 병합 (중복 제거)
                 existing_ids = {p['id']: i for i, p in enumerate(existing_positions)}
@@ -85,9 +82,8 @@ class TradeStore:
                 # timestamp 기준으로 정렬
                 existing_positions.sort(key=lambda x: x['timestamp'], reverse=True)
                 
-                # 파일 저장
-                with open(position_file, 'w') as f:
-                    json.dump(existing_positions, f, indent=2)
+                # 파일 저장 (원자적 기록)
+                atomic_write_json(position_file, existing_positions)
                 
                 # 마지막 업데이트 시간 저장
                 if positions_data:
@@ -109,11 +105,7 @@ class TradeStore:
                 month_str = date_str[:6]  # YYYYMM
                 position_file = self.positions_dir / month_str / f"{date_str}.json"
                 
-                if not position_file.exists():
-                    return []
-                
-                with open(position_file, 'r') as f:
-                    return json.load(f)
+                return read_json(position_file, [])
             
             # timestamp 범위가 주어진 경우
             elif start_time and end_time:
@@ -165,11 +157,8 @@ class TradeStore:
     def get_last_update(self) -> int:
         """마지막 업데이트 시간 조회"""
         try:
-            if self.last_update_file.exists():
-                with open(self.last_update_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('last_update', 0)
-            return 0
+            data = read_json(self.last_update_file, {})
+            return data.get('last_update', 0)
         except Exception as e:
             logger.error(f"마지막 업데이트 시간 로드 실패: {e}")
             return 0
@@ -177,7 +166,24 @@ class TradeStore:
     def save_last_update(self, timestamp: int):
         """마지막 업데이트 시간 저장"""
         try:
-            with open(self.last_update_file, 'w') as f:
-                json.dump({'last_update': timestamp}, f)
+            atomic_write_json(self.last_update_file, {'last_update': timestamp}, indent=None)
         except Exception as e:
-            logger.error(f"마지막 업데이트 시간 저장 실패: {e}")
\ No newline at end of file
+            logger.error(f"마지막 업데이트 시간 저장 실패: {e}")
+
+    # ---- 비동기 래퍼 (스토리지 I/O 스레드에서 실행) ----
+
+    async def save_positions_async(self, positions: List[Dict]) -> bool:
+        """포지션 정보 저장 (비동기)"""
+        return await run_io(self.save_positions, positions)
+
+    async def get_positions_async(self, start_time=None, end_time=None, date_str=None) -> List[Dict]:
+        """포지션 조회 (비동기)"""
+        return await run_io(self.get_positions, start_time, end_time, date_str)
+
+    async def get_positions_by_date_range_async(self, start_date: str, end_date: str) -> List[Dict]:
+        """날짜 범위의 포지션 조회 (비동기)"""
+        return await run_io(self.get_positions_by_date_range, start_date, end_date)
+
+    async def get_last_update_async(self) -> int:
+        """마지막 업데이트 시간 조회 (비동기)"""
+        return await run_io(self.get_last_update)
@@ -20,7 +20,6 @@ import time
 # 로거 설정
 logger = logging.getLogger(__name__)
 
-from ai.gpt_analyzer import GPTAnalyzer
 from .handlers.analysis_handler import AnalysisHandler
 from .handlers.trading_handler import TradingHandler
 from .handlers.system_handler import SystemHandler
@@ -29,21 +28,23 @@ from .monitors.profit_monitor import ProfitMonitor
 from .utils.time_utils import TimeUtils
 from .formatters.analysis_formatter import AnalysisFormatter
 from .formatters.message_formatter import MessageFormatter
-from services.position_service import PositionService
 from services.market_data_service import MarketDataService
-from services.order_service import OrderService
 from config import config
 from .handlers.base_handler import BaseHandler
 from exchange.bybit_client import BybitClient
-from ai.ai_trader import AITrader
+from ai.analysis_repository import AnalysisRepository
+from services.container import ServiceContainer
+from services.storage_io import StorageIOExecutor, EventLoopLagMonitor
+from services.tracer import Tracer
+from services.metrics import (MetricsServer, registry, observe_rest_request, collect_websocket,
+                              EVENT_LOOP_LAG, QUEUE_DEPTH)
 from trade.trade_manager import TradeManager
 from config.telegram_config import TelegramConfig
 from .formatters.storage_formatter import StorageFormatter
 from .formatters.order_formatter import OrderFormatter
-from services.balance_service import BalanceService
-from services.trade_history_service import TradeHistoryService
 from .handlers.stats_handler import StatsHandler
 from .monitors.monitor_manager import MonitorManager
+from .notification_dispatcher import NotificationDispatcher
 
 class TelegramBot:
     # 메시지 타입 정의
@@ -57,49 +58,50 @@ class TelegramBot:
 
     def __init__(self, config: TelegramConfig, bybit_client: BybitClient, 
                  trade_manager: TradeManager = None,
-                 market_data_service: MarketDataService = None):
+                 market_data_service: MarketDataService = None,
+                 container: ServiceContainer = None):
         self.config = config
         self.bybit_client = bybit_client
         
-        # 서비스 초기화 (순서 중요)
-        self.position_service = PositionService(bybit_client)
-        self.balance_service = BalanceService(bybit_client)
-        self.order_service = OrderService(
-            bybit_client=bybit_client,
-            position_service=self.position_service,
-            balance_service=self.balance_service,
-            telegram_bot=self
-        )
-        self.market_data_service = market_data_service or MarketDataService(bybit_client)
-        self.trade_history_service = TradeHistoryService(bybit_client)
+        # 서비스는 컨테이너에서 한 번만 생성하여 공유
+        self.container = container or ServiceContainer(bybit_client)
+        if market_data_service:
+            self.container.register_instance('market_data_service', market_data_service)
+        if trade_manager:
+            self.container.register_instance('trade_manager', trade_manager)
+        
+        self.position_service = self.container.position_service
+        self.balance_service = self.container.balance_service
+        self.order_service = self.container.order_service
+        self.order_service.telegram_bot = self
+        self.market_data_service = self.container.market_data_service
+        self.trade_history_service = self.container.trade_history_service
         
         # 모니터 매니저 초기화
         self.monitor_manager = MonitorManager(self, bybit_client)
+        self.profit_monitor = self.monitor_manager.profit_monitor
         
         # 종료 이벤트 초기화
         self._stop_event = asyncio.Event()
         
+        # 이벤트 루프 블로킹 감지용 모니터
+        self.loop_lag_monitor = EventLoopLagMonitor(threshold=0.1)
+        
+        # 신호 → 주문 경로 단계별 지연 추적 (/latency)
+        self.tracer = Tracer.get_instance()
+        
+        # Prometheus 지표 엔드포인트 (/metrics)
+        self.metrics_server = MetricsServer()
+        
         # 포맷터 초기화
         self.storage_formatter = StorageFormatter()
         self.analysis_formatter = AnalysisFormatter()
         self.message_formatter = MessageFormatter()
         self.order_formatter = OrderFormatter()
         
-        # 트레이드 매니저 초기화 (수정)
-        self.trade_manager = trade_manager or TradeManager(
-            order_service=self.order_service
-        )
-        
-        # AI Trader 초기화
-        self.ai_trader = AITrader(
-            bybit_client=bybit_client,
-            market_data_service=self.market_data_service,
-            gpt_analyzer=GPTAnalyzer(
-                bybit_client=bybit_client,
-                market_data_service=self.market_data_service
-            ),
-            trade_manager=self.trade_manager
-        )
+        # 트레이드 매니저 / AI Trader
+        self.trade_manager = self.container.trade_manager
+        self.ai_trader = self.container.ai_trader
         
         # 텔레그램 설정 로드 (수정)
         self.admin_chat_id = config.admin_chat_id
@@ -112,14 +114,20 @@ class TelegramBot:
         
         # Application 초기화
         self.application = Application.builder().token(config.bot_token).build()
+        
+        # 알림 전송기 (채팅방별 동시 전송, 속도 제한, 재시도)
+        self.notifier = NotificationDispatcher(self._deliver_message)
 
         # 모니터링 초기화
         self.auto_analyzer = AutoAnalyzer(
             market_data_service=self.market_data_service,
             gpt_analyzer=self.ai_trader.gpt_analyzer,
             order_service=self.order_service,
-            telegram_bot=self
+            telegram_bot=self,
+            public_ws_client=self.bybit_client.public_ws_client,
+            account_state=self.container.account_state
         )
+        self._register_metrics()
         
         # 핸들러 초기화 (순서 중요)
         self.analysis_handler = AnalysisHandler(
@@ -137,15 +145,15 @@ class TelegramBot:
         )
 
     async def send_message_to_all(self, message: str, msg_type: str = None):
-        """모든 채팅방에 메시지 전송"""
+        """모든 채팅방에 메시지 전송 (전송 대기열에 등록 후 즉시 반환)"""
         try:
             # 관리자 채팅방에는 모든 메시지 전송
-            await self.send_message(message, self.admin_chat_id)
+            self.notifier.enqueue(self.admin_chat_id, message, msg_type=msg_type)
             
             # 알림 채팅방에도 모든 메시지 전송 (명령어 응답 제외)
             if msg_type != self.MSG_TYPE_COMMAND:
                 for chat_id in self.alert_chat_ids:
-                    await self.send_message(message, chat_id)
+                    self.notifier.enqueue(chat_id, message, msg_type=msg_type)
                     
         except Exception as e:
             logger.error(f"메시지 전송 중 오류: {str(e)}")
@@ -154,12 +162,7 @@ class TelegramBot:
         """관리자방에만 메시지 전송"""
         try:
             if self.admin_chat_id:
-                await self.application.bot.send_message(
-                    chat_id=self.admin_chat_id,
-                    text=message,
-                    parse_mode=parse_mode
-                )
-                logger.info(f"관리자방({self.admin_chat_id})에 메시지 전송됨")
+                self.notifier.enqueue(self.admin_chat_id, message, parse_mode)
         except Exception as e:
             logger.error(f"관리자 메시지 전송 실패: {str(e)}")
 
@@ -167,29 +170,24 @@ class TelegramBot:
         """알림방에만 메시지 전송"""
         try:
             for chat_id in self.alert_chat_ids:
-                await self.application.bot.send_message(
-                    chat_id=chat_id,
-                    text=message,
-                    parse_mode=parse_mode
-                )
-                logger.info(f"알림방({chat_id})에 메시지 전송됨")
+                self.notifier.enqueue(chat_id, message, parse_mode)
         except Exception as e:
             logger.error(f"알림방 메시지 전송 실패: {str(e)}")
 
+    async def _deliver_message(self, chat_id: int, message: str, parse_mode: str = None):
+        """실제 텔레그램 전송 (알림 전송기에서 호출, 실패 시 예외 발생)"""
+        await self.tracer.measure('telegram.send', self.application.bot.send_message(
+            chat_id=chat_id,
+            text=message,
+            parse_mode=parse_mode
+        ))
+
     async def initialize(self):
         """봇 초기화"""
         try:
             logger.info("봇 초기화 시작...")
             
-            # 거래 내역 서비스 초기화
-            await self.trade_history_service.initialize()
-            
-            # 봇 초기화
-            self.application = (
-                Application.builder()
-                .token(self.config.bot_token)
-                .build()
-            )
+            # Application 은 __init__ 에서 한 번만 생성 (거래 내역 동기화는 main 에서 병렬 실행)
             
             # 명령어 핸들러 등록
             logger.info("명령어 핸들러 등록 시작...")
@@ -199,6 +197,7 @@ class TelegramBot:
             self.application.add_handler(CommandHandler("stop", self.system_handler.handle_stop))
             self.application.add_handler(CommandHandler("monitor_start", self.system_handler.handle_start_monitoring))
             self.application.add_handler(CommandHandler("monitor_stop", self.system_handler.handle_stop_monitoring))
+            self.application.add_handler(CommandHandler("latency", self.system_handler.handle_latency))
             
             # 분석 명령어
             self.application.add_handler(CommandHandler("analyze", self.analysis_handler.handle_analyze))
@@ -213,6 +212,7 @@ class TelegramBot:
             self.application.add_handler(CommandHandler("daily", self.stats_handler.daily_stats))
             self.application.add_handler(CommandHandler("monthly", self.stats_handler.monthly_stats))
             self.application.add_handler(CommandHandler("stats", self.stats_handler.stats))
+            self.application.add_handler(CommandHandler("equity", self.stats_handler.equity_stats))
             
             # 에러 핸들러 등록
             self.application.add_error_handler(self._error_handler)
@@ -226,6 +226,18 @@ class TelegramBot:
             logger.error(f"봇 초기화 실패: {str(e)}")
             raise
 
+    def _register_metrics(self):
+        """지표 연결 (핫 패스에서는 카운터 갱신만 하고 나머지는 수집 시점에 읽음)"""
+        self.bybit_client.request_observer = observe_rest_request
+        self.loop_lag_monitor.add_listener(EVENT_LOOP_LAG.observe)
+        registry.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self):
+        collect_websocket('private', self.bybit_client.ws_client)
+        collect_websocket('public', self.bybit_client.public_ws_client)
+        QUEUE_DEPTH.set(self.notifier.queue_depth(), 'notification')
+        QUEUE_DEPTH.set(sum(1 for runner in self.auto_analyzer.runners.values() if runner.is_busy()), 'analysis')
+
     async def start(self):
         """봇 시작"""
         try:
@@ -234,9 +246,22 @@ class TelegramBot:
             # 기존 웹훅 제거
             await self.application.bot.delete_webhook()
             
+            # 이벤트 루프 지연 모니터 시작
+            await self.loop_lag_monitor.start()
+            
+            # 구간 추적 내보내기 / 지표 엔드포인트 시작
+            await self.tracer.start()
+            await self.metrics_server.start()
+            
             # 모니터링 시작
             await self.monitor_manager.start_all_monitors()
             
+            # 심볼별 분석 작업이 공유하는 계정 상태 미러 시작
+            await self.container.account_state.start(self.bybit_client)
+            
+            # 분할 익절/트레일링 스톱 실행기 시작 (포지션 스트림 + 마크 가격)
+            await self.container.exit_manager.start()
+            
             # 봇 시작 알람 전송
             await self.send_message_to_all("🤖 바이빗 트레이딩 봇이 시작되었습니다", self.MSG_TYPE_SYSTEM)
             
@@ -253,6 +278,11 @@ class TelegramBot:
                 allowed_updates=["message", "callback_query"]
             )
             
+            # 첫 명령 처리 가능 시점 기록
+            profiler = self.container.startup_profiler
+            profiler.mark('first_command_ready')
+            logger.info(profiler.report())
+            
             # 봇이 실행 중인 동안 대기
             try:
                 await self._stop_event.wait()
@@ -270,27 +300,44 @@ class TelegramBot:
         try:
             logger.info("봇 종료 시작...")
             
-            # 1. 텔레그램 봇 종료
-            logger.info("텔레그램 봇 종료 중...")
-            await self.application.stop()
-            await self.application.shutdown()
-            
-            # 2. 자동 분석기 중지
+            # 1. 자동 분석기 중지
             logger.info("자동 분석기 종료 중...")
             await self.auto_analyzer.stop()
+            await self.auto_analyzer.gpt_analyzer.llm_client.close()
             
-            # 3. 모니터링 중지 (웹소켓 콜백 제거)
+            # 2. 모니터링 중지 (웹소켓 콜백 제거, 병합 대기 알림 전송)
             logger.info("모니터링 종료 중...")
             await self.monitor_manager.stop_all_monitors()
+            self.container.account_state.stop()
+            self.container.exit_manager.stop()
+            
+            # 3. 대기 중인 알림 전송 완료 후 텔레그램 봇 종료
+            logger.info("알림 전송 대기열 정리 중...")
+            await self.notifier.stop()
+            logger.info("텔레그램 봇 종료 중...")
+            await self.application.stop()
+            await self.application.shutdown()
             
             # 4. 웹소켓 연결 종료
             logger.info("웹소켓 연결 종료 중...")
             await self.bybit_client.ws_client.stop()
+            await self.bybit_client.public_ws_client.stop()
             
             # 5. Bybit 클라이언트 종료
             logger.info("Bybit 클라이언트 종료 중...")
             await self.bybit_client.close()
             
+            # 6. 분석 저장소의 대기 중인 기록 완료
+            logger.info("분석 저장소 종료 중...")
+            await asyncio.get_running_loop().run_in_executor(None, AnalysisRepository.get_instance().close)
+            
+            # 7. 지표 엔드포인트, 남은 추적 구간 저장, 스토리지 I/O 실행기 및 루프 지연 모니터 종료
+            await self.metrics_server.stop()
+            registry.remove_collector(self._collect_metrics)
+            await self.tracer.stop()
+            await self.loop_lag_monitor.stop()
+            StorageIOExecutor.get_instance().shutdown(wait=True)
+            
             logger.info("봇이 성공적으로 종료되었습니다")
             
         except Exception as e:
@@ -302,11 +349,7 @@ class TelegramBot:
         """관리자에게 메시지 전송"""
         try:
             if self.admin_chat_id:
-                await self.application.bot.send_message(
-                    chat_id=self.admin_chat_id,
-                    text=message,
-                    parse_mode=ParseMode.HTML
-                )
+                self.notifier.enqueue(self.admin_chat_id, message, ParseMode.HTML)
         except Exception as e:
             logger.error(f"관리자 메시지 전송 실패: {str(e)}")
 
@@ -317,11 +360,7 @@ class TelegramBot:
     async def send_message(self, message: str, chat_id: int, parse_mode: str = None):
         """특정 채팅방에 메시지 전송"""
         try:
-            await self.application.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode=parse_mode
-            )
+            self.notifier.enqueue(chat_id, message, parse_mode)
         except Exception as e:
             logger.error(f"메시지 전송 실패 (chat_id: {chat_id}): {str(e)}")
 
@@ -398,6 +437,11 @@ class TelegramBot:
             # 봇 초기화
             await self.initialize()
             
+            # 거래 내역 동기화는 백그라운드에서 실행 (태스크 참조 보관, 실패 시 로그)
+            self.container.startup_profiler.background(
+                'trade_history_sync', self.trade_history_service.initialize()
+            )
+            
             # 봇 시작
             logger.info("봇 시작 시도...")
             await self.start()
@@ -3,6 +3,8 @@ import logging
 from decimal import Decimal, InvalidOperation
 import json
 from .base_formatter import BaseFormatter
+from .records import AnalysisRecord
+from .template_renderer import MessageTemplate, TranslationTable, RenderCache
 from ..utils.time_utils import TimeUtils
 from datetime import datetime
 import pytz
@@ -29,29 +31,55 @@ class AnalysisFormatter(BaseFormatter):
         'volume_neutral': '➖'
     }
 
+    KST = pytz.timezone('Asia/Seoul')
+
+    # 번역 테이블 (대소문자 구분 없음, 클래스 로드 시 한 번만 생성)
+    TRANSLATIONS = TranslationTable({
+        # Trading signals
+        "position_suggestion": "포지션",
+        "BUY": "매수",
+        "SELL": "매도",
+        "HOLD": "관망",
+        
+        # Market phase & trends
+        "SIDEWAYS": "횡보",
+        "UPTREND": "상승",
+        "DOWNTREND": "하락",
+        
+        # Sentiment
+        "NEUTRAL": "중립",
+        "POSITIVE": "긍정",
+        "NEGATIVE": "부정",
+        
+        # Volume
+        "VOLUME_INCREASE": "거래량 증가",
+        "VOLUME_DECREASE": "거래량 감소",
+        "VOLUME_NEUTRAL": "거래량 보통",
+        
+        # Risk
+        "HIGH": "높음",
+        "MEDIUM": "보통",
+        "LOW": "낮음",
+        
+        # Technical indicators
+        "STRONG_BULLISH": "매우 강세",
+        "BULLISH": "강세",
+        "STRONG_BEARISH": "매우 약세",
+        "BEARISH": "약세",
+        "OVERBOUGHT": "과매수",
+        "OVERSOLD": "과매도",
+        
+        # Bollinger Bands
+        "UPPER_BREAK": "상단 돌파",
+        "LOWER_BREAK": "하단 돌파",
+        "ABOVE_MIDDLE": "중앙선 위",
+        "BELOW_MIDDLE": "중앙선 아래",
+    })
+
     def __init__(self):
         """초기화 메서드"""
         self.time_utils = TimeUtils()
-        self.translations = {
-            # Market phases
-            "BULLISH": "상승",
-            "BEARISH": "하락",
-            # Sentiments
-            "POSITIVE": "긍정적",
-            "NEGATIVE": "부정적",
-            # Volume
-            "VOLUME_INCREASE": "거래량 증가",
-            "VOLUME_DECREASE": "거래량 감소",
-            "VOLUME_NEUTRAL": "거래량 보통",
-            # RSI signals
-            "OVERBOUGHT": "과매수",
-            "OVERSOLD": "과매도",
-            "NEUTRAL": "중립",
-            # Trading signals
-            "BUY": "매수",
-            "SELL": "매도",
-            "HOLD": "관망"
-        }
+        self._render_cache = RenderCache()
 
     def validate_analysis_data(self, analysis_result: Dict) -> bool:
         """분석 데이터 유효성 검사
@@ -135,65 +163,82 @@ class AnalysisFormatter(BaseFormatter):
             return self.EMOJIS['volume_down']
         return self.EMOJIS['volume_neutral']
 
+    # 분석 메시지 템플릿 (클래스 로드 시 한 번만 파싱)
+    ANALYSIS_TEMPLATE = MessageTemplate(
+        "📊 {symbol_label}1h 분석 ({time})\n\n"
+        "{auto_trading}"
+        "🌍 시장 요약:\n"
+        "• 시장 단계: {market_phase}\n"
+        "• 전반적 심리: {overall_sentiment}\n"
+        "• 단기 심리: {short_sentiment}\n"
+        "• 거래량: {volume_status}\n"
+        "• 리스크: {risk_level}\n"
+        "• 신뢰도: {confidence}%\n\n"
+        "📈 기술적 분석:\n"
+        "• 추세: {trend}\n"
+        "• 강도: {strength}\n"
+        "• RSI: {rsi:.2f}\n"
+        "• MACD: {macd}\n"
+        "• 볼린저밴드: {bollinger}\n"
+        "• 다이버전스: {divergence_type}\n"
+        "• 설명: {divergence_description}\n\n"
+        "💡 매매 신호:\n"
+        "• 포지션: {position_emoji} {position_side}\n"
+        "• 진입가: ${entry_price:,.1f}\n"
+        "• 손절가: ${stop_loss:,.1f}\n"
+        "• 목표가: ${take_profit1:,.1f}, ${take_profit2:,.1f}\n"
+        "• 레버리지: {leverage}x\n"
+        "• 포지션 크기: {position_size}%\n"
+        "• 사유: {reason}"
+    )
+
     def format_analysis(self, analysis_result: Dict, auto_trading_status: str = None) -> str:
-        """분석 결과 포맷팅"""
+        """분석 결과 포맷팅 (같은 분석은 캐시된 메시지 재사용)"""
         try:
             if not analysis_result:
                 return "❌ 분석 결과 없음"
 
-            market = analysis_result.get('market_summary', {})
-            technical = analysis_result.get('technical_analysis', {})
-            signals = analysis_result.get('trading_signals', {})
-
-            # 현재 시간을 KST로 변환
-            kst = pytz.timezone('Asia/Seoul')
-            current_time = datetime.now(kst).strftime('%Y-%m-%d %H:%M:%S KST')
-
-            # 포지션 방향 결정
-            position = signals.get('position_suggestion', '관망')
-            position_side = '숏' if position.upper() == 'SELL' else '롱' if position.upper() == 'BUY' else '관망'
-            position_emoji = "🔴" if position.upper() == "SELL" else "🟢" if position.upper() == "BUY" else "⚪"
-
-            lines = [
-                f"📊 1h 분석 ({current_time})\n",
-                
-                # 자동매매 상태
-                f"⚙️ {auto_trading_status}\n" if auto_trading_status else "",
-                
-                "🌍 시장 요약:",
-                f"• 시장 단계: {self.translate(market.get('market_phase', '-'))}",
-                f"• 전반적 심리: {self.translate(market.get('overall_sentiment', '-'))}",
-                f"• 단기 심리: {self.translate(market.get('short_sentiment', '-'))}",
-                f"• 거래량: {self.translate(market.get('volume_status', '-'))}",
-                f"• 리스크: {self.translate(market.get('risk_level', '-'))}",
-                f"• 신뢰도: {market.get('confidence', 0)}%\n",
-
-                "📈 기술적 분석:",
-                f"• 추세: {self.translate(technical.get('trend', '-'))}",
-                f"• 강도: {technical.get('strength', 0)}",
-                f"• RSI: {technical.get('indicators', {}).get('rsi', 0):.2f}",
-                f"• MACD: {technical.get('indicators', {}).get('macd', '-')}",
-                f"• 볼린저밴드: {technical.get('indicators', {}).get('bollinger', '-')}",
-                f"• 다이버전스: {technical.get('divergence', {}).get('type', '없음')}",
-                f"• 설명: {technical.get('divergence', {}).get('description', '현재 다이버전스 없음')}\n",
-
-                "💡 매매 신호:",
-                f"• 포지션: {position_emoji} {position_side}",
-                f"• 진입가: ${float(signals.get('entry_price', 0)):,.1f}",
-                f"• 손절가: ${float(signals.get('stop_loss', 0)):,.1f}",
-                f"• 목표가: ${float(signals.get('take_profit1', 0)):,.1f}, ${float(signals.get('take_profit2', 0)):,.1f}",
-                f"• 레버리지: {signals.get('leverage', 1)}x",
-                f"• 포지션 크기: {signals.get('position_size', 10)}%",
-                f"• 사유: {signals.get('reason', '알 수 없음')}"
-            ]
-
-            return "\n".join(line for line in lines if line)
+            record = AnalysisRecord.from_dict(analysis_result)
+            return self._render_cache.get_or_render(
+                (record, auto_trading_status),
+                lambda: self._render_analysis(record, auto_trading_status)
+            )
 
         except Exception as e:
             logger.error(f"분석 결과 포맷팅 중 오류: {str(e)}")
             logger.error(traceback.format_exc())
             return "❌ 분석 결과 포맷팅 실패"
 
+    def _render_analysis(self, record: AnalysisRecord, auto_trading_status: str = None) -> str:
+        """분석 레코드를 메시지로 렌더링"""
+        # 분석 시각 기준 (없으면 현재 시각) KST 표시
+        if record.timestamp:
+            analysis_time = datetime.fromtimestamp(record.timestamp / 1000, self.KST)
+        else:
+            analysis_time = datetime.now(self.KST)
+
+        # 포지션 방향 결정
+        position = record.position.upper()
+        position_side = '숏' if position == 'SELL' else '롱' if position == 'BUY' else '관망'
+        position_emoji = "🔴" if position == "SELL" else "🟢" if position == "BUY" else "⚪"
+
+        translate = self.translate
+        values = record._asdict()
+        values.update(
+            time=analysis_time.strftime('%Y-%m-%d %H:%M:%S KST'),
+            symbol_label=f"{record.symbol} " if record.symbol else "",
+            auto_trading=f"⚙️ {auto_trading_status}\n\n" if auto_trading_status else "",
+            market_phase=translate(record.market_phase),
+            overall_sentiment=translate(record.overall_sentiment),
+            short_sentiment=translate(record.short_sentiment),
+            volume_status=translate(record.volume_status),
+            risk_level=translate(record.risk_level),
+            trend=translate(record.trend),
+            position_emoji=position_emoji,
+            position_side=position_side
+        )
+        return self.ANALYSIS_TEMPLATE.render(values)
+
     def format_balance(self, balance_data: Dict) -> str:
         """잔고 정보를 포맷팅"""
         try:
@@ -271,50 +316,9 @@ class AnalysisFormatter(BaseFormatter):
 
     def translate(self, text: str) -> str:
         """번역 처리"""
-        translations = {
-            # Trading signals
-            "position_suggestion": "포지션",
-            "BUY": "매수",
-            "SELL": "매도",
-            "HOLD": "관망",
-            
-            # Market phase & trends
-            "SIDEWAYS": "횡보",
-            "UPTREND": "상승",
-            "DOWNTREND": "하락",
-            
-            # Sentiment
-            "NEUTRAL": "중립",
-            "POSITIVE": "긍정",
-            "NEGATIVE": "부정",
-            
-            # Volume
-            "VOLUME_INCREASE": "거래량 증가",
-            "VOLUME_DECREASE": "거래량 감소",
-            "VOLUME_NEUTRAL": "거래량 보통",
-            
-            # Risk
-            "HIGH": "높음",
-            "MEDIUM": "보통",
-            "LOW": "낮음",
-            
-            # Technical indicators
-            "STRONG_BULLISH": "매우 강세",
-            "BULLISH": "강세",
-            "STRONG_BEARISH": "매우 약세",
-            "BEARISH": "약세",
-            "OVERBOUGHT": "과매수",
-            "OVERSOLD": "과매도",
-            
-            # Bollinger Bands
-            "UPPER_BREAK": "상단 돌파",
-            "LOWER_BREAK": "하단 돌파",
-            "ABOVE_MIDDLE": "중앙선 위",
-            "BELOW_MIDDLE": "중앙선 아래",
-            
-            # ... 기존 코드 ...
-        }
-        return translations.get(text, text)
+        if not text or text == '-':
+            return '-'
+        return self.TRANSLATIONS.get(text, text)
 
     def _translate_macd(self, macd_signal: str) -> str:
         """MACD 신호 번역"""
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Union, Any
-from decimal import Decimal
 import logging
+from .template_renderer import format_decimal
 
 logger = logging.getLogger(__name__)
 
@@ -38,17 +38,12 @@ class BaseFormatter(ABC):
         Returns:
             str: 포맷팅된 숫자 문자열
         """
-        try:
-            if number is None:
-                return '-'
-            if isinstance(number, str):
-                number = number.replace(',', '').replace('$', '')
-            number_decimal = Decimal(str(number))
-            format_str = f"{{:,.{decimals}f}}"
-            return format_str.format(float(number_decimal))
-        except (ValueError, TypeError, decimal.InvalidOperation) as e:
-            logger.error(f"숫자 포맷팅 실패: {number}, 오류: {str(e)}")
+        if number is None:
             return '-'
+        result = format_decimal(number, decimals)
+        if result == '-':
+            logger.error(f"숫자 포맷팅 실패: {number}")
+        return result
 
     def format_error(self, message: str) -> str:
         """에러 메시지 포맷팅
@@ -156,7 +156,7 @@ class MessageFormatter(BaseFormatter):
             return f"""
 📊 시스템 상태
 
-💹 시장 정보 (BTCUSDT):
+💹 시장 정보 ({market_data.get('symbol', '-')}):
 • 현재가: ${last_price:,.2f}
 • 매수호가: ${bid:,.2f}
 • 매도호가: ${ask:,.2f}
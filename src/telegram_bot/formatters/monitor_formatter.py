@@ -1,6 +1,8 @@
 import logging
 from typing import Dict, Union
 from .base_formatter import BaseFormatter
+from .records import OrderEventRecord, PositionEventRecord
+from .template_renderer import MessageTemplate, RenderCache
 
 logger = logging.getLogger(__name__)
 
@@ -90,98 +92,96 @@ class MonitorFormatter(BaseFormatter):
             logger.error(f"상태 정보 포맷 오류: {str(e)}")
             return self.format_error("상태 정보 포맷 오류")
 
-    def format_order_created(self, order_data: Dict) -> str:
-        """주문 생성 알림 포맷"""
+    # 이벤트 메시지 템플릿 (클래스 로드 시 한 번만 파싱)
+    ORDER_CREATED_TEMPLATE = MessageTemplate(
+        "🔔 주문 생성\n\n"
+        "코인: {symbol}\n"
+        "유형: {order_type}\n"
+        "방향: {side}\n"
+        "가격: {price:,.2f}\n"
+        "수량: {qty:,.4f} BTC"
+    )
+    ORDER_FILLED_TEMPLATE = MessageTemplate(
+        "✅ 주문 체결\n\n"
+        "코인: {symbol}\n"
+        "방향: {side}\n"
+        "체결가: {price:,.2f}\n"
+        "수량: {qty:,.4f} BTC"
+    )
+    ORDER_CANCELLED_TEMPLATE = MessageTemplate(
+        "❌ 주문 취소\n\n"
+        "코인: {symbol}\n"
+        "유형: {order_type}\n"
+        "방향: {side}\n"
+        "가격: {price:,.2f}"
+    )
+    POSITION_UPDATE_TEMPLATE = MessageTemplate(
+        "📊 포지션 업데이트\n\n"
+        "코인: {symbol}\n"
+        "방향: {direction_emoji} {direction}\n"
+        "크기: {size:,.4f} BTC\n"
+        "진입가: {entry_price:,.2f}\n"
+        "레버리지: {leverage}x"
+    )
+
+    ORDER_CREATED_KEYS = frozenset(['symbol', 'orderType', 'side', 'price', 'qty'])
+    ORDER_FILLED_KEYS = frozenset(['symbol', 'side', 'price', 'qty'])
+    ORDER_CANCELLED_KEYS = frozenset(['symbol', 'orderType', 'side', 'price'])
+    POSITION_UPDATE_KEYS = frozenset(['symbol', 'side', 'size', 'entryPrice', 'leverage'])
+
+    def __init__(self):
+        super().__init__()
+        self._render_cache = RenderCache()
+
+    def _render_order(self, template: MessageTemplate, required: frozenset,
+                      order_data: Dict, error_message: str) -> str:
+        """주문 이벤트 렌더링 (같은 레코드는 캐시 재사용)"""
         try:
-            if not self.validate_data(order_data, ['symbol', 'orderType', 'side', 'price', 'qty']):
+            if not isinstance(order_data, dict) or not required.issubset(order_data):
                 return self.format_error("주문 데이터 누락")
 
-            symbol = order_data.get('symbol', '')
-            order_type = order_data.get('orderType', '')
-            side = order_data.get('side', '')  # 주문 방향 (Buy/Sell)
-            price = float(order_data.get('price', 0))
-            qty = float(order_data.get('qty', 0))
-            
-            return (
-                f"{self.TRADING_EMOJIS['order_created']} 주문 생성\n\n"
-                f"코인: {symbol}\n"
-                f"유형: {order_type}\n"
-                f"방향: {side}\n"
-                f"가격: {self.format_number(price)}\n"
-                f"수량: {self.format_number(qty, 4)} BTC"
+            record = OrderEventRecord.from_dict(order_data)
+            return self._render_cache.get_or_render(
+                (id(template), record),
+                lambda: template.render(record._asdict())
             )
         except Exception as e:
-            logger.error(f"주문 생성 알림 포맷 오류: {str(e)}")
-            return self.format_error("주문 생성 알림 포맷 오류")
+            logger.error(f"{error_message}: {str(e)}")
+            return self.format_error(error_message)
+
+    def format_order_created(self, order_data: Dict) -> str:
+        """주문 생성 알림 포맷"""
+        return self._render_order(self.ORDER_CREATED_TEMPLATE, self.ORDER_CREATED_KEYS,
+                                  order_data, "주문 생성 알림 포맷 오류")
 
     def format_order_filled(self, order_data: Dict) -> str:
         """주문 체결 알림 포맷"""
-        try:
-            if not self.validate_data(order_data, ['symbol', 'side', 'price', 'qty']):
-                return self.format_error("주문 데이터 누락")
-
-            symbol = order_data.get('symbol', '')
-            side = order_data.get('side', '')  # 주문 방향 (Buy/Sell)
-            price = float(order_data.get('price', 0))
-            qty = float(order_data.get('qty', 0))
-            
-            return (
-                f"{self.TRADING_EMOJIS['order_filled']} 주문 체결\n\n"
-                f"코인: {symbol}\n"
-                f"방향: {side}\n"
-                f"체결가: {self.format_number(price)}\n"
-                f"수량: {self.format_number(qty, 4)} BTC"
-            )
-        except Exception as e:
-            logger.error(f"주문 체결 알림 포맷 오류: {str(e)}")
-            return self.format_error("주문 체결 알림 포맷 오류")
+        return self._render_order(self.ORDER_FILLED_TEMPLATE, self.ORDER_FILLED_KEYS,
+                                  order_data, "주문 체결 알림 포맷 오류")
 
     def format_order_cancelled(self, order_data: Dict) -> str:
         """주문 취소 알림 포맷"""
-        try:
-            if not self.validate_data(order_data, ['symbol', 'orderType', 'side', 'price']):
-                return self.format_error("주문 데이터 누락")
-
-            symbol = order_data.get('symbol', '')
-            order_type = order_data.get('orderType', '')
-            side = order_data.get('side', '')
-            price = float(order_data.get('price', 0))
-            
-            return (
-                f"{self.TRADING_EMOJIS['order_cancelled']} 주문 취소\n\n"
-                f"코인: {symbol}\n"
-                f"유형: {order_type}\n"
-                f"방향: {side}\n"
-                f"가격: {self.format_number(price)}"
-            )
-        except Exception as e:
-            logger.error(f"주문 취소 알림 포맷 오류: {str(e)}")
-            return self.format_error("주문 취소 알림 포맷 오류")
+        return self._render_order(self.ORDER_CANCELLED_TEMPLATE, self.ORDER_CANCELLED_KEYS,
+                                  order_data, "주문 취소 알림 포맷 오류")
 
     def format_position_update(self, position_data: Dict) -> str:
         """포지션 업데이트 알림 포맷"""
         try:
-            if not self.validate_data(position_data, ['symbol', 'side', 'size', 'entryPrice', 'leverage']):
+            if not isinstance(position_data, dict) or not self.POSITION_UPDATE_KEYS.issubset(position_data):
                 return self.format_error("포지션 데이터 누락")
 
-            symbol = position_data.get('symbol', '')
-            side = position_data.get('side', '')  # Long/Short
-            size = float(position_data.get('size', 0))
-            entry_price = float(position_data.get('entryPrice', 0))
-            leverage = position_data.get('leverage', '')
-            
-            # 한글로 포지션 방향 표시
-            direction = "롱" if side == "Long" else "숏"
-            direction_emoji = self.TRADING_EMOJIS['long'] if side == "Long" else self.TRADING_EMOJIS['short']
-            
-            return (
-                f"{self.TRADING_EMOJIS['position_update']} 포지션 업데이트\n\n"
-                f"코인: {symbol}\n"
-                f"방향: {direction_emoji} {direction}\n"
-                f"크기: {self.format_number(size, 4)} BTC\n"
-                f"진입가: {self.format_number(entry_price)}\n"
-                f"레버리지: {leverage}x"
-            )
+            record = PositionEventRecord.from_dict(position_data)
+
+            def render() -> str:
+                # 한글로 포지션 방향 표시
+                is_long = record.side == "Long"
+                values = record._asdict()
+                values['direction'] = "롱" if is_long else "숏"
+                values['direction_emoji'] = self.TRADING_EMOJIS['long'] if is_long else self.TRADING_EMOJIS['short']
+                return self.POSITION_UPDATE_TEMPLATE.render(values)
+
+            return self._render_cache.get_or_render((id(self.POSITION_UPDATE_TEMPLATE), record), render)
+
         except Exception as e:
             logger.error(f"포지션 업데이트 알림 포맷 오류: {str(e)}")
             return self.format_error("포지션 업데이트 알림 포맷 오류")
@@ -1,9 +1,10 @@
 import logging
 from typing import Dict, List, Tuple
-from decimal import Decimal
 from datetime import datetime
 import json
 import traceback
+from .template_renderer import MessageTemplate
+from config.trading_config import trading_config
 
 logger = logging.getLogger('order_formatter')
 
@@ -14,12 +15,21 @@ class OrderFormatter:
     ORDER_SIDES = {'BUY', 'SELL'}
     ORDER_STATUSES = {'NEW', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED', 'REJECTED'}
     
-    def __init__(self):
-        self.current_time = datetime.now()
+    # 자동매매 신호 메시지 템플릿 (클래스 로드 시 한 번만 파싱)
+    ORDER_TEMPLATE = MessageTemplate(
+        "🤖 자동매매 신호\n\n"
+        "{side_emoji} {position_side} 포지션\n"
+        "레버리지: {leverage}x\n"
+        "주문수량: {qty:.3f} BTC\n"
+        "진입가격: ${entry_price:,.0f}\n"
+        "손절가격: ${stop_loss:,.0f}\n"
+        "목표가격: ${take_profit:,.0f}\n\n"
+        "시간: {time}"
+    )
 
     def _get_current_time(self) -> str:
-        """현재 시간 포맷팅"""
-        return self.current_time.strftime("%Y-%m-%d %H:%M:%S KST")
+        """현재 시간 포맷팅 (호출 시점 기준)"""
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S KST")
 
     @classmethod
     def _validate_order(cls, order: Dict) -> Tuple[bool, str]:
@@ -60,24 +70,23 @@ class OrderFormatter:
     def _format_number(value: float, decimals: int = 2) -> str:
         """숫자 포맷팅"""
         try:
-            decimal_value = Decimal(str(value))
-            return f"{float(decimal_value.normalize()):.{decimals}f}"
-        except:
+            return f"{float(value):.{decimals}f}"
+        except (ValueError, TypeError):
             return str(value)
     
+    STATUS_EMOJIS = {
+        'NEW': '📝',
+        'PARTIALLY_FILLED': '⏳',
+        'FILLED': '✅',
+        'CANCELED': '❌',
+        'REJECTED': '⛔'
+    }
+
     @classmethod
     def _get_order_emoji(cls, side: str, status: str) -> str:
         """주문 상태별 이모지 선택"""
-        status_emojis = {
-            'NEW': '📝',
-            'PARTIALLY_FILLED': '⏳',
-            'FILLED': '✅',
-            'CANCELED': '❌',
-            'REJECTED': '⛔'
-        }
-        
         side_emoji = "🟢" if side == "BUY" else "🔴"
-        status_emoji = status_emojis.get(status, '❓')
+        status_emoji = cls.STATUS_EMOJIS.get(status, '❓')
         
         return f"{status_emoji} {side_emoji}"
     
@@ -88,30 +97,17 @@ class OrderFormatter:
                 return "주문 정보 없음"
 
             # 주문 정보 추출
-            entry_price = float(order.get('price', order.get('entry_price', 0)))
-            btc_quantity = float(order.get('qty', order.get('amount', 0)))  
-            leverage = int(order.get('leverage', 1))
-            stop_loss = float(order.get('stopLoss', order.get('stop_loss', 0)))
-            take_profit = float(order.get('takeProfit', order.get('take_profit', 0)))
-            
-            # 이모지 설정
             side = order.get('side', '').lower()
-            position_side = '숏' if side == 'sell' else '롱'
-            side_emoji = "🔴" if side == 'sell' else "🟢"
-
-            # 메시지 구성
-            message = (
-                f"🤖 자동매매 신호\n\n"
-                f"{side_emoji} {position_side} 포지션\n"
-                f"레버리지: {leverage}x\n"
-                f"주문수량: {btc_quantity:.3f} BTC\n"
-                f"진입가격: ${entry_price:,.0f}\n"
-                f"손절가격: ${stop_loss:,.0f}\n"
-                f"목표가격: ${take_profit:,.0f}\n\n"
-                f"시간: {self._get_current_time()}"
-            )
-            
-            return message
+            return self.ORDER_TEMPLATE.render({
+                'entry_price': float(order.get('price', order.get('entry_price', 0))),
+                'qty': float(order.get('qty', order.get('amount', 0))),
+                'leverage': int(order.get('leverage', 1)),
+                'stop_loss': float(order.get('stopLoss', order.get('stop_loss', 0))),
+                'take_profit': float(order.get('takeProfit', order.get('take_profit', 0))),
+                'position_side': '숏' if side == 'sell' else '롱',
+                'side_emoji': "🔴" if side == 'sell' else "🟢",
+                'time': self._get_current_time()
+            })
             
         except Exception as e:
             logger.error(f"주문 정보 포맷팅 중 오류: {str(e)}")
@@ -206,7 +202,7 @@ class OrderFormatter:
                 f"📝 ❌ 주문 실패 ({current_time})",
                 "",
                 "📋 주문 정보:",
-                f"• 심볼: {params.get('symbol', 'BTCUSDT')}",
+                f"• 심볼: {params.get('symbol', trading_config.symbol)}",
                 f"• 방향: {'롱' if side == 'BUY' else '숏'}",
                 f"• 레버리지: {params.get('leverage', '10')}x",
                 "",
@@ -1,6 +1,6 @@
 import logging
 from typing import Dict, Optional, Tuple
-from decimal import Decimal
+from services.instrument_cache import InstrumentCache
 
 logger = logging.getLogger('position_formatter')
 
@@ -8,7 +8,6 @@ class PositionFormatter:
     """포지션 정보 포맷팅 클래스"""
 
     POSITION_SIDES = {'LONG', 'SHORT'}
-    MIN_POSITION_SIZE = 0.001  # 최소 포지션 크기
     
     @classmethod
     def _validate_position(cls, position: Dict) -> Tuple[bool, str]:
@@ -29,8 +28,9 @@ class PositionFormatter:
             if not isinstance(value, expected_type):
                 return False, f"잘못된 데이터 타입: {field}"
                 
+        # 심볼의 최소 수량 단위보다 작으면 포지션 없음으로 처리
         size = float(position.get('contracts', position.get('size', 0)) or 0)
-        if abs(size) < cls.MIN_POSITION_SIZE:
+        if abs(size) < InstrumentCache.get_instance().get(position['symbol'])['qty_step']:
             return False, "포지션 크기가 너무 작습니다."
             
         return True, ""
@@ -39,9 +39,8 @@ class PositionFormatter:
     def _format_number(value: float, decimals: int = 2) -> str:
         """숫자 포맷팅"""
         try:
-            decimal_value = Decimal(str(value))
-            return f"{float(decimal_value.normalize()):.{decimals}f}"
-        except:
+            return f"{float(value):.{decimals}f}"
+        except (ValueError, TypeError):
             return str(value)
     
     @staticmethod
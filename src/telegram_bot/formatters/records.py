@@ -0,0 +1,98 @@
+from typing import Any, Dict, NamedTuple
+from .template_renderer import to_float
+
+class OrderEventRecord(NamedTuple):
+    """주문 이벤트 (웹소켓 order 토픽)"""
+    symbol: str
+    order_type: str
+    side: str
+    price: float
+    qty: float
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OrderEventRecord':
+        return cls(
+            symbol=data.get('symbol', ''),
+            order_type=data.get('orderType', ''),
+            side=data.get('side', ''),
+            price=to_float(data.get('price')),
+            qty=to_float(data.get('qty'))
+        )
+
+class PositionEventRecord(NamedTuple):
+    """포지션 이벤트 (웹소켓 position 토픽)"""
+    symbol: str
+    side: str
+    size: float
+    entry_price: float
+    leverage: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PositionEventRecord':
+        return cls(
+            symbol=data.get('symbol', ''),
+            side=data.get('side', ''),
+            size=to_float(data.get('size')),
+            entry_price=to_float(data.get('entryPrice')),
+            leverage=str(data.get('leverage', ''))
+        )
+
+class AnalysisRecord(NamedTuple):
+    """분석 결과 메시지에 필요한 값만 추출한 레코드"""
+    timestamp: int
+    market_phase: str
+    overall_sentiment: str
+    short_sentiment: str
+    volume_status: str
+    risk_level: str
+    confidence: Any
+    trend: str
+    strength: Any
+    rsi: float
+    macd: str
+    bollinger: str
+    divergence_type: str
+    divergence_description: str
+    position: str
+    entry_price: float
+    stop_loss: float
+    take_profit1: float
+    take_profit2: float
+    leverage: Any
+    position_size: Any
+    reason: str
+    symbol: str = ''
+
+    @classmethod
+    def from_dict(cls, analysis: Dict) -> 'AnalysisRecord':
+        market = analysis.get('market_summary', {}) or {}
+        technical = analysis.get('technical_analysis', {}) or {}
+        indicators = technical.get('indicators', {}) or {}
+        divergence = technical.get('divergence', {}) or {}
+        signals = analysis.get('trading_signals', {}) or {}
+
+        return cls(
+            timestamp=int(analysis.get('timestamp') or 0),
+            market_phase=market.get('market_phase', '-'),
+            overall_sentiment=market.get('overall_sentiment', '-'),
+            short_sentiment=market.get('short_sentiment', '-'),
+            volume_status=market.get('volume_status', '-'),
+            risk_level=market.get('risk_level', '-'),
+            confidence=market.get('confidence', 0),
+            trend=technical.get('trend', '-'),
+            strength=technical.get('strength', 0),
+            rsi=to_float(indicators.get('rsi')),
+            macd=str(indicators.get('macd', '-')),
+            bollinger=str(indicators.get('bollinger', '-')),
+            divergence_type=divergence.get('type', '없음'),
+            divergence_description=divergence.get('description', '현재 다이버전스 없음'),
+            position=str(signals.get('position_suggestion', '관망')),
+            entry_price=to_float(signals.get('entry_price')),
+            stop_loss=to_float(signals.get('stop_loss')),
+            take_profit1=to_float(signals.get('take_profit1')),
+            take_profit2=to_float(signals.get('take_profit2')),
+            leverage=signals.get('leverage', 1),
+            position_size=signals.get('position_size', 10),
+            reason=signals.get('reason', '알 수 없음'),
+            symbol=str(analysis.get('symbol') or '')
+        )
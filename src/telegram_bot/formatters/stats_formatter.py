@@ -1,7 +1,6 @@
 from .base_formatter import BaseFormatter
-from typing import Dict, List
+from typing import Dict
 import logging
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -49,145 +48,117 @@ class StatsFormatter(BaseFormatter):
             logger.error(f"통계 포맷팅 실패: {str(e)}")
             return "통계 데이터 포맷팅 중 오류가 발생했습니다."
 
-    def format_daily_stats(self, positions: List[Dict]) -> str:
+    def format_daily_stats(self, stats: Dict) -> str:
         """일일 포지션 통계 포맷팅"""
-        if not positions:
+        if not stats.get('total_trades'):
             return "📊 오늘은 청산된 포지션이 없습니다."
-        
-        total_pnl = sum(float(p['pnl']) for p in positions)
-        winning_trades = len([p for p in positions if float(p['pnl']) > 0])
-        losing_trades = len([p for p in positions if float(p['pnl']) < 0])
-        total_trades = len(positions)
-        
-        # 롱/숏 구분
-        long_positions = [p for p in positions if p['side'] == 'Buy']
-        short_positions = [p for p in positions if p['side'] == 'Sell']
-        
-        long_pnl = sum(float(p['pnl']) for p in long_positions)
-        short_pnl = sum(float(p['pnl']) for p in short_positions)
-        
-        # 승률 계산
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        # 최대 수익/손실
-        max_profit = max([float(p['pnl']) for p in positions]) if positions else 0
-        max_loss = min([float(p['pnl']) for p in positions]) if positions else 0
-        
-        message = f"""
-📊 일일 거래 통계
+        return self.format_period_stats(stats, "일일", detailed=False)
 
-💰 수익 현황:
-• 총 수익: ${self.format_number(total_pnl)}
-• 최대 수익: ${self.format_number(max_profit)}
-• 최대 손실: ${self.format_number(max_loss)}
-
-📈 거래 실적:
-• 총 거래: {total_trades}회
-• 성공: {winning_trades}회
-• 실패: {losing_trades}회
-• 승률: {self.format_number(win_rate)}%
-
-🔄 포지션별 실적:
-• 롱: {len(long_positions)}회 (${self.format_number(long_pnl)})
-• 숏: {len(short_positions)}회 (${self.format_number(short_pnl)})
-"""
-        return message.strip()
-
-    def format_weekly_stats(self, positions: List[Dict]) -> str:
-        if not positions:
+    def format_weekly_stats(self, stats: Dict) -> str:
+        """주간 포지션 통계 포맷팅"""
+        if not stats.get('total_trades'):
             return "거래 내역이 없습니다."
+        return self.format_period_stats(stats, "7일")
 
-        # 기본 통계 계산
-        total_pnl = sum(p.get('pnl', 0) for p in positions)
-        profits = [p.get('pnl', 0) for p in positions if p.get('pnl', 0) > 0]
-        losses = [p.get('pnl', 0) for p in positions if p.get('pnl', 0) < 0]
-
-        # 승률 계산
-        total_trades = len(positions)
-        winning_trades = len(profits)
-        losing_trades = len(losses)
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-
-        # 평균/최대 손익 계산
-        avg_profit = sum(profits) / len(profits) if profits else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-        max_profit = max(profits) if profits else 0
-        max_loss = min(losses) if losses else 0
-
-        # 포지션별 분류 - position_side 기준으로 분류
-        long_positions = [p for p in positions if p.get('position_side') == 'Long']
-        short_positions = [p for p in positions if p.get('position_side') == 'Short']
-        
-        # 각 포지션별 PnL 계산
-        long_pnl = sum(p.get('pnl', 0) for p in long_positions)
-        short_pnl = sum(p.get('pnl', 0) for p in short_positions)
-
-        return f"""📊 7일 거래 통계
-
-💰 수익 현황:
-• 총 수익: ${self.format_number(total_pnl)}
-• 평균 수익: ${self.format_number(avg_profit)}
-• 평균 손실: ${self.format_number(avg_loss)}
-• 최대 수익: ${self.format_number(max_profit)}
-• 최대 손실: ${self.format_number(max_loss)}
-
-📈 거래 실적:
-• 총 거래: {total_trades}회
-• 성공: {winning_trades}회
-• 실패: {losing_trades}회
-• 승률: {self.format_number(win_rate)}%
-
-🔄 포지션별 실적:
-• 롱: {len(long_positions)}회 (${self.format_number(long_pnl)})
-• 숏: {len(short_positions)}회 (${self.format_number(short_pnl)})"""
-
-    def format_monthly_stats(self, positions: List[Dict]) -> str:
-        if not positions:
+    def format_monthly_stats(self, stats: Dict) -> str:
+        """월간 포지션 통계 포맷팅"""
+        if not stats.get('total_trades'):
             return "거래 내역이 없습니다."
+        return self.format_period_stats(stats, "월간")
 
-        # 기본 통계 계산
-        total_pnl = sum(p.get('pnl', 0) for p in positions)
-        profits = [p.get('pnl', 0) for p in positions if p.get('pnl', 0) > 0]
-        losses = [p.get('pnl', 0) for p in positions if p.get('pnl', 0) < 0]
-
-        # 승률 계산
-        total_trades = len(positions)
-        winning_trades = len(profits)
-        losing_trades = len(losses)
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-
-        # 평균/최대 손익 계산
-        avg_profit = sum(profits) / len(profits) if profits else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-        max_profit = max(profits) if profits else 0
-        max_loss = min(losses) if losses else 0
-
-        # 포지션별 분류 - position_side 기준으로 분류
-        long_positions = [p for p in positions if p.get('position_side') == 'Long']
-        short_positions = [p for p in positions if p.get('position_side') == 'Short']
-        
-        # 각 포지션별 PnL 계산
-        long_pnl = sum(p.get('pnl', 0) for p in long_positions)
-        short_pnl = sum(p.get('pnl', 0) for p in short_positions)
-
-        return f"""📊 월간 거래 통계
+    def format_period_stats(self, stats: Dict, period: str, detailed: bool = True) -> str:
+        """기간별 통계 포맷팅 (TradeAnalytics 계산 결과 렌더링)"""
+        try:
+            lines = [f"📊 {period} 거래 통계", "", "💰 수익 현황:",
+                     f"• 총 수익: ${self.format_number(stats.get('total_profit', 0))}"]
+            if detailed:
+                lines += [
+                    f"• 평균 수익: ${self.format_number(stats.get('average_profit', 0))}",
+                    f"• 평균 손실: ${self.format_number(stats.get('average_loss', 0))}"
+                ]
+            lines += [
+                f"• 최대 수익: ${self.format_number(stats.get('max_profit', 0))}",
+                f"• 최대 손실: ${self.format_number(stats.get('max_loss', 0))}",
+                "",
+                "📈 거래 실적:",
+                f"• 총 거래: {stats.get('total_trades', 0)}회",
+                f"• 성공: {stats.get('winning_trades', 0)}회",
+                f"• 실패: {stats.get('losing_trades', 0)}회",
+                f"• 승률: {self.format_number(stats.get('win_rate', 0))}%",
+                f"• 최대 연승/연패: {stats.get('max_win_streak', 0)}회 / {stats.get('max_loss_streak', 0)}회",
+                "",
+                "🔄 포지션별 실적:",
+                f"• 롱: {stats.get('long_trades', 0)}회 (${self.format_number(stats.get('long_profit', 0))})",
+                f"• 숏: {stats.get('short_trades', 0)}회 (${self.format_number(stats.get('short_profit', 0))})"
+            ]
+            if detailed:
+                lines += [
+                    "",
+                    "📉 리스크 지표:",
+                    f"• 수익 팩터: {self.format_number(stats.get('profit_factor', 0))}",
+                    f"• 기대값: ${self.format_number(stats.get('expectancy', 0))}",
+                    f"• 최대 손실폭: ${self.format_number(stats.get('max_drawdown', 0))}",
+                    f"• 샤프 비율: {self.format_number(stats.get('sharpe_ratio', 0))}",
+                    f"• 소르티노 비율: {self.format_number(stats.get('sortino_ratio', 0))}"
+                ]
+                weekday_perf = stats.get('weekday_performance', {})
+                if weekday_perf:
+                    lines += ["", "📅 요일별 성과:"] + [
+                        f"• {day}: {data['trades']}건, ${self.format_number(data['profit'])}"
+                        for day, data in weekday_perf.items()
+                    ]
+                hourly_perf = stats.get('hourly_performance', {})
+                if hourly_perf:
+                    lines += ["", "⏰ 시간대별 성과:"] + [
+                        f"• {hour:02d}시: {data['trades']}건, ${self.format_number(data['profit'])}"
+                        for hour, data in sorted(hourly_perf.items())
+                    ]
+            return "\n".join(lines)
 
-💰 수익 현황:
-• 총 수익: ${self.format_number(total_pnl)}
-• 평균 수익: ${self.format_number(avg_profit)}
-• 평균 손실: ${self.format_number(avg_loss)}
-• 최대 수익: ${self.format_number(max_profit)}
-• 최대 손실: ${self.format_number(max_loss)}
+        except Exception as e:
+            logger.error(f"통계 포맷팅 실패: {str(e)}")
+            return "통계 데이터 포맷팅 중 오류가 발생했습니다."
 
-📈 거래 실적:
-• 총 거래: {total_trades}회
-• 성공: {winning_trades}회
-• 실패: {losing_trades}회
-• 승률: {self.format_number(win_rate)}%
+    def format_equity_stats(self, latest: Dict, drawdown: Dict, exposure: Dict, period: str) -> str:
+        """자산 곡선/낙폭/노출도 포맷팅"""
+        try:
+            if not latest:
+                return "📊 기록된 자산 데이터가 없습니다."
+
+            lines = [
+                f"📊 자산 현황 ({period})",
+                "",
+                "💰 현재 자산:",
+                f"• 총 자산: ${self.format_number(latest.get('equity', 0))}",
+                f"• 사용 증거금: ${self.format_number(latest.get('used_margin', 0))}",
+                f"• 미실현 손익: ${self.format_number(latest.get('unrealized_pnl', 0))}",
+                f"• 포지션 가치: ${self.format_number(latest.get('position_value', 0))}"
+            ]
+            if drawdown:
+                lines += [
+                    "",
+                    "📉 낙폭:",
+                    f"• 최고 자산: ${self.format_number(drawdown.get('peak_equity', 0))}",
+                    f"• 현재 낙폭: ${self.format_number(drawdown.get('current_drawdown', 0))} "
+                    f"({self.format_number(drawdown.get('current_drawdown_pct', 0))}%)",
+                    f"• 최대 낙폭: ${self.format_number(drawdown.get('max_drawdown', 0))} "
+                    f"({self.format_number(drawdown.get('max_drawdown_pct', 0))}%)"
+                ]
+            if exposure:
+                lines += [
+                    "",
+                    "⚖️ 노출도:",
+                    f"• 평균 포지션 가치: ${self.format_number(exposure.get('avg_position_value', 0))}",
+                    f"• 최대 포지션 가치: ${self.format_number(exposure.get('max_position_value', 0))}",
+                    f"• 평균 증거금 사용률: {self.format_number(exposure.get('avg_margin_usage_pct', 0))}%",
+                    f"• 최대 실효 레버리지: {self.format_number(exposure.get('max_effective_leverage', 0))}x",
+                    f"• 포지션 보유 비율: {self.format_number(exposure.get('time_in_market_pct', 0))}%"
+                ]
+            return "\n".join(lines)
 
-🔄 포지션별 실적:
-• 롱: {len(long_positions)}회 (${self.format_number(long_pnl)})
-• 숏: {len(short_positions)}회 (${self.format_number(short_pnl)})"""
+        except Exception as e:
+            logger.error(f"자산 통계 포맷팅 실패: {str(e)}")
+            return "자산 데이터 포맷팅 중 오류가 발생했습니다."
 
     # BaseFormatter의 추상 메서드 구현
     def format_balance(self, balance: Dict) -> str:
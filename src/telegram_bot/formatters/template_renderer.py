@@ -0,0 +1,104 @@
+import logging
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+def format_decimal(value: Any, decimals: int = 2, default: str = '-') -> str:
+    """천 단위 구분 숫자 포맷 (Decimal 변환 없이 float 로 처리)"""
+    if value is None:
+        return default
+    try:
+        if isinstance(value, str):
+            value = value.replace(',', '').replace('$', '')
+        return f"{float(value):,.{decimals}f}"
+    except (ValueError, TypeError):
+        return default
+
+def to_float(value: Any, default: float = 0.0) -> float:
+    """안전한 float 변환"""
+    try:
+        if value is None or value == '':
+            return default
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+class MessageTemplate:
+    """한 번만 파싱되는 메시지 템플릿
+
+    str.format 문법을 사용하며, 생성 시 필드 목록을 미리 추출해 두고
+    렌더링은 바인딩된 format_map 호출 한 번으로 처리합니다.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self.fields = frozenset(
+            field.split('.')[0].split('[')[0]
+            for _, field, _, _ in Formatter().parse(template)
+            if field
+        )
+        self._format_map = template.format_map
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """값 매핑으로 렌더링"""
+        return self._format_map(values)
+
+class TranslationTable:
+    """대소문자 구분 없는 번역 테이블 (포맷터별로 한 번만 생성)"""
+
+    def __init__(self, mapping: Dict[str, str], empty: str = '-'):
+        self._table = {key.upper(): value for key, value in mapping.items()}
+        self._empty = empty
+
+    def __call__(self, text: Optional[str]) -> str:
+        if not text or text == '-':
+            return self._empty
+        return self._table.get(str(text).upper(), text)
+
+    def get(self, text: str, default: str = None) -> str:
+        return self._table.get(str(text).upper(), default)
+
+class RenderCache:
+    """렌더링 결과 LRU 캐시 (같은 입력을 여러 채팅방에 보낼 때 재사용)"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """캐시에 있으면 반환, 없으면 렌더링 후 저장"""
+        try:
+            with self._lock:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return self._data[key]
+        except TypeError:
+            # 해시 불가능한 키는 캐시 없이 렌더링
+            return render()
+
+        result = render()
+        with self._lock:
+            self.misses += 1
+            self._data[key] = result
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+def freeze(value: Any) -> Hashable:
+    """dict/list 를 캐시 키로 쓸 수 있도록 불변 구조로 변환"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
@@ -20,37 +20,58 @@ class AnalysisHandler(BaseHandler):
             if not update.effective_chat:
                 return
                 
-            analysis = await self.auto_analyzer.analyze_market(manual=True)
+            # /analyze [심볼] (미지정 시 모든 분석 대상 심볼)
+            symbol = context.args[0].upper() if context.args else None
+            if symbol and symbol not in self.auto_analyzer.symbols:
+                await self.send_message(
+                    f"분석 대상이 아닌 심볼입니다 ({', '.join(self.auto_analyzer.symbols)})",
+                    update.effective_chat.id
+                )
+                return
+
+            analysis = await self.auto_analyzer.analyze_market(manual=True, symbol=symbol)
             
             if not analysis:
                 return
             
-            # 매매 신호 변환
-            if analysis and analysis.get('trading_signals'):
-                signals = analysis['trading_signals']
-                position_suggestion = signals.get('position_suggestion', 'HOLD')
-                
-                # HOLD가 아닐 때만 매매 신호 생성
-                if position_suggestion != 'HOLD':
-                    analysis['trading_signals'] = {
-                        'position_suggestion': '매수' if position_suggestion == 'BUY' else '매도',
-                        'leverage': signals.get('leverage', 5),
-                        'position_size': signals.get('position_size', 10),
-                        'entry_price': signals.get('entry_price', 0),
-                        'stop_loss': signals.get('stop_loss', 0),
-                        'take_profit1': signals.get('take_profit1', 0),
-                        'reason': signals.get('reason', '알 수 없음')
-                    }
-            
-            return analysis
+            # 심볼 미지정 시 {심볼: 분석 결과}
+            if symbol is None:
+                return {
+                    name: self._convert_signals(result)
+                    for name, result in analysis.items() if result
+                }
+            return self._convert_signals(analysis)
             
         except Exception as e:
             logger.error(f"분석 처리 중 오류: {str(e)}")
 
+    def _convert_signals(self, analysis: dict) -> dict:
+        """매매 신호 변환 (저장된 분석 결과를 변경하지 않도록 복사본 사용)"""
+        analysis = dict(analysis)
+        
+        if analysis.get('trading_signals'):
+            signals = analysis['trading_signals']
+            position_suggestion = signals.get('position_suggestion', 'HOLD')
+            
+            # HOLD가 아닐 때만 매매 신호 생성
+            if position_suggestion != 'HOLD':
+                analysis['trading_signals'] = {
+                    'position_suggestion': '매수' if position_suggestion == 'BUY' else '매도',
+                    'leverage': signals.get('leverage', 5),
+                    'position_size': signals.get('position_size', 10),
+                    'entry_price': signals.get('entry_price', 0),
+                    'stop_loss': signals.get('stop_loss', 0),
+                    'take_profit1': signals.get('take_profit1', 0),
+                    'reason': signals.get('reason', '알 수 없음')
+                }
+        
+        return analysis
+
     async def show_timeframe_help(self, chat_id: int):
         """분석 명령어 도움말"""
         help_message = (
             "1시간봉 분석 명령어:\n"
-            "/analyze - 현재 시장 분석 실행"
+            "/analyze - 현재 시장 분석 실행\n"
+            "/analyze ETHUSDT - 특정 심볼만 분석"
         )
         await self.send_message(help_message, chat_id)
@@ -75,4 +75,4 @@ class BaseHandler:
 
     async def send_command_response(self, message: str, chat_id: int):
         """명령어 응답 전송 (관리자 채팅방에만)"""
-        await self.bot.send_message(message, chat_id, self.bot.MSG_TYPE_COMMAND) 
\ No newline at end of file
+        await self.bot.send_message(message, chat_id)
\ No newline at end of file
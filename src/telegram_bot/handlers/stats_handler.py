@@ -2,8 +2,9 @@ import logging
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
 from datetime import datetime, timedelta
-from typing import List, Dict
 from services.trade_history_service import TradeHistoryService
+from services.trade_analytics import compute_trade_stats
+from services.equity_store import EquityStore
 from telegram_bot.formatters.stats_formatter import StatsFormatter
 from telegram_bot.handlers.base_handler import BaseHandler
 import traceback
@@ -12,15 +13,25 @@ import time
 logger = logging.getLogger(__name__)
 
 class StatsHandler(BaseHandler):
+    READY_TIMEOUT = 60.0   # 시작 시 거래 내역 동기화 대기 최대 시간 (초)
+
     def __init__(self, bot):
         super().__init__(bot)
         self.trade_history_service = bot.trade_history_service
         self.formatter = StatsFormatter()
 
+    async def wait_for_history(self, update: Update) -> bool:
+        """시작 시 백그라운드 동기화가 진행 중이면 완료 대기 (제한 시간 초과 시 오류 응답)"""
+        if await self.trade_history_service.wait_until_ready(self.READY_TIMEOUT):
+            return True
+        logger.error(f"거래 내역 초기 동기화 대기 시간 초과 ({self.READY_TIMEOUT:.0f}초)")
+        await update.message.reply_text("❌ 거래 내역 동기화가 아직 끝나지 않았습니다. 잠시 후 다시 시도해주세요.")
+        return False
+
     async def update_trade_data(self) -> bool:
         """새로운 거래 데이터가 있는지 확인하고 업데이트"""
         try:
-            last_stored_time = self.trade_history_service.trade_store.get_last_update()
+            last_stored_time = await self.trade_history_service.trade_store.get_last_update_async()
             current_time = int(time.time() * 1000)  # milliseconds
 
             # 새로운 데이터가 있는지 확인 (1분 이상 차이나면 업데이트)
@@ -46,15 +57,17 @@ class StatsHandler(BaseHandler):
             
         try:
             # 새로운 데이터 확인 및 업데이트
+            if not await self.wait_for_history(update):
+                return
             if await self.update_trade_data():
                 await update.message.reply_text("거래 데이터가 업데이트되었습니다.")
             
             # 오늘 날짜의 포지션 조회
             today = datetime.now().strftime('%Y%m%d')
-            positions = self.trade_history_service.trade_store.get_positions(date_str=today)
+            positions = await self.trade_history_service.trade_store.get_positions_async(date_str=today)
             
             # 통계 메시지 생성
-            message = self.formatter.format_daily_stats(positions)
+            message = self.formatter.format_daily_stats(compute_trade_stats(positions))
             
             # 메시지 전송
             await update.message.reply_text(message)
@@ -70,26 +83,21 @@ class StatsHandler(BaseHandler):
             
         try:
             # 새로운 데이터 확인 및 업데이트
+            if not await self.wait_for_history(update):
+                return
             if await self.update_trade_data():
                 await update.message.reply_text("거래 데이터가 업데이트되었습니다.")
             
-            # 이번 달 포지션 조회
-            current_month = datetime.now().strftime('%Y%m')
-            positions = []
-            
-            # 이번 달의 모든 일자 데이터 조회
+            # 이번 달의 모든 일자 데이터 조회 (스토리지 I/O 스레드에서 실행)
             start_date = datetime.now().replace(day=1)
             end_date = datetime.now()
-            current_date = start_date
-            
-            while current_date <= end_date:
-                date_str = current_date.strftime('%Y%m%d')
-                daily_positions = self.trade_history_service.trade_store.get_positions(date_str=date_str)
-                positions.extend(daily_positions)
-                current_date += timedelta(days=1)
+            positions = await self.trade_history_service.trade_store.get_positions_by_date_range_async(
+                start_date.strftime('%Y%m%d'),
+                end_date.strftime('%Y%m%d')
+            )
             
             # 통계 메시지 생성
-            message = self.formatter.format_monthly_stats(positions)
+            message = self.formatter.format_monthly_stats(compute_trade_stats(positions))
             
             # 메시지 전송
             await update.message.reply_text(message)
@@ -110,6 +118,8 @@ class StatsHandler(BaseHandler):
             
         try:
             # 새로운 데이터 확인 및 업데이트
+            if not await self.wait_for_history(update):
+                return
             if await self.update_trade_data():
                 await update.message.reply_text("거래 데이터가 업데이트되었습니다.")
             
@@ -139,19 +149,14 @@ class StatsHandler(BaseHandler):
                 start_str = start_date.strftime('%Y%m%d')
                 end_str = end_date.strftime('%Y%m%d')
                 
-                # 해당 기간의 모든 포지션 수집
-                positions = []
-                current_date = start_date
-                
-                while current_date <= end_date:
-                    date_str = current_date.strftime('%Y%m%d')
-                    daily_positions = self.trade_history_service.trade_store.get_positions(date_str=date_str)
-                    positions.extend(daily_positions)
-                    current_date += timedelta(days=1)
+                # 해당 기간의 모든 포지션 수집 (스토리지 I/O 스레드에서 실행)
+                positions = await self.trade_history_service.trade_store.get_positions_by_date_range_async(
+                    start_str, end_str
+                )
                 
                 if positions:
                     period_str = f"{days}일" if days > 0 else "전체"
-                    stats_message = self._format_period_stats(positions, period_str)
+                    stats_message = self.formatter.format_period_stats(compute_trade_stats(positions), period_str)
                     messages.append(stats_message)
                 else:
                     messages.append(f"\n📊 {days}일 거래 내역이 없습니다.")
@@ -166,61 +171,39 @@ class StatsHandler(BaseHandler):
             logger.error(f"통계 조회 중 오류: {str(e)}")
             await update.message.reply_text("통계 조회 중 오류가 발생했습니다.")
 
-    def _format_period_stats(self, positions: List[Dict], period: str) -> str:
-        """기간별 통계 포맷팅"""
-        total_pnl = sum(float(p.get('pnl', 0)) for p in positions)
-        winning_trades = len([p for p in positions if float(p.get('pnl', 0)) > 0])
-        losing_trades = len([p for p in positions if float(p.get('pnl', 0)) < 0])
-        total_trades = len(positions)
-        
-        # 롱/숏 구분 - position_side 기준으로 분류
-        long_positions = [p for p in positions if p.get('position_side') == 'Long']
-        short_positions = [p for p in positions if p.get('position_side') == 'Short']
-        
-        # 각 포지션별 PnL 계산
-        long_pnl = sum(float(p.get('pnl', 0)) for p in long_positions)
-        short_pnl = sum(float(p.get('pnl', 0)) for p in short_positions)
-        
-        # 승률 계산
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        # 평균 수익/손실
-        winning_pnls = [float(p.get('pnl', 0)) for p in positions if float(p.get('pnl', 0)) > 0]
-        losing_pnls = [float(p.get('pnl', 0)) for p in positions if float(p.get('pnl', 0)) < 0]
-        
-        avg_profit = sum(winning_pnls) / len(winning_pnls) if winning_pnls else 0
-        avg_loss = sum(losing_pnls) / len(losing_pnls) if losing_pnls else 0
-        
-        # 최대 수익/손실
-        max_profit = max([float(p.get('pnl', 0)) for p in positions]) if positions else 0
-        max_loss = min([float(p.get('pnl', 0)) for p in positions]) if positions else 0
-        
-        message = f"""
-📊 {period} 거래 통계
-
-💰 수익 현황:
-• 총 수익: ${self.formatter.format_number(total_pnl)}
-• 평균 수익: ${self.formatter.format_number(avg_profit)}
-• 평균 손실: ${self.formatter.format_number(avg_loss)}
-• 최대 수익: ${self.formatter.format_number(max_profit)}
-• 최대 손실: ${self.formatter.format_number(max_loss)}
-
-📈 거래 실적:
-• 총 거래: {total_trades}회
-• 성공: {winning_trades}회
-• 실패: {losing_trades}회
-• 승률: {self.formatter.format_number(win_rate)}%
-
-🔄 포지션별 실적:
-• 롱: {len(long_positions)}회 (${self.formatter.format_number(long_pnl)})
-• 숏: {len(short_positions)}회 (${self.formatter.format_number(short_pnl)})
-"""
-        return message.strip()
+    async def equity_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """자산 곡선/낙폭/노출도 조회 (거래소 호출 없이 저장된 시계열 사용)
+        사용법:
+        /equity : 7일
+        /equity 30 : 30일
+        """
+        if not await self.check_permission(update):
+            return
+            
+        try:
+            days = int(context.args[0]) if context.args else 7
+            start = int(time.time()) - days * 24 * 60 * 60
+            # 2일 이내는 1분, 90일 이내는 1시간, 그 이상은 일 단위 시계열 사용
+            tier = '1m' if days <= 2 else '1h' if days <= 90 else '1d'
+            
+            store = EquityStore.get_instance()
+            message = self.formatter.format_equity_stats(
+                store.get_latest(),
+                store.get_drawdown(tier, start=start),
+                store.get_exposure(tier, start=start),
+                f"{days}일"
+            )
+            await update.message.reply_text(message)
+            
+        except Exception as e:
+            logger.error(f"자산 통계 조회 중 오류: {str(e)}")
+            await update.message.reply_text("자산 통계 조회 중 오류가 발생했습니다.")
 
     def get_handlers(self):
         """핸들러 리스트 반환"""
         return [
             CommandHandler('daily', self.daily_stats),
             CommandHandler('monthly', self.monthly_stats),
-            CommandHandler('stats', self.stats)
+            CommandHandler('stats', self.stats),
+            CommandHandler('equity', self.equity_stats)
         ]
\ No newline at end of file
@@ -47,6 +47,7 @@ class SystemHandler(BaseHandler):
   - weekly: 주간 통계
   - monthly: 월간 통계
   - 생략시 이번 달 전체 통계
+/equity [days] - 자산 곡선/낙폭/노출도 (기본 7일)
 
 💰 거래 명령어:
 /trade - 거래 실행
@@ -61,6 +62,7 @@ class SystemHandler(BaseHandler):
 ⚙️ 시스템 명령어:
 /monitor_start - 자동 모니터링 시작
 /monitor_stop - 자동 모니터링 중지
+/latency [분] - 단계별 지연 p50/p95/p99 (기본 60분)
 /stop - 봇 종료
 """
         await self.send_message(help_text, update.effective_chat.id)
@@ -139,6 +141,26 @@ class SystemHandler(BaseHandler):
             logger.error(f"모니터링 중지 중 오류: {str(e)}")
             await self.send_message("❌ 모니터링 중지 실패", chat_id)
 
+    async def handle_latency(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """단계별 지연 통계 (/latency [분])"""
+        if not await self.check_permission(update):
+            return
+
+        chat_id = update.effective_chat.id
+        try:
+            window = None
+            if context.args:
+                try:
+                    window = max(float(context.args[0]), 1) * 60
+                except ValueError:
+                    await self.send_message("⚠️ 사용법: /latency [분]", chat_id)
+                    return
+            await self.send_message(self.bot.tracer.report(window), chat_id)
+
+        except Exception as e:
+            logger.error(f"지연 통계 조회 중 오류: {str(e)}")
+            await self.send_message("❌ 지연 통계 조회 실패", chat_id)
+
     async def handle_cancel_orders(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """활성 주문 취소"""
         try:
@@ -5,7 +5,7 @@ from telegram import Update
 from telegram.ext import ContextTypes, CallbackContext
 from functools import wraps
 from trade.trade_manager import TradeManager
-from config.trading_config import TradingConfig
+from config.trading_config import TradingConfig, trading_config
 from ..formatters.order_formatter import OrderFormatter
 from ..formatters.message_formatter import MessageFormatter
 import os
@@ -72,14 +72,17 @@ class TradingHandler(BaseHandler):
             chat_id = update.effective_chat.id
             logger.info(f"[Position] 포지션 조회 시작 (chat_id: {chat_id})")
 
-            positions = await self.position_service.get_positions('BTCUSDT')
+            results = await asyncio.gather(*(
+                self.position_service.get_positions(symbol) for symbol in trading_config.symbols
+            ))
+            positions = [position for result in results for position in (result or [])]
             logger.info(f"[Position] 포지션 조회 결과: {positions}")
 
             if positions:
-                position = positions[0]
                 # PositionFormatter 사용하여 메시지 포맷팅
-                message = PositionFormatter.format_position(position)
-                await self.send_message(message, chat_id)
+                for position in positions:
+                    message = PositionFormatter.format_position(position)
+                    await self.send_message(message, chat_id)
             else:
                 await self.send_message("활성화된 포지션이 없습니다", chat_id)
 
@@ -100,7 +103,7 @@ class TradingHandler(BaseHandler):
             logger.info(f"[Status] 상태 조회 시작 (chat_id: {chat_id})")
             
             # 시장 데이터 조회
-            market_data = await self.market_data_service.get_market_data('BTCUSDT')
+            market_data = await self.market_data_service.get_market_data(trading_config.symbol)
             
             # 봇 상태 정보
             bot_status = {
@@ -0,0 +1,347 @@
+import time
+import asyncio
+import inspect
+import logging
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from config import config
+from services.tracer import Tracer
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+ANALYSIS_CYCLE = registry.histogram('analysis_cycle_duration_seconds', '분석 작업 1회 소요 시간',
+                                    ('symbol', 'status'), buckets=ANALYSIS_BUCKETS)
+ANALYSIS_STAGE = registry.histogram('analysis_stage_duration_seconds', '분석 단계별 소요 시간',
+                                    ('symbol', 'stage'), buckets=ANALYSIS_BUCKETS)
+
+# 제한 시간을 넘겨 백그라운드에서 계속 실행 중인 단계 (참조 보관)
+_detached_stages: Set[asyncio.Future] = set()
+
+def _detach(name: str, future: asyncio.Future):
+    """대기를 멈춘 단계를 끝까지 실행되도록 보관 (실패 시 로그)"""
+    logger.warning(f"{name} 단계가 제한 시간을 넘겨 백그라운드에서 계속 실행됩니다")
+    _detached_stages.add(future)
+    future.add_done_callback(_detached_done)
+
+def _detached_done(future: asyncio.Future):
+    _detached_stages.discard(future)
+    error = None if future.cancelled() else future.exception()
+    if error is not None:
+        logger.error(f"백그라운드 단계 실패: {str(error)}")
+        logger.error(''.join(traceback.format_exception(type(error), error, error.__traceback__)))
+
+class AnalysisStageTimeout(Exception):
+    """분석 단계 제한 시간 초과"""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"{stage} 단계 시간 초과 ({timeout:.1f}초)")
+        self.stage = stage
+        self.timeout = timeout
+
+class AnalysisRun:
+    """분석 작업 1회 실행 정보 (단계별 제한 시간과 소요 시간 기록)"""
+
+    def __init__(self, trigger: str, candle_open: int, deadline: float,
+                 timeouts: Dict[str, float], store_reserve: float, data: Dict = None):
+        self.trigger = trigger
+        self.data = data or {}                  # 트리거가 전달한 입력 (예: 스트림으로 받은 봉 목록)
+        self.candle_open = candle_open
+        self.deadline = deadline                # time.monotonic() 기준 다음 봉 시작 전 마감 시각
+        self.timeouts = timeouts
+        self.store_reserve = store_reserve      # 저장 단계 이전 단계들이 남겨둘 시간
+        self.started_at = time.monotonic()
+        self.timings: Dict[str, float] = {}
+        self.status = 'running'
+        self.task: Optional[asyncio.Task] = None
+
+    def remaining(self) -> float:
+        """다음 봉 마감까지 남은 시간 (초)"""
+        return self.deadline - time.monotonic()
+
+    async def stage(self, name: str, work: Any, *args) -> Any:
+        """단계 실행
+
+        work 가 코루틴/퓨처면 그대로 대기하고, 일반 함수면 스레드에서 실행합니다.
+        제한 시간은 단계별 설정값과 다음 봉 마감까지 남은 시간 중 작은 값입니다 (봉 마감 대상 단계만).
+        DETACHED_STAGES 는 제한 시간이 지나도 취소하지 않고 대기만 멈춥니다.
+        """
+        timeout = self.timeouts.get(name, AnalysisJobRunner.DEFAULT_STAGE_TIMEOUT)
+        if name in AnalysisJobRunner.CANDLE_BOUND_STAGES:
+            remaining = self.remaining()
+            if name in AnalysisJobRunner.PRE_STORE_STAGES:
+                remaining -= self.store_reserve
+            timeout = min(timeout, remaining)
+
+        if timeout <= 0:
+            if asyncio.iscoroutine(work):
+                work.close()
+            elif isinstance(work, asyncio.Future):
+                work.cancel()
+            raise AnalysisStageTimeout(name, 0)
+
+        awaitable = work if inspect.isawaitable(work) else asyncio.to_thread(work, *args)
+        detached = None
+        if name in AnalysisJobRunner.DETACHED_STAGES:
+            # 주문 도중 취소되면 반전 주문의 청산만 나가고 재진입이 빠질 수 있음
+            detached = asyncio.ensure_future(awaitable)
+            awaitable = asyncio.shield(detached)
+
+        started = time.monotonic()
+        try:
+            with Tracer.get_instance().span(f"analysis.{name}"):
+                return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise AnalysisStageTimeout(name, timeout)
+        finally:
+            self.timings[name] = time.monotonic() - started
+            if detached is not None and not detached.done():
+                _detach(name, detached)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def summary(self) -> str:
+        """단계별 소요 시간 요약"""
+        stages = ", ".join(f"{name} {duration:.1f}s" for name, duration in self.timings.items())
+        return f"{self.trigger}, {self.status}, {self.elapsed():.1f}s: {stages or '-'}"
+
+class AnalysisJobRunner:
+    """분석 작업 단일 실행기
+
+    - 동시에 하나의 분석만 실행 (single-flight)
+    - 같은 봉에 대한 중복 요청은 실행 중인 작업 결과를 함께 받음 (merge)
+    - 이미 완료된 봉에 대한 스케줄/시작 요청은 건너뜀 (skip), 수동 요청은 새로 실행
+    - 단계별 제한 시간과 다음 봉 시작 전 마감 시각을 적용하여 결과가 다음 봉 전에 저장되도록 보장
+      (수동 요청은 봉 마감이 아닌 요청 시점 + manual_budget 을 마감으로 사용)
+    - 저장 이후의 알림/주문 단계는 봉 마감과 무관하며, 주문 단계는 시간 초과 시에도 취소하지 않음
+    """
+
+    TRIGGER_CRON = 'cron'
+    TRIGGER_START = 'start'
+    TRIGGER_MANUAL = 'manual'
+    TRIGGER_KLINE = 'kline'
+
+    STAGES = ('fetch', 'indicators', 'llm', 'risk', 'store', 'notify', 'order')
+    PRE_STORE_STAGES = ('fetch', 'indicators', 'llm', 'risk')
+    CANDLE_BOUND_STAGES = ('fetch', 'indicators', 'llm', 'risk', 'store')
+    DETACHED_STAGES = ('order',)
+    DEFAULT_STAGE_TIMEOUT = 30.0
+    DEFAULT_STAGE_TIMEOUTS = {
+        'fetch': 20.0,
+        'indicators': 10.0,
+        'llm': 120.0,
+        'risk': 5.0,
+        'store': 5.0,
+        'notify': 10.0,
+        'order': 30.0
+    }
+    DEFAULT_CANDLE_SECONDS = 3600
+    DEFAULT_SAFETY_MARGIN = 5.0     # 다음 봉 시작 몇 초 전까지 저장을 끝낼지
+    HISTORY_SIZE = 50
+
+    def __init__(self, job: Callable[[AnalysisRun], Awaitable[Optional[Dict]]],
+                 candle_seconds: int = None, name: str = None):
+        """
+        Args:
+            job: 단계별로 run.stage() 를 호출하는 분석 코루틴 함수, 분석 결과 반환
+            candle_seconds: 분석 기준 봉 길이 (초)
+            name: 로그에 표시할 이름 (예: 심볼)
+        """
+        settings = config.load_json_config('analysis_config.json')
+        self._job = job
+        self.name = name
+        self._log_prefix = f"[{name}] " if name else ''
+        self.candle_seconds = candle_seconds or settings.get('candle_seconds', self.DEFAULT_CANDLE_SECONDS)
+        self.safety_margin = float(settings.get('candle_safety_margin', self.DEFAULT_SAFETY_MARGIN))
+        self.timeouts = {**self.DEFAULT_STAGE_TIMEOUTS,
+                         **{k: float(v) for k, v in settings.get('stage_timeouts', {}).items()}}
+        # 수동 요청 마감 (기본: 봉 마감 대상 단계 제한 시간 합)
+        default_budget = sum(self.timeouts.get(stage, self.DEFAULT_STAGE_TIMEOUT) for stage in self.CANDLE_BOUND_STAGES)
+        self.manual_budget = float(settings.get('manual_budget', default_budget))
+
+        self._lock = asyncio.Lock()
+        self._current: Optional[AnalysisRun] = None
+        self._last_completed_candle: Optional[int] = None
+        self._last_result: Optional[Dict] = None
+
+        self._history = deque(maxlen=self.HISTORY_SIZE)
+        self._stage_timings = {stage: deque(maxlen=self.HISTORY_SIZE) for stage in self.STAGES}
+        self.run_count = 0
+        self.skipped_count = 0
+        self.merged_count = 0
+        self.timeout_count = 0
+        self.failed_count = 0
+
+    # ---- 실행 ----
+
+    async def submit(self, trigger: str, candle_open: int = None, data: Dict = None) -> Optional[Dict]:
+        """분석 요청 (중복 요청은 병합하거나 건너뜀)
+
+        Args:
+            trigger: 요청 종류 (cron/start/manual/kline)
+            candle_open: 분석 대상 봉 시작 시각 (epoch 초, 미지정 시 현재 시각 기준)
+            data: 작업에 전달할 입력 (run.data)
+        """
+        fixed_candle = candle_open
+        candle_open = fixed_candle or self._candle_open()
+
+        current = self._current
+        if current and current.task and not current.task.done() and current.candle_open == candle_open:
+            self.merged_count += 1
+            logger.info(f"{self._log_prefix}실행 중인 분석에 병합 ({trigger} → {current.trigger})")
+            return await asyncio.shield(current.task)
+
+        async with self._lock:
+            # 요청자가 취소되어도 작업은 계속되므로 이전 작업 종료를 먼저 기다림
+            if self.is_busy():
+                await asyncio.wait({self._current.task})
+
+            # 대기 중 다른 요청이 같은 봉 분석을 끝냈을 수 있음
+            candle_open = fixed_candle or self._candle_open()
+            if trigger != self.TRIGGER_MANUAL and self._last_completed_candle == candle_open:
+                self.skipped_count += 1
+                logger.info(f"{self._log_prefix}이미 분석된 봉이므로 건너뜀 ({trigger}, 봉: {self._format_candle(candle_open)})")
+                return self._last_result
+
+            run = AnalysisRun(
+                trigger=trigger,
+                candle_open=candle_open,
+                deadline=(time.monotonic() + self.manual_budget if trigger == self.TRIGGER_MANUAL
+                          else self._deadline(candle_open)),
+                timeouts=self.timeouts,
+                store_reserve=self.timeouts.get('store', 0),
+                data=data
+            )
+            run.task = asyncio.create_task(self._execute(run))
+            self._current = run
+            try:
+                return await asyncio.shield(run.task)
+            finally:
+                if run.task.done():
+                    self._current = None
+
+    async def stop(self):
+        """실행 중인 분석 취소"""
+        current = self._current
+        if current and current.task and not current.task.done():
+            current.task.cancel()
+            await asyncio.gather(current.task, return_exceptions=True)
+            logger.info(f"{self._log_prefix}실행 중인 분석 작업이 취소되었습니다")
+        self._current = None
+
+    def has_completed(self, candle_open: int = None) -> bool:
+        """해당 봉(기본: 현재 봉) 분석 완료 여부"""
+        return self._last_completed_candle == (candle_open or self._candle_open())
+
+    def is_busy(self) -> bool:
+        """분석 실행 중 여부"""
+        current = self._current
+        return bool(current and current.task and not current.task.done())
+
+    # ---- 통계 ----
+
+    def get_stats(self) -> Dict:
+        """단계별 소요 시간과 실행 통계"""
+        stages = {}
+        for stage, samples in self._stage_timings.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            count = len(ordered)
+            stages[stage] = {
+                'avg': round(sum(ordered) / count, 3),
+                'p95': round(ordered[min(count - 1, int(count * 0.95))], 3),
+                'max': round(ordered[-1], 3)
+            }
+        return {
+            'runs': self.run_count,
+            'skipped': self.skipped_count,
+            'merged': self.merged_count,
+            'timeouts': self.timeout_count,
+            'failed': self.failed_count,
+            'busy': self.is_busy(),
+            'stages': stages,
+            'last_runs': list(self._history)[-5:]
+        }
+
+    # ---- 내부 ----
+
+    async def _execute(self, run: AnalysisRun) -> Optional[Dict]:
+        """분석 작업 실행 (봉 마감 → 주문 응답까지를 하나의 trace 로 기록)"""
+        with Tracer.get_instance().span('analysis.cycle', symbol=self.name or '', trigger=run.trigger) as span:
+            try:
+                return await self._run_job(run)
+            finally:
+                if span:
+                    span.set('status', run.status)
+
+    async def _run_job(self, run: AnalysisRun) -> Optional[Dict]:
+        """분석 작업 실행 및 결과 기록"""
+        self.run_count += 1
+        logger.info(f"{self._log_prefix}분석 작업 시작 ({run.trigger}, 봉: {self._format_candle(run.candle_open)}, "
+                    f"마감까지 {run.remaining():.0f}초)")
+        result = None
+        try:
+            result = await self._job(run)
+            run.status = 'ok' if result else 'failed'
+            if result:
+                self._last_completed_candle = run.candle_open
+                self._last_result = result
+            else:
+                self.failed_count += 1
+            return result
+
+        except AnalysisStageTimeout as e:
+            run.status = f'timeout:{e.stage}'
+            self.timeout_count += 1
+            logger.error(f"{self._log_prefix}분석 작업 시간 초과: {str(e)}")
+            return None
+
+        except asyncio.CancelledError:
+            run.status = 'cancelled'
+            raise
+
+        except Exception as e:
+            run.status = 'error'
+            self.failed_count += 1
+            logger.error(f"{self._log_prefix}분석 작업 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+
+        finally:
+            self._record(run)
+
+    def _record(self, run: AnalysisRun):
+        """단계별 소요 시간 기록"""
+        symbol = self.name or ''
+        for stage, duration in run.timings.items():
+            self._stage_timings.setdefault(stage, deque(maxlen=self.HISTORY_SIZE)).append(duration)
+            ANALYSIS_STAGE.observe(duration, symbol, stage)
+        # timeout:<단계> 는 단계 이름을 빼고 집계 (레이블 종류 제한)
+        ANALYSIS_CYCLE.observe(run.elapsed(), symbol, run.status.split(':')[0])
+        self._history.append({
+            'trigger': run.trigger,
+            'candle': self._format_candle(run.candle_open),
+            'status': run.status,
+            'elapsed': round(run.elapsed(), 3),
+            'timings': {k: round(v, 3) for k, v in run.timings.items()}
+        })
+        logger.info(f"{self._log_prefix}분석 작업 종료 ({run.summary()})")
+
+    def _candle_open(self, now: float = None) -> int:
+        """현재 봉 시작 시각 (epoch 초)"""
+        now = time.time() if now is None else now
+        return int(now // self.candle_seconds) * self.candle_seconds
+
+    def _deadline(self, candle_open: int) -> float:
+        """다음 봉 시작 safety_margin 초 전 시각 (monotonic 기준)"""
+        remaining = candle_open + self.candle_seconds - self.safety_margin - time.time()
+        return time.monotonic() + remaining
+
+    @staticmethod
+    def _format_candle(candle_open: int) -> str:
+        return datetime.fromtimestamp(candle_open).strftime('%Y-%m-%d %H:%M')
@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import functools
 import traceback
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from ..utils.time_utils import TimeUtils
 from ..formatters.order_formatter import OrderFormatter
@@ -9,11 +10,28 @@ from ..formatters.storage_formatter import StorageFormatter
 from config.trading_config import trading_config
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from ..formatters.analysis_formatter import AnalysisFormatter
+from .analysis_job_runner import AnalysisJobRunner, AnalysisRun, AnalysisStageTimeout
+from .kline_trigger import KlineTrigger
+from config import config
+from services.account_state import AccountState
+from services.rate_limiter import RateLimiter
+from services.risk_engine import RiskEngine
 
 logger = logging.getLogger(__name__)
 
 class AutoAnalyzer:
-    def __init__(self, market_data_service, gpt_analyzer, order_service, telegram_bot=None):
+    """심볼별 자동 분석 (데이터 조회 → 지표 → GPT → 리스크 검사 → 저장 → 알림 → 주문)
+
+    - 심볼마다 AnalysisJobRunner 를 두어 한 심볼이 늦어져도 다른 심볼 분석은 기다리지 않음
+    - GPT 분석기(LLM 클라이언트와 속도 제한), 시세 조회 속도 제한, 계정 상태 미러는 모든 심볼이 공유
+    - 동시에 실행되는 분석 수는 workers 설정으로 제한 (0 이면 심볼 수)
+    """
+
+    DEFAULT_FALLBACK_DELAY = 30     # 봉 마감 이벤트를 기다린 뒤 cron 으로 대신 실행하기까지 (초)
+    DEFAULT_FETCH_RATE = 5          # 시세 조회 초당 요청 수 (모든 심볼 합계)
+
+    def __init__(self, market_data_service, gpt_analyzer, order_service, telegram_bot=None,
+                 public_ws_client=None, account_state: AccountState = None):
         logger.info("AutoAnalyzer 초기화 시작")
         self.market_data_service = market_data_service
         self.gpt_analyzer = gpt_analyzer
@@ -24,8 +42,32 @@ class AutoAnalyzer:
         self.analysis_formatter = AnalysisFormatter()  # 누락된 부분 추가
         self.is_running = False
         self.last_run_time = None
-        self._current_analysis_task = None
+        self._initial_analysis_task = None
         self._stop_event = asyncio.Event()
+        self.account_state = account_state or AccountState.get_instance()
+        self.risk_engine = RiskEngine.get_instance()
+
+        # 심볼별 작업 큐 (single-flight), 공유 작업자 수 제한과 시세 조회 속도 제한
+        settings = config.load_json_config('analysis_config.json')
+        self.symbols: List[str] = trading_config.symbols
+        self.runners = {
+            symbol: AnalysisJobRunner(functools.partial(self._analysis_job, symbol), name=symbol)
+            for symbol in self.symbols
+        }
+        self.workers = int(settings.get('workers', 0)) or len(self.symbols)
+        self._worker_slots = asyncio.Semaphore(self.workers)
+        self.fetch_limiter = RateLimiter(float(settings.get('fetch_rate', self.DEFAULT_FETCH_RATE)),
+                                         name='fetch')
+
+        # 봉 마감(kline confirm) 트리거, cron 은 스트림 장애 시 대체 실행
+        self.kline_triggers = {}
+        if public_ws_client and settings.get('kline_trigger', True):
+            self.kline_triggers = {
+                symbol: KlineTrigger(public_ws_client, market_data_service,
+                                     functools.partial(self._on_candle_close, symbol), symbol=symbol)
+                for symbol in self.symbols
+            }
+        fallback_delay = int(settings.get('fallback_delay', self.DEFAULT_FALLBACK_DELAY)) if self.kline_triggers else 0
 
         # 스케줄러 설정 개선
         try:
@@ -36,8 +78,11 @@ class AutoAnalyzer:
                 'cron',  # interval에서 cron으로 변경
                 hour='*',  # 매시간
                 minute='0',  # 정각
+                second=str(fallback_delay),  # 봉 마감 트리거 사용 시 대체 실행 지연
                 id='hourly_analysis',
-                replace_existing=True
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True
             )
             logger.info("스케줄러 설정 완료")
         except Exception as e:
@@ -51,11 +96,26 @@ class AutoAnalyzer:
         logger.info(f"다음 실행 예정 시간: {next_hour}")
         return next_hour
 
-    async def _scheduled_analysis(self):
-        """스케줄된 분석 실행 래퍼"""
+    async def _scheduled_analysis(self, trigger: str = AnalysisJobRunner.TRIGGER_CRON):
+        """스케줄된 분석 실행 래퍼 (봉 마감 트리거로 분석되지 않은 심볼만)"""
         try:
-            logger.info(f"스케줄된 분석 시작 - {datetime.now()}")
-            await self.analyze_market(manual=False)
+            symbols = self.symbols
+            if trigger == AnalysisJobRunner.TRIGGER_CRON and self.kline_triggers:
+                symbols = []
+                for symbol in self.symbols:
+                    runner = self.runners[symbol]
+                    if runner.has_completed() or runner.is_busy():
+                        logger.info(f"[{symbol}] 봉 마감 트리거로 분석되었으므로 cron 실행 생략")
+                        continue
+                    healthy = self.kline_triggers[symbol].is_healthy()
+                    logger.warning(f"[{symbol}] 봉 마감 이벤트 없음 (스트림 상태: {'정상' if healthy else '장애'}), cron 으로 대체 실행")
+                    symbols.append(symbol)
+                if not symbols:
+                    return
+            logger.info(f"스케줄된 분석 시작 - {datetime.now()} ({trigger}, {', '.join(symbols)})")
+            await asyncio.gather(*(
+                self.analyze_market(manual=False, trigger=trigger, symbol=symbol) for symbol in symbols
+            ))
         except Exception as e:
             logger.error(f"스케줄된 분석 중 오류 발생: {str(e)}")
             logger.error(traceback.format_exc())
@@ -70,14 +130,14 @@ class AutoAnalyzer:
         try:
             self.is_running = True
             self.scheduler.start()
+            for kline_trigger in self.kline_triggers.values():
+                await kline_trigger.start()
             next_run = self.scheduler.get_job('hourly_analysis').next_run_time
             logger.info(f"스케줄러 시작됨. 다음 실행 시간: {next_run}")
             
-            # 시작 즉시 한 번 실행
-            logger.info("초기 분석 실행 시작")
-            await asyncio.sleep(1)  # 봇 시작 메시지가 먼저 전송되도록 대기
-            await self._scheduled_analysis()
-            logger.info("초기 분석 실행 완료")
+            # 시작 즉시 한 번 실행 (봇 시작을 막지 않도록 백그라운드 실행)
+            logger.info("초기 분석 예약")
+            self._initial_analysis_task = asyncio.create_task(self._initial_analysis())
         except Exception as e:
             logger.error(f"시작 중 오류 발생: {str(e)}")
             logger.error(traceback.format_exc())
@@ -91,9 +151,12 @@ class AutoAnalyzer:
                 logger.info("스케줄러가 중지되었습니다")
             
             # 실행 중인 분석 작업 취소
-            if self._current_analysis_task:
-                self._current_analysis_task.cancel()
-                logger.info("실행 중인 분석 작업이 취소되었습니다")
+            if self._initial_analysis_task and not self._initial_analysis_task.done():
+                self._initial_analysis_task.cancel()
+            for kline_trigger in self.kline_triggers.values():
+                await kline_trigger.stop()
+            await asyncio.gather(*(runner.stop() for runner in self.runners.values()))
+            self.is_running = False
             
             # 중지 이벤트 설정
             self._stop_event.set()
@@ -106,78 +169,196 @@ class AutoAnalyzer:
             logger.error(traceback.format_exc())
             return False
 
-    async def analyze_market(self, manual: bool = False):
-        """시장 분석 실행"""
+    async def _initial_analysis(self):
+        """시작 시 초기 분석"""
+        await asyncio.sleep(1)  # 봇 시작 메시지가 먼저 전송되도록 대기
+        await self._scheduled_analysis(AnalysisJobRunner.TRIGGER_START)
+        logger.info("초기 분석 실행 완료")
+
+    async def analyze_market(self, manual: bool = False, trigger: str = None,
+                             symbol: str = None) -> Optional[Dict]:
+        """시장 분석 실행 (실행 중인 분석이 있으면 병합)
+
+        Args:
+            symbol: 분석할 심볼 (미지정 시 모든 심볼을 동시에 분석하고 {심볼: 결과} 반환)
+        """
         try:
             if not self.is_running and not manual:
                 logger.warning("자동 분석이 비활성화 상태입니다")
-                return
+                return None
 
-            current_time = datetime.now()
-            logger.info(f"시장 분석 시작 - {current_time} {'(수동)' if manual else '(자동)'}")
-            
-            # 분석 실행
-            analysis_result = await self._run_analysis()
-            if not analysis_result:
-                return
+            if trigger is None:
+                trigger = AnalysisJobRunner.TRIGGER_MANUAL if manual else AnalysisJobRunner.TRIGGER_CRON
+            if symbol is None:
+                results = await asyncio.gather(*(
+                    self.analyze_market(manual, trigger, symbol) for symbol in self.symbols
+                ))
+                return dict(zip(self.symbols, results))
 
-            # 결과 저장
-            self.storage_formatter.save_analysis('1h', analysis_result)
-            
-            # 자동매매 상태 확인
-            auto_trading_enabled = trading_config.auto_trading['enabled']
-            confidence = analysis_result.get('market_summary', {}).get('confidence', 0)
-            confidence_sufficient = confidence >= trading_config.min_confidence
-            
-            # 분석 결과 알림 전송
-            if self.telegram_bot:
-                message = self.analysis_formatter.format_analysis(
-                    analysis_result,
-                    auto_trading_status=f"자동매매: {'활성화' if auto_trading_enabled and confidence_sufficient else '비활성화'} (신뢰도: {confidence}%)"
-                )
-                await self.telegram_bot.send_message_to_all(message, self.telegram_bot.MSG_TYPE_ANALYSIS)
-            
-            # 매매 신호 처리
-            await self._handle_trading_signals(analysis_result)
-            
-            # 마지막 실행 시간 업데이트
-            self.last_run_time = current_time
-            logger.info(f"시장 분석 완료 - {current_time}")
+            runner = self.runners.get(symbol)
+            if runner is None:
+                logger.error(f"분석 대상이 아닌 심볼: {symbol}")
+                return None
+            logger.info(f"[{symbol}] 시장 분석 요청 - {datetime.now()} ({trigger})")
+            return await runner.submit(trigger)
             
         except Exception as e:
             logger.error(f"시장 분석 중 오류 발생: {str(e)}")
             logger.error(traceback.format_exc())
+            return None
+
+    async def _on_candle_close(self, symbol: str, klines, candle_close: int):
+        """봉 마감 이벤트 (마감된 봉 목록을 그대로 분석에 사용)"""
+        if not self.is_running:
+            return
+        await self.runners[symbol].submit(
+            AnalysisJobRunner.TRIGGER_KLINE,
+            candle_open=candle_close,
+            data={'klines': klines}
+        )
 
-    async def _run_analysis(self):
-        """분석 실행"""
+    def get_stats(self) -> Dict:
+        """심볼별 분석 작업 단계별 소요 시간 및 GPT 응답 캐시 통계"""
+        stats = {
+            'workers': self.workers,
+            'symbols': {symbol: runner.get_stats() for symbol, runner in self.runners.items()},
+            'account': self.account_state.snapshot()
+        }
+        cache = getattr(self.gpt_analyzer, 'analysis_cache', None)
+        if cache:
+            stats['llm_cache'] = cache.get_stats()
+        prefilter = getattr(self.gpt_analyzer, 'prefilter', None)
+        if prefilter:
+            stats['prefilter'] = prefilter.get_stats()
+        validator = getattr(self.gpt_analyzer, 'signal_validator', None)
+        if validator:
+            stats['validator'] = validator.get_stats()
+        prompt_builder = getattr(self.gpt_analyzer, 'prompt_builder', None)
+        if prompt_builder:
+            stats['prompt'] = prompt_builder.get_stats()
+        return stats
+
+    async def _analysis_job(self, symbol: str, run: AnalysisRun) -> Optional[Dict]:
+        """분석 작업 (데이터 조회 → 지표 → GPT → 리스크 검사 → 저장 → 알림 → 주문)"""
+        current_time = datetime.now()
         try:
-            # OHLCV 데이터 조회 및 검증
-            klines = await self.market_data_service.get_ohlcv('BTCUSDT', '1h')
-            if not isinstance(klines, list) or not klines:
-                await self._handle_error("시장 데이터 조회 실패")
-                return None
-            
-            # 분석 실행
-            analysis = await self.gpt_analyzer.analyze_market('1h', klines)
-            if not analysis:
-                await self._handle_error("분석 실패")
-                return None
+            # 조회~리스크 검사 단계만 공유 작업자 수 제한 적용
+            async with self._worker_slots:
+                klines = run.data.get('klines')
+                if not klines:
+                    # OHLCV 와 시장 데이터 동시 조회 (봉 마감 이벤트가 없을 때)
+                    await self.fetch_limiter.acquire()
+                    klines, market_data = await run.stage('fetch', asyncio.gather(
+                        self.market_data_service.get_ohlcv(symbol, '1h'),
+                        self.market_data_service.get_market_data(symbol)
+                    ))
+                    if not isinstance(klines, list) or not klines or not market_data:
+                        await self._handle_error(f"[{symbol}] 시장 데이터 조회 실패")
+                        return None
+
+                # 기술적 지표 계산 (스레드에서 실행)
+                prepared = await run.stage('indicators', self.gpt_analyzer.compute_indicators, klines)
+                if not prepared:
+                    await self._handle_error(f"[{symbol}] 분석 실패")
+                    return None
+
+                # GPT 분석 (수동 요청은 캐시를 쓰지 않고 새로 분석)
+                analysis_result = await run.stage('llm', self.gpt_analyzer.request_analysis(
+                    '1h', prepared, use_cache=run.trigger != AnalysisJobRunner.TRIGGER_MANUAL, symbol=symbol
+                ))
+                if not analysis_result:
+                    await self._handle_error(f"[{symbol}] 분석 실패")
+                    return None
 
-            return analysis
+                # 계정 전체 노출 한도 검사 (다른 심볼 포지션 포함)
+                analysis_result['risk_check'] = await run.stage('risk', self._check_risk, symbol, analysis_result)
+
+        except AnalysisStageTimeout as e:
+            await self._handle_error(f"[{symbol}] 분석 시간 초과 ({e.stage} 단계)")
+            raise
 
         except Exception as e:
-            logger.error(f"분석 중 오류: {str(e)}")
+            logger.error(f"[{symbol}] 분석 중 오류: {str(e)}")
             logger.error(traceback.format_exc())
-            await self._handle_error("분석 중 오류가 발생했습니다")
+            await self._handle_error(f"[{symbol}] 분석 중 오류가 발생했습니다")
             return None
 
+        # 결과 저장 (다음 봉 시작 전)
+        if not await run.stage('store', self.storage_formatter.save_analysis, '1h', analysis_result, symbol):
+            logger.error(f"[{symbol}] 분석 결과 저장 실패")
+        
+        # 자동매매 상태 확인
+        auto_trading_enabled = trading_config.auto_trading['enabled']
+        confidence = analysis_result.get('market_summary', {}).get('confidence', 0)
+        confidence_sufficient = confidence >= trading_config.min_confidence
+        
+        # 분석 결과 알림 전송
+        if self.telegram_bot:
+            message = self.analysis_formatter.format_analysis(
+                analysis_result,
+                auto_trading_status=f"자동매매: {'활성화' if auto_trading_enabled and confidence_sufficient else '비활성화'} (신뢰도: {confidence}%)"
+            )
+            try:
+                await run.stage('notify', self.telegram_bot.send_message_to_all(message, self.telegram_bot.MSG_TYPE_ANALYSIS))
+            except AnalysisStageTimeout as e:
+                logger.error(f"[{symbol}] 분석 결과 알림 시간 초과: {str(e)}")
+        
+        # 매매 신호 처리 (시간 초과 시에도 주문은 취소되지 않고 끝까지 실행)
+        try:
+            await run.stage('order', self._handle_trading_signals(symbol, analysis_result))
+        except AnalysisStageTimeout as e:
+            logger.error(f"[{symbol}] 매매 신호 처리 대기 시간 초과 (주문은 계속 진행): {str(e)}")
+        
+        # 마지막 실행 시간 업데이트
+        self.last_run_time = current_time
+        logger.info(f"[{symbol}] 시장 분석 완료 - {current_time}")
+        return analysis_result
+
+    def _check_risk(self, symbol: str, analysis_result: Dict) -> Dict:
+        """계정 상태 미러 기준 신규 진입 가능 여부 (다른 심볼 포지션 명목 가치 + 이번 진입 ≤ 노출 한도)"""
+        signals = analysis_result.get('trading_signals', {})
+        side = signals.get('position_suggestion', 'HOLD')
+        if side not in ('BUY', 'SELL'):
+            return {'allowed': True, 'reason': '관망'}
+        if not self.account_state.has_wallet():
+            return {'allowed': True, 'reason': '계정 상태 없음 (주문 단계에서 확인)'}
+
+        # 주문 단계와 같은 기준 자산 (RiskEngine.sizing_equity)
+        equity = self.risk_engine.sizing_equity({
+            'total_equity': self.account_state.equity,
+            'unrealized_pnl': self.account_state.unrealized_pnl(),
+            'available_balance': self.account_state.available
+        })
+        plan = self.risk_engine.size_position(
+            equity, signals.get('position_size', trading_config.position_settings['default']),
+            signals.get('leverage', trading_config.leverage_settings['default']),
+            signals.get('entry_price', 0), side,
+            signals.get('stop_loss'), signals.get('take_profit1'), symbol
+        )
+        other_exposure = self.account_state.exposure(exclude=symbol)
+        limit = equity * self.risk_engine.max_exposure
+        result = {
+            'allowed': True,
+            'reason': '통과',
+            'notional': round(plan['notional'], 2),
+            'account_exposure': round(other_exposure, 2),
+            'limit': round(limit, 2)
+        }
+        if plan['qty'] <= 0:
+            result.update(allowed=False, reason='최소 주문 수량 미만')
+        elif other_exposure + plan['notional'] > limit:
+            result.update(allowed=False, reason='계정 노출 한도 초과')
+        if not result['allowed']:
+            logger.warning(f"[{symbol}] 리스크 검사 불통과: {result}")
+        return result
+
     async def _handle_error(self, message: str):
         """에러 처리"""
         logger.error(message)
         if self.telegram_bot:
             await self.telegram_bot.send_message_to_all(f"❌ {message}", self.telegram_bot.MSG_TYPE_ANALYSIS)
 
-    async def _handle_trading_signals(self, analysis_result: Dict):
+    async def _handle_trading_signals(self, symbol: str, analysis_result: Dict):
         """매매 신호 처리"""
         try:
             signals = analysis_result.get('trading_signals', {})
@@ -200,13 +381,18 @@ class AutoAnalyzer:
                 logger.info(f"신뢰도 부족 (현재: {confidence}%, 최소: {trading_config.min_confidence}%)")
                 return
             
+            risk_check = analysis_result.get('risk_check') or {}
+            if not risk_check.get('allowed', True):
+                logger.info(f"[{symbol}] 리스크 검사로 자동매매 생략: {risk_check.get('reason')}")
+                return
+            
             # HOLD가 아닐 때만 자동매매 실행
             if position_suggestion != 'HOLD':
-                logger.info(f"매매 신호 감지: {position_suggestion}")
+                logger.info(f"[{symbol}] 매매 신호 감지: {position_suggestion}")
                 
                 # trading_signals에 필요한 정보 추가
                 signals.update({
-                    'symbol': 'BTCUSDT',
+                    'symbol': symbol,
                     'side': 'BUY' if position_suggestion == 'BUY' else 'SELL',
                     'is_btc_unit': False
                 })
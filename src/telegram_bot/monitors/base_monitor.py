@@ -14,3 +14,7 @@ class BaseMonitor(ABC):
     async def start(self):
         """모니터링 시작"""
         pass
+    
+    async def stop(self):
+        """모니터링 중지"""
+        pass
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import traceback
+from typing import Dict
+from .base_monitor import BaseMonitor
+from services.equity_store import EquityStore
+
+logger = logging.getLogger(__name__)
+
+class EquityMonitor(BaseMonitor):
+    """지갑/포지션 스트림으로 자산 시계열 기록"""
+
+    SAVE_INTERVAL = 300  # 파일 저장 주기 (초)
+
+    def __init__(self, bot, bybit_client, equity_store: EquityStore = None):
+        super().__init__(bot, bybit_client)
+        self.ws_client = bybit_client.ws_client
+        self.equity_store = equity_store or EquityStore.get_instance()
+        self._wallet = {}
+        self._positions = {}  # 심볼별 {'size', 'value', 'unrealized_pnl'}
+        self._save_task = None
+
+    async def start(self):
+        """모니터링 시작"""
+        self.ws_client.add_callback('wallet', self._handle_wallet_update)
+        self.ws_client.add_callback('position', self._handle_position_update)
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_loop())
+        logger.info("자산 시계열 모니터 시작")
+
+    async def stop(self):
+        """모니터링 중지 및 시계열 저장"""
+        self.ws_client.remove_callback('wallet', self._handle_wallet_update)
+        self.ws_client.remove_callback('position', self._handle_position_update)
+        if self._save_task:
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+            self._save_task = None
+        await self.equity_store.save_async()
+        logger.info("자산 시계열 모니터 중지됨")
+
+    async def _handle_wallet_update(self, data: Dict):
+        """지갑 업데이트 처리"""
+        try:
+            wallet = data.get('data', {})
+            if not wallet or wallet.get('accountType', 'UNIFIED') != 'UNIFIED':
+                return
+
+            self._wallet = {
+                'equity': self._to_float(wallet.get('totalEquity')),
+                'used_margin': self._to_float(wallet.get('totalInitialMargin')),
+                'unrealized_pnl': self._to_float(wallet.get('totalPerpUPL'))
+            }
+            self._record()
+
+        except Exception as e:
+            logger.error(f"지갑 업데이트 처리 중 오류: {str(e)}")
+
+    async def _handle_position_update(self, data: Dict):
+        """포지션 업데이트 처리"""
+        try:
+            position = data.get('data', {})
+            symbol = position.get('symbol')
+            if not symbol:
+                return
+
+            size = abs(self._to_float(position.get('size')))
+            if size > 0:
+                self._positions[symbol] = {
+                    'size': size,
+                    'value': abs(self._to_float(position.get('positionValue'))),
+                    'unrealized_pnl': self._to_float(position.get('unrealisedPnl'))
+                }
+            else:
+                self._positions.pop(symbol, None)
+            self._record()
+
+        except Exception as e:
+            logger.error(f"포지션 업데이트 처리 중 오류: {str(e)}")
+
+    def _record(self):
+        """현재 상태를 샘플로 기록 (지갑 정보 수신 전에는 건너뜀)"""
+        if not self._wallet:
+            return
+
+        positions = self._positions.values()
+        # 포지션 스트림이 지갑보다 자주 오므로 미실현 손익은 포지션 기준 우선
+        unrealized_pnl = (sum(p['unrealized_pnl'] for p in positions)
+                          if self._positions else self._wallet['unrealized_pnl'])
+
+        self.equity_store.record(
+            equity=self._wallet['equity'],
+            used_margin=self._wallet['used_margin'],
+            unrealized_pnl=unrealized_pnl,
+            position_size=sum(p['size'] for p in positions),
+            position_value=sum(p['value'] for p in positions)
+        )
+
+    async def _save_loop(self):
+        """주기적 파일 저장"""
+        while True:
+            await asyncio.sleep(self.SAVE_INTERVAL)
+            try:
+                await self.equity_store.save_async()
+            except Exception as e:
+                logger.error(f"자산 시계열 주기 저장 중 오류: {str(e)}")
+                logger.error(traceback.format_exc())
+
+    @staticmethod
+    def _to_float(value, default: float = 0.0) -> float:
+        """안전한 float 변환"""
+        try:
+            if value is None or value == '':
+                return default
+            return float(value)
+        except (ValueError, TypeError):
+            return default
@@ -0,0 +1,142 @@
+import time
+import asyncio
+import logging
+import traceback
+from collections import deque
+from typing import Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class KlineTrigger:
+    """봉 마감(confirm=true) kline 이벤트 기반 분석 트리거
+
+    - 퍼블릭 웹소켓 kline 토픽을 구독하고 마감된 봉만 버퍼에 추가
+    - 버퍼는 처음 한 번만 REST 로 채우고 이후에는 스트림 데이터만 사용
+    - 봉이 마감되면 on_close(klines, candle_close) 를 백그라운드로 호출
+    """
+
+    INTERVALS = {'1m': '1', '1h': '60'}
+
+    def __init__(self, ws_client, market_data_service, on_close: Callable[[List[Dict], int], Awaitable],
+                 symbol: str = 'BTCUSDT', timeframe: str = '1h'):
+        """
+        Args:
+            ws_client: 퍼블릭 웹소켓 클라이언트
+            market_data_service: 버퍼 초기화용 REST 조회 서비스
+            on_close: 봉 마감 시 호출 (마감된 봉까지의 OHLCV 목록, 마감 시각 epoch 초)
+        """
+        self.ws_client = ws_client
+        self.market_data_service = market_data_service
+        self.on_close = on_close
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.interval = self.INTERVALS[timeframe]
+        self.candle_seconds = int(self.interval) * 60
+        self.topic = ws_client.kline_topic(symbol, self.interval)
+
+        self._klines = deque(maxlen=getattr(market_data_service, 'timeframe_limit', 200))
+        self._seeded = False
+        self._seed_lock = asyncio.Lock()
+        self._tasks = set()
+        self.last_close_at = 0.0
+        self.is_running = False
+
+    async def start(self):
+        """kline 토픽 구독 시작"""
+        if self.is_running:
+            return
+        self.ws_client.add_callback(self.topic, self._handle_kline)
+        self.is_running = True
+        logger.info(f"봉 마감 트리거 시작 ({self.topic})")
+
+        # 첫 봉 마감 때 REST 조회가 없도록 미리 버퍼 채우기
+        current_open_ms = int(time.time() // self.candle_seconds * self.candle_seconds * 1000)
+        self._spawn(self._seed_safely(current_open_ms))
+
+    async def stop(self):
+        """구독 해제 및 진행 중인 콜백 종료"""
+        self.ws_client.remove_callback(self.topic, self._handle_kline)
+        self.is_running = False
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def is_healthy(self) -> bool:
+        """스트림이 살아 있는지 여부 (확정 봉 사이에도 미확정 kline 이 계속 수신됨)"""
+        return self.is_running and self.ws_client.is_healthy(max_silence=60)
+
+    def get_klines(self) -> List[Dict]:
+        """버퍼의 마감된 봉 목록"""
+        return list(self._klines)
+
+    async def _handle_kline(self, message: Dict):
+        """kline 메시지 처리 (수신 루프를 막지 않도록 마감 처리는 별도 작업)"""
+        try:
+            for item in message.get('data', []):
+                if not item.get('confirm'):
+                    continue
+                bar = {
+                    'timestamp': int(item['start']),
+                    'open': float(item['open']),
+                    'high': float(item['high']),
+                    'low': float(item['low']),
+                    'close': float(item['close']),
+                    'volume': float(item['volume'])
+                }
+                self._spawn(self._on_confirmed(bar))
+        except Exception as e:
+            logger.error(f"kline 메시지 처리 중 오류: {str(e)}")
+
+    async def _on_confirmed(self, bar: Dict):
+        """마감된 봉을 버퍼에 추가하고 분석 호출"""
+        try:
+            await self._ensure_seeded(bar['timestamp'])
+            self._append(bar)
+            self.last_close_at = time.monotonic()
+
+            candle_close = bar['timestamp'] // 1000 + self.candle_seconds
+            logger.info(f"봉 마감 수신 ({self.topic}, 종가: {bar['close']})")
+            await self.on_close(self.get_klines(), candle_close)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"봉 마감 처리 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _seed_safely(self, before_ts: int):
+        try:
+            await self._ensure_seeded(before_ts)
+        except Exception as e:
+            logger.error(f"kline 버퍼 초기화 중 오류: {str(e)}")
+
+    async def _ensure_seeded(self, before_ts: int):
+        """최초 한 번 REST 로 과거 봉 채우기 (진행 중인 봉 제외, 연결 끊김으로 봉이 빠지면 다시 채움)"""
+        if self._seeded and self._klines[-1]['timestamp'] + self.candle_seconds * 1000 < before_ts:
+            logger.warning("kline 버퍼에 누락된 봉이 있어 다시 초기화합니다")
+            self._seeded = False
+            self._klines.clear()
+        if self._seeded:
+            return
+        async with self._seed_lock:
+            if self._seeded:
+                return
+            klines = await self.market_data_service.get_ohlcv(self.symbol, self.timeframe)
+            for kline in klines or []:
+                if kline['timestamp'] < before_ts:
+                    self._append(kline)
+            self._seeded = bool(self._klines)
+            logger.info(f"kline 버퍼 초기화: {len(self._klines)}개")
+
+    def _append(self, bar: Dict):
+        """시간순 유지하며 추가 (같은 시각 봉은 교체)"""
+        if self._klines and self._klines[-1]['timestamp'] == bar['timestamp']:
+            self._klines[-1] = bar
+        elif not self._klines or self._klines[-1]['timestamp'] < bar['timestamp']:
+            self._klines.append(bar)
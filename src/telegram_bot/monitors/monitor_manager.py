@@ -21,6 +21,22 @@ class MonitorManager:
         )
         self._monitors.append(self.order_monitor)
         
+        # 자산 시계열 모니터 초기화
+        from .equity_monitor import EquityMonitor
+        self.equity_monitor = EquityMonitor(
+            bot=telegram_bot,
+            bybit_client=bybit_client
+        )
+        self._monitors.append(self.equity_monitor)
+        
+        # 실시간 수익률 모니터 초기화 (포지션 스트림 + 마크 가격 티커)
+        from .profit_monitor import ProfitMonitor
+        self.profit_monitor = ProfitMonitor(
+            bot=telegram_bot,
+            bybit_client=bybit_client
+        )
+        self._monitors.append(self.profit_monitor)
+        
     async def start_all_monitors(self) -> None:
         """모든 모니터링 시작"""
         try:
@@ -1,19 +1,96 @@
 import logging
-import asyncio
-import time
-from typing import Dict
-from telegram_bot.utils.time_utils import TimeUtils
 import traceback
+from typing import Dict, List, Optional
+from .base_monitor import BaseMonitor
+from config import config
+from config.trading_config import trading_config
 
 logger = logging.getLogger(__name__)
 
-class ProfitMonitor:
-    def __init__(self, bot):
-        self.bot = bot
-        self.time_utils = TimeUtils()
-        self.scheduler = None
+class ProfitAlertTracker:
+    """심볼별 수익률(ROE) 알림 상태
+
+    - 고정 임계값: 음수는 이하로 내려갈 때, 양수는 이상으로 올라갈 때 한 번만 알림
+      (히스테리시스 폭만큼 되돌아간 뒤에야 다시 알림)
+    - 트레일링: 최고 ROE 가 activate 이상이 된 뒤 giveback 만큼 되돌리면 알림,
+      이후 알림 시점보다 giveback 이상 다시 오르고 activate 이상일 때 재무장
+    - 포지션이 청산되거나 방향이 바뀌면 상태 초기화
+    """
+
+    def __init__(self, tiers: List[float], hysteresis: float = 0.5, trailing: Dict = None):
+        self.tiers = sorted(float(tier) for tier in tiers)
+        self.hysteresis = abs(float(hysteresis))
+        trailing = trailing or {}
+        self.trailing_enabled = bool(trailing.get('enabled', False))
+        self.trailing_activate = float(trailing.get('activate', 3.0))
+        self.trailing_giveback = abs(float(trailing.get('giveback', 1.5)))
+        self._state: Dict[str, Dict] = {}
+
+    def reset(self, symbol: str):
+        self._state.pop(symbol, None)
+
+    def evaluate(self, symbol: str, roe: float) -> List[Dict]:
+        """새 ROE 반영 후 보낼 알림 목록"""
+        state = self._state.setdefault(symbol, {'fired': set(), 'peak': None, 'rearm_at': None})
+        alerts = []
+
+        for tier in self.tiers:
+            crossed = roe <= tier if tier < 0 else roe >= tier
+            if tier in state['fired']:
+                recovered = roe > tier + self.hysteresis if tier < 0 else roe < tier - self.hysteresis
+                if recovered:
+                    state['fired'].discard(tier)
+            elif crossed:
+                state['fired'].add(tier)
+                alerts.append({'kind': 'loss' if tier < 0 else 'profit', 'threshold': tier, 'roe': roe})
+
+        if self.trailing_enabled:
+            alerts.extend(self._evaluate_trailing(state, roe))
+        return alerts
+
+    def _evaluate_trailing(self, state: Dict, roe: float) -> List[Dict]:
+        if state['rearm_at'] is not None:
+            if roe < state['rearm_at']:
+                return []
+            state['rearm_at'] = None
+            state['peak'] = None
+
+        if state['peak'] is None or roe > state['peak']:
+            state['peak'] = roe
+        peak = state['peak']
+        if peak >= self.trailing_activate and roe <= peak - self.trailing_giveback:
+            state['rearm_at'] = max(self.trailing_activate, roe + self.trailing_giveback)
+            return [{'kind': 'trailing', 'threshold': peak - self.trailing_giveback, 'roe': roe, 'peak': peak}]
+        return []
+
+class ProfitMonitor(BaseMonitor):
+    """실시간 수익률 모니터 (REST 폴링 없음)
+
+    포지션 스트림으로 진입가/수량/레버리지를, 퍼블릭 티커로 마크 가격을 받아
+    업데이트가 올 때마다 미실현 손익과 ROE 를 다시 계산합니다.
+    시작 시 한 번만 REST 로 열린 포지션을 채웁니다.
+    """
+
+    DEFAULT_SETTINGS = {
+        'tiers': [-1.5, 2.0],     # ROE % 임계값
+        'hysteresis': 0.5,        # 재알림 전 되돌아가야 하는 ROE 폭 (%p)
+        'trailing': {'enabled': True, 'activate': 3.0, 'giveback': 1.5}
+    }
+
+    def __init__(self, bot, bybit_client, settings: Dict = None):
+        super().__init__(bot, bybit_client)
+        if settings is None:
+            settings = config.load_json_config('profit_config.json')
+        options = {**self.DEFAULT_SETTINGS, **settings}
+
+        self.ws_client = bybit_client.ws_client
+        self.public_ws_client = bybit_client.public_ws_client
+        self.tracker = ProfitAlertTracker(options['tiers'], options['hysteresis'], options['trailing'])
+        self._positions: Dict[str, Dict] = {}     # 심볼별 {'side', 'size', 'entry_price', 'leverage', 'margin'}
+        self._mark_prices: Dict[str, float] = {}
+        self._topics: Dict[str, str] = {}         # 구독 중인 심볼별 티커 토픽
         self._is_running = False
-        self.monitor_task = None
+        self.alert_count = 0
 
     def is_running(self):
         """실행 상태 확인"""
@@ -26,52 +103,155 @@ class ProfitMonitor:
             return False
 
         self._is_running = True
-        self.monitor_task = asyncio.create_task(self.monitor_profit())
-        logger.info("수익률 모니터링 시작됨")
+        self.ws_client.add_callback('position', self._handle_position_update)
+        for symbol in trading_config.symbols:
+            self._watch(symbol)
+        await self._seed_positions()
+        logger.info(f"수익률 모니터링 시작됨 (임계값: {self.tracker.tiers}, 포지션 {len(self._positions)}개)")
         return True
 
     async def stop(self):
         """수익률 모니터링 중지"""
         self._is_running = False
-        if self.monitor_task:
-            self.monitor_task.cancel()
-            self.monitor_task = None
+        self.ws_client.remove_callback('position', self._handle_position_update)
+        for topic in self._topics.values():
+            self.public_ws_client.remove_callback(topic, self._handle_ticker)
+        self._topics.clear()
         logger.info("수익률 모니터링 중지됨")
 
-    async def monitor_profit(self):
-        """실시간 수익률 모니터링"""
-        while self._is_running:
-            try:
-                positions = await self.bot.bybit_client.fetch_positions('BTCUSDT')
-                if positions:
-                    for position in positions:
-                        unrealized_pnl = float(position.get('unrealizedPnl', 0))
-                        percentage = float(position.get('percentage', 0))
-                        entry_price = float(position.get('entryPrice', 0))
-                        current_size = float(position.get('size', 0))
-                        leverage = float(position.get('leverage', 0))
-                        
-                        # 수익률 알림 기준
-                        if percentage <= -1.5:  # -1.5% 손실
-                            await self.bot.send_message(
-                                f"⚠️ 손실 경고\n"
-                                f"수익률: {percentage:.2f}%\n"
-                                f"미실현 손익: ${unrealized_pnl:.2f}\n"
-                                f"레버리지: {leverage}x\n"
-                                f"포지션 크기: {current_size:.4f} BTC"
-                            )
-                        elif percentage >= 2.0:  # 2% 이상 수익
-                            await self.bot.send_message(
-                                f"✅ 수익률 달성\n"
-                                f"수익률: {percentage:.2f}%\n"
-                                f"미실현 손익: ${unrealized_pnl:.2f}\n"
-                                f"레버리지: {leverage}x\n"
-                                f"포지션 크기: {current_size:.4f} BTC"
-                            )
-                
-            except Exception as e:
-                logger.error(f"수익률 모니터링 중 오류: {str(e)}")
-                logger.debug(traceback.format_exc())
-                # 에러가 발생해도 계속 실행
-            
-            await asyncio.sleep(60)  # 1분마다 체크
\ No newline at end of file
+    def get_pnl(self, symbol: str) -> Optional[Dict]:
+        """마크 가격 기준 미실현 손익과 ROE (포지션이나 마크 가격이 없으면 None)"""
+        position = self._positions.get(symbol)
+        mark_price = self._mark_prices.get(symbol)
+        if not position or not mark_price:
+            return None
+
+        sign = 1 if position['side'] == 'Buy' else -1
+        unrealized_pnl = sign * (mark_price - position['entry_price']) * position['size']
+        margin = position['margin'] or position['entry_price'] * position['size'] / max(position['leverage'], 1)
+        return {
+            'symbol': symbol,
+            **position,
+            'mark_price': mark_price,
+            'unrealized_pnl': unrealized_pnl,
+            'roe': unrealized_pnl / margin * 100 if margin > 0 else 0.0
+        }
+
+    def get_status(self) -> Dict:
+        return {
+            'running': self._is_running,
+            'alerts': self.alert_count,
+            'positions': [pnl for pnl in map(self.get_pnl, self._positions) if pnl]
+        }
+
+    # ---- 스트림 처리 ----
+
+    async def _seed_positions(self):
+        """열린 포지션 초기화 (시작 시 한 번)"""
+        try:
+            response = await self.bybit_client.v5_get_positions({'category': 'linear', 'settleCoin': 'USDT'})
+            if not response or response.get('retCode') != 0:
+                logger.warning(f"수익률 모니터 포지션 초기화 실패: {response}")
+                return
+            for item in response.get('result', {}).get('list', []):
+                await self._update_position(item)
+        except Exception as e:
+            logger.error(f"수익률 모니터 포지션 초기화 중 오류: {str(e)}")
+
+    async def _handle_position_update(self, data: Dict):
+        """포지션 업데이트 처리"""
+        try:
+            await self._update_position(data.get('data', {}))
+        except Exception as e:
+            logger.error(f"수익률 모니터 포지션 처리 중 오류: {str(e)}")
+            logger.debug(traceback.format_exc())
+
+    async def _handle_ticker(self, data: Dict):
+        """티커 업데이트 처리 (delta 에 마크 가격이 없으면 무시)"""
+        try:
+            item = data.get('data', {})
+            mark_price = self._to_float(item.get('markPrice'))
+            symbol = item.get('symbol')
+            if not symbol or mark_price <= 0:
+                return
+            self._mark_prices[symbol] = mark_price
+            if symbol in self._positions:
+                await self._evaluate(symbol)
+        except Exception as e:
+            logger.error(f"수익률 모니터 티커 처리 중 오류: {str(e)}")
+
+    async def _update_position(self, item: Dict):
+        symbol = item.get('symbol')
+        if not symbol:
+            return
+
+        side = item.get('side')
+        size = abs(self._to_float(item.get('size')))
+        if size <= 0 or side not in ('Buy', 'Sell'):
+            if self._positions.pop(symbol, None):
+                self.tracker.reset(symbol)
+            return
+
+        previous = self._positions.get(symbol)
+        if previous and previous['side'] != side:
+            self.tracker.reset(symbol)
+        self._positions[symbol] = {
+            'side': side,
+            'size': size,
+            'entry_price': self._to_float(item.get('entryPrice') or item.get('avgPrice')),
+            'leverage': self._to_float(item.get('leverage'), 1.0),
+            'margin': self._to_float(item.get('positionIM'))
+        }
+        # 티커를 받기 전에는 포지션 데이터의 마크 가격 사용
+        if symbol not in self._mark_prices and self._to_float(item.get('markPrice')) > 0:
+            self._mark_prices[symbol] = self._to_float(item.get('markPrice'))
+        self._watch(symbol)
+        await self._evaluate(symbol)
+
+    def _watch(self, symbol: str):
+        """심볼 티커 구독 (이미 구독 중이면 무시)"""
+        if symbol in self._topics:
+            return
+        topic = self.public_ws_client.ticker_topic(symbol)
+        self.public_ws_client.add_callback(topic, self._handle_ticker)
+        self._topics[symbol] = topic
+
+    async def _evaluate(self, symbol: str):
+        """ROE 재계산 후 임계값 알림"""
+        if not self._is_running:
+            return
+        pnl = self.get_pnl(symbol)
+        if not pnl:
+            return
+        for alert in self.tracker.evaluate(symbol, pnl['roe']):
+            self.alert_count += 1
+            logger.info(f"수익률 알림: {symbol} {alert}")
+            await self.bot.send_message_to_all(self._format_alert(pnl, alert), self.bot.MSG_TYPE_POSITION)
+
+    @staticmethod
+    def _format_alert(pnl: Dict, alert: Dict) -> str:
+        titles = {
+            'loss': f"⚠️ 손실 경고 (ROE {alert['threshold']:+.1f}%)",
+            'profit': f"✅ 수익률 달성 (ROE {alert['threshold']:+.1f}%)",
+            'trailing': f"📉 수익 반납 (최고 ROE {alert.get('peak', 0):+.2f}%)"
+        }
+        base = pnl['symbol'].replace('USDT', '')
+        return (
+            f"{titles[alert['kind']]}\n"
+            f"심볼: {pnl['symbol']} {'롱' if pnl['side'] == 'Buy' else '숏'}\n"
+            f"수익률(ROE): {pnl['roe']:.2f}%\n"
+            f"미실현 손익: ${pnl['unrealized_pnl']:.2f}\n"
+            f"진입가: ${pnl['entry_price']:,.2f} / 마크 가격: ${pnl['mark_price']:,.2f}\n"
+            f"레버리지: {pnl['leverage']:g}x\n"
+            f"포지션 크기: {pnl['size']:.4f} {base}"
+        )
+
+    @staticmethod
+    def _to_float(value, default: float = 0.0) -> float:
+        """안전한 float 변환"""
+        try:
+            if value is None or value == '':
+                return default
+            return float(value)
+        except (ValueError, TypeError):
+            return default
@@ -0,0 +1,238 @@
+import time
+import asyncio
+import logging
+import traceback
+from typing import Dict, List, Tuple
+from config import config
+from .formatters.monitor_formatter import MonitorFormatter
+
+logger = logging.getLogger(__name__)
+
+class NotificationCoalescer:
+    """고빈도 주문/체결/포지션 알림 병합기
+
+    - 같은 orderId(주문/체결) 또는 심볼(포지션)의 이벤트를 window 초 동안 모아 한 번에 전송
+    - 체결은 수량 합계와 VWAP 으로 집계, 포지션은 중간 상태를 버리고 최종 상태만 전송
+    - digest_intervals 에 간격이 설정된 메시지 타입은 주기적으로 요약본 하나로 전송
+    """
+
+    DEFAULT_WINDOW = 2.0
+    ORDER_STATUSES = ('Created', 'New', 'PartiallyFilled', 'Filled', 'Cancelled')
+    MAX_DIGEST_ITEMS = 20
+
+    def __init__(self, bot, formatter: MonitorFormatter = None,
+                 window: float = None, digest_intervals: Dict[str, float] = None):
+        settings = config.load_json_config('notification_config.json')
+        self.bot = bot
+        self.formatter = formatter or MonitorFormatter()
+        self.window = window if window is not None else settings.get('coalesce_window', self.DEFAULT_WINDOW)
+        intervals = digest_intervals if digest_intervals is not None else settings.get('digest_intervals', {})
+        self.digest_intervals = {k: float(v) for k, v in intervals.items() if v}
+
+        self._pending: Dict[Tuple[str, str], Dict] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._digests: Dict[str, List[str]] = {}
+        self._digest_tasks: Dict[str, asyncio.Task] = {}
+        self.merged_count = 0
+        self.sent_count = 0
+
+    # ---- 이벤트 등록 ----
+
+    def add_order(self, order_data: Dict):
+        """주문 상태 이벤트 (같은 orderId 의 상태 변화를 하나로 병합)"""
+        order_id = order_data.get('orderId')
+        status = order_data.get('orderStatus')
+        if not order_id or status not in self.ORDER_STATUSES:
+            return
+
+        entry = self._entry(('order', order_id), {'statuses': []})
+        if not entry['statuses'] or entry['statuses'][-1] != status:
+            entry['statuses'].append(status)
+        entry['data'] = order_data
+
+    def add_execution(self, execution_data: Dict):
+        """체결 이벤트 (수량 합계와 VWAP 집계, 완전 체결 시 즉시 전송)"""
+        order_id = execution_data.get('orderId')
+        if not order_id:
+            return
+
+        entry = self._entry(('execution', order_id), {
+            'symbol': execution_data.get('symbol'),
+            'side': execution_data.get('side'),
+            'qty': 0.0,
+            'notional': 0.0,
+            'fee': 0.0
+        })
+        qty = float(execution_data.get('execQty', 0) or 0)
+        price = float(execution_data.get('execPrice', 0) or 0)
+        entry['qty'] += qty
+        entry['notional'] += qty * price
+        entry['fee'] += float(execution_data.get('execFee', 0) or 0)
+        entry['order_qty'] = float(execution_data.get('orderQty', 0) or 0)
+
+        leaves_qty = execution_data.get('leavesQty')
+        completed = (float(leaves_qty) == 0 if leaves_qty not in (None, '')
+                     else entry['order_qty'] and entry['qty'] >= entry['order_qty'])
+        if completed:
+            self._flush_soon(('execution', order_id))
+
+    def add_position(self, position_data: Dict):
+        """포지션 이벤트 (중간 상태는 버리고 최종 상태만 유지)"""
+        symbol = position_data.get('symbol')
+        if not symbol:
+            return
+        entry = self._entry(('position', symbol), {})
+        entry['data'] = position_data
+
+    # ---- 종료 ----
+
+    async def flush_all(self):
+        """대기 중인 병합 알림과 요약본 모두 전송"""
+        for key in list(self._pending):
+            await self._flush(key)
+        for msg_type in list(self._digests):
+            await self._send_digest(msg_type)
+
+    async def stop(self):
+        """타이머 취소 후 남은 알림 전송"""
+        tasks = list(self._timers.values()) + list(self._digest_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._timers.clear()
+        self._digest_tasks.clear()
+        await self.flush_all()
+
+    def get_stats(self) -> Dict:
+        """병합 통계"""
+        return {
+            'pending': len(self._pending),
+            'digest_pending': sum(len(v) for v in self._digests.values()),
+            'merged': self.merged_count,
+            'sent': self.sent_count
+        }
+
+    # ---- 내부 ----
+
+    def _entry(self, key: Tuple[str, str], initial: Dict) -> Dict:
+        """병합 항목 조회/생성 후 전송 타이머 예약"""
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = dict(initial, count=0, first_at=time.monotonic())
+            self._pending[key] = entry
+            self._timers[key] = asyncio.create_task(self._flush_after(key, self.window))
+        else:
+            self.merged_count += 1
+        entry['count'] += 1
+        return entry
+
+    def _flush_soon(self, key: Tuple[str, str]):
+        """창 종료를 기다리지 않고 전송"""
+        timer = self._timers.get(key)
+        if timer:
+            timer.cancel()
+        self._timers[key] = asyncio.create_task(self._flush_after(key, 0))
+
+    async def _flush_after(self, key: Tuple[str, str], delay: float):
+        """지연 후 전송"""
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        self._timers.pop(key, None)
+        await self._flush(key)
+
+    async def _flush(self, key: Tuple[str, str]):
+        """병합된 항목을 메시지로 변환하여 전송 또는 요약본에 추가"""
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+
+        try:
+            kind = key[0]
+            if kind == 'order':
+                message, msg_type = self._render_order(entry), self.bot.MSG_TYPE_ORDER
+            elif kind == 'execution':
+                message, msg_type = self._render_execution(entry), self.bot.MSG_TYPE_EXECUTION
+            else:
+                message, msg_type = self._render_position(entry), self.bot.MSG_TYPE_POSITION
+
+            if not message:
+                return
+
+            if msg_type in self.digest_intervals:
+                self._digests.setdefault(msg_type, []).append(message)
+                self._ensure_digest_task(msg_type)
+            else:
+                await self.bot.send_message_to_all(message, msg_type)
+                self.sent_count += 1
+
+        except Exception as e:
+            logger.error(f"병합 알림 전송 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+
+    def _render_order(self, entry: Dict) -> str:
+        """주문 알림 (최종 상태 기준, 상태 변화 이력 포함)"""
+        data = entry['data']
+        status = entry['statuses'][-1]
+        if status in ('Created', 'New'):
+            message = self.formatter.format_order_created(data)
+        elif status == 'Filled':
+            message = self.formatter.format_order_filled(data)
+        elif status == 'Cancelled':
+            message = self.formatter.format_order_cancelled(data)
+        else:
+            return ""
+
+        if len(entry['statuses']) > 1:
+            message += f"\n상태: {' → '.join(entry['statuses'])}"
+        return message
+
+    def _render_execution(self, entry: Dict) -> str:
+        """체결 알림 (누적 수량과 VWAP)"""
+        qty = entry['qty']
+        vwap = entry['notional'] / qty if qty > 0 else 0
+        message = (
+            f"💫 체결 알림 (누적)\n"
+            f"심볼: {entry['symbol']}\n"
+            f"방향: {entry['side']}\n"
+            f"체결 수량: {qty:.3f}\n"
+            f"평균 가격(VWAP): {vwap:.1f}\n"
+            f"수수료: {entry['fee']:.6f} USDT"
+        )
+        if entry['count'] > 1:
+            message += f"\n체결 {entry['count']}건 병합"
+        return message
+
+    def _render_position(self, entry: Dict) -> str:
+        """포지션 알림 (최종 상태만)"""
+        message = self.formatter.format_position_update(entry['data'])
+        if message and entry['count'] > 1:
+            message += f"\n(업데이트 {entry['count']}건 병합)"
+        return message
+
+    def _ensure_digest_task(self, msg_type: str):
+        """요약 전송 주기 작업 시작"""
+        task = self._digest_tasks.get(msg_type)
+        if task is None or task.done():
+            self._digest_tasks[msg_type] = asyncio.create_task(self._digest_loop(msg_type))
+
+    async def _digest_loop(self, msg_type: str):
+        """주기적으로 요약본 전송 (쌓인 메시지가 없으면 종료)"""
+        interval = self.digest_intervals[msg_type]
+        while self._digests.get(msg_type):
+            await asyncio.sleep(interval)
+            await self._send_digest(msg_type)
+
+    async def _send_digest(self, msg_type: str):
+        """요약본 전송"""
+        messages = self._digests.pop(msg_type, [])
+        if not messages:
+            return
+
+        shown = messages[-self.MAX_DIGEST_ITEMS:]
+        header = f"🗂 {msg_type} 요약 ({len(messages)}건)"
+        if len(messages) > len(shown):
+            header += f" - 최근 {len(shown)}건 표시"
+        await self.bot.send_message_to_all(header + "\n\n" + "\n\n".join(shown), msg_type)
+        self.sent_count += 1
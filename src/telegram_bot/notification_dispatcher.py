@@ -0,0 +1,204 @@
+import time
+import asyncio
+import logging
+import traceback
+from collections import deque
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, Optional
+from services.rate_limiter import RateLimiter
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_SEND = registry.histogram('telegram_send_duration_seconds', '텔레그램 전송 1회 소요 시간', ('result',))
+
+class NotificationDispatcher:
+    """텔레그램 알림 백그라운드 전송기
+
+    - enqueue() 는 즉시 반환하므로 매매 코루틴이 전송을 기다리지 않음
+    - 채팅방별 워커가 순서를 유지하며 동시에 전송 (채팅방별 최소 간격 + 전체 초당 한도)
+    - RetryAfter 응답은 지정된 시간만큼 대기 후 재시도, 네트워크 오류는 지수 백오프로 재시도
+    """
+
+    GLOBAL_RATE = 25           # 전체 초당 전송 수 (텔레그램 한도 30/s)
+    PRIVATE_INTERVAL = 1.0     # 개인 채팅 최소 전송 간격 (초)
+    GROUP_INTERVAL = 3.0       # 그룹 채팅 최소 전송 간격 (초, 한도 20/min)
+    MAX_RETRIES = 3
+    MAX_QUEUE_SIZE = 1000      # 채팅방별 최대 대기 메시지 수
+    WARN_QUEUE_DEPTH = 50      # 대기열 경고 기준
+    LATENCY_WINDOW = 500       # 지연 통계에 사용할 최근 전송 수
+
+    def __init__(self, send_func: Callable[..., Awaitable], global_rate: float = GLOBAL_RATE):
+        """
+        Args:
+            send_func: 실제 전송 함수 (chat_id, text, parse_mode) - 실패 시 예외 발생
+            global_rate: 전체 초당 전송 한도
+        """
+        self._send_func = send_func
+        self._global_limiter = RateLimiter(global_rate, name='telegram')
+        self._queues: Dict[int, deque] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._wakeups: Dict[int, asyncio.Event] = {}
+        self._last_sent: Dict[int, float] = {}
+        self._closed = False
+
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self.sent_count = 0
+        self.failed_count = 0
+        self.retry_count = 0
+        self.dropped_count = 0
+
+    # ---- 등록 ----
+
+    def enqueue(self, chat_id: int, text: str, parse_mode: str = None, msg_type: str = None) -> bool:
+        """메시지 전송 예약 (대기하지 않음)"""
+        if self._closed:
+            logger.warning("알림 전송기가 종료되어 메시지를 버립니다")
+            self.dropped_count += 1
+            return False
+        if not chat_id or not text:
+            return False
+
+        queue = self._queues.setdefault(chat_id, deque())
+        if len(queue) >= self.MAX_QUEUE_SIZE:
+            # 가장 오래된 메시지를 버리고 최신 상태 우선
+            queue.popleft()
+            self.dropped_count += 1
+            logger.warning(f"알림 대기열 초과로 오래된 메시지 폐기 (chat_id: {chat_id})")
+
+        queue.append({
+            'text': text,
+            'parse_mode': parse_mode,
+            'msg_type': msg_type,
+            'enqueued_at': time.monotonic(),
+            'attempts': 0
+        })
+        if len(queue) == self.WARN_QUEUE_DEPTH:
+            logger.warning(f"알림 대기열 적체 (chat_id: {chat_id}, 대기: {len(queue)}건)")
+        self._ensure_worker(chat_id)
+        return True
+
+    # ---- 종료 ----
+
+    async def drain(self, timeout: float = 10.0) -> bool:
+        """대기 중인 메시지 전송 완료까지 대기"""
+        deadline = time.monotonic() + timeout
+        while self.queue_depth() > 0:
+            if time.monotonic() >= deadline:
+                logger.warning(f"알림 대기열 비우기 시간 초과 (남은 메시지: {self.queue_depth()})")
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def stop(self, timeout: float = 10.0):
+        """남은 메시지를 전송하고 워커 종료"""
+        await self.drain(timeout)
+        self._closed = True
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        logger.info(f"알림 전송기 종료됨: {self.get_stats()}")
+
+    # ---- 통계 ----
+
+    def queue_depth(self) -> int:
+        """전체 대기 메시지 수"""
+        return sum(len(q) for q in self._queues.values())
+
+    def get_stats(self) -> Dict:
+        """대기열/전송 지연 통계"""
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        return {
+            'queue_depth': self.queue_depth(),
+            'queue_depth_by_chat': {chat_id: len(q) for chat_id, q in self._queues.items() if q},
+            'sent': self.sent_count,
+            'failed': self.failed_count,
+            'retried': self.retry_count,
+            'dropped': self.dropped_count,
+            'latency_avg_ms': round(sum(latencies) / count * 1000, 1) if count else 0.0,
+            'latency_p95_ms': round(latencies[min(count - 1, int(count * 0.95))] * 1000, 1) if count else 0.0,
+            'latency_max_ms': round(latencies[-1] * 1000, 1) if count else 0.0
+        }
+
+    # ---- 내부 ----
+
+    def _ensure_worker(self, chat_id: int):
+        """채팅방 워커가 없으면 생성하고 깨움"""
+        wakeup = self._wakeups.setdefault(chat_id, asyncio.Event())
+        wakeup.set()
+        worker = self._workers.get(chat_id)
+        if worker is None or worker.done():
+            self._workers[chat_id] = asyncio.create_task(self._worker(chat_id))
+
+    def _min_interval(self, chat_id: int) -> float:
+        """채팅방 종류별 최소 전송 간격 (음수 ID 는 그룹)"""
+        return self.GROUP_INTERVAL if int(chat_id) < 0 else self.PRIVATE_INTERVAL
+
+    async def _worker(self, chat_id: int):
+        """채팅방별 전송 루프"""
+        queue = self._queues[chat_id]
+        wakeup = self._wakeups[chat_id]
+        while True:
+            if not queue:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+
+            # 채팅방별 간격 유지
+            wait = self._last_sent.get(chat_id, 0) + self._min_interval(chat_id) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            item = queue[0]
+            await self._global_limiter.acquire()
+            retry_delay = await self._deliver(chat_id, item)
+            self._last_sent[chat_id] = time.monotonic()
+
+            if retry_delay is None:
+                queue.popleft()
+            else:
+                await asyncio.sleep(retry_delay)
+
+    async def _deliver(self, chat_id: int, item: Dict) -> Optional[float]:
+        """메시지 1건 전송 (재시도가 필요하면 대기 시간 반환)"""
+        started = time.monotonic()
+        try:
+            await self._send_func(chat_id, item['text'], item['parse_mode'])
+            TELEGRAM_SEND.observe(time.monotonic() - started, 'ok')
+            self.sent_count += 1
+            self._latencies.append(time.monotonic() - item['enqueued_at'])
+            return None
+
+        except Exception as e:
+            TELEGRAM_SEND.observe(time.monotonic() - started, type(e).__name__)
+            item['attempts'] += 1
+            retry_after = getattr(e, 'retry_after', None)
+
+            if retry_after is not None:
+                # 텔레그램 FloodControl: 지정된 시간 후 재시도 (시도 횟수와 무관)
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                self.retry_count += 1
+                logger.warning(f"텔레그램 전송 제한, {retry_after}초 후 재시도 (chat_id: {chat_id})")
+                return float(retry_after)
+
+            if self._is_transient(e) and item['attempts'] <= self.MAX_RETRIES:
+                self.retry_count += 1
+                delay = min(2 ** item['attempts'], 30)
+                logger.warning(f"메시지 전송 재시도 {item['attempts']}/{self.MAX_RETRIES} "
+                               f"(chat_id: {chat_id}): {str(e)}")
+                return delay
+
+            self.failed_count += 1
+            logger.error(f"메시지 전송 실패 (chat_id: {chat_id}): {str(e)}")
+            logger.debug(traceback.format_exc())
+            return None
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """재시도 가능한 오류 여부 (타임아웃/네트워크 오류)"""
+        if isinstance(error, (asyncio.TimeoutError, ConnectionError, OSError)):
+            return True
+        return type(error).__name__ in ('TimedOut', 'NetworkError')
@@ -1,3 +1,4 @@
 from .trade_manager import TradeManager
+from .exit_manager import ExitManager
 
-__all__ = ['TradeManager']
\ No newline at end of file
+__all__ = ['TradeManager', 'ExitManager']
\ No newline at end of file
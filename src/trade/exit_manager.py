@@ -0,0 +1,368 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from config import config
+from config.trading_config import trading_config
+from services.risk_engine import RiskEngine
+
+logger = logging.getLogger(__name__)
+
+class ExitManager:
+    """클라이언트 측 분할 익절/본전 이동/트레일링 스톱 실행기
+
+    - 진입 주문에는 손절가와 2차 익절가(전량)만 걸고, 포지션이 열리면 1차 익절가에
+      tp1_fraction 만큼 부분 익절(trading-stop Partial)을 한 번 등록
+    - 1차 익절로 포지션이 줄면 손절가를 진입가(+수수료 여유)로 이동
+    - 트레일링이 활성화되면 마크 가격의 최고가(숏은 최저가)에서 distance_pct 만큼 떨어진 곳으로 손절가를 올림
+    - 손절가 변경은 trading-stop(Full) 한 번으로 보내고, min_step_ticks 호가 이상 개선될 때만,
+      심볼당 요청 하나만 진행 중일 때, min_interval 초 간격으로 보냄 (그 사이 값은 최신 값으로 합침)
+
+    실거래에서는 포지션 스트림과 퍼블릭 티커로, 백테스트에서는 봉 내부 가격 경로로 구동됩니다.
+    """
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'tp1_fraction': 0.5,           # 1차 익절에서 정리할 비중
+        'breakeven_offset_pct': 0.1,   # 1차 익절 후 손절가 = 진입가 ± 이 비율(%) (None 이면 이동 안 함)
+        'trailing': {'enabled': True, 'activate_pct': None, 'distance_pct': 1.0},
+        'min_step_ticks': 10,          # 이보다 작은 손절가 개선은 보내지 않음 (호가 단위 수)
+        'min_interval': 1.0            # 심볼별 손절가 변경 요청 최소 간격 (초)
+    }
+
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self, bybit_client, risk_engine: RiskEngine = None, settings: Dict = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if settings is None:
+            settings = config.load_json_config('exit_config.json')
+        options = {**self.DEFAULT_SETTINGS, **settings}
+        trailing = {**self.DEFAULT_SETTINGS['trailing'], **(options.get('trailing') or {})}
+
+        self.bybit_client = bybit_client
+        self.risk_engine = risk_engine or RiskEngine.get_instance()
+        self.clock = clock
+        self.enabled = bool(options['enabled'])
+        self.tp1_fraction = float(options['tp1_fraction'])
+        offset = options['breakeven_offset_pct']
+        self.breakeven_offset = None if offset is None else float(offset) / 100
+        self.trailing_enabled = bool(trailing['enabled'])
+        activate = trailing['activate_pct']
+        self.trailing_activate = None if activate is None else float(activate) / 100
+        self.trailing_distance = float(trailing['distance_pct']) / 100
+        self.min_step_ticks = max(int(options['min_step_ticks']), 1)
+        self.min_interval = float(options['min_interval'])
+
+        self._plans: Dict[str, Dict] = {}
+        self._positions: Dict[str, Dict] = {}   # 스트림으로 받은 심볼별 {'side', 'size', 'entry_price'}
+        self._tasks = set()
+        self._ws_client = None
+        self._public_ws_client = None
+        self._topics: Dict[str, str] = {}
+        self.stats = {'ticks': 0, 'requests': 0, 'take_profit_orders': 0, 'stop_updates': 0,
+                      'failed': 0, 'deferred': 0}
+        self._tick_latency = deque(maxlen=self.LATENCY_SAMPLES)      # 마크 가격 한 틱 처리 시간
+        self._reaction_latency = deque(maxlen=self.LATENCY_SAMPLES)  # 이벤트 수신 → 요청 전송
+
+    # ---- 시작/중지 ----
+
+    async def start(self):
+        """포지션 스트림과 거래 심볼 티커 구독"""
+        if not self.enabled or self._ws_client is not None:
+            return
+        self._ws_client = self.bybit_client.ws_client
+        self._public_ws_client = self.bybit_client.public_ws_client
+        self._ws_client.add_callback('position', self._handle_position_update)
+        for symbol in trading_config.symbols:
+            self._watch(symbol)
+        logger.info(f"청산 실행기 시작 (1차 익절 {self.tp1_fraction:.0%}, 트레일링 {self.trailing_distance:.2%})")
+
+    def stop(self):
+        """스트림 구독 해제 (거래소에 걸린 손절/익절은 그대로 유지)"""
+        if self._ws_client is not None:
+            self._ws_client.remove_callback('position', self._handle_position_update)
+            for topic in self._topics.values():
+                self._public_ws_client.remove_callback(topic, self._handle_ticker)
+            self._topics.clear()
+            self._ws_client = None
+            self._public_ws_client = None
+        for task in self._tasks:
+            task.cancel()
+
+    # ---- 진입 등록 ----
+
+    def accepts(self, side: str, entry_price: float, take_profit1: float, take_profit2: float) -> bool:
+        """분할 익절을 적용할 수 있는 신호인지 (진입가 < 1차 < 2차 익절, 숏은 반대)"""
+        if not self.enabled:
+            return False
+        try:
+            entry_price, take_profit1, take_profit2 = float(entry_price), float(take_profit1), float(take_profit2)
+        except (TypeError, ValueError):
+            return False
+        if side == 'Buy':
+            return 0 < entry_price < take_profit1 < take_profit2
+        return entry_price > take_profit1 > take_profit2 > 0
+
+    def register(self, symbol: str, side: str, qty: float, entry_price: float, stop_loss: float,
+                 take_profit1: float, take_profit2: float) -> bool:
+        """신규 진입 주문의 청산 계획 등록 (1차 익절 수량이 최소 주문 수량보다 작으면 등록 안 함)"""
+        if not self.accepts(side, entry_price, take_profit1, take_profit2):
+            return False
+        tp1_qty = float(self.risk_engine.round_qty(qty * self.tp1_fraction, symbol))
+        min_qty = self.risk_engine.min_order_qty(symbol)
+        if tp1_qty < min_qty or qty - tp1_qty < min_qty:
+            logger.info(f"분할 익절 생략 ({symbol}): 수량 {qty} 이 너무 작음")
+            return False
+
+        self._plans[symbol] = {
+            'symbol': symbol,
+            'side': side,
+            'sign': 1 if side == 'Buy' else -1,
+            'stage': 'pending',              # pending → open → tp1
+            'qty': float(qty),
+            'tp1_qty': tp1_qty,
+            'entry_price': float(entry_price),
+            'take_profit1': float(take_profit1),
+            'take_profit2': float(take_profit2),
+            'stop_loss': float(stop_loss or 0),   # 거래소에 걸린 손절가
+            'target_stop': None,                  # 보내려는 손절가
+            'force': False,                       # 본전 이동은 최소 폭/간격 무시
+            'tp1_sent': False,
+            'trailing': self.trailing_enabled and self.trailing_activate == 0,
+            'best_price': None,
+            'sending': False,
+            'last_sent': float('-inf')
+        }
+        logger.info(f"청산 계획 등록: {symbol} {side} {qty} (1차 {take_profit1} x {tp1_qty}, 2차 {take_profit2})")
+        self._watch(symbol)
+
+        # 주문 응답보다 체결 스트림이 먼저 온 경우
+        position = self._positions.get(symbol)
+        if position and position['side'] == side:
+            self.on_position(symbol, side, position['size'], position['entry_price'])
+        return True
+
+    def release(self, symbol: str):
+        """청산 계획 해제 (수동 조정 등으로 포지션이 계획과 달라진 경우)"""
+        if self._plans.pop(symbol, None):
+            logger.info(f"청산 계획 해제: {symbol}")
+
+    def has_plan(self, symbol: str) -> bool:
+        return symbol in self._plans
+
+    # ---- 이벤트 처리 (동기, 요청은 태스크로 보냄) ----
+
+    def on_position(self, symbol: str, side: str, size: float, entry_price: float):
+        """포지션 변경 반영 (체결 → 1차 익절 등록, 1차 익절 체결 → 본전 이동, 청산 → 계획 종료)"""
+        received = time.perf_counter()
+        if size > 0 and side in ('Buy', 'Sell'):
+            self._positions[symbol] = {'side': side, 'size': size, 'entry_price': entry_price}
+        else:
+            self._positions.pop(symbol, None)
+
+        plan = self._plans.get(symbol)
+        if not plan:
+            return
+        if plan['stage'] == 'pending':
+            # 반대 포지션 청산 직후의 크기 0 업데이트는 무시
+            if size > 0 and side == plan['side']:
+                plan['stage'] = 'open'
+                plan['entry_price'] = entry_price or plan['entry_price']
+                self._on_size(plan, size, received)
+            return
+        if size <= 0 or side != plan['side']:
+            logger.info(f"청산 계획 종료: {symbol} 포지션 청산")
+            self._plans.pop(symbol, None)
+            return
+        self._on_size(plan, size, received)
+
+    def on_mark(self, symbol: str, price: float):
+        """마크 가격 반영 (트레일링 손절가 갱신)"""
+        received = time.perf_counter()
+        plan = self._plans.get(symbol)
+        if not plan or plan['stage'] == 'pending' or price <= 0:
+            return
+        self.stats['ticks'] += 1
+
+        sign = plan['sign']
+        if plan['best_price'] is None or sign * (price - plan['best_price']) > 0:
+            plan['best_price'] = price
+        if (self.trailing_enabled and not plan['trailing'] and self.trailing_activate is not None
+                and sign * (plan['best_price'] / plan['entry_price'] - 1) >= self.trailing_activate):
+            plan['trailing'] = True
+        if plan['trailing']:
+            self._raise_target(plan, plan['best_price'] * (1 - sign * self.trailing_distance))
+
+        self._maybe_update_stop(plan, received)
+        self._tick_latency.append(time.perf_counter() - received)
+
+    async def flush(self):
+        """진행 중인 요청이 모두 끝날 때까지 대기 (백테스트에서 틱마다 호출)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _on_size(self, plan: Dict, size: float, received: float):
+        half_step = self.risk_engine.spec(plan['symbol'])['qty_step'] / 2
+        if not plan['tp1_sent']:
+            # 진입 지정가가 전부 체결된 뒤 1차 익절 등록
+            if size >= plan['qty'] - half_step:
+                plan['tp1_sent'] = True
+                self._spawn(self._send_take_profit(plan, received))
+        elif plan['stage'] == 'open' and size <= plan['qty'] - plan['tp1_qty'] + half_step:
+            plan['stage'] = 'tp1'
+            logger.info(f"1차 익절 체결: {plan['symbol']} 남은 수량 {size}")
+            if self.breakeven_offset is not None:
+                breakeven = plan['entry_price'] * (1 + plan['sign'] * self.breakeven_offset)
+                if self._raise_target(plan, breakeven):
+                    plan['force'] = True
+            if self.trailing_enabled and self.trailing_activate is None:
+                plan['trailing'] = True
+            self._maybe_update_stop(plan, received)
+
+    def _raise_target(self, plan: Dict, price: float) -> bool:
+        """목표 손절가를 더 유리한 쪽으로만 이동"""
+        current = plan['target_stop'] if plan['target_stop'] is not None else plan['stop_loss']
+        if current and plan['sign'] * (price - current) <= 0:
+            return False
+        plan['target_stop'] = price
+        return True
+
+    def _maybe_update_stop(self, plan: Dict, received: Optional[float]):
+        """목표 손절가가 충분히 개선됐고 요청 간격이 지났으면 전송 (진행 중이면 끝난 뒤 최신 값으로)"""
+        target = plan['target_stop']
+        if target is None or plan['sending']:
+            return
+        symbol = plan['symbol']
+        target = float(self.risk_engine.round_price(target, symbol))
+        current = plan['stop_loss']
+        min_step = 1 if plan['force'] else self.min_step_ticks
+        if current and plan['sign'] * (target - current) < min_step * self.risk_engine.spec(symbol)['tick_size'] - 1e-12:
+            return
+        if not plan['force'] and self.clock() - plan['last_sent'] < self.min_interval:
+            self.stats['deferred'] += 1
+            return
+        plan['sending'] = True
+        self._spawn(self._send_stop(plan, target, received))
+
+    # ---- 거래소 요청 ----
+
+    async def _send_take_profit(self, plan: Dict, received: float):
+        symbol = plan['symbol']
+        ok = await self._trading_stop(symbol, {
+            'tpslMode': 'Partial',
+            'takeProfit': self.risk_engine.format_price(plan['take_profit1'], symbol),
+            'tpSize': self.risk_engine.format_qty(plan['tp1_qty'], symbol),
+            'tpOrderType': 'Market'
+        }, received)
+        if ok:
+            self.stats['take_profit_orders'] += 1
+        else:
+            logger.warning(f"1차 익절 등록 실패: {symbol} (2차 익절/손절만 유지)")
+
+    async def _send_stop(self, plan: Dict, price: float, received: Optional[float]):
+        symbol = plan['symbol']
+        try:
+            ok = await self._trading_stop(symbol, {
+                'tpslMode': 'Full',
+                'stopLoss': self.risk_engine.format_price(price, symbol)
+            }, received)
+            if ok:
+                self.stats['stop_updates'] += 1
+                plan['stop_loss'] = price
+                logger.info(f"손절가 이동: {symbol} → {price}")
+            plan['force'] = False
+        finally:
+            plan['sending'] = False
+            plan['last_sent'] = self.clock()
+        # 전송 중에 더 개선된 목표가가 생겼으면 이어서 처리
+        if self._plans.get(symbol) is plan:
+            self._maybe_update_stop(plan, None)
+
+    async def _trading_stop(self, symbol: str, params: Dict, received: Optional[float]) -> bool:
+        """/v5/position/trading-stop 호출 (지정하지 않은 손절/익절 값은 거래소에서 그대로 유지)"""
+        if received is not None:
+            self._reaction_latency.append(time.perf_counter() - received)
+        self.stats['requests'] += 1
+        try:
+            response = await self.bybit_client.exchange.private_post_v5_position_trading_stop({
+                'category': 'linear',
+                'symbol': symbol,
+                'positionIdx': 0,
+                **params
+            })
+            if response and str(response.get('retCode')) == '0':
+                return True
+            self.stats['failed'] += 1
+            logger.warning(f"손절/익절 변경 실패 ({symbol}): {response}")
+            return False
+        except Exception as e:
+            self.stats['failed'] += 1
+            logger.error(f"손절/익절 변경 중 오류: {str(e)}")
+            return False
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ---- 스트림 ----
+
+    def _watch(self, symbol: str):
+        """심볼 티커 구독 (스트림 미연결 또는 이미 구독 중이면 무시)"""
+        if self._public_ws_client is None or symbol in self._topics:
+            return
+        topic = self._public_ws_client.ticker_topic(symbol)
+        self._public_ws_client.add_callback(topic, self._handle_ticker)
+        self._topics[symbol] = topic
+
+    async def _handle_position_update(self, data: Dict):
+        try:
+            item = data.get('data', {})
+            if item.get('symbol'):
+                self.on_position(
+                    item['symbol'], item.get('side'), abs(self._to_float(item.get('size'))),
+                    self._to_float(item.get('entryPrice') or item.get('avgPrice'))
+                )
+        except Exception as e:
+            logger.error(f"청산 실행기 포지션 처리 중 오류: {str(e)}")
+
+    async def _handle_ticker(self, data: Dict):
+        try:
+            item = data.get('data', {})
+            mark_price = self._to_float(item.get('markPrice'))
+            if item.get('symbol') and mark_price > 0:
+                self.on_mark(item['symbol'], mark_price)
+        except Exception as e:
+            logger.error(f"청산 실행기 티커 처리 중 오류: {str(e)}")
+
+    # ---- 조회 ----
+
+    def get_stats(self) -> Dict:
+        """요청 수와 처리 지연 (µs, p50/p95/max)"""
+        def percentiles(samples) -> Dict:
+            if not samples:
+                return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+            values = np.asarray(samples) * 1e6
+            return {'p50': float(np.percentile(values, 50)), 'p95': float(np.percentile(values, 95)),
+                    'max': float(values.max())}
+
+        return {
+            **self.stats,
+            'plans': {symbol: plan['stage'] for symbol, plan in self._plans.items()},
+            'tick_us': percentiles(self._tick_latency),
+            'reaction_us': percentiles(self._reaction_latency)
+        }
+
+    @staticmethod
+    def _to_float(value, default: float = 0.0) -> float:
+        """안전한 float 변환"""
+        try:
+            if value is None or value == '':
+                return default
+            return float(value)
+        except (ValueError, TypeError):
+            return default
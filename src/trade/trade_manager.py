@@ -2,6 +2,7 @@ import logging
 import traceback
 from typing import Dict, TYPE_CHECKING
 from config.trading_config import trading_config
+from services.tracer import traced
 
 if TYPE_CHECKING:
     from services.order_service import OrderService
@@ -13,6 +14,7 @@ class TradeManager:
         self.order_service = order_service
         self.symbol = trading_config.symbol
 
+    @traced('trade.execute_trade')
     async def execute_trade(self, analysis: Dict) -> bool:
         """분석 결과에 따른 매매 실행"""
         try:
@@ -35,7 +37,7 @@ class TradeManager:
             
             # 주문 파라미터 설정
             order_params = {
-                'symbol': 'BTCUSDT',
+                'symbol': analysis.get('symbol') or self.symbol,
                 'side': 'Buy' if signals['position_suggestion'] == 'BUY' else 'Sell',
                 'position_size': signals['position_size'],
                 'leverage': signals['leverage'],
@@ -53,8 +55,8 @@ class TradeManager:
             logger.error(f"매매 실행 중 오류: {str(e)}")
             return False
 
-    def _should_execute_trade(self, analysis: Dict) -> bool:
-        """자동매매 실행 여부 결정"""
+    def should_execute_trade(self, analysis: Dict) -> bool:
+        """자동매매 실행 여부 결정 (관망/자동매매 비활성/신뢰도 부족이면 False)"""
         try:
             signals = analysis.get('trading_signals', {})
             
@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# config 패키지는 import 시 API 키/텔레그램 설정을 요구하므로 테스트용 값 지정 (실제 값이 있으면 유지)
+for key, value in {
+    'BYBIT_MODE': 'testnet',
+    'BYBIT_TESTNET_API_KEY': 'test-key',
+    'BYBIT_TESTNET_SECRET_KEY': 'test-secret',
+    'TELEGRAM_BOT_TOKEN': 'test-token',
+    'TELEGRAM_ADMIN_CHAT_ID': '1',
+    'TELEGRAM_ALERT_CHAT_IDS': '1'
+}.items():
+    os.environ.setdefault(key, value)
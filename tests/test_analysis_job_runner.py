@@ -0,0 +1,182 @@
+import time
+import asyncio
+
+import pytest
+
+from telegram_bot.monitors import analysis_job_runner
+from telegram_bot.monitors.analysis_job_runner import AnalysisJobRunner, AnalysisRun, AnalysisStageTimeout
+
+TIMEOUTS = {stage: 1.0 for stage in AnalysisJobRunner.STAGES}
+
+def make_run(deadline_in: float = 100.0, store_reserve: float = 0.0, **timeouts) -> AnalysisRun:
+    return AnalysisRun(
+        trigger=AnalysisJobRunner.TRIGGER_CRON,
+        candle_open=0,
+        deadline=time.monotonic() + deadline_in,
+        timeouts={**TIMEOUTS, **timeouts},
+        store_reserve=store_reserve
+    )
+
+def make_runner(job) -> AnalysisJobRunner:
+    runner = AnalysisJobRunner(job, candle_seconds=3600, name='BTCUSDT')
+    runner.timeouts = dict(TIMEOUTS)
+    runner.safety_margin = 5.0
+    runner.manual_budget = 5.0
+    return runner
+
+async def simple_job(run: AnalysisRun):
+    await run.stage('fetch', asyncio.sleep(0))
+    return {'trigger': run.trigger}
+
+@pytest.mark.asyncio
+async def test_stage_returns_result_and_records_timing():
+    run = make_run()
+
+    assert await run.stage('fetch', asyncio.sleep(0, result=42)) == 42
+    assert await run.stage('indicators', lambda x: x * 2, 21) == 42
+    assert set(run.timings) == {'fetch', 'indicators'}
+
+@pytest.mark.asyncio
+async def test_stage_timeout_cancels_candle_bound_work():
+    run = make_run(llm=0.05)
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(AnalysisStageTimeout) as info:
+        await run.stage('llm', slow())
+    assert info.value.stage == 'llm'
+    assert cancelled.is_set()
+
+@pytest.mark.asyncio
+async def test_candle_deadline_bounds_stage_timeout():
+    # 단계 제한 시간(1초)보다 봉 마감(0.05초)이 먼저
+    run = make_run(deadline_in=0.05)
+
+    with pytest.raises(AnalysisStageTimeout) as info:
+        await run.stage('fetch', asyncio.sleep(1))
+    assert info.value.timeout <= 0.05
+
+@pytest.mark.asyncio
+async def test_pre_store_stage_leaves_time_for_store():
+    # 남은 시간 1초 < 저장 예약 2초 → 실행하지 않고 바로 시간 초과
+    run = make_run(deadline_in=1.0, store_reserve=2.0)
+    work = asyncio.sleep(1)
+
+    with pytest.raises(AnalysisStageTimeout) as info:
+        await run.stage('llm', work)
+    assert info.value.timeout == 0
+    assert work.cr_frame is None     # 코루틴은 닫힘
+
+    # 저장 단계는 예약 시간을 뺄 필요 없음
+    assert await run.stage('store', asyncio.sleep(0, result='ok')) == 'ok'
+
+@pytest.mark.asyncio
+async def test_post_store_stages_ignore_candle_deadline():
+    run = make_run(deadline_in=-1.0)
+
+    assert await run.stage('notify', asyncio.sleep(0, result='sent')) == 'sent'
+
+@pytest.mark.asyncio
+async def test_order_stage_keeps_running_after_timeout():
+    run = make_run(order=0.05)
+    finished = asyncio.Event()
+
+    async def place_order():
+        await asyncio.sleep(0.2)
+        finished.set()
+
+    with pytest.raises(AnalysisStageTimeout):
+        await run.stage('order', place_order())
+    assert len(analysis_job_runner._detached_stages) == 1
+
+    await asyncio.wait_for(finished.wait(), 1)
+    await asyncio.sleep(0)
+    assert not analysis_job_runner._detached_stages
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_for_same_candle_are_merged():
+    calls = []
+
+    async def job(run):
+        calls.append(run.trigger)
+        await run.stage('fetch', asyncio.sleep(0.05))
+        return {'ok': True}
+
+    runner = make_runner(job)
+    candle_open = runner._candle_open()
+    results = await asyncio.gather(
+        runner.submit(AnalysisJobRunner.TRIGGER_CRON, candle_open=candle_open),
+        runner.submit(AnalysisJobRunner.TRIGGER_KLINE, candle_open=candle_open)
+    )
+
+    assert results == [{'ok': True}, {'ok': True}]
+    assert calls == [AnalysisJobRunner.TRIGGER_CRON]
+    assert runner.merged_count == 1
+
+@pytest.mark.asyncio
+async def test_completed_candle_is_skipped_except_for_manual():
+    runner = make_runner(simple_job)
+    candle_open = runner._candle_open()
+
+    first = await runner.submit(AnalysisJobRunner.TRIGGER_CRON)
+    again = await runner.submit(AnalysisJobRunner.TRIGGER_KLINE)
+    manual = await runner.submit(AnalysisJobRunner.TRIGGER_MANUAL)
+
+    assert runner.has_completed(candle_open)
+    assert again is first
+    assert runner.skipped_count == 1
+    assert manual == {'trigger': AnalysisJobRunner.TRIGGER_MANUAL}
+    assert runner.run_count == 2
+
+@pytest.mark.asyncio
+async def test_manual_run_has_its_own_deadline():
+    runner = make_runner(simple_job)
+    # 봉 마감 시각이 이미 지난 상태
+    runner.safety_margin = runner.candle_seconds + 10
+
+    assert await runner.submit(AnalysisJobRunner.TRIGGER_CRON) is None
+    assert runner.timeout_count == 1
+    assert runner.get_stats()['last_runs'][-1]['status'] == 'timeout:fetch'
+
+    assert await runner.submit(AnalysisJobRunner.TRIGGER_MANUAL) == {'trigger': AnalysisJobRunner.TRIGGER_MANUAL}
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_run():
+    finished = asyncio.Event()
+
+    async def job(run):
+        await run.stage('fetch', asyncio.sleep(0.1))
+        finished.set()
+        return {'ok': True}
+
+    runner = make_runner(job)
+    caller = asyncio.create_task(runner.submit(AnalysisJobRunner.TRIGGER_CRON))
+    await asyncio.sleep(0.02)
+    caller.cancel()
+
+    await asyncio.wait_for(finished.wait(), 1)
+    assert runner.has_completed()
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_analysis():
+    async def job(run):
+        await run.stage('fetch', asyncio.sleep(1))
+        return {'ok': True}
+
+    runner = make_runner(job)
+    caller = asyncio.create_task(runner.submit(AnalysisJobRunner.TRIGGER_CRON))
+    await asyncio.sleep(0.02)
+    assert runner.is_busy()
+
+    await runner.stop()
+
+    assert not runner.is_busy()
+    assert runner.get_stats()['last_runs'][-1]['status'] == 'cancelled'
+    with pytest.raises(asyncio.CancelledError):
+        await caller
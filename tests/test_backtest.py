@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.signal_sources import GPTSignalSource
+from config.trading_config import TradingConfig
+from services.account_state import AccountState
+from services.order_service import OrderService
+
+HOUR_MS = 3_600_000
+
+def make_klines(n: int = 400, seed: int = 1):
+    """무작위 보행 1시간봉 (고가/저가는 시가·종가 ±0.3%)"""
+    rng = np.random.default_rng(seed)
+    close = 40000 * np.exp(np.cumsum(rng.normal(0.0002, 0.006, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    start = 1700000000000 // HOUR_MS * HOUR_MS
+    return [
+        {'timestamp': start + i * HOUR_MS, 'open': float(o), 'high': float(max(o, c) * 1.003),
+         'low': float(min(o, c) * 0.997), 'close': float(c), 'volume': float(v)}
+        for i, (o, c, v) in enumerate(zip(open_, close, rng.uniform(50, 150, n)))
+    ]
+
+@pytest.mark.asyncio
+async def test_stub_backtest_fills_orders():
+    engine = BacktestEngine(make_klines(), GPTSignalSource.with_stub(), settings={})
+
+    report = await engine.run()
+
+    summary = report['summary']
+    assert summary['orders_executed'] > 0
+    assert summary['orders_failed'] == 0
+    assert report['stats']['total_trades'] > 0
+    assert summary['fees'] > 0
+
+@pytest.mark.asyncio
+async def test_report_equity_matches_closed_trades():
+    engine = BacktestEngine(make_klines(), GPTSignalSource.with_stub(), settings={})
+
+    report = await engine.run()
+
+    # 남은 포지션은 마지막에 정리되므로 손익 합계(수수료/펀딩비 포함) = 자산 변화
+    summary, trades = report['summary'], report['trades']
+    assert summary['final_equity'] == pytest.approx(summary['initial_balance'] + sum(t['pnl'] for t in trades))
+    assert summary['fees'] == pytest.approx(sum(t['fees'] for t in trades))
+    assert report['equity_curve'].size == summary['bars']
+
+@pytest.mark.asyncio
+async def test_backtest_with_exits_replays_ticks():
+    engine = BacktestEngine(make_klines(), GPTSignalSource.with_stub(), settings={'exits': {'enabled': True}})
+
+    report = await engine.run()
+
+    summary = report['summary']
+    assert summary['orders_failed'] == 0
+    assert summary['exits']['ticks'] > 0
+    assert summary['exits']['take_profit_orders'] > 0
+    assert report['stats']['total_trades'] > 0
+
+class FakePositionService:
+    def __init__(self, positions):
+        self.positions = positions
+
+    async def get_position(self, symbol=None):
+        return self.positions.get(symbol, {})
+
+class FakeBalanceService:
+    async def get_balance(self):
+        return {'currencies': {'USDT': {'total_equity': 1100.0, 'used_margin': 200.0, 'available_balance': 900.0}}}
+
+@pytest.mark.asyncio
+async def test_balance_fallback_sums_unrealized_pnl_over_trading_symbols(monkeypatch):
+    monkeypatch.setattr(TradingConfig, 'symbols', property(lambda self: ['BTCUSDT', 'ETHUSDT']))
+    positions = FakePositionService({'BTCUSDT': {'unrealisedPnl': 60.0}, 'ETHUSDT': {'unrealisedPnl': 40.0}})
+    order_service = OrderService(None, positions, FakeBalanceService(), account_state=AccountState())
+
+    balance = await order_service.get_balance()
+
+    assert balance['unrealized_pnl'] == 100.0
+    assert order_service.risk_engine.sizing_equity(balance) == 1000.0
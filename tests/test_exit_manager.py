@@ -0,0 +1,197 @@
+import pytest
+
+from services.instrument_cache import DEFAULT_SPEC, InstrumentCache
+from services.risk_engine import RiskEngine
+from trade.exit_manager import ExitManager
+
+SYMBOL = 'BTCUSDT'
+
+class FakeExchange:
+    """trading-stop 요청 기록 (retCode 를 바꿔 실패 응답 재현)"""
+
+    def __init__(self):
+        self.requests = []
+        self.ret_code = 0
+
+    async def private_post_v5_position_trading_stop(self, params):
+        self.requests.append(params)
+        return {'retCode': self.ret_code}
+
+class FakeClient:
+    def __init__(self):
+        self.exchange = FakeExchange()
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def engine(tmp_path):
+    cache = InstrumentCache(settings={'symbols': [SYMBOL]}, path=tmp_path / 'instruments.json')
+    cache.update(dict(DEFAULT_SPEC))
+    return RiskEngine(settings={}, instruments=cache)
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def manager(client, engine, clock):
+    return ExitManager(client, risk_engine=engine, settings={}, clock=clock)
+
+def register_long(manager):
+    return manager.register(SYMBOL, 'Buy', 0.1, 60000, 58800, 61200, 62400)
+
+async def open_long(manager, client):
+    register_long(manager)
+    manager.on_position(SYMBOL, 'Buy', 0.1, 60000)
+    await manager.flush()
+    client.exchange.requests.clear()
+
+def test_register_rejects_unordered_targets_and_tiny_qty(manager):
+    assert not manager.register(SYMBOL, 'Buy', 0.1, 60000, 58800, 62400, 61200)
+    assert not manager.register(SYMBOL, 'Sell', 0.1, 60000, 61200, 61200, 58800)
+    # 1차 익절 수량 0.0005 → 0 (최소 수량 미만)
+    assert not manager.register(SYMBOL, 'Buy', 0.001, 60000, 58800, 61200, 62400)
+    assert not manager.has_plan(SYMBOL)
+
+@pytest.mark.asyncio
+async def test_take_profit_is_placed_once_entry_is_filled(manager, client):
+    assert register_long(manager)
+    assert manager.get_stats()['plans'] == {SYMBOL: 'pending'}
+
+    # 부분 체결에서는 1차 익절을 걸지 않음
+    manager.on_position(SYMBOL, 'Buy', 0.04, 60000)
+    await manager.flush()
+    assert client.exchange.requests == []
+
+    manager.on_position(SYMBOL, 'Buy', 0.1, 60000)
+    manager.on_position(SYMBOL, 'Buy', 0.1, 60000)
+    await manager.flush()
+
+    assert client.exchange.requests == [{
+        'category': 'linear', 'symbol': SYMBOL, 'positionIdx': 0,
+        'tpslMode': 'Partial', 'takeProfit': '61200.0', 'tpSize': '0.050', 'tpOrderType': 'Market'
+    }]
+    assert manager.get_stats()['plans'] == {SYMBOL: 'open'}
+    assert manager.stats['take_profit_orders'] == 1
+
+@pytest.mark.asyncio
+async def test_position_update_before_register_is_applied(manager, client):
+    manager.on_position(SYMBOL, 'Buy', 0.1, 60010)
+    register_long(manager)
+    await manager.flush()
+
+    assert manager.get_stats()['plans'] == {SYMBOL: 'open'}
+    assert client.exchange.requests[0]['tpslMode'] == 'Partial'
+
+@pytest.mark.asyncio
+async def test_no_trailing_before_take_profit1(manager, client):
+    await open_long(manager, client)
+
+    manager.on_mark(SYMBOL, 61100)
+    await manager.flush()
+
+    assert client.exchange.requests == []
+
+@pytest.mark.asyncio
+async def test_take_profit1_fill_moves_stop_to_breakeven(manager, client, clock):
+    await open_long(manager, client)
+
+    manager.on_position(SYMBOL, 'Buy', 0.05, 60000)
+    await manager.flush()
+
+    # 진입가 + 0.1%
+    assert client.exchange.requests == [{
+        'category': 'linear', 'symbol': SYMBOL, 'positionIdx': 0,
+        'tpslMode': 'Full', 'stopLoss': '60060.0'
+    }]
+    assert manager.get_stats()['plans'] == {SYMBOL: 'tp1'}
+    assert manager.stats['stop_updates'] == 1
+
+@pytest.mark.asyncio
+async def test_trailing_stop_only_moves_forward(manager, client, clock):
+    await open_long(manager, client)
+    manager.on_position(SYMBOL, 'Buy', 0.05, 60000)
+    await manager.flush()
+    client.exchange.requests.clear()
+
+    clock.now += 2
+    manager.on_mark(SYMBOL, 61000)
+    await manager.flush()
+    assert client.exchange.requests[-1]['stopLoss'] == '60390.0'     # 61000 × (1 - 1%)
+
+    # 가격이 내려가도 손절가는 그대로
+    clock.now += 2
+    manager.on_mark(SYMBOL, 60500)
+    await manager.flush()
+    assert len(client.exchange.requests) == 1
+
+    # min_step_ticks(10호가 = 1.0) 미만 개선은 보내지 않음
+    clock.now += 2
+    manager.on_mark(SYMBOL, 61000.5)
+    await manager.flush()
+    assert len(client.exchange.requests) == 1
+
+@pytest.mark.asyncio
+async def test_stop_updates_within_min_interval_are_coalesced(manager, client, clock):
+    await open_long(manager, client)
+    manager.on_position(SYMBOL, 'Buy', 0.05, 60000)
+    await manager.flush()
+    client.exchange.requests.clear()
+
+    # 본전 이동 직후 (min_interval 이내) 는 보류
+    manager.on_mark(SYMBOL, 61000)
+    manager.on_mark(SYMBOL, 61500)
+    await manager.flush()
+    assert client.exchange.requests == []
+    assert manager.stats['deferred'] == 2
+
+    # 간격이 지나면 최신 목표가 하나만 전송
+    clock.now += 2
+    manager.on_mark(SYMBOL, 61400)
+    await manager.flush()
+    assert [request['stopLoss'] for request in client.exchange.requests] == ['60885.0']
+
+@pytest.mark.asyncio
+async def test_short_breakeven_and_trailing(manager, client, clock):
+    assert manager.register(SYMBOL, 'Sell', 0.1, 60000, 61200, 58800, 57600)
+    manager.on_position(SYMBOL, 'Sell', 0.1, 60000)
+    manager.on_position(SYMBOL, 'Sell', 0.05, 60000)
+    await manager.flush()
+    assert client.exchange.requests[-1]['stopLoss'] == '59940.0'     # 진입가 - 0.1%
+
+    clock.now += 2
+    manager.on_mark(SYMBOL, 59000)
+    await manager.flush()
+    assert client.exchange.requests[-1]['stopLoss'] == '59590.0'     # 59000 × (1 + 1%)
+
+@pytest.mark.asyncio
+async def test_failed_request_keeps_previous_stop(manager, client, clock):
+    await open_long(manager, client)
+    client.exchange.ret_code = 10001
+
+    manager.on_position(SYMBOL, 'Buy', 0.05, 60000)
+    await manager.flush()
+
+    assert manager.stats['failed'] == 1
+    assert manager.stats['stop_updates'] == 0
+    assert manager._plans[SYMBOL]['stop_loss'] == 58800
+
+@pytest.mark.asyncio
+async def test_plan_ends_when_position_is_closed(manager, client):
+    await open_long(manager, client)
+
+    manager.on_position(SYMBOL, 'Buy', 0, 0)
+
+    assert not manager.has_plan(SYMBOL)
+    manager.on_mark(SYMBOL, 62000)
+    await manager.flush()
+    assert client.exchange.requests == []
@@ -0,0 +1,74 @@
+import pytest
+
+from services.instrument_cache import DEFAULT_SPEC, InstrumentCache, margin_rate_scale, risk_tiers
+from services.risk_engine import RiskEngine
+
+# ccxt bybit fetchDerivativesMarketLeverageTiers 주석의 GET /v5/market/risk-limit 응답 예시 (퍼센트 표기)
+CCXT_SAMPLE = {
+    'retCode': 0,
+    'retMsg': 'OK',
+    'result': {
+        'category': 'inverse',
+        'list': [
+            {
+                'id': 1,
+                'symbol': 'BTCUSD',
+                'riskLimitValue': '150',
+                'maintenanceMargin': '0.5',
+                'initialMargin': '1',
+                'isLowestRisk': 1,
+                'maxLeverage': '100.00'
+            }
+        ]
+    },
+    'retExtInfo': {},
+    'time': 1672054488010
+}
+
+# 비율 표기 응답 (0.5% → 0.005)
+FRACTION_TIERS = [
+    {'riskLimitValue': '2000000', 'maintenanceMargin': '0.005', 'initialMargin': '0.01', 'maxLeverage': '100.00'},
+    {'riskLimitValue': '4000000', 'maintenanceMargin': '0.01', 'initialMargin': '0.02', 'maxLeverage': '50.00'}
+]
+
+@pytest.fixture
+def cache(tmp_path):
+    return InstrumentCache(settings={'symbols': ['BTCUSDT']}, path=tmp_path / 'instruments.json')
+
+def test_ccxt_sample_is_read_as_percent():
+    items = CCXT_SAMPLE['result']['list']
+    assert margin_rate_scale(items) == 100.0
+    assert risk_tiers(items) == [{'max_notional': 150.0, 'maintenance_margin': 0.005, 'max_leverage': 100.0}]
+
+def test_fraction_form_is_kept():
+    tiers = risk_tiers(FRACTION_TIERS)
+    assert [tier['maintenance_margin'] for tier in tiers] == [0.005, 0.01]
+
+def test_unit_is_decided_once_per_response():
+    # 퍼센트 표기에서 1 미만/이상 값이 섞여 있어도 모두 같은 단위로 변환
+    items = [
+        {'riskLimitValue': '4000000', 'maintenanceMargin': '1.5', 'initialMargin': '3', 'maxLeverage': '33.33'},
+        {'riskLimitValue': '2000000', 'maintenanceMargin': '0.5', 'initialMargin': '1', 'maxLeverage': '100.00'}
+    ]
+    tiers = risk_tiers(items)
+    assert [tier['max_notional'] for tier in tiers] == [2000000.0, 4000000.0]
+    assert [tier['maintenance_margin'] for tier in tiers] == pytest.approx([0.005, 0.015])
+
+def test_without_initial_margin_falls_back_to_magnitude():
+    assert margin_rate_scale([{'maintenanceMargin': '0.5'}, {'maintenanceMargin': '1'}]) == 100.0
+    assert margin_rate_scale([{'maintenanceMargin': '0.005'}]) == 1.0
+
+def test_invalid_items_are_skipped():
+    assert risk_tiers([{'riskLimitValue': '', 'maintenanceMargin': '0.5'}, {'riskLimitValue': '100'}]) == []
+    assert risk_tiers(None) == []
+
+def test_sizing_with_ccxt_sample_keeps_requested_leverage(cache):
+    cache.update({**DEFAULT_SPEC, 'risk_tiers': risk_tiers(CCXT_SAMPLE['result']['list'])})
+    engine = RiskEngine(settings={}, instruments=cache)
+
+    plan = engine.size_position(10000, 10, 5, 60000, 'Buy', symbol='BTCUSDT')
+
+    assert plan['leverage'] == 5
+    assert plan['maintenance_margin'] == pytest.approx(0.005)
+    # 롱 청산가 = 진입가 × (1 - 1/레버리지 + 유지 증거금률)
+    assert plan['liquidation_price'] == pytest.approx(60000 * (1 - 1 / 5 + 0.005))
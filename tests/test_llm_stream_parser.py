@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from ai.llm_client import JSONStreamParser
+
+def feed_all(parser, chunks):
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return completed
+
+def test_members_are_returned_as_soon_as_they_close():
+    parser = JSONStreamParser()
+
+    assert parser.feed('{"market_summary": {"trend": "up"') == []
+    assert parser.feed('}, "trading_signals": {"position_suggestion"') == [('market_summary', {'trend': 'up'})]
+    assert parser.feed(': "BUY", "leverage": 5}}') == [
+        ('trading_signals', {'position_suggestion': 'BUY', 'leverage': 5})
+    ]
+    assert parser.result() == {'market_summary': {'trend': 'up'},
+                               'trading_signals': {'position_suggestion': 'BUY', 'leverage': 5}}
+
+def test_brackets_and_quotes_inside_strings_are_ignored():
+    text = '{"reason": "range [1, 2] {not json} \\"quoted\\"", "levels": [1, [2, 3]], "ok": true}'
+
+    completed = feed_all(JSONStreamParser(), [text[i:i + 7] for i in range(0, len(text), 7)])
+
+    assert completed == [
+        ('reason', 'range [1, 2] {not json} "quoted"'),
+        ('levels', [1, [2, 3]]),
+        ('ok', True)
+    ]
+
+def test_truncated_response_falls_back_to_lenient_parse():
+    parser = JSONStreamParser()
+    feed_all(parser, ['{"market_summary": {"trend": "up"}, ', '"trading_signals": {"leverage": 5, "position_si'])
+
+    assert parser.members == {'market_summary': {'trend': 'up'}}
+    # 마지막으로 완성된 값까지만 사용
+    assert parser.result() == {'market_summary': {'trend': 'up'}, 'trading_signals': {'leverage': 5}}
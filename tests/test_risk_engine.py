@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from services.instrument_cache import DEFAULT_SPEC, InstrumentCache
+from services.risk_engine import RiskEngine
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = InstrumentCache(settings={'symbols': ['BTCUSDT']}, path=tmp_path / 'instruments.json')
+    cache.update(dict(DEFAULT_SPEC))
+    return cache
+
+@pytest.fixture
+def engine(cache):
+    return RiskEngine(settings={}, instruments=cache)
+
+def test_qty_is_floored_to_qty_step(engine):
+    # 10000 × 10% × 5배 = 5000 USDT → 0.08333 BTC → 0.083
+    plan = engine.size_position(10000, 10, 5, 60000, 'Buy', stop_loss=58800, symbol='BTCUSDT')
+
+    assert plan['leverage'] == 5
+    assert plan['qty'] == pytest.approx(0.083)
+    assert plan['notional'] == pytest.approx(0.083 * 60000)
+    assert not plan['leverage_capped']
+    assert not plan['exposure_capped']
+
+def test_leverage_is_lowered_until_stop_precedes_liquidation(engine):
+    # 손절 10% → floor(1 / (0.10 + 0.01 + 0.005)) = 8배
+    plan = engine.size_position(10000, 10, 10, 60000, 'Buy', stop_loss=54000, symbol='BTCUSDT')
+
+    assert plan['leverage'] == 8
+    assert plan['leverage_capped']
+    assert plan['liquidation_price'] == pytest.approx(60000 * (1 - 1 / 8 + 0.005))
+    assert plan['liquidation_price'] < plan['stop_loss']
+
+def test_short_liquidation_is_above_entry(engine):
+    plan = engine.size_position(10000, 10, 5, 60000, 'Sell', symbol='BTCUSDT')
+
+    # 손절가/익절가가 없으면 기본 거리 2%
+    assert plan['stop_loss'] == pytest.approx(61200)
+    assert plan['take_profit'] == pytest.approx(58800)
+    assert plan['liquidation_price'] == pytest.approx(60000 * (1 + 1 / 5 - 0.005))
+
+def test_notional_is_capped_by_max_exposure(engine):
+    # 1000 × 100% × 10배 = 10000 > 최대 노출 1000 × 3
+    plan = engine.size_position(1000, 100, 10, 60000, 'Buy', symbol='BTCUSDT')
+
+    assert plan['exposure_capped']
+    assert plan['qty'] == pytest.approx(0.05)
+    assert plan['notional'] <= 1000 * engine.max_exposure
+
+def test_below_min_qty_is_raised_or_rejected(cache):
+    raised = RiskEngine(settings={}, instruments=cache).size_position(10, 1, 1, 60000, 'Buy', symbol='BTCUSDT')
+    rejected = RiskEngine(settings={'raise_to_min_qty': False}, instruments=cache).size_position(
+        10, 1, 1, 60000, 'Buy', symbol='BTCUSDT'
+    )
+
+    assert raised['below_min_qty'] and raised['qty'] == pytest.approx(0.001)
+    assert rejected['below_min_qty'] and rejected['qty'] == 0
+
+def test_invalid_price_or_equity_gives_zero_qty(engine):
+    assert engine.size_position(10000, 10, 5, 0, 'Buy', symbol='BTCUSDT')['qty'] == 0
+    assert engine.size_position(0, 10, 5, 60000, 'Buy', symbol='BTCUSDT')['qty'] == 0
+
+def test_risk_tier_limits_leverage_and_sets_maintenance_margin(cache):
+    cache.update({**DEFAULT_SPEC, 'risk_tiers': [
+        {'max_notional': 1000.0, 'maintenance_margin': 0.005, 'max_leverage': 10.0},
+        {'max_notional': 1e9, 'maintenance_margin': 0.05, 'max_leverage': 4.0}
+    ]})
+    engine = RiskEngine(settings={}, instruments=cache)
+
+    # 요청 명목 가치 1000 × 10 = 10000 → 두 번째 단계
+    plan = engine.size_position(10000, 10, 10, 60000, 'Buy', symbol='BTCUSDT')
+
+    assert plan['leverage'] == 4
+    assert plan['maintenance_margin'] == pytest.approx(0.05)
+
+def test_batch_matches_single_sizing(engine):
+    equity = np.array([10000, 1000, 10000])
+    leverage = np.array([5, 10, 10])
+    stop_loss = np.array([58800, 0, 54000])
+    batch = engine.size_batch(equity, 10, leverage, 60000, 'Buy', stop_loss, symbol='BTCUSDT')
+
+    for i in range(3):
+        single = engine.size_position(equity[i], 10, leverage[i], 60000, 'Buy', stop_loss[i], symbol='BTCUSDT')
+        assert batch['qty'][i] == pytest.approx(single['qty'])
+        assert batch['leverage'][i] == single['leverage']
+
+def test_sizing_equity_basis(cache):
+    balance = {'total_equity': 1100, 'unrealized_pnl': 100, 'available_balance': 700}
+
+    assert RiskEngine(settings={}, instruments=cache).sizing_equity(balance) == 1000
+    assert RiskEngine(settings={'equity_basis': 'available'}, instruments=cache).sizing_equity(balance) == 700
@@ -0,0 +1,170 @@
+import pytest
+
+from backtest.simulated_exchange import InsufficientMargin, SimulatedExchange, bar_path
+
+HOUR_MS = 3_600_000
+# 2023-11-15 01:00 UTC (펀딩 시각 아님)
+START = 1700010000000 // HOUR_MS * HOUR_MS
+
+SETTINGS = {
+    'initial_balance': 10000.0,
+    'maker_fee': 0.0002,
+    'taker_fee': 0.001,
+    'slippage': 0.0,
+    'funding_rate': 0.0001,
+    'funding_hours': [0, 8, 16],
+    'maintenance_margin': 0.005
+}
+
+def make_exchange(**settings) -> SimulatedExchange:
+    exchange = SimulatedExchange({**SETTINGS, **settings})
+    exchange.on_bar(START, 100.0, 100.0, 100.0, 100.0)
+    return exchange
+
+async def open_position(exchange, side='buy', amount=10.0, leverage=5, **params):
+    await exchange.set_leverage(leverage)
+    return await exchange.create_order('BTCUSDT', side, 'market', amount, params=params)
+
+def next_bar(exchange, open_, high, low, close, hours=1):
+    exchange.on_bar(START + hours * HOUR_MS, open_, high, low, close)
+
+@pytest.mark.asyncio
+async def test_market_entry_pays_slippage_and_taker_fee():
+    exchange = make_exchange(slippage=0.001)
+
+    order = await open_position(exchange)
+
+    fill = 100.0 * 1.001
+    assert order['price'] == pytest.approx(fill)
+    assert exchange.position['entry_price'] == pytest.approx(fill)
+    assert exchange.position['margin'] == pytest.approx(10 * fill / 5)
+    assert exchange.fees_paid == pytest.approx(10 * fill * 0.001)
+    assert exchange.wallet == pytest.approx(10000 - 10 * fill * 0.001)
+
+@pytest.mark.asyncio
+async def test_limit_order_fills_at_limit_or_better_price():
+    passive = make_exchange()
+    await passive.create_order('BTCUSDT', 'buy', 'limit', 1.0, 99.0)
+    assert passive.position['entry_price'] == 99.0
+    assert passive.fees_paid == pytest.approx(99.0 * 0.0002)     # 메이커
+
+    crossing = make_exchange()
+    await crossing.create_order('BTCUSDT', 'buy', 'limit', 1.0, 101.0)
+    assert crossing.position['entry_price'] == 100.0
+    assert crossing.fees_paid == pytest.approx(100.0 * 0.001)    # 테이커
+
+@pytest.mark.asyncio
+async def test_stop_loss_hit_inside_bar():
+    exchange = make_exchange()
+    await open_position(exchange, stopLoss=95.0, takeProfit=110.0)
+
+    next_bar(exchange, 100.0, 104.0, 94.0, 101.0)
+
+    assert exchange.position is None
+    trade = exchange.closed_trades[-1]
+    assert trade['reason'] == 'stop_loss'
+    assert trade['exit_price'] == 95.0
+    # 손실 + 진입/청산 수수료
+    assert trade['pnl'] == pytest.approx(-50.0 - 10 * 100 * 0.001 - 10 * 95 * 0.001)
+    assert exchange.wallet == pytest.approx(10000 + trade['pnl'])
+
+@pytest.mark.asyncio
+async def test_take_profit_hit_inside_bar():
+    exchange = make_exchange()
+    await open_position(exchange, side='sell', stopLoss=105.0, takeProfit=90.0)
+
+    next_bar(exchange, 100.0, 101.0, 89.0, 95.0)
+
+    trade = exchange.closed_trades[-1]
+    assert trade['reason'] == 'take_profit'
+    assert trade['position_side'] == 'Short'
+    assert trade['exit_price'] == 90.0
+
+@pytest.mark.asyncio
+async def test_stop_loss_wins_when_both_hit_in_same_bar():
+    exchange = make_exchange()
+    await open_position(exchange, stopLoss=95.0, takeProfit=110.0)
+
+    next_bar(exchange, 100.0, 111.0, 94.0, 100.0)
+
+    assert exchange.closed_trades[-1]['reason'] == 'stop_loss'
+
+@pytest.mark.asyncio
+async def test_gap_through_stop_fills_at_open():
+    exchange = make_exchange()
+    await open_position(exchange, stopLoss=95.0)
+
+    next_bar(exchange, 92.0, 93.0, 91.0, 92.5)
+
+    assert exchange.closed_trades[-1]['exit_price'] == 92.0
+
+@pytest.mark.asyncio
+async def test_liquidation_before_stop_loss():
+    exchange = make_exchange()
+    # 10배 롱 청산가 = 100 × (1 - 1/10 + 0.005) = 90.5, 손절가 85 보다 먼저
+    await open_position(exchange, leverage=10, stopLoss=85.0)
+    assert exchange.liquidation_price(exchange.position) == pytest.approx(90.5)
+
+    next_bar(exchange, 95.0, 96.0, 88.0, 89.0)
+
+    trade = exchange.closed_trades[-1]
+    assert trade['reason'] == 'liquidation'
+    assert trade['exit_price'] == pytest.approx(90.5)
+    assert exchange.liquidations == 1
+
+@pytest.mark.asyncio
+async def test_funding_is_settled_at_funding_hours():
+    exchange = make_exchange()
+    await open_position(exchange)
+    funding_hour = (START // (8 * HOUR_MS) + 1) * 8 * HOUR_MS
+
+    # 펀딩 시각이 아닌 봉은 정산하지 않음
+    exchange.on_bar(funding_hour - HOUR_MS, 100.0, 100.0, 100.0, 100.0)
+    assert exchange.funding_paid == 0
+    exchange.on_bar(funding_hour, 100.0, 100.0, 100.0, 100.0)
+
+    # 롱이 10 × 100 × 0.01% 지급
+    assert exchange.funding_paid == pytest.approx(0.1)
+    exchange.close_all()
+    trade = exchange.closed_trades[-1]
+    assert trade['funding'] == pytest.approx(0.1)
+    assert trade['pnl'] == pytest.approx(-0.1 - 10 * 100 * 0.001 * 2)
+
+@pytest.mark.asyncio
+async def test_partial_take_profit_then_remaining_stop():
+    exchange = make_exchange()
+    await open_position(exchange, stopLoss=95.0, takeProfit=120.0)
+    await exchange.private_post_v5_position_trading_stop({'tpslMode': 'Partial', 'takeProfit': '105', 'tpSize': '4'})
+
+    next_bar(exchange, 100.0, 106.0, 99.0, 104.0)
+    assert exchange.closed_trades[-1]['reason'] == 'take_profit1'
+    assert exchange.position['size'] == pytest.approx(6.0)
+
+    await exchange.private_post_v5_position_trading_stop({'tpslMode': 'Full', 'stopLoss': '100.5'})
+    next_bar(exchange, 104.0, 104.5, 100.0, 100.2, hours=2)
+    assert exchange.closed_trades[-1]['reason'] == 'stop_loss'
+    assert exchange.position is None
+
+@pytest.mark.asyncio
+async def test_opposite_order_reverses_position():
+    exchange = make_exchange()
+    await open_position(exchange)
+
+    await exchange.create_order('BTCUSDT', 'sell', 'market', 15.0)
+
+    assert exchange.closed_trades[-1]['reason'] == 'signal'
+    assert exchange.position['side'] == 'Short'
+    assert exchange.position['size'] == pytest.approx(5.0)
+
+@pytest.mark.asyncio
+async def test_entry_beyond_available_margin_is_rejected():
+    exchange = make_exchange()
+
+    with pytest.raises(InsufficientMargin):
+        await open_position(exchange, amount=1000.0, leverage=5)
+    assert exchange.position is None
+
+def test_bar_path_visits_low_before_high_on_up_bar():
+    path = bar_path(100.0, 110.0, 95.0, 105.0, steps=1)
+
+    assert path.tolist() == [100.0, 95.0, 110.0, 105.0]
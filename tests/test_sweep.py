@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from backtest import sweep as sweep_module
+from backtest.engine import BacktestEngine
+from backtest.signal_sources import GPTSignalSource
+from backtest.sweep import ParameterSweep, SharedArrays
+from indicators.technical import TechnicalIndicators
+from test_backtest import make_klines
+
+PARAMS = {'trading.min_confidence': [60, 70]}
+
+def make_sweep(tmp_path, klines, **settings):
+    return ParameterSweep(klines, {
+        'source': 'stub', 'workers': 1, 'parameters': PARAMS,
+        'checkpoint': str(tmp_path / 'checkpoint.jsonl'), 'report': None, **settings
+    }, {})
+
+def test_indicator_frame_restores_text_columns(tmp_path):
+    klines = make_klines()
+    expected = TechnicalIndicators().calculate_indicators(klines)
+    shared = SharedArrays()
+    try:
+        base, frames = make_sweep(tmp_path, klines)._share_arrays(shared, [{'trading.min_confidence': 60}])
+        sweep_module._init_worker(base, frames, 'stub', {}, [])
+        df = sweep_module._indicator_frame('{}')
+
+        assert set(df.columns) == set(expected.columns)
+        for column in ('trend', 'divergence_type', 'divergence_desc'):
+            assert df[column].tolist() == expected[column].tolist()
+        np.testing.assert_allclose(df['rsi'].to_numpy(), expected['rsi'].to_numpy())
+    finally:
+        for block in sweep_module._worker.pop('blocks', []):
+            block.close()
+        sweep_module._worker.clear()
+        shared.close()
+
+def test_stub_sweep_produces_trades(tmp_path):
+    report = make_sweep(tmp_path, make_klines()).run(fresh=True)
+
+    assert report['completed'] == 2
+    assert report['failed'] == 0
+    for result in report['results']:
+        signals = result['summary']['signals']
+        assert signals['BUY'] + signals['SELL'] > 0
+        assert result['stats']['total_trades'] > 0
+
+@pytest.mark.asyncio
+async def test_analysis_error_fails_the_run(monkeypatch):
+    prepare = BacktestEngine._prepare
+
+    def without_divergence(self, df, signals, i):
+        prepared = prepare(self, df, signals, i)
+        prepared['df'] = prepared['df'].drop(columns=['divergence_type', 'divergence_desc'])
+        return prepared
+
+    monkeypatch.setattr(BacktestEngine, '_prepare', without_divergence)
+    engine = BacktestEngine(make_klines(), GPTSignalSource.with_stub(), settings={})
+
+    # 봉 분석 예외는 신호 없음이 아닌 실패
+    assert await engine.run() is None